@@ -0,0 +1,141 @@
+"""Ρυθμός καταχώρησης παραλαβών με N ταυτόχρονους χρήστες
+
+Εκτέλεση: python benchmarks/bench_concurrency.py [--per-writer 200] [--sync]
+
+Δύο σενάρια ανά μηχανή αποθήκευσης (sqlite, journal):
+- συνεδρίες: N νήματα μοιράζονται το ίδιο αποθετήριο, όπως οι συνεδρίες
+  ενός διακομιστή Streamlit·
+- διεργασίες: N διεργασίες με δικό τους αποθετήριο στα ίδια αρχεία.
+
+Κάθε χρήστης καταχωρεί νέες παραλαβές με expected_version=0 και, αν το id
+πάρθηκε στο μεταξύ, ξαναδοκιμάζει με το επόμενο. Στο τέλος ελέγχεται ότι
+δεν χάθηκε καμία καταχώρηση. Με --sync οι εγγραφές γίνονται χωρίς το
+write-behind (PRODUCER_WRITE_BEHIND=0).
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.repository import ConflictError, Repository
+from core.storage import open_store
+from core.writer import WriteBehindStore
+
+WRITERS = (1, 2, 4, 8)
+
+
+def open_repository(backend, directory, write_behind):
+    store = open_store(backend, path=os.path.join(directory, 'data.db'), directory=directory)
+    if write_behind:
+        store = WriteBehindStore(store)
+    return Repository(store)
+
+
+def make_receipt(record_id, writer):
+    return {
+        'id': record_id,
+        'receipt_date': '2026-01-15',
+        'producer_id': writer,
+        'producer_name': f'Παραγωγός {writer}',
+        'variety': 'Navel',
+        'lot': f'260115-{writer}-NAV',
+        'storage_location_id': 1,
+        'size_quantities': {'10': 100},
+        'total_kg': 100,
+    }
+
+
+def write_receipts(repository, writer, count):
+    """Καταχώρηση count παραλαβών· επιστρέφει το πλήθος των συγκρούσεων id"""
+    conflicts = 0
+    for _ in range(count):
+        while True:
+            try:
+                repository.upsert('receipts', make_receipt(repository.next_id('receipts'), writer), expected_version=0)
+                break
+            except ConflictError:
+                conflicts += 1
+    return conflicts
+
+
+def run_sessions(backend, directory, writers, count, write_behind):
+    repository = open_repository(backend, directory, write_behind)
+    conflicts = []
+    barrier = threading.Barrier(writers + 1)
+
+    def session(writer):
+        barrier.wait()
+        conflicts.append(write_receipts(repository, writer, count))
+
+    threads = [threading.Thread(target=session, args=(i + 1,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    if write_behind:
+        repository.store.flush()
+    elapsed = time.perf_counter() - start
+    if write_behind:
+        repository.store.close()
+    return elapsed, sum(conflicts)
+
+
+def _process(backend, directory, writer, count, write_behind, barrier, results):
+    repository = open_repository(backend, directory, write_behind)
+    barrier.wait()
+    conflicts = write_receipts(repository, writer, count)
+    if write_behind:
+        repository.store.close()
+    results.put(conflicts)
+
+
+def run_processes(backend, directory, writers, count, write_behind):
+    barrier = multiprocessing.Barrier(writers + 1)
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_process, args=(backend, directory, i + 1, count, write_behind, barrier, results))
+        for i in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    conflicts = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return time.perf_counter() - start, conflicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--per-writer', type=int, default=200)
+    parser.add_argument('--sync', action='store_true', help='Χωρίς write-behind')
+    args = parser.parse_args()
+    write_behind = not args.sync
+
+    print(f"{'μηχανή':>8} {'σενάριο':>10} {'χρήστες':>8} {'εγγραφές/s':>11} {'συγκρούσεις':>12}")
+    for backend in ('sqlite', 'journal'):
+        for name, run in (('συνεδρίες', run_sessions), ('διεργασίες', run_processes)):
+            for writers in WRITERS:
+                directory = tempfile.mkdtemp(prefix='bench-concurrency-')
+                try:
+                    elapsed, conflicts = run(backend, directory, writers, args.per_writer, write_behind)
+                    # Έλεγχος: καμία καταχώρηση δεν χάθηκε
+                    stored = open_store(backend, path=os.path.join(directory, 'data.db'), directory=directory).load('receipts')
+                    expected = writers * args.per_writer
+                    assert len(stored) == expected, f'{backend}/{name}: {len(stored)} αντί για {expected}'
+                finally:
+                    shutil.rmtree(directory)
+                print(f'{backend:>8} {name:>10} {writers:>8} {expected / elapsed:>11.0f} {conflicts:>12}')
+
+
+if __name__ == '__main__':
+    main()
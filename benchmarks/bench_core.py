@@ -0,0 +1,205 @@
+"""Χρόνος και μέγιστη μνήμη των βασικών διαδρομών δεδομένων ανά κλίμακα
+
+Εκτέλεση:
+    python benchmarks/bench_core.py [--scales 1000,10000,100000] [--backend sqlite]
+                                    [--save results.json] [--compare results.json]
+
+Για κάθε κλίμακα (πλήθος παραλαβών) τα δεδομένα παράγονται με το
+generate.py σε προσωρινό φάκελο και μετριούνται οι λειτουργίες της
+εφαρμογής: φόρτωση (load_data), πλήρης και ανά εγγραφή αποθήκευση
+(save_data/save_record), get_next_id, calculate_storage_usage (τρέχον
+και σε ημερομηνία, από το καθολικό κινήσεων) και τα φίλτρα/αθροίσματα
+των αναφορών, και σε μια ιστορική σεζόν που δεν φορτώνεται κατά την
+εκκίνηση (μετά την πρώτη κλήση οι μήνες της είναι στην cache). Ο χρόνος
+είναι ο καλύτερος από --repeat επαναλήψεις (timeit) και η μνήμη η
+μέγιστη κατά tracemalloc σε μία ξεχωριστή εκτέλεση.
+
+Με --compare οι τιμές συγκρίνονται με αποθηκευμένα αποτελέσματα και ο
+κωδικός εξόδου είναι 1 αν κάποια λειτουργία είναι πάνω από --tolerance
+πιο αργή ή πιο απαιτητική σε μνήμη.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate import write_store
+
+from core.browser import RecordBrowser
+from core.ledger import sync
+from core.options import OptionLists
+from core.partitions import season_bounds
+from core.query import QueryEngine
+from core.services import open_repository, storage_usage
+from core.storage import open_store
+
+DEFAULT_SCALES = (1000, 10000, 100000)
+
+# Οι αναφορές φιλτράρουν συνήθως τον τελευταίο μήνα της σεζόν
+REPORT_END = date(2026, 3, 31)
+REPORT_START = REPORT_END - timedelta(days=30)
+
+# Σεζόν εκτός των ενεργών (τα δεδομένα του generate.py φτάνουν ως τη 2025-26)
+HISTORY_START, HISTORY_END = season_bounds(2022)
+
+# Κάτω από αυτά τα όρια οι διαφορές είναι θόρυβος και δεν αναφέρονται
+NOISE_FLOOR = {'ms': 0.05, 'peak_kib': 64}
+
+
+def open_bench_repository(backend, directory):
+    return open_repository(backend, path=os.path.join(directory, 'data.db'), directory=directory)
+
+
+def close_repository(repository):
+    if hasattr(repository.store, 'flush'):
+        repository.store.close()
+
+
+def measure(function, repeat, number=1):
+    """(καλύτερος χρόνος ανά κλήση σε ms, μέγιστη μνήμη σε KiB)"""
+    best = min(timeit.repeat(function, repeat=repeat, number=number)) / number
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+def cases(backend, directory, repository):
+    """Ζεύγη (όνομα, συνάρτηση, πλήθος κλήσεων ανά μέτρηση)"""
+    receipts = repository.view('receipts')
+    sample = dict(receipts[len(receipts) // 2])
+    producers = list(repository.view('producers'))
+    receipt_columns = repository.index('receipts', 'columns')
+    options = OptionLists(repository)
+    engine = QueryEngine(repository)
+    last_producer = producers[-1]['id']
+    order_columns = repository.index('orders', 'columns')
+
+    def load_data_cold():
+        close_repository(open_bench_repository(backend, directory))
+
+    def load_data_warm():
+        repository.refresh()
+        return repository.views()
+
+    def save_data():
+        repository.save('producers', producers)
+
+    def save_record():
+        sample['observations'] = str(len(sample['observations']))
+        repository.upsert('receipts', dict(sample))
+
+    def receipts_report():
+        rows = receipt_columns.select(REPORT_START, REPORT_END)
+        receipt_columns.summarize(rows)
+        return receipt_columns.records(rows)
+
+    def orders_report():
+        rows = order_columns.select(REPORT_START, REPORT_END)
+        order_columns.summarize(rows)
+        return order_columns.records(rows)
+
+    def producer_options():
+        # Όπως η φόρμα παραλαβής σε επανεκτέλεση: λίστα επιλογών και προεπιλογή
+        labels, positions = options.get('producers')
+        return labels, positions.get(last_producer, 0)
+
+    def central_db_sorted_page():
+        # Νέος περιηγητής σε κάθε κλήση: μετράται η ταξινόμηση, όχι η cache
+        return RecordBrowser(repository, 'receipts').page(1, 50, 'total_kg', True)
+
+    return [
+        ('load_data (ψυχρή)', load_data_cold, 1),
+        ('load_data (ζεστή)', load_data_warm, 100),
+        ('save_data (παραγωγοί)', save_data, 5),
+        ('save_record (παραλαβή)', save_record, 50),
+        ('get_next_id', lambda: repository.next_id('receipts'), 10000),
+        ('calculate_storage_usage', lambda: storage_usage(repository), 100),
+        ('απόθεμα σε ημερομηνία', lambda: storage_usage(repository, REPORT_START), 100),
+        ('επιλογές παραγωγών (φόρμα)', producer_options, 1000),
+        ('αναφορά παραλαβών (30 ημέρες)', receipts_report, 10),
+        ('αναφορά παραγγελιών (30 ημέρες)', orders_report, 10),
+        ('πωλήσεις ανά πελάτη', lambda: engine.entity_totals('orders'), 10),
+        ('παραλαβές ανά παραγωγό', lambda: engine.entity_totals('receipts'), 10),
+        ('παραλαβές ανά ποικιλία × μήνα', lambda: engine.run('receipts', ['variety', 'month']), 10),
+        ('ιστορική σεζόν ανά παραγωγό',
+         lambda: engine.run('receipts', ['producer'], start=HISTORY_START, end=HISTORY_END), 10),
+        ('κεντρική βάση: ταξινομημένη σελίδα', central_db_sorted_page, 3),
+    ]
+
+
+def run_scale(scale, backend, repeat, seed):
+    directory = tempfile.mkdtemp(prefix='bench-core-')
+    try:
+        write_store(open_store(backend, path=os.path.join(directory, 'data.db'), directory=directory), scale, seed)
+        repository = open_bench_repository(backend, directory)
+        # Όπως στην πρώτη εκκίνηση της εφαρμογής: κινήσεις αποθέματος για τις παραλαβές
+        sync(repository)
+        results = {}
+        for name, function, number in cases(backend, directory, repository):
+            # Οι ακριβές λειτουργίες εκτελούνται λιγότερες φορές στις μεγάλες κλίμακες
+            runs = repeat if number > 1 or scale <= 10000 else max(1, repeat // 2)
+            ms, kib = measure(function, runs, number)
+            results[name] = {'ms': ms, 'peak_kib': kib}
+            print(f'{scale:>9} {name:<36} {ms:>11.3f} {kib:>12.0f}', flush=True)
+        close_repository(repository)
+        return results
+    finally:
+        shutil.rmtree(directory)
+
+
+def compare(results, baseline, tolerance):
+    """Λειτουργίες που χειροτέρεψαν πάνω από tolerance σε χρόνο ή μνήμη"""
+    regressions = []
+    for scale, measurements in results.items():
+        for name, current in measurements.items():
+            previous = baseline.get(scale, {}).get(name)
+            if not previous:
+                continue
+            for metric in ('ms', 'peak_kib'):
+                if current[metric] < NOISE_FLOOR[metric]:
+                    continue
+                if current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append((scale, name, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Μετρήσεις χρόνου και μνήμης των βασικών λειτουργιών')
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='Πλήθη παραλαβών χωρισμένα με κόμμα (π.χ. 1000,10000,100000,1000000)')
+    parser.add_argument('--backend', choices=['sqlite', 'journal'], default='sqlite')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', help='Αποθήκευση αποτελεσμάτων σε JSON')
+    parser.add_argument('--compare', help='Σύγκριση με αποθηκευμένα αποτελέσματα')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    print(f"{'κλίμακα':>9} {'λειτουργία':<36} {'ms/κλήση':>11} {'μνήμη KiB':>12}")
+    results = {}
+    for scale in (int(s) for s in args.scales.split(',')):
+        results[str(scale)] = run_scale(scale, args.backend, args.repeat, args.seed)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for scale, name, metric, before, after in regressions:
+            print(f'ΧΕΙΡΟΤΕΡΕΥΣΗ {scale} {name} {metric}: {before:.3f} -> {after:.3f}')
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Χρόνος αναφοράς εύρους ημερομηνιών καθώς μεγαλώνει το ιστορικό
+
+Εκτέλεση: python benchmarks/bench_date_range.py
+Για κάθε μέγεθος ιστορικού μετράται το φιλτράρισμα των τελευταίων 30
+ημερών και τα αθροίσματα ανά νούμερο. Ο αριθμός των εγγραφών στο εύρος
+μένει σταθερός, οπότε και ο χρόνος πρέπει να μένει περίπου σταθερός.
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.columnar import ColumnarMirror
+from core.constants import SIZES
+
+RECEIPTS_PER_DAY = 150
+
+
+def make_receipts(days, end):
+    rng = random.Random(42)
+    receipts = []
+    for offset in range(days, 0, -1):
+        day = (end - timedelta(days=offset - 1)).isoformat()
+        for _ in range(RECEIPTS_PER_DAY):
+            receipts.append({
+                'id': len(receipts) + 1,
+                'receipt_date': day,
+                'producer_id': rng.randint(1, 300),
+                'size_quantities': {size: rng.randint(0, 50) for size in SIZES},
+                'total_kg': rng.randint(100, 5000),
+                'total_value': rng.random() * 1000,
+            })
+    return receipts
+
+
+def main():
+    end = date(2026, 1, 31)
+    start = end - timedelta(days=29)
+    print(f"{'ιστορικό (ημέρες)':>18} {'εγγραφές':>10} {'στο εύρος':>10} {'ms/ερώτημα':>12}")
+    for days in (60, 365, 3 * 365, 6 * 365):
+        mirror = ColumnarMirror('receipt_date', 'producer_id')
+        mirror.rebuild(make_receipts(days, end))
+
+        def query():
+            rows = mirror.select(start, end)
+            return mirror.summarize(rows)
+
+        number = 50
+        seconds = min(timeit.repeat(query, number=number, repeat=5)) / number
+        print(f"{days:>18} {len(mirror):>10} {len(mirror.select(start, end)):>10} {seconds * 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
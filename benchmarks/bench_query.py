@@ -0,0 +1,104 @@
+"""Χρόνος ερωτημάτων αναφορών (core.query) σε μεγάλο ιστορικό παραλαβών
+
+Εκτέλεση:
+    python benchmarks/bench_query.py [--receipts 1000000] [--repeat 5]
+
+Οι συνθετικές παραλαβές γράφονται απευθείας σε ColumnarMirror, χωρίς
+μηχανή αποθήκευσης. Ώστε 1.000.000 εγγραφές να χωρούν στη μνήμη, από κάθε
+εγγραφή κρατιούνται μόνο τα πεδία που διαβάζει το είδωλο και οι ποσότητες
+αφαιρούνται αφού αντιγραφούν στους πίνακες. Για κάθε ερώτημα αναφέρεται ο
+καλύτερος χρόνος από --repeat εκτελέσεις (μετά από μία προθέρμανση).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate import _days, iter_receipts, make_producers, make_storage_locations, scale_counts
+
+from core.columnar import ColumnarMirror
+from core.query import QueryEngine
+
+FIELDS = ('id', 'receipt_date', 'producer_id', 'variety', 'storage_location_id', 'certifications',
+          'agreed_price_per_kg', 'total_kg', 'total_value', 'paid', 'size_quantities', 'quality_quantities')
+
+
+class MirrorRepository:
+    """Τα μέρη του αποθετηρίου που χρησιμοποιεί το QueryEngine"""
+
+    def __init__(self, mirror, collections):
+        self.mirror = mirror
+        self.collections = collections
+
+    def index(self, key, name):
+        return self.mirror
+
+    def version(self, key):
+        return 1
+
+    def load_range(self, key, start=None, end=None):
+        # Όλες οι εγγραφές είναι ήδη στο είδωλο
+        return 0
+
+    def get(self, key, record_id):
+        return self.collections[key].get(record_id)
+
+
+def build(receipts, seed=42):
+    rng = random.Random(seed)
+    counts = scale_counts(receipts)
+    producers = make_producers(counts['producers'], rng)
+    storage_locations = make_storage_locations(counts['storage_locations'], receipts)
+    mirror = ColumnarMirror('receipt_date', 'producer_id', 'storage_location_id', capacity=receipts)
+    for record in iter_receipts(receipts, producers, storage_locations, random.Random(seed + 1), _days()):
+        record = {field: record[field] for field in FIELDS}
+        mirror.insert(record)
+        del record['size_quantities'], record['quality_quantities']
+    collections = {
+        'producers': {p['id']: p for p in producers},
+        'storage_locations': {s['id']: s for s in storage_locations},
+    }
+    return MirrorRepository(mirror, collections)
+
+
+def queries(engine):
+    season = {'start': date(2025, 9, 1), 'end': date(2026, 8, 31)}
+    return {
+        'σύνολα (χωρίς ομαδοποίηση)': lambda: engine.run('receipts'),
+        'ανά παραγωγό': lambda: engine.run('receipts', ['producer']),
+        'ανά παραγωγό × μήνα': lambda: engine.run('receipts', ['producer', 'month']),
+        'ανά ποικιλία × σεζόν': lambda: engine.run('receipts', ['variety', 'season']),
+        'ανά πιστοποίηση × αποθήκη': lambda: engine.run('receipts', ['certification', 'storage']),
+        'ανά εβδομάδα, σεζόν 2025-26': lambda: engine.run('receipts', ['week'], **season),
+        'ανά ημέρα, απλήρωτες Navel': lambda: engine.run('receipts', ['date'], variety='Navel', paid='Όχι'),
+        'παραγωγός × νούμερο (pivot)': lambda: engine.pivot('receipts', 'producer', 'size'),
+        'ποικιλία × ποιότητα, σεζόν': lambda: engine.pivot('receipts', 'variety', 'quality', **season),
+        'ποικιλία × μήνας (pivot)': lambda: engine.pivot('receipts', 'variety', 'month'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Χρόνος ερωτημάτων αναφορών')
+    parser.add_argument('--receipts', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = QueryEngine(build(args.receipts))
+    print(f'{args.receipts} παραλαβές σε {time.perf_counter() - start:.1f} s\n')
+
+    print(f"{'ερώτημα':<32} {'ομάδες':>8} {'ms':>9}")
+    for name, query in queries(engine).items():
+        groups = len(query())
+        seconds = min(timeit.repeat(query, number=1, repeat=args.repeat))
+        print(f'{name:<32} {groups:>8} {seconds * 1000:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
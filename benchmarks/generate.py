@@ -0,0 +1,230 @@
+"""Συνθετικά δεδομένα με σπόρο (seed) για μετρήσεις σε μεγάλη κλίμακα
+
+Εκτέλεση: python benchmarks/generate.py 100000 [--seed 42] [--backend sqlite] [--db PATH | --dir DIR]
+
+Η κλίμακα είναι το πλήθος των παραλαβών· οι υπόλοιπες συλλογές
+προκύπτουν αναλογικά (παραγωγοί, πελάτες, αποθήκες, παραγγελίες στο
+μισό των παραλαβών). Οι ημερομηνίες πέφτουν κυρίως στη σεζόν συγκομιδής
+(Νοέμβριος–Μάιος) και κάθε παραλαβή έχει νούμερα, ποιότητες,
+πιστοποιήσεις και LOT όπως τα καταχωρεί η εφαρμογή. Με τον ίδιο σπόρο
+παράγονται πάντα τα ίδια δεδομένα.
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.constants import CERTIFICATIONS, QUALITIES, SIZES
+from core.lots import LOT_PREFIXES, generate_lot_number
+
+VARIETIES = ['Navel', 'Navelina', 'Lane Late', 'Valencia', 'Merlin', 'Κλημεντίνη', 'Νοβα', 'Μέρκοτ']
+FIRST_NAMES = ['Γιώργος', 'Νίκος', 'Μαρία', 'Ελένη', 'Κώστας', 'Δημήτρης', 'Αθηνά', 'Παναγιώτης', 'Σοφία', 'Βασίλης']
+LAST_NAMES = ['Παπαδόπουλος', 'Νικολάου', 'Γεωργίου', 'Οικονόμου', 'Καραγιάννης', 'Μαυρίδης', 'Σταύρου', 'Αθανασίου']
+CUSTOMER_KINDS = ['Σούπερ Μάρκετ', 'Χονδρεμπόριο', 'Εξαγωγές', 'Λαϊκή Αγορά', 'Χυμοποιία']
+
+# Βάρος κάθε μήνα στις παραλαβές: η συγκομιδή εσπεριδοειδών είναι Νοέμβριος–Μάιος
+MONTH_WEIGHTS = {1: 10, 2: 9, 3: 8, 4: 6, 5: 3, 6: 1, 7: 0.5, 8: 0.5, 9: 1, 10: 3, 11: 8, 12: 10}
+START_DATE = date(2020, 10, 1)
+END_DATE = date(2026, 5, 31)
+
+
+def scale_counts(receipts):
+    """Πλήθος εγγραφών ανά συλλογή για δοσμένο πλήθος παραλαβών"""
+    return {
+        'producers': max(20, receipts // 200),
+        'customers': max(10, receipts // 1000),
+        'storage_locations': max(4, receipts // 50000),
+        'receipts': receipts,
+        'orders': receipts // 2,
+    }
+
+
+def _days():
+    days, weights = [], []
+    day = START_DATE
+    while day <= END_DATE:
+        days.append(day)
+        weights.append(MONTH_WEIGHTS[day.month])
+        day += timedelta(days=1)
+    return days, weights
+
+
+def _timestamp(day, rng):
+    moment = datetime(day.year, day.month, day.day, rng.randint(6, 19), rng.randint(0, 59), rng.randint(0, 59))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _quantities(rng, kg):
+    """Κατανομή κιλών σε νούμερα (κυρίως μεσαία) και ποιότητες (κυρίως Α')"""
+    size_weights = [rng.random() * (1 + min(i, len(SIZES) - 1 - i)) for i in range(len(SIZES))]
+    quality_weights = [rng.random() * w for w in (8, 4, 2, 1, 0.5, 0.5)[:len(QUALITIES)]]
+    sizes = _split(kg, size_weights)
+    qualities = _split(kg // 4, quality_weights)
+    return dict(zip(SIZES, sizes)), dict(zip(QUALITIES, qualities))
+
+
+def _split(total, weights):
+    scale = sum(weights) or 1
+    parts = [int(total * w / scale) for w in weights]
+    parts[0] += total - sum(parts)
+    return parts
+
+
+def make_producers(count, rng):
+    return [
+        {
+            "id": i,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} ({i})",
+            "quantity": rng.randint(500, 50000),
+            "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 2)),
+            "address": f"Αγρόκτημα {i}",
+            "phone": f"27{rng.randint(10000000, 99999999)}",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_customers(count, rng):
+    return [
+        {
+            "id": i,
+            "name": f"{rng.choice(CUSTOMER_KINDS)} {rng.choice(LAST_NAMES)} ({i})",
+            "address": f"Οδός {rng.randint(1, 200)}, Αθήνα",
+            "phone": f"21{rng.randint(10000000, 99999999)}",
+            "email": f"customer{i}@example.com",
+            "vat": f"{rng.randint(100000000, 999999999)}",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_storage_locations(count, receipts):
+    # Χωρητικότητα ώστε η πληρότητα να είναι ρεαλιστική (περίπου 75%, με ~2600 kg ανά παραλαβή)
+    capacity = max(10000, receipts * 3500 // count)
+    return [
+        {"id": i, "name": f"Αποθήκη {i}", "capacity": capacity, "description": f"Ψυκτικός θάλαμος {i}"}
+        for i in range(1, count + 1)
+    ]
+
+
+def iter_receipts(count, producers, storage_locations, rng, days):
+    """Παραλαβές σε χρονολογική σειρά (όπως καταχωρούνται)"""
+    dates = sorted(rng.choices(days[0], weights=days[1], k=count))
+    for i, day in enumerate(dates, start=1):
+        producer = rng.choice(producers)
+        storage = rng.choice(storage_locations)
+        variety = rng.choice(VARIETIES)
+        sizes, qualities = _quantities(rng, rng.randint(200, 4000))
+        price = round(rng.uniform(0.25, 0.85), 2)
+        total_kg = sum(sizes.values()) + sum(qualities.values())
+        yield {
+            "id": i,
+            "receipt_date": day.isoformat(),
+            "producer_id": producer['id'],
+            "producer_name": producer['name'],
+            "variety": variety,
+            "lot": generate_lot_number(day, producer['id'], variety),
+            "storage_location_id": storage['id'],
+            "storage_location": storage['name'],
+            "size_quantities": sizes,
+            "quality_quantities": qualities,
+            "certifications": producer['certifications'],
+            "agreed_price_per_kg": price,
+            "total_kg": total_kg,
+            "total_value": total_kg * price,
+            "paid": rng.choice(["Ναι", "Όχι"]),
+            "invoice_ref": f"ΤΔΑ-{i}" if rng.random() < 0.7 else "",
+            "observations": "",
+            "created_by": "admin",
+            "created_at": _timestamp(day, rng),
+        }
+
+
+def iter_orders(count, customers, rng, days):
+    dates = sorted(rng.choices(days[0], weights=days[1], k=count))
+    for i, day in enumerate(dates, start=1):
+        customer = rng.choice(customers)
+        variety = rng.choice(VARIETIES)
+        sizes, qualities = _quantities(rng, rng.randint(500, 10000))
+        price = round(rng.uniform(0.5, 1.4), 2)
+        total_kg = sum(sizes.values()) + sum(qualities.values())
+        yield {
+            "id": i,
+            "date": day.isoformat(),
+            "customer_id": customer['id'],
+            "customer": customer['name'],
+            "variety": variety,
+            "lot": generate_lot_number(day, customer['id'], variety, prefix=LOT_PREFIXES['orders']),
+            "size_quantities": sizes,
+            "quality_quantities": qualities,
+            "executed_quantity": int(total_kg * rng.uniform(0.8, 1.0)),
+            "agreed_price_per_kg": price,
+            "total_kg": total_kg,
+            "total_value": total_kg * price,
+            "paid": rng.choice(["Ναι", "Όχι"]),
+            "invoice_ref": f"ΤΠΥ-{i}",
+            "observations": "",
+            "created_by": "admin",
+            "created_at": _timestamp(day, rng),
+        }
+
+
+def generate(receipts, seed=42):
+    """Όλες οι συλλογές για δοσμένο πλήθος παραλαβών
+
+    Οι παραλαβές και οι παραγγελίες επιστρέφονται ως iterators ώστε να
+    μπορούν να γραφτούν σε τμήματα χωρίς να κρατηθούν όλες στη μνήμη.
+    """
+    rng = random.Random(seed)
+    counts = scale_counts(receipts)
+    days = _days()
+    producers = make_producers(counts['producers'], rng)
+    customers = make_customers(counts['customers'], rng)
+    storage_locations = make_storage_locations(counts['storage_locations'], receipts)
+    return {
+        'producers': producers,
+        'customers': customers,
+        'storage_locations': storage_locations,
+        'receipts': iter_receipts(counts['receipts'], producers, storage_locations, random.Random(seed + 1), days),
+        'orders': iter_orders(counts['orders'], customers, random.Random(seed + 2), days),
+    }
+
+
+def write_store(store, receipts, seed=42, chunk_size=10000):
+    """Εγγραφή των συνθετικών δεδομένων σε μηχανή αποθήκευσης (αντικαθιστά ό,τι υπάρχει)"""
+    data = generate(receipts, seed)
+    counts = scale_counts(receipts)
+    for key in ('producers', 'customers', 'storage_locations'):
+        store.save(key, data[key])
+    for key in ('receipts', 'orders'):
+        store.save(key, [])
+        chunk = []
+        for record in data[key]:
+            chunk.append((record['id'], record))
+            if len(chunk) == chunk_size:
+                store.write_batch(key, chunk)
+                chunk = []
+        if chunk:
+            store.write_batch(key, chunk)
+    for key, count in counts.items():
+        store.set_meta(f'sequence_{key}', count)
+    return counts
+
+
+if __name__ == '__main__':
+    from core.storage import DB_FILE, open_store
+
+    parser = argparse.ArgumentParser(description='Συνθετικά δεδομένα για μετρήσεις')
+    parser.add_argument('receipts', type=int, help='Πλήθος παραλαβών (π.χ. 1000, 10000, 100000, 1000000)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--backend', choices=['sqlite', 'journal'], default='sqlite')
+    parser.add_argument('--db', default=DB_FILE, help='Αρχείο SQLite')
+    parser.add_argument('--dir', default='.', help='Φάκελος για τη μηχανή journal')
+    args = parser.parse_args()
+
+    store = open_store(args.backend, path=args.db, directory=args.dir)
+    counts = write_store(store, args.receipts, args.seed)
+    print(', '.join(f'{key}: {count}' for key, count in counts.items()))
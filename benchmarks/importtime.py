@@ -0,0 +1,148 @@
+"""Χρόνος εκκίνησης: κόστος εισαγωγών και κάθε επανεκτέλεσης του script
+
+Εκτέλεση:
+    python benchmarks/importtime.py [--receipts 1000] [--repeat 5]
+                                    [--save results.json] [--compare results.json]
+
+Δύο μετρήσεις:
+- εισαγωγές: κάθε μονάδα εισάγεται σε νέα διεργασία με
+  `python -X importtime` και αναφέρεται ο συνολικός χρόνος της μαζί με τις
+  πιο ακριβές εξαρτήσεις της·
+- εκτελέσεις: το app.py τρέχει με το streamlit.testing (AppTest) πάνω σε
+  συνθετικά δεδομένα. Για κάθε ενότητα μετριέται η πρώτη εκτέλεση (με την
+  εισαγωγή της μονάδας της) και η καλύτερη από --repeat επανεκτελέσεις.
+
+Με --compare ο κωδικός εξόδου είναι 1 αν κάποια μέτρηση είναι πάνω από
+--tolerance πιο αργή από τα αποθηκευμένα αποτελέσματα.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODULES = ('core', 'core.services', 'core.export', 'core.bulk_import', 'streamlit', 'sections.common')
+
+# Κάτω από αυτό το όριο (ms) οι διαφορές είναι θόρυβος και δεν αναφέρονται
+NOISE_FLOOR = 1.0
+
+
+def import_profile(module, top=5):
+    """(συνολικά ms, [(ms, μονάδα), ...] οι ακριβότερες εξαρτήσεις κατά ίδιο χρόνο)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    # Οι γραμμές είναι σε μεταδιάταξη: το υποδέντρο μιας μονάδας προηγείται
+    # της γραμμής της, που είναι χωρίς εσοχή (όπως και του site στην αρχή)
+    total, subtree, own = 0, [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        subtree.append((int(self_us) / 1000, name.strip()))
+        if not name[1:].startswith(' '):
+            if name.strip() == module:
+                total, own = int(cumulative_us) / 1000, subtree
+            subtree = []
+    return total, sorted(own, reverse=True)[:top]
+
+
+def run_sections(receipts, repeat):
+    """Χρόνοι πρώτης εκτέλεσης και επανεκτέλεσης ανά ενότητα (ms)"""
+    from types import SimpleNamespace
+
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    from generate import write_store
+
+    from core.storage import open_store
+    from sections import SECTIONS
+
+    # Το AppTest ελέγχει κάθε 0.1 s αν τελείωσε το script· πυκνότερος έλεγχος
+    # ώστε να μετριέται η εκτέλεση και όχι το διάστημα αναμονής
+    local_script_runner.time = SimpleNamespace(time=time.time, sleep=lambda seconds: time.sleep(0.0005))
+
+    directory = tempfile.mkdtemp(prefix='bench-importtime-')
+    cwd = os.getcwd()
+    try:
+        os.chdir(directory)
+        write_store(open_store(path='data.db', directory='.'), receipts)
+        app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=120)
+        app.session_state['authenticated'] = True
+        app.session_state['current_user'] = 'admin'
+        app.session_state['user_role'] = 'admin'
+        start = time.perf_counter()
+        app.run()
+        results = {'εκκίνηση': (time.perf_counter() - start) * 1000}
+        for name in SECTIONS:
+            app.sidebar.selectbox[0].select(name)
+            timings = []
+            for _ in range(repeat + 1):
+                start = time.perf_counter()
+                app.run()
+                timings.append((time.perf_counter() - start) * 1000)
+                if app.exception:
+                    raise SystemExit(f'{name}: {app.exception}')
+            results[f'{name} (πρώτη)'] = timings[0]
+            results[f'{name} (επανεκτέλεση)'] = min(timings[1:])
+        return results
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for group, measurements in results.items():
+        for name, ms in measurements.items():
+            before = baseline.get(group, {}).get(name)
+            if before is None or ms < NOISE_FLOOR:
+                continue
+            if ms > before * (1 + tolerance):
+                regressions.append((group, name, before, ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Χρόνος εισαγωγών και επανεκτελέσεων της εφαρμογής')
+    parser.add_argument('--modules', default=','.join(MODULES))
+    parser.add_argument('--receipts', type=int, default=1000, help='Πλήθος συνθετικών παραλαβών')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help='Αποθήκευση αποτελεσμάτων σε JSON')
+    parser.add_argument('--compare', help='Σύγκριση με αποθηκευμένα αποτελέσματα')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {'imports': {}, 'sections': {}}
+    print(f"{'μονάδα':<36} {'ms':>9}  ακριβότερες εξαρτήσεις (ms)")
+    for module in args.modules.split(','):
+        total, heaviest = import_profile(module)
+        results['imports'][module] = total
+        print(f"{module:<36} {total:>9.1f}  " + ', '.join(f'{name} {ms:.1f}' for ms, name in heaviest))
+
+    print(f"\n{'ενότητα':<36} {'ms':>9}")
+    results['sections'] = run_sections(args.receipts, args.repeat)
+    for name, ms in results['sections'].items():
+        print(f'{name:<36} {ms:>9.1f}')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for group, name, before, after in regressions:
+            print(f'ΧΕΙΡΟΤΕΡΕΥΣΗ {group} {name}: {before:.1f} -> {after:.1f} ms')
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""Πυρήνας της εφαρμογής χωρίς διεπαφή: αποθήκευση, αποθετήριο, ευρετήρια και υπηρεσίες
+
+Οι μονάδες εισάγονται ρητά (π.χ. from core.services import open_repository)·
+εδώ δεν φορτώνεται τίποτα, ώστε η εισαγωγή να μην έχει κόστος ή παρενέργειες.
+"""
@@ -0,0 +1,88 @@
+"""Σελιδοποίηση, ταξινόμηση και φιλτράρισμα εγγραφών στην πλευρά του διακομιστή"""
+import threading
+from collections import OrderedDict
+
+from .storage import DATE_COLUMNS
+
+
+def _sort_key(value):
+    """Κλειδί ταξινόμησης για μικτούς τύπους: αριθμοί, κείμενα, κενά στο τέλος"""
+    if value is None or value == '':
+        return (2, 0, '')
+    if isinstance(value, bool):
+        return (1, 0, str(value))
+    if isinstance(value, (int, float)):
+        return (0, value, '')
+    return (1, 0, str(value).casefold())
+
+
+def _matches(value, text):
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(str(v) for v in value)
+    return text in str(value).casefold()
+
+
+class RecordBrowser:
+    """Σελίδες εγγραφών μιας συλλογής του αποθετηρίου
+
+    Χωρίς ταξινόμηση και φίλτρο η σελίδα είναι απλή φέτα της συλλογής.
+    Διαφορετικά η σειρά των εγγραφών υπολογίζεται μία φορά ανά έκδοση
+    της συλλογής και κρατιέται σε μικρή LRU cache, ώστε η αλλαγή σελίδας
+    να μην εξαρτάται από το μέγεθος της συλλογής. Φίλτρο χωρίς στήλη
+    σημαίνει αναζήτηση σε όλα τα πεδία (core.search), με σειρά συνάφειας.
+    Το εύρος ημερομηνιών (start/end, ISO) περιορίζει τις εγγραφές της
+    μνήμης π.χ. σε μία σεζόν.
+    """
+
+    def __init__(self, repository, key, max_cached=8):
+        self.repository = repository
+        self.key = key
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _ordered(self, sort_column, descending, filter_column, filter_text, start=None, end=None):
+        cache_key = (self.repository.version(self.key), sort_column, descending, filter_column, filter_text, start, end)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+
+        records = self.repository.view(self.key)
+        if filter_text and filter_column is None:
+            # Σε όλα τα πεδία μέσω του ευρετηρίου κειμένου, με σειρά συνάφειας
+            ranked = self.repository.index(self.key, 'search').query(filter_text)
+            records = [self.repository.get(self.key, record_id) for record_id, _ in ranked]
+        elif filter_text:
+            text = filter_text.casefold()
+            records = [r for r in records if _matches(r.get(filter_column, ''), text)]
+        else:
+            records = list(records)
+        if start is not None or end is not None:
+            column = DATE_COLUMNS[self.key]
+            records = [
+                r for r in records
+                if (start is None or r[column] >= start) and (end is None or r[column] <= end)
+            ]
+        if sort_column:
+            records.sort(key=lambda r: _sort_key(r.get(sort_column)), reverse=descending)
+            if descending:
+                # Τα κενά μένουν στο τέλος και σε φθίνουσα σειρά
+                empty = sum(1 for r in records if _sort_key(r.get(sort_column))[0] == 2)
+                records = records[empty:] + records[:empty]
+
+        with self._lock:
+            self._cache[cache_key] = records
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return records
+
+    def page(self, page, page_size, sort_column=None, descending=False, filter_column=None, filter_text='',
+             start=None, end=None):
+        """Οι εγγραφές μίας σελίδας (αρίθμηση από 1) και το συνολικό πλήθος"""
+        offset = (page - 1) * page_size
+        if not sort_column and not filter_text and start is None and end is None:
+            records = self.repository.view(self.key)
+        else:
+            records = self._ordered(sort_column, descending, filter_column, filter_text, start, end)
+        return records[offset:offset + page_size], len(records)
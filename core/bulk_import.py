@@ -0,0 +1,245 @@
+"""Μαζική εισαγωγή παραλαβών ζυγαριάς από αρχείο CSV ή Excel
+
+Κάθε γραμμή του αρχείου είναι μία παραλαβή και οι στήλες έχουν τα ίδια
+ονόματα με την εξαγωγή (export.py):
+
+    receipt_date, producer_id ή producer_name, variety,
+    storage_location_id ή storage_location, size_*, quality_*,
+    certifications (χωρισμένες με κόμμα), agreed_price_per_kg, paid,
+    invoice_ref, observations
+
+Ο έλεγχος γίνεται ανά στήλη με pandas. Οι έγκυρες γραμμές γίνονται
+εγγραφές και καταχωρούνται όλες μαζί με μία εγγραφή στον δίσκο, ενώ οι
+απορριφθείσες επιστρέφονται με τα σφάλματα κάθε γραμμής.
+
+Εκτέλεση:
+    python -m core.bulk_import παραλαβές.csv [--dry-run] [--user admin]
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from .constants import CERTIFICATIONS, QUALITIES, SIZES
+from .export import QUALITY_COLUMNS, SIZE_COLUMNS
+from .ledger import post
+from .lots import generate_lot_number
+
+PAID_VALUES = ['Ναι', 'Όχι']
+KNOWN_COLUMNS = set(
+    ['receipt_date', 'producer_id', 'producer_name', 'variety', 'storage_location_id', 'storage_location',
+     'certifications', 'agreed_price_per_kg', 'paid', 'invoice_ref', 'observations']
+    + SIZE_COLUMNS + QUALITY_COLUMNS
+)
+
+
+def read_batch(fileobj, filename):
+    """Ανάγνωση αρχείου .csv, .csv.gz, .xlsx ή .xls με όλες τις τιμές ως κείμενο"""
+    name = filename.lower()
+    if name.endswith(('.xlsx', '.xls')):
+        frame = pd.read_excel(fileobj, dtype=str, keep_default_na=False)
+    else:
+        compression = 'gzip' if name.endswith('.gz') else None
+        frame = pd.read_csv(fileobj, dtype=str, keep_default_na=False, compression=compression)
+    frame.columns = [str(column).strip() for column in frame.columns]
+    return frame.apply(lambda column: column.str.strip())
+
+
+def check_columns(frame):
+    """Σφάλματα που αφορούν όλο το αρχείο (λείπουν ή περισσεύουν στήλες)"""
+    problems = []
+    for column in ('receipt_date', 'variety'):
+        if column not in frame:
+            problems.append(f"Λείπει η στήλη {column}")
+    if 'producer_id' not in frame and 'producer_name' not in frame:
+        problems.append("Λείπει η στήλη producer_id ή producer_name")
+    if 'storage_location_id' not in frame and 'storage_location' not in frame:
+        problems.append("Λείπει η στήλη storage_location_id ή storage_location")
+    unknown = [column for column in frame.columns if column not in KNOWN_COLUMNS]
+    if unknown:
+        problems.append(f"Άγνωστες στήλες: {', '.join(unknown)}")
+    return problems
+
+
+def _text(frame, column, default=''):
+    if column in frame:
+        return frame[column]
+    return pd.Series(default, index=frame.index, dtype=object)
+
+
+def _resolve(frame, id_column, name_column, entities):
+    """id οντότητας ανά γραμμή από τη στήλη id ή, αν λείπει, από το όνομα
+
+    Ονόματα που ανήκουν σε περισσότερες από μία οντότητες δεν αντιστοιχίζονται.
+    """
+    ids = pd.to_numeric(_text(frame, id_column), errors='coerce')
+    ids = ids.where(ids.isin([entity['id'] for entity in entities]))
+
+    by_name, ambiguous = {}, set()
+    for entity in entities:
+        name = str(entity.get('name', '')).strip().casefold()
+        if name in by_name:
+            ambiguous.add(name)
+        by_name[name] = entity['id']
+    for name in ambiguous:
+        del by_name[name]
+    names = pd.to_numeric(_text(frame, name_column).str.casefold().map(by_name), errors='coerce')
+    return ids.fillna(names)
+
+
+def _dates(column):
+    """Ημερομηνίες ISO (και από Excel) ή ΗΗ/ΜΜ/ΕΕΕΕ, NaT όπου δεν αναγνωρίζονται"""
+    iso = pd.to_datetime(column.str[:10], format='%Y-%m-%d', errors='coerce')
+    local = pd.to_datetime(column, format='%d/%m/%Y', errors='coerce')
+    return iso.fillna(local)
+
+
+def validate_receipts(frame, producers, storage_locations, first_id, created_by, created_at=None):
+    """Έλεγχος όλων των γραμμών και κατασκευή εγγραφών για τις έγκυρες
+
+    Επιστρέφει (εγγραφές, απορριφθείσες) όπου οι απορριφθείσες είναι οι
+    αρχικές γραμμές με τον αριθμό γραμμής του αρχείου ('row') και τα
+    σφάλματα ('errors').
+    """
+    created_at = created_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    failures = []
+
+    dates = _dates(_text(frame, 'receipt_date'))
+    failures.append((dates.isna(), "Μη έγκυρη ημερομηνία"))
+
+    producer_ids = _resolve(frame, 'producer_id', 'producer_name', producers)
+    failures.append((producer_ids.isna(), "Άγνωστος παραγωγός"))
+
+    storage_ids = _resolve(frame, 'storage_location_id', 'storage_location', storage_locations)
+    failures.append((storage_ids.isna(), "Άγνωστος αποθηκευτικός χώρος"))
+
+    variety = _text(frame, 'variety')
+    failures.append((variety == '', "Λείπει η ποικιλία"))
+
+    # Ποσότητες: μη αρνητικοί ακέραιοι, τα κενά μετρούν ως 0
+    quantities = frame.reindex(columns=SIZE_COLUMNS + QUALITY_COLUMNS, fill_value='0').replace('', '0')
+    quantities = quantities.apply(pd.to_numeric, errors='coerce')
+    for column in quantities.columns:
+        values = quantities[column]
+        failures.append((values.isna() | (values < 0) | (values % 1 != 0), f"Μη έγκυρη ποσότητα στη στήλη {column}"))
+    quantities = quantities.fillna(0).astype('int64')
+    total_kg = quantities.sum(axis=1)
+    failures.append((total_kg <= 0, "Μηδενική ποσότητα"))
+
+    price = pd.to_numeric(_text(frame, 'agreed_price_per_kg', '0').replace('', '0'), errors='coerce')
+    failures.append((price.isna() | (price < 0), "Μη έγκυρη τιμή ανά κιλό"))
+    price = price.fillna(0)
+
+    paid = _text(frame, 'paid', 'Όχι').replace('', 'Όχι')
+    failures.append((~paid.isin(PAID_VALUES), "Η στήλη paid δέχεται Ναι ή Όχι"))
+
+    # Πιστοποιήσεις: μία γραμμή ανά πιστοποίηση και έλεγχος όλων μαζί
+    certs = _text(frame, 'certifications').str.split(',').explode().str.strip()
+    certs = certs[certs != '']
+    unknown_certs = ~certs.isin(CERTIFICATIONS)
+    failures.append((
+        unknown_certs.groupby(level=0).any().reindex(frame.index, fill_value=False),
+        "Άγνωστη πιστοποίηση"
+    ))
+    certs = certs[~unknown_certs].groupby(level=0).agg(list)
+
+    errors = {}
+    for mask, message in failures:
+        for i in frame.index[mask.to_numpy(dtype=bool)]:
+            errors.setdefault(i, []).append(message)
+
+    storage_names = {s['id']: s['name'] for s in storage_locations}
+    producer_names = {p['id']: p['name'] for p in producers}
+    invoice_ref = _text(frame, 'invoice_ref')
+    observations = _text(frame, 'observations')
+    size_values = quantities[SIZE_COLUMNS].to_numpy().tolist()
+    quality_values = quantities[QUALITY_COLUMNS].to_numpy().tolist()
+    records = []
+    for position, i in enumerate(frame.index):
+        if i in errors:
+            continue
+        receipt_date = dates[i].date()
+        producer_id = int(producer_ids[i])
+        storage_id = int(storage_ids[i])
+        records.append({
+            "id": first_id + len(records),
+            "receipt_date": receipt_date.strftime("%Y-%m-%d"),
+            "producer_id": producer_id,
+            "producer_name": producer_names[producer_id],
+            "variety": variety[i],
+            "lot": generate_lot_number(receipt_date, producer_id, variety[i]),
+            "storage_location_id": storage_id,
+            "storage_location": storage_names[storage_id],
+            "size_quantities": dict(zip(SIZES, size_values[position])),
+            "quality_quantities": dict(zip(QUALITIES, quality_values[position])),
+            "certifications": certs.get(i, []),
+            "agreed_price_per_kg": float(price[i]),
+            "total_kg": int(total_kg[i]),
+            "total_value": int(total_kg[i]) * float(price[i]),
+            "paid": paid[i],
+            "invoice_ref": invoice_ref[i],
+            "observations": observations[i],
+            "created_by": created_by,
+            "created_at": created_at
+        })
+
+    rejected = frame.loc[sorted(errors)].copy()
+    # Αρίθμηση όπως στο αρχείο: η γραμμή 1 είναι η κεφαλίδα
+    rejected.insert(0, 'row', [frame.index.get_loc(i) + 2 for i in rejected.index])
+    rejected.insert(1, 'errors', ['; '.join(errors[i]) for i in rejected.index])
+    return records, rejected
+
+
+def import_receipts(repository, frame, created_by):
+    """Έλεγχος και καταχώρηση όλων των έγκυρων γραμμών με μία εγγραφή
+
+    Επιστρέφει (καταχωρημένες εγγραφές, απορριφθείσες γραμμές).
+    """
+    problems = check_columns(frame)
+    if problems:
+        raise ValueError('; '.join(problems))
+    records, rejected = validate_receipts(
+        frame,
+        repository.view('producers'),
+        repository.view('storage_locations'),
+        repository.next_id('receipts'),
+        created_by
+    )
+    # Τα id πρέπει να είναι ακόμη ελεύθερα· αλλιώς ConflictError χωρίς καμία καταχώρηση.
+    # Οι LOT γίνονται μοναδικοί υπό το κλείδωμα, και μεταξύ γραμμών του ίδιου αρχείου.
+    with repository.transaction():
+        records = repository.upsert_many(
+            'receipts', records, [0] * len(records), prepare=repository.index('receipts', 'lots').assigner()
+        )
+        post(repository, 'receipts', [record['id'] for record in records], created_by)
+    return records, rejected
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from .services import open_repository
+
+    parser = argparse.ArgumentParser(description='Μαζική εισαγωγή παραλαβών από CSV ή Excel')
+    parser.add_argument('file')
+    parser.add_argument('--user', default='admin')
+    parser.add_argument('--dry-run', action='store_true', help='Μόνο έλεγχος, χωρίς καταχώρηση')
+    args = parser.parse_args()
+
+    # Όπως στην εφαρμογή: αρχικά δεδομένα (παραγωγοί, αποθήκες) και στιγμιότυπα
+    repository = open_repository(write_behind=False)
+    with open(args.file, 'rb') as f:
+        frame = read_batch(f, args.file)
+    if args.dry_run:
+        problems = check_columns(frame)
+        if problems:
+            raise SystemExit('; '.join(problems))
+        records, rejected = validate_receipts(
+            frame, repository.view('producers'), repository.view('storage_locations'),
+            repository.next_id('receipts'), args.user
+        )
+    else:
+        records, rejected = import_receipts(repository, frame, args.user)
+    print(f'{len(records)} έγκυρες γραμμές, {len(rejected)} απορρίφθηκαν')
+    for row, message in zip(rejected['row'], rejected['errors']):
+        print(f'  γραμμή {row}: {message}')
+    raise SystemExit(1 if len(rejected) else 0)
@@ -0,0 +1,151 @@
+"""Cache αποτελεσμάτων αναφορών και αρχείων εξαγωγής (LRU με όριο μεγέθους)
+
+Το κλειδί μιας καταχώρησης είναι το όνομα της αναφοράς, η έκδοση
+(Repository.version) κάθε συλλογής από την οποία διαβάζει και τα
+κανονικοποιημένα φίλτρα της. Μια αλλαγή σε οποιαδήποτε από τις συλλογές
+δίνει νέο κλειδί, οπότε δεν χρειάζεται ακύρωση· οι παλιές καταχωρήσεις
+φεύγουν με σειρά LRU όταν ξεπεραστεί το πλήθος ή τα bytes. Και η φόρτωση
+ιστορικών μηνών αλλάζει την έκδοση, γι' αυτό οι μήνες της αναφοράς
+φορτώνονται πριν από το key (QueryEngine.load)· αλλιώς το αποτέλεσμα θα
+έμενε σε κλειδί που δεν ζητείται ξανά.
+
+Ρυθμίσεις: PRODUCER_REPORT_CACHE_ENTRIES (καταχωρήσεις) και
+PRODUCER_REPORT_CACHE_MB (εκτίμηση μνήμης των τιμών).
+
+Παράδειγμα:
+    cache = ResultCache(repository)
+    engine.load('receipts', start, end)
+    key = cache.key('pivot', ['receipts', 'producers'], 'producer', 'size', start, end)
+    table = cache.fetch(key, lambda: engine.pivot('receipts', 'producer', 'size', start=start, end=end))
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+from . import timing
+
+REPORT_CACHE_ENTRIES = int(os.environ.get('PRODUCER_REPORT_CACHE_ENTRIES', 64))
+REPORT_CACHE_BYTES = int(os.environ.get('PRODUCER_REPORT_CACHE_MB', 128)) * 1024 * 1024
+
+
+def normalize(value):
+    """Τιμή φίλτρου σε hashable μορφή: λίστες ως tuple, λεξικά και σύνολα ταξινομημένα, ημερομηνίες ISO"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize(item) for item in value))
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def size_of(value):
+    """Εκτίμηση bytes μιας τιμής: bytes, πίνακες NumPy, DataFrame/Series και οι συλλογές τους"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, 'memory_usage'):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(size_of(key) + size_of(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Κοινή για όλες τις συνεδρίες LRU cache αποτελεσμάτων, με όριο πλήθους και bytes
+
+    Μετρά επιτυχίες, αστοχίες (υπολογισμούς) και εκτοπίσεις. Οι τιμές δεν
+    πρέπει να τροποποιούνται από όποιον τις παίρνει. Μια τιμή μεγαλύτερη
+    από όλο το όριο επιστρέφεται χωρίς να αποθηκευτεί, και το None δεν
+    αποθηκεύεται ποτέ (σημαίνει «δεν υπάρχει»).
+    """
+
+    def __init__(self, repository, max_entries=REPORT_CACHE_ENTRIES, max_bytes=REPORT_CACHE_BYTES):
+        self.repository = repository
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, name, collections, *parts):
+        """Κλειδί για την αναφορά name με τις τρέχουσες εκδόσεις των collections και τα φίλτρα parts"""
+        versions = tuple(self.repository.version(collection) for collection in collections)
+        return (name, versions, normalize(parts))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Η τιμή του key (μετρά ως επιτυχία) ή None χωρίς να μετρηθεί αστοχία"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        timing.event(f'cache hit {key[0]}')
+        return entry[0]
+
+    def put(self, key, value):
+        if value is None:
+            return
+        size = size_of(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def fetch(self, key, compute):
+        """Η τιμή του key από την cache, ή από compute() που αποθηκεύεται"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with timing.span(f'cache miss {key[0]}'):
+            value = compute()
+        with self._lock:
+            self.misses += 1
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Μετρητές για το πάνελ χρονομέτρησης"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,422 @@
+"""Στηλοθετημένο είδωλο παραλαβών/παραγγελιών σε πίνακες NumPy"""
+from datetime import date
+
+import numpy as np
+
+from .constants import CERTIFICATIONS, QUALITIES, SIZES
+from .snapshot import LIST_SEPARATOR
+
+CERT_BITS = {cert: 1 << i for i, cert in enumerate(CERTIFICATIONS)}
+
+# Στήλες μίας τιμής ανά γραμμή (οι πίνακες νούμερων/ποιοτήτων χωριστά)
+_ROW_COLUMNS = ('ids', 'dates', 'entities', 'varieties', 'paid', 'locations', 'certs', 'prices',
+                'total_kg', 'total_value', 'alive')
+
+
+def date_ordinal(value):
+    """Ημερομηνία (date ή 'YYYY-MM-DD') σε ακέραιο ordinal"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def _number(value):
+    """Ακέραιος όταν η τιμή δεν έχει δεκαδικά, όπως στα αρχικά δεδομένα"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def cert_mask(certifications):
+    mask = 0
+    for cert in certifications or []:
+        mask |= CERT_BITS.get(cert, 0)
+    return mask
+
+
+class ColumnarMirror:
+    """Παράλληλοι πίνακες ανά εγγραφή, ενημερώνονται σταδιακά
+
+    Κάθε εγγραφή καταλαμβάνει μία γραμμή: πίνακες N×13 για τα νούμερα και
+    N×6 για τις ποιότητες, συν ημερομηνία, οντότητα (παραγωγός ή πελάτης),
+    ποικιλία (κωδικός στο variety_values), πληρωμή, αποθηκευτικό χώρο,
+    τιμή, κιλά και αξία. Οι διαγραφές σημαδεύονται ως ανενεργές γραμμές
+    και ο χώρος ανακτάται με συμπύκνωση όταν περισσέψουν.
+
+    Οι ημερομηνίες διατηρούνται επιπλέον ταξινομημένες (date_index) ώστε
+    ένα εύρος ημερομηνιών να βρίσκεται με δύο np.searchsorted.
+
+    Με attach οι πίνακες είναι οι στήλες ενός στιγμιοτύπου (core.snapshot,
+    memory-mapped): το είδωλο καλύπτει τότε όλους τους μήνες της συλλογής
+    (complete) και όχι μόνο όσους έχει στη μνήμη το αποθετήριο, και οι
+    εγγραφές των γραμμών του στιγμιοτύπου φτιάχνονται από τις στήλες του
+    μόνο όταν ζητηθούν.
+    """
+
+    def __init__(self, date_field, entity_field, location_field=None, capacity=1024):
+        self.date_field = date_field
+        self.entity_field = entity_field
+        self.location_field = location_field
+        # Λεξικό ποικιλιών: οι κωδικοί μένουν σταθεροί και μετά από rebuild
+        self.variety_values = []
+        self._variety_codes = {}
+        self.snapshot = None
+        self._allocate(capacity)
+
+    @property
+    def complete(self):
+        """Αν το είδωλο έχει όλους τους μήνες (από στιγμιότυπο), όχι μόνο τους φορτωμένους"""
+        return self.snapshot is not None
+
+    def _allocate(self, capacity):
+        self._capacity = capacity
+        self._count = 0
+        self._dead = 0
+        self._row_of = {}
+        self._records = [None] * capacity
+        # Η γραμμή του στιγμιοτύπου από την οποία προέρχεται κάθε γραμμή (-1: καμία)
+        self._origins = np.full(capacity, -1, dtype=np.int64)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.dates = np.zeros(capacity, dtype=np.int32)
+        self.entities = np.zeros(capacity, dtype=np.int64)
+        self.varieties = np.zeros(capacity, dtype=np.int32)
+        self.paid = np.zeros(capacity, dtype=bool)
+        self.locations = np.zeros(capacity, dtype=np.int64)
+        self.certs = np.zeros(capacity, dtype=np.uint16)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.total_kg = np.zeros(capacity, dtype=np.float64)
+        self.total_value = np.zeros(capacity, dtype=np.float64)
+        # Κατά στήλες (order='F'): τα αθροίσματα ανά νούμερο/ποιότητα διαβάζουν συνεχή μνήμη
+        self.sizes = np.zeros((capacity, len(SIZES)), dtype=np.int64, order='F')
+        self.qualities = np.zeros((capacity, len(QUALITIES)), dtype=np.int64, order='F')
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.date_index = SortedDateIndex(capacity)
+
+    def _grow(self):
+        """Διπλασιασμός χωρητικότητας (αποσβεσμένο O(1) ανά εισαγωγή)"""
+        capacity = self._capacity * 2
+        for name in _ROW_COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+        for name in ('sizes', 'qualities'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, old.shape[1]), dtype=old.dtype, order='F')
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+        origins = np.full(capacity, -1, dtype=np.int64)
+        origins[:self._count] = self._origins[:self._count]
+        self._origins = origins
+        self._records.extend([None] * (capacity - self._capacity))
+        self.date_index.reserve(capacity)
+        self._capacity = capacity
+
+    def _write_row(self, row, record):
+        size_quantities = record.get('size_quantities') or {}
+        quality_quantities = record.get('quality_quantities') or {}
+        self.ids[row] = record['id']
+        self.dates[row] = date_ordinal(record[self.date_field])
+        self.entities[row] = record.get(self.entity_field) or 0
+        self.varieties[row] = self.variety_code(record.get('variety') or '')
+        self.paid[row] = record.get('paid') == 'Ναι'
+        self.locations[row] = (record.get(self.location_field) or 0) if self.location_field else 0
+        self.certs[row] = cert_mask(record.get('certifications'))
+        self.prices[row] = record.get('agreed_price_per_kg') or 0
+        self.total_kg[row] = record.get('total_kg') or 0
+        self.total_value[row] = record.get('total_value') or 0
+        self.sizes[row] = [int(size_quantities.get(size, 0) or 0) for size in SIZES]
+        self.qualities[row] = [int(quality_quantities.get(quality, 0) or 0) for quality in QUALITIES]
+        self.alive[row] = True
+        self._records[row] = record
+
+    def _write_rows(self, rows, records):
+        """Όπως το _write_row για πολλές γραμμές, με μία ανάθεση ανά στήλη"""
+        sizes = [record.get('size_quantities') or {} for record in records]
+        qualities = [record.get('quality_quantities') or {} for record in records]
+        self.ids[rows] = [record['id'] for record in records]
+        self.dates[rows] = [date_ordinal(record[self.date_field]) for record in records]
+        self.entities[rows] = [record.get(self.entity_field) or 0 for record in records]
+        self.varieties[rows] = [self.variety_code(record.get('variety') or '') for record in records]
+        self.paid[rows] = [record.get('paid') == 'Ναι' for record in records]
+        if self.location_field:
+            self.locations[rows] = [record.get(self.location_field) or 0 for record in records]
+        else:
+            self.locations[rows] = 0
+        self.certs[rows] = [cert_mask(record.get('certifications')) for record in records]
+        self.prices[rows] = [record.get('agreed_price_per_kg') or 0 for record in records]
+        self.total_kg[rows] = [record.get('total_kg') or 0 for record in records]
+        self.total_value[rows] = [record.get('total_value') or 0 for record in records]
+        if records:
+            self.sizes[rows] = [[int(quantities.get(size, 0) or 0) for size in SIZES] for quantities in sizes]
+            self.qualities[rows] = [
+                [int(quantities.get(quality, 0) or 0) for quality in QUALITIES] for quantities in qualities
+            ]
+        self.alive[rows] = True
+        for row, record in zip(rows.tolist(), records):
+            self._records[row] = record
+
+    def variety_code(self, variety):
+        code = self._variety_codes.get(variety)
+        if code is None:
+            code = self._variety_codes[variety] = len(self.variety_values)
+            self.variety_values.append(variety)
+        return code
+
+    def find_variety(self, variety):
+        """Κωδικός ποικιλίας ή -1 αν δεν υπάρχει (χωρίς προσθήκη στο λεξικό)"""
+        return self._variety_codes.get(variety, -1)
+
+    def __len__(self):
+        return self._count - self._dead
+
+    @property
+    def row_count(self):
+        """Γραμμές σε χρήση, μαζί με τις ανενεργές"""
+        return self._count
+
+    def rebuild(self, items):
+        """Πλήρης κατασκευή από τις εγγραφές (μόνο κατά τη φόρτωση)"""
+        self.snapshot = None
+        self._allocate(max(1024, len(items) * 2))
+        self._write_rows(np.arange(len(items)), items)
+        self._row_of = {record['id']: row for row, record in enumerate(items)}
+        self._count = len(items)
+        self.date_index.rebuild(self.dates[:self._count])
+
+    def attach(self, snapshot, stop, stale, items):
+        """Κατασκευή από τις γραμμές [0, stop) του στιγμιοτύπου και τις εγγραφές items
+
+        Οι γραμμές στις φέτες stale (μήνες που άλλαξαν μετά το στιγμιότυπο)
+        σημαδεύονται ανενεργές· οι τρέχουσες εγγραφές τους, όπως και των
+        μηνών μετά το stop, δίνονται στο items. Οι στήλες που υπάρχουν
+        αυτούσιες στο στιγμιότυπο χρησιμοποιούνται χωρίς αντιγραφή.
+        """
+        capacity = snapshot.capacity
+        self.snapshot = snapshot
+        self._capacity = capacity
+        self._records = [None] * capacity
+        self._origins = np.full(capacity, -1, dtype=np.int64)
+        self._origins[:stop] = np.arange(stop)
+
+        self.ids = snapshot.column('id')
+        self.dates = snapshot.column(self.date_field)
+        self.entities = snapshot.column(self.entity_field)
+        self.varieties = snapshot.column('variety')
+        self.variety_values = snapshot.table('variety').tolist()
+        self._variety_codes = {variety: code for code, variety in enumerate(self.variety_values)}
+        self.paid = np.zeros(capacity, dtype=bool)
+        self.paid[:stop] = snapshot.column('paid')[:stop] == self._code(snapshot.table('paid'), 'Ναι')
+        if self.location_field:
+            self.locations = snapshot.column(self.location_field)
+        else:
+            self.locations = np.zeros(capacity, dtype=np.int64)
+        self.certs = np.zeros(capacity, dtype=np.uint16)
+        if 'certifications' in snapshot.fields:
+            table = snapshot.table('certifications')
+            masks = np.array([cert_mask(value.split(LIST_SEPARATOR)) for value in table.tolist()], dtype=np.uint16)
+            self.certs[:stop] = masks[snapshot.column('certifications')[:stop]]
+        self.prices = snapshot.column('agreed_price_per_kg')
+        self.total_kg = snapshot.column('total_kg')
+        self.total_value = snapshot.column('total_value')
+        self.sizes = snapshot.column('size_quantities')
+        self.qualities = snapshot.column('quality_quantities')
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.alive[:stop] = True
+        for start, end in stale:
+            self.alive[start:end] = False
+        self.date_index = SortedDateIndex(capacity)
+
+        self._count = stop
+        self._dead = stop - int(np.count_nonzero(self.alive[:stop]))
+        live = np.flatnonzero(self.alive[:stop])
+        self._row_of = dict(zip(self.ids[live].tolist(), live.tolist()))
+        rows = []
+        count = self._count
+        for record in items:
+            row = self._row_of.get(record['id'])
+            if row is None:
+                row = self._row_of[record['id']] = count
+                count += 1
+            rows.append(row)
+        while count > self._capacity:
+            self._grow()
+        self._count = count
+        self._write_rows(np.array(rows, dtype=np.int64), items)
+        self.date_index.rebuild(self.dates[:self._count], self.rows())
+
+    @staticmethod
+    def _code(table, value):
+        for code, text in enumerate(table.tolist()):
+            if text == value:
+                return code
+        return -1
+
+    def insert(self, record):
+        if self._count == self._capacity:
+            self._grow()
+        row = self._count
+        self._write_row(row, record)
+        self._row_of[record['id']] = row
+        self._count += 1
+        self.date_index.insert(self.dates[row], row)
+        return row
+
+    def update(self, old, new):
+        row = self._row_of.get(old['id'])
+        if row is None:
+            return self.insert(new)
+        old_date = self.dates[row]
+        self._write_row(row, new)
+        if self.dates[row] != old_date:
+            self.date_index.remove(old_date, row)
+            self.date_index.insert(self.dates[row], row)
+        return row
+
+    def delete(self, old):
+        row = self._row_of.pop(old['id'], None)
+        if row is None:
+            return None
+        self.alive[row] = False
+        self._records[row] = None
+        self.date_index.remove(self.dates[row], row)
+        self._dead += 1
+        if self._dead > 1024 and self._dead * 2 > self._count:
+            self.compact()
+        return row
+
+    def compact(self):
+        """Αφαίρεση των ανενεργών γραμμών διατηρώντας τη σειρά
+
+        Οι στήλες αντιγράφονται ως φέτες NumPy (και οι γραμμές στιγμιοτύπου,
+        που δεν έχουν εγγραφή στη μνήμη, κρατούν την προέλευσή τους).
+        """
+        rows = self.rows()
+        count = len(rows)
+        capacity = max(1024, count * 2)
+        for name in (*_ROW_COLUMNS, '_origins'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype) if name != '_origins' else np.full(capacity, -1, dtype=old.dtype)
+            new[:count] = old[rows]
+            setattr(self, name, new)
+        for name in ('sizes', 'qualities'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, old.shape[1]), dtype=old.dtype, order='F')
+            new[:count] = old[rows]
+            setattr(self, name, new)
+        self._records = [self._records[row] for row in rows.tolist()] + [None] * (capacity - count)
+        self._row_of = dict(zip(self.ids[:count].tolist(), range(count)))
+        self._capacity = capacity
+        self._count = count
+        self._dead = 0
+        self.date_index = SortedDateIndex(capacity)
+        self.date_index.rebuild(self.dates[:count])
+
+    def rows(self):
+        """Όλες οι ενεργές γραμμές με σειρά εισαγωγής"""
+        return np.flatnonzero(self.alive[:self._count])
+
+    def select(self, start=None, end=None, entity_id=None, certification=None):
+        """Γραμμές που ικανοποιούν τα φίλτρα (ημερομηνίες συμπεριλαμβάνονται)
+
+        Το εύρος ημερομηνιών δίνει μία φέτα του ταξινομημένου ευρετηρίου και
+        τα υπόλοιπα φίλτρα εφαρμόζονται μόνο σε αυτή. Οι γραμμές
+        επιστρέφονται με σειρά εισαγωγής.
+        """
+        rows = self.date_index.between(
+            date_ordinal(start) if start is not None else None,
+            date_ordinal(end) if end is not None else None
+        )
+        if entity_id is not None:
+            rows = rows[self.entities[rows] == entity_id]
+        if certification is not None:
+            rows = rows[(self.certs[rows] & CERT_BITS.get(certification, 0)) != 0]
+        return np.sort(rows)
+
+    def summarize(self, rows):
+        """Αθροίσματα για τις δοσμένες γραμμές"""
+        size_totals = self.sizes[rows].sum(axis=0)
+        quality_totals = self.qualities[rows].sum(axis=0)
+        return {
+            'count': len(rows),
+            'total_kg': _number(self.total_kg[rows].sum()),
+            'total_value': float(self.total_value[rows].sum()),
+            'sizes': {size: int(q) for size, q in zip(SIZES, size_totals)},
+            'qualities': {quality: int(q) for quality, q in zip(QUALITIES, quality_totals)},
+        }
+
+    def records(self, rows):
+        """Οι αρχικές εγγραφές για τις δοσμένες γραμμές"""
+        records = [self._records[row] for row in rows]
+        if self.snapshot is not None:
+            # Γραμμές του στιγμιοτύπου: οι εγγραφές φτιάχνονται από τις στήλες του
+            missing = [i for i, record in enumerate(records) if record is None]
+            if missing:
+                origins = self._origins[np.asarray(rows)[missing]]
+                for i, record in zip(missing, self.snapshot.records(origins)):
+                    records[i] = record
+        return records
+
+
+class SortedDateIndex:
+    """Ταξινομημένες ημερομηνίες (ordinal) με τις αντίστοιχες γραμμές
+
+    Η εισαγωγή και η διαγραφή μετακινούν την ουρά των πινάκων επί τόπου
+    (memmove), ενώ το ερώτημα εύρους είναι δύο δυαδικές αναζητήσεις.
+    """
+
+    def __init__(self, capacity=1024):
+        self._count = 0
+        self.dates = np.zeros(capacity, dtype=np.int32)
+        self.rows = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self._count
+
+    def reserve(self, capacity):
+        if capacity <= len(self.dates):
+            return
+        for name in ('dates', 'rows'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def rebuild(self, dates, rows=None):
+        """Κατασκευή από τη στήλη ημερομηνιών (σταθερή ταξινόμηση), μόνο για τις rows αν δοθούν"""
+        if rows is not None:
+            dates = dates[rows]
+        self.reserve(len(dates))
+        order = np.argsort(dates, kind='stable')
+        self._count = len(dates)
+        self.dates[:self._count] = dates[order]
+        self.rows[:self._count] = order if rows is None else rows[order]
+
+    def insert(self, ordinal, row):
+        if self._count == len(self.dates):
+            self.reserve(max(1024, self._count * 2))
+        n = self._count
+        pos = int(np.searchsorted(self.dates[:n], ordinal, side='right'))
+        self.dates[pos + 1:n + 1] = self.dates[pos:n]
+        self.rows[pos + 1:n + 1] = self.rows[pos:n]
+        self.dates[pos] = ordinal
+        self.rows[pos] = row
+        self._count += 1
+
+    def remove(self, ordinal, row):
+        n = self._count
+        left = int(np.searchsorted(self.dates[:n], ordinal, side='left'))
+        right = int(np.searchsorted(self.dates[:n], ordinal, side='right'))
+        matches = np.flatnonzero(self.rows[left:right] == row)
+        if not len(matches):
+            return
+        pos = left + int(matches[0])
+        self.dates[pos:n - 1] = self.dates[pos + 1:n]
+        self.rows[pos:n - 1] = self.rows[pos + 1:n]
+        self._count -= 1
+
+    def between(self, start=None, end=None):
+        """Γραμμές με start <= ημερομηνία <= end (None = χωρίς όριο)"""
+        n = self._count
+        left = 0 if start is None else int(np.searchsorted(self.dates[:n], start, side='left'))
+        right = n if end is None else int(np.searchsorted(self.dates[:n], end, side='right'))
+        return self.rows[left:right]
@@ -0,0 +1,13 @@
+"""Κοινές σταθερές της εφαρμογής"""
+
+# Νούμερα (μεγέθη) καρπού
+SIZES = ["10", "12", "14", "16", "18", "20", "22", "24", "26", "26-32", "Διάφορα", "Σκάρτα", "Μεταποίηση"]
+
+# Ποιότητες
+QUALITIES = ["Ι", "ΙΙ", "ΙΙΙ", "Σκάρτα", "Διάφορα", "Μεταποίηση"]
+
+# Πιστοποιήσεις
+CERTIFICATIONS = ["GlobalGAP", "GRASP", "Βιολογικό", "Βιοδυναμικό", "Συμβατικό", "ΟΠ"]
+
+# Η σεζόν συγκομιδής ξεκινά τον Σεπτέμβριο: Οκτ. 2025 – Μάιος 2026 είναι η "2025-26"
+SEASON_START_MONTH = 9
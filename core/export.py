@@ -0,0 +1,179 @@
+"""Εξαγωγή παραλαβών/παραγγελιών σε τμήματα με φραγμένη μνήμη
+
+Οι εγγραφές διαβάζονται ως ροή και γράφονται ανά τμήμα (chunk) σε αρχείο,
+οπότε η μέγιστη μνήμη δεν εξαρτάται από το πλήθος των γραμμών. Τα νούμερα
+και οι ποιότητες γίνονται ξεχωριστές στήλες (size_10, quality_Ι, ...).
+
+Μορφές: 'csv.gz', 'xlsx' (openpyxl σε write-only) και 'npz' (στηλοθετημένο
+αρχείο NumPy με ένα .npy ανά στήλη και τμήμα, π.χ. part-00000/total_kg).
+"""
+import csv
+import gzip
+import io
+import json
+import zipfile
+from itertools import islice
+
+from .constants import QUALITIES, SIZES
+
+CHUNK_SIZE = 5000
+
+BASE_COLUMNS = {
+    'receipts': [
+        'id', 'receipt_date', 'producer_id', 'producer_name', 'variety', 'lot',
+        'storage_location_id', 'storage_location', 'certifications', 'agreed_price_per_kg',
+        'total_kg', 'total_value', 'paid', 'invoice_ref', 'observations', 'created_by', 'created_at'
+    ],
+    'orders': [
+        'id', 'date', 'customer_id', 'customer', 'variety', 'lot', 'storage_location_id', 'storage_location',
+        'executed_quantity', 'agreed_price_per_kg', 'total_kg', 'total_value', 'paid', 'invoice_ref', 'observations',
+        'created_by', 'created_at'
+    ],
+    'movements': [
+        'id', 'date', 'type', 'location_id', 'to_location_id', 'variety', 'kg', 'source', 'source_id', 'note',
+        'created_by', 'created_at'
+    ],
+    'allocations': ['id', 'receipt_id', 'receipt_lot', 'order_id', 'order_lot', 'kg', 'created_by', 'created_at'],
+    # Γραμμές αναφοράς ιχνηλασιμότητας (core.trace)
+    'trace': [
+        'allocation_id', 'receipt_id', 'receipt_lot', 'receipt_date', 'producer_id', 'producer_name', 'variety',
+        'kg', 'order_id', 'order_lot', 'order_date', 'customer_id', 'customer'
+    ],
+}
+
+# Συλλογές με ποσότητες ανά νούμερο και ποιότητα (στήλες size_*/quality_*)
+QUANTITY_COLLECTIONS = ('receipts', 'orders', 'movements')
+
+SIZE_COLUMNS = [f'size_{size}' for size in SIZES]
+QUALITY_COLUMNS = [f'quality_{quality}' for quality in QUALITIES]
+
+# Τύποι NumPy για τη στηλοθετημένη μορφή· οι υπόλοιπες στήλες είναι κείμενο
+NUMERIC_TYPES = {
+    'id': 'i8', 'producer_id': 'i8', 'customer_id': 'i8', 'storage_location_id': 'i8',
+    'location_id': 'i8', 'to_location_id': 'i8', 'source_id': 'i8',
+    'allocation_id': 'i8', 'receipt_id': 'i8', 'order_id': 'i8', 'kg': 'f8',
+    'executed_quantity': 'f8', 'agreed_price_per_kg': 'f8', 'total_kg': 'f8', 'total_value': 'f8',
+    **{column: 'i8' for column in SIZE_COLUMNS + QUALITY_COLUMNS},
+}
+
+FORMATS = {
+    'xlsx': ('Excel (.xlsx)', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'csv.gz': ('CSV συμπιεσμένο (.csv.gz)', 'application/gzip'),
+    'npz': ('Στηλοθετημένο NumPy (.npz)', 'application/octet-stream'),
+}
+
+
+def columns_for(key):
+    if key not in QUANTITY_COLLECTIONS:
+        return BASE_COLUMNS[key]
+    return BASE_COLUMNS[key] + SIZE_COLUMNS + QUALITY_COLUMNS
+
+
+def flatten(record, base_columns, quantities=True):
+    """Μία εγγραφή ως επίπεδη γραμμή τιμών"""
+    row = []
+    for column in base_columns:
+        value = record.get(column)
+        if isinstance(value, list):
+            value = ', '.join(str(v) for v in value)
+        row.append(value)
+    if not quantities:
+        return row
+    size_quantities = record.get('size_quantities') or {}
+    quality_quantities = record.get('quality_quantities') or {}
+    row.extend(size_quantities.get(size, 0) for size in SIZES)
+    row.extend(quality_quantities.get(quality, 0) for quality in QUALITIES)
+    return row
+
+
+def iter_chunks(records, key, chunk_size=CHUNK_SIZE):
+    """Επίπεδες γραμμές σε τμήματα των chunk_size"""
+    base_columns = BASE_COLUMNS[key]
+    quantities = key in QUANTITY_COLLECTIONS
+    records = iter(records)
+    while True:
+        chunk = [flatten(record, base_columns, quantities) for record in islice(records, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv_gz(records, key, fileobj, chunk_size=CHUNK_SIZE):
+    with gzip.GzipFile(fileobj=fileobj, mode='wb') as gz:
+        text = io.TextIOWrapper(gz, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(columns_for(key))
+        for chunk in iter_chunks(records, key, chunk_size):
+            writer.writerows(chunk)
+        text.flush()
+        text.detach()
+
+
+def write_xlsx(records, key, fileobj, chunk_size=CHUNK_SIZE, sheet_name=None):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name or key)
+    sheet.append(columns_for(key))
+    for chunk in iter_chunks(records, key, chunk_size):
+        for row in chunk:
+            sheet.append(row)
+    workbook.save(fileobj)
+
+
+def write_npz(records, key, fileobj, chunk_size=CHUNK_SIZE):
+    """Ένα .npy ανά στήλη και τμήμα μέσα σε zip, χωρίς pickle
+
+    Διαβάζεται με np.load(path): τα κλειδιά είναι 'part-NNNNN/στήλη' και
+    το 'schema' περιέχει τις στήλες και τους τύπους τους.
+    """
+    import numpy as np
+
+    columns = columns_for(key)
+    parts = 0
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for chunk in iter_chunks(records, key, chunk_size):
+            for i, column in enumerate(columns):
+                values = [row[i] for row in chunk]
+                dtype = NUMERIC_TYPES.get(column)
+                if dtype:
+                    array = np.array([v or 0 for v in values], dtype=dtype)
+                else:
+                    array = np.array(['' if v is None else str(v) for v in values], dtype=str)
+                with archive.open(f'part-{parts:05d}/{column}.npy', 'w', force_zip64=True) as f:
+                    np.save(f, array, allow_pickle=False)
+            parts += 1
+        schema = {'columns': columns, 'types': {c: NUMERIC_TYPES.get(c, 'str') for c in columns}, 'parts': parts}
+        with archive.open('schema.npy', 'w') as f:
+            np.save(f, np.array(json.dumps(schema, ensure_ascii=False)), allow_pickle=False)
+
+
+WRITERS = {'xlsx': write_xlsx, 'csv.gz': write_csv_gz, 'npz': write_npz}
+
+
+def export(records, key, fmt, fileobj, chunk_size=CHUNK_SIZE):
+    """Εγγραφή των records στο fileobj με τη μορφή fmt"""
+    WRITERS[fmt](records, key, fileobj, chunk_size=chunk_size)
+
+
+if __name__ == '__main__':
+    import argparse
+    from datetime import date
+
+    from .storage import DATE_COLUMNS, open_store
+
+    parser = argparse.ArgumentParser(description='Εξαγωγή παραλαβών, παραγγελιών ή κατανομών')
+    parser.add_argument('collection', choices=sorted(set(BASE_COLUMNS) - {'trace'}))
+    parser.add_argument('-f', '--format', choices=sorted(FORMATS), default='csv.gz')
+    parser.add_argument('--start', type=date.fromisoformat, help='Από ημερομηνία (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Έως ημερομηνία (YYYY-MM-DD)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('-o', '--output', required=True)
+    args = parser.parse_args()
+    if (args.start or args.end) and args.collection not in DATE_COLUMNS:
+        parser.error(f'η συλλογή {args.collection} δεν έχει ημερομηνία')
+
+    store = open_store()
+    records = store.iter_records(args.collection, args.start, args.end)
+    with open(args.output, 'wb') as f:
+        export(records, args.collection, args.format, f, chunk_size=args.chunk_size)
@@ -0,0 +1,332 @@
+"""Αποθήκευση σε JSON με ημερολόγιο προσθήκης (journal) και συμπύκνωση"""
+import json
+import os
+import tempfile
+import threading
+import zlib
+
+from . import timing
+from .storage import COLLECTIONS, DATE_COLUMNS, KEYED_COLLECTIONS, FileLock
+
+# Όρια συμπύκνωσης: όποιο ξεπεραστεί πρώτο ενεργοποιεί τη συμπύκνωση
+COMPACT_ENTRIES = int(os.environ.get('JOURNAL_COMPACT_ENTRIES', 5000))
+COMPACT_BYTES = int(os.environ.get('JOURNAL_COMPACT_BYTES', 8 * 1024 * 1024))
+
+
+def atomic_write_json(path, value):
+    """Ατομική εγγραφή JSON μέσω προσωρινού αρχείου και os.replace"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class JournalStore:
+    """Στιγμιότυπο {key}.json και ημερολόγιο {key}.journal.jsonl ανά συλλογή"""
+
+    def __init__(self, directory='.', compact_entries=COMPACT_ENTRIES, compact_bytes=COMPACT_BYTES, fsync=True):
+        self.directory = directory
+        self.compact_entries = compact_entries
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        # Οι εγγραφές αρχείων από πολλές διεργασίες σειριοποιούνται με flock
+        self.file_lock = FileLock(os.path.join(directory, '.lock'))
+        self._lock = threading.RLock()
+        self._state = {}
+        self._journal_entries = {}
+        self._pending = set()
+        self._known = {}
+        self._generation = 0
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._compactor = threading.Thread(target=self._compaction_loop, name='journal-compactor', daemon=True)
+        self._compactor.start()
+
+    def snapshot_path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def journal_path(self, key):
+        return os.path.join(self.directory, f'{key}.journal.jsonl')
+
+    def _replay(self, key):
+        """Ανάγνωση στιγμιοτύπου και εφαρμογή της ουράς του ημερολογίου"""
+        state = {}
+        path = self.snapshot_path(key)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if key in KEYED_COLLECTIONS:
+                state = dict(snapshot)
+            else:
+                state = {item['id']: item for item in snapshot}
+
+        entries = 0
+        path = self.journal_path(key)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Μισογραμμένη τελευταία γραμμή μετά από διακοπή
+                        break
+                    self._apply(state, entry)
+                    entries += 1
+
+        self._journal_entries[key] = entries
+        return state
+
+    def _apply(self, state, entry):
+        if entry['op'] == 'upsert':
+            state[entry['id']] = entry['record']
+        elif entry['op'] == 'delete':
+            state.pop(entry['id'], None)
+        elif entry['op'] == 'batch':
+            for item in entry['entries']:
+                self._apply(state, item)
+
+    def _get_state(self, key):
+        if key not in self._state:
+            self._state[key] = self._replay(key)
+        return self._state[key]
+
+    def _sync_external(self, key):
+        """Αν άλλη διεργασία άλλαξε τα αρχεία, η κατάσταση ξαναδιαβάζεται
+
+        Καλείται υπό file_lock, πριν από κάθε εγγραφή αρχείων.
+        """
+        stat = self._stat(key)
+        if self._known.get(key) != stat:
+            self._state.pop(key, None)
+            self._known[key] = stat
+            self._generation += 1
+
+    def _append(self, key, entry):
+        """Προσθήκη μίας γραμμής στο ημερολόγιο και εφαρμογή στη μνήμη"""
+        with self.file_lock, self._lock:
+            self._sync_external(key)
+            state = self._get_state(key)
+            line = json.dumps(entry, ensure_ascii=False) + '\n'
+            with open(self.journal_path(key), 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                size = f.tell()
+            self._apply(state, entry)
+            self._mark_known(key)
+            span = timing.current()
+            if span is not None:
+                span.count(bytes=len(line.encode()))
+            self._journal_entries[key] = self._journal_entries.get(key, 0) + 1
+            if self._journal_entries[key] >= self.compact_entries or size >= self.compact_bytes:
+                self._pending.add(key)
+                self._wakeup.set()
+
+    def load(self, key, start=None, end=None):
+        with self._lock:
+            state = self._get_state(key)
+            if key in KEYED_COLLECTIONS:
+                return dict(state)
+            if start is None and end is None:
+                return list(state.values())
+            return list(self._between(key, state.values(), start, end))
+
+    def _between(self, key, records, start, end):
+        """Εγγραφές σε εύρος ημερομηνιών (οι ημερομηνίες ISO συγκρίνονται ως κείμενο)"""
+        column = DATE_COLUMNS.get(key)
+        for record in records:
+            if start is not None and record[column] < str(start):
+                continue
+            if end is not None and record[column] > str(end):
+                continue
+            yield record
+
+    def iter_records(self, key, start=None, end=None):
+        return self._between(key, self.load(key), start, end)
+
+    def get(self, key, record_id):
+        with self._lock:
+            return self._get_state(key).get(record_id)
+
+    def last_id(self, key):
+        with self._lock:
+            return max(self._get_state(key), default=0)
+
+    def partitions(self, key):
+        """Κατάλογος μηνών από την κατάσταση στη μνήμη (το στιγμιότυπο είναι ένα αρχείο)"""
+        column = DATE_COLUMNS[key]
+        counts = {}
+        with self._lock:
+            for record in self._get_state(key).values():
+                month = record[column][:7]
+                counts[month] = counts.get(month, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def partition_stamps(self, key):
+        """'YYYY-MM' -> CRC32 των εγγραφών του μήνα (ίδιο stamp: ίδιες εγγραφές)"""
+        column = DATE_COLUMNS[key]
+        stamps = {}
+        with self._lock:
+            for record_id, record in sorted(self._get_state(key).items()):
+                month = record[column][:7]
+                stamps[month] = zlib.crc32(json.dumps(record, ensure_ascii=False).encode(), stamps.get(month, 0))
+        return dict(sorted(stamps.items()))
+
+    def save(self, key, value):
+        if key in KEYED_COLLECTIONS:
+            records = dict(value)
+        else:
+            records = {item['id']: item for item in value}
+        with self.file_lock, self._lock:
+            self._state[key] = records
+            self._write_snapshot(key)
+
+    def upsert(self, key, record_id, record):
+        self._append(key, {'op': 'upsert', 'id': record_id, 'record': record})
+
+    def write_batch(self, key, upserts, deletes=()):
+        """Πολλές αλλαγές ως μία γραμμή 'batch': εφαρμόζονται όλες ή καμία"""
+        entries = [{'op': 'upsert', 'id': record_id, 'record': record} for record_id, record in upserts]
+        entries.extend({'op': 'delete', 'id': record_id} for record_id in deletes)
+        self._append(key, {'op': 'batch', 'entries': entries})
+
+    def delete(self, key, record_id):
+        self._append(key, {'op': 'delete', 'id': record_id})
+
+    def is_empty(self, key):
+        with self._lock:
+            return not self._get_state(key)
+
+    def _stat(self, key):
+        """Χρόνος τροποποίησης και μέγεθος των αρχείων μίας συλλογής"""
+        result = []
+        for path in (self.snapshot_path(key), self.journal_path(key)):
+            try:
+                stat = os.stat(path)
+                result.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                result.append(None)
+        return tuple(result)
+
+    def _mark_known(self, key):
+        self._known[key] = self._stat(key)
+
+    def signature(self):
+        """Αυξάνεται μόνο όταν τα αρχεία αλλάξουν από άλλη διεργασία
+
+        Οι δικές μας εγγραφές και συμπυκνώσεις καταγράφονται ως γνωστές.
+        """
+        with self._lock:
+            for key in COLLECTIONS:
+                stat = self._stat(key)
+                if self._known.get(key) != stat:
+                    self._known[key] = stat
+                    self._generation += 1
+            return self._generation
+
+    def lock(self):
+        """Κλείδωμα για έλεγχο-και-εγγραφή μεταξύ διεργασιών"""
+        return self.file_lock
+
+    def invalidate(self):
+        """Απόρριψη της κατάστασης στη μνήμη ώστε να ξαναδιαβαστεί"""
+        with self._lock:
+            self._state.clear()
+            self._journal_entries.clear()
+            for key in COLLECTIONS:
+                self._mark_known(key)
+
+    def get_meta(self, name, default=None):
+        path = os.path.join(self.directory, 'meta.json')
+        if not os.path.exists(path):
+            return default
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get(name, default)
+
+    def set_meta(self, name, value):
+        path = os.path.join(self.directory, 'meta.json')
+        with self.file_lock, self._lock:
+            meta = {}
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            meta[name] = str(value)
+            atomic_write_json(path, meta)
+
+    def _write_snapshot(self, key):
+        """Πλήρες στιγμιότυπο υπό κλείδωμα και άδειασμα του ημερολογίου"""
+        state = self._state[key]
+        value = dict(state) if key in KEYED_COLLECTIONS else list(state.values())
+        atomic_write_json(self.snapshot_path(key), value)
+        span = timing.current()
+        if span is not None:
+            span.count(bytes=os.path.getsize(self.snapshot_path(key)))
+        if os.path.exists(self.journal_path(key)):
+            os.remove(self.journal_path(key))
+        self._mark_known(key)
+        self._journal_entries[key] = 0
+
+    def compact(self, key):
+        """Συγχώνευση του ημερολογίου σε νέο στιγμιότυπο
+
+        Το στιγμιότυπο γράφεται εκτός του κλειδώματος της μνήμης ώστε οι
+        εγγραφές της διεργασίας να συνεχίζουν· όσες γραμμές προστέθηκαν στο
+        μεταξύ διατηρούνται. Άλλες διεργασίες περιμένουν στο file_lock.
+        """
+        with self.file_lock:
+            with self._lock:
+                self._sync_external(key)
+                state = self._get_state(key)
+                value = dict(state) if key in KEYED_COLLECTIONS else list(state.values())
+                journal = self.journal_path(key)
+                offset = os.path.getsize(journal) if os.path.exists(journal) else 0
+                entries = self._journal_entries.get(key, 0)
+
+            atomic_write_json(self.snapshot_path(key), value)
+
+            with self._lock:
+                if not os.path.exists(journal):
+                    self._mark_known(key)
+                    return
+                with open(journal, 'r', encoding='utf-8') as f:
+                    f.seek(offset)
+                    tail = f.read()
+                if tail:
+                    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.jsonl', dir=os.path.dirname(os.path.abspath(journal)))
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.write(tail)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, journal)
+                else:
+                    os.remove(journal)
+                self._mark_known(key)
+                self._journal_entries[key] = max(self._journal_entries.get(key, 0) - entries, 0)
+
+    def _compaction_loop(self):
+        while not self._closed:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                pending, self._pending = self._pending, set()
+            for key in pending:
+                self.compact(key)
+
+    def compact_all(self):
+        for key in COLLECTIONS:
+            if self._journal_entries.get(key):
+                self.compact(key)
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._compactor.join(timeout=5)
@@ -0,0 +1,477 @@
+"""Καθολικό κινήσεων αποθέματος ανά αποθηκευτικό χώρο, ποικιλία, νούμερο και ποιότητα
+
+Κάθε κίνηση (συλλογή 'movements') είναι εισαγωγή από παραλαβή, εξαγωγή
+από εκτέλεση παραγγελίας, μεταφορά μεταξύ χώρων ή διόρθωση. Οι κινήσεις
+δεν αλλάζουν ποτέ: όταν διορθωθεί ή διαγραφεί μια παραλαβή/παραγγελία
+προστίθενται κινήσεις με τη διαφορά (post), στην ημερομηνία της
+εγγραφής, οπότε το καθολικό μένει πλήρες ιστορικό.
+
+Το ευρετήριο StockLedger κρατά τρέχοντα υπόλοιπα ανά (χώρος, ποικιλία,
+νούμερο, ποιότητα), αθροίσματα ανά ημέρα και ένα σημείο ελέγχου
+(υπόλοιπα στην αρχή κάθε μήνα), οπότε το τρέχον απόθεμα είναι O(1) και
+το απόθεμα σε παλαιότερη ημερομηνία είναι σημείο ελέγχου συν το πολύ
+έναν μήνα ημερήσιων αθροισμάτων.
+
+Τα νούμερα και οι ποιότητες είναι χωριστές αναλύσεις (όπως στο
+calculate_totals), οπότε κάθε κλειδί υπολοίπου έχει είτε νούμερο είτε
+ποιότητα και το άλλο κενό.
+
+Εκτέλεση:
+    python -m core.ledger sync          # κινήσεις για όσες παραλαβές/παραγγελίες λείπουν
+    python -m core.ledger stock --date 2025-12-31
+"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+
+MOVEMENT_TYPES = {
+    'receipt': 'Παραλαβή',
+    'order': 'Εκτέλεση παραγγελίας',
+    'transfer': 'Μεταφορά',
+    'adjustment': 'Διόρθωση',
+}
+
+# Συλλογές που δημιουργούν κινήσεις: (τύπος κίνησης, πεδίο ημερομηνίας)
+SOURCES = {'receipts': ('receipt', 'receipt_date'), 'orders': ('order', 'date')}
+
+
+def movement_lines(movement):
+    """(κλειδί υπολοίπου, κιλά με πρόσημο) μιας κίνησης
+
+    Η μεταφορά αφαιρεί από το location_id και προσθέτει στο to_location_id.
+    """
+    variety = movement.get('variety') or ''
+    grades = [((size, ''), kg) for size, kg in (movement.get('size_quantities') or {}).items() if kg]
+    grades += [(('', quality), kg) for quality, kg in (movement.get('quality_quantities') or {}).items() if kg]
+    location_id = movement['location_id']
+    to_location_id = movement.get('to_location_id')
+    for (size, quality), kg in grades:
+        if to_location_id is None:
+            yield (location_id, variety, size, quality), kg
+        else:
+            yield (location_id, variety, size, quality), -kg
+            yield (to_location_id, variety, size, quality), kg
+
+
+def _add(balances, key, kg):
+    value = balances.get(key, 0) + kg
+    if value:
+        balances[key] = value
+    else:
+        balances.pop(key, None)
+
+
+class StockLedger:
+    """Υπόλοιπα αποθέματος από τις κινήσεις, τρέχοντα και σε ημερομηνία
+
+    Οι ημερομηνίες είναι κείμενο ISO ('2025-11-03'), οπότε ο μήνας είναι
+    τα 7 πρώτα γράμματα και η σύγκριση κειμένου είναι χρονολογική.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._balances = {}
+        self._location_balances = {}
+        self._location_kg = {}
+        self._daily = {}
+        self._days = []
+        self._checkpoints = {}
+        self._months = []
+        self._by_location = {}
+        self._by_source = {}
+
+    def _index(self, movement):
+        for location_id in (movement['location_id'], movement.get('to_location_id')):
+            if location_id is not None:
+                self._by_location.setdefault(location_id, {})[movement['id']] = movement
+        if movement.get('source_id') is not None:
+            self._by_source.setdefault((movement['source'], movement['source_id']), {})[movement['id']] = movement
+
+    def _unindex(self, movement):
+        sides = [(self._by_location, movement['location_id']), (self._by_location, movement.get('to_location_id'))]
+        if movement.get('source_id') is not None:
+            sides.append((self._by_source, (movement['source'], movement['source_id'])))
+        for side, key in sides:
+            movements = side.get(key)
+            if movements is not None:
+                movements.pop(movement['id'], None)
+                if not movements:
+                    del side[key]
+
+    def _apply(self, movement, sign):
+        day = movement['date']
+        month = day[:7]
+        if month not in self._checkpoints:
+            # Υπόλοιπα στην αρχή του νέου μήνα, πριν μετρήσει η κίνηση
+            self._checkpoints[month] = self._state(f'{month}-01', bisect_left)
+            insort(self._months, month)
+        daily = self._daily.get(day)
+        if daily is None:
+            daily = self._daily[day] = {}
+            insort(self._days, day)
+        later = [self._checkpoints[m] for m in self._months[bisect_right(self._months, month):]]
+        location_kg = self._location_kg
+        for key, kg in movement_lines(movement):
+            kg *= sign
+            _add(self._balances, key, kg)
+            self._add_location(key, kg)
+            _add(daily, key, kg)
+            location_kg[key[0]] = location_kg.get(key[0], 0) + kg
+            # Μια κίνηση με παλαιότερη ημερομηνία αλλάζει τα σημεία ελέγχου των επόμενων μηνών
+            for checkpoint in later:
+                _add(checkpoint, key, kg)
+
+    def _add_location(self, key, kg):
+        """Το υπόλοιπο του κλειδιού και στα υπόλοιπα του χώρου του (key[0])"""
+        balances = self._location_balances.get(key[0])
+        if balances is None:
+            balances = self._location_balances[key[0]] = {}
+        _add(balances, key, kg)
+        if not balances:
+            del self._location_balances[key[0]]
+
+    def _state(self, day, bisect=bisect_right):
+        """Υπόλοιπα στο τέλος της day (ή στην αρχή της, με bisect_left)"""
+        i = bisect_right(self._months, day[:7]) - 1
+        if i < 0:
+            return {}
+        month = self._months[i]
+        balances = dict(self._checkpoints[month])
+        for d in self._days[bisect_left(self._days, f'{month}-01'):bisect(self._days, day)]:
+            for key, kg in self._daily[d].items():
+                _add(balances, key, kg)
+        return balances
+
+    def rebuild(self, items):
+        self._reset()
+        for movement in items:
+            self._index(movement)
+            daily = self._daily.setdefault(movement['date'], {})
+            for key, kg in movement_lines(movement):
+                _add(self._balances, key, kg)
+                self._add_location(key, kg)
+                _add(daily, key, kg)
+                self._location_kg[key[0]] = self._location_kg.get(key[0], 0) + kg
+        # Σημεία ελέγχου με ένα πέρασμα των ημερών σε χρονολογική σειρά
+        self._days = sorted(self._daily)
+        running = {}
+        for day in self._days:
+            month = day[:7]
+            if month not in self._checkpoints:
+                self._checkpoints[month] = dict(running)
+                self._months.append(month)
+            for key, kg in self._daily[day].items():
+                _add(running, key, kg)
+
+    def insert(self, movement):
+        self._index(movement)
+        self._apply(movement, 1)
+
+    def update(self, old, new):
+        self.delete(old)
+        self.insert(new)
+
+    def delete(self, old):
+        self._unindex(old)
+        self._apply(old, -1)
+
+    def on_hand(self, location_id):
+        """Τρέχοντα κιλά σε έναν χώρο (O(1))"""
+        return self._location_kg.get(location_id, 0)
+
+    def balance(self, key):
+        """Τρέχοντα κιλά ενός κλειδιού (χώρος, ποικιλία, νούμερο, ποιότητα)"""
+        return self._balances.get(key, 0)
+
+    def lowest_balance(self, key, day):
+        """Το μικρότερο υπόλοιπο ενός κλειδιού στο τέλος της day και κάθε επόμενης ημέρας
+
+        Μια κίνηση με παλαιότερη ημερομηνία μετρά σε όλες τις επόμενες ημέρες,
+        οπότε μια αφαίρεση χωρά μόνο αν κανένα από αυτά τα υπόλοιπα δεν γίνεται
+        αρνητικό (όχι μόνο το τρέχον).
+        """
+        i = bisect_right(self._months, day[:7]) - 1
+        balance = 0
+        start = 0
+        if i >= 0:
+            balance = self._checkpoints[self._months[i]].get(key, 0)
+            start = bisect_left(self._days, f'{self._months[i]}-01')
+        stop = bisect_right(self._days, day)
+        for d in self._days[start:stop]:
+            balance += self._daily[d].get(key, 0)
+        lowest = balance
+        for d in self._days[stop:]:
+            balance += self._daily[d].get(key, 0)
+            lowest = min(lowest, balance)
+        return lowest
+
+    def balances(self, location_id=None, day=None):
+        """Υπόλοιπα ανά κλειδί, τρέχοντα ή στο τέλος της day (κείμενο ISO)
+
+        Τα τρέχοντα υπόλοιπα ενός χώρου διαβάζονται από τα δικά του
+        (O(κλειδιά του χώρου)), χωρίς να περνιούνται όλα τα κλειδιά.
+        """
+        if day is None:
+            if location_id is None:
+                return dict(self._balances)
+            return dict(self._location_balances.get(location_id, {}))
+        balances = self._state(day)
+        return {
+            key: kg for key, kg in balances.items()
+            if location_id is None or key[0] == location_id
+        }
+
+    def location_totals(self, day=None):
+        """Κιλά ανά χώρο, τρέχοντα ή στο τέλος της day"""
+        if day is None:
+            return dict(self._location_kg)
+        totals = {}
+        for key, kg in self._state(day).items():
+            totals[key[0]] = totals.get(key[0], 0) + kg
+        return totals
+
+    def count(self, location_id):
+        return len(self._by_location.get(location_id, {}))
+
+    def movements(self, location_id, offset=0, limit=None):
+        """Μία σελίδα κινήσεων ενός χώρου, οι νεότερες πρώτες"""
+        movements = self._by_location.get(location_id, {})
+        stop = None if limit is None else offset + limit
+        return list(islice(reversed(movements.values()), offset, stop))
+
+    def posted(self, source, source_id):
+        """Καθαρά κιλά ανά (ημερομηνία, κλειδί) που έχουν καταχωρηθεί για μία εγγραφή"""
+        net = {}
+        for movement in self._by_source.get((source, source_id), {}).values():
+            for key, kg in movement_lines(movement):
+                _add(net, (movement['date'], key), kg)
+        return net
+
+    def sources(self, source):
+        """Τα id των εγγραφών της συλλογής source που έχουν κινήσεις"""
+        return [source_id for key, source_id in self._by_source if key == source]
+
+
+def split_quantity(total, weights):
+    """Ακέραια κατανομή του total ανάλογα με τα βάρη (μέθοδος μεγαλύτερου υπολοίπου)"""
+    weight_sum = sum(weights.values())
+    if not weight_sum:
+        return {}
+    shares = {name: total * weight / weight_sum for name, weight in weights.items()}
+    parts = {name: int(share) for name, share in shares.items()}
+    remainder = round(total - sum(parts.values()))
+    for name in sorted(shares, key=lambda name: parts[name] - shares[name])[:remainder]:
+        parts[name] += 1
+    return parts
+
+
+def target_lines(key, record):
+    """(ημερομηνία, κλειδί) -> κιλά που πρέπει να έχει στο καθολικό η εγγραφή
+
+    Παραλαβή: εισαγωγή των ποσοτήτων της στον αποθηκευτικό χώρο.
+    Παραγγελία: εξαγωγή της εκτελεσθείσας ποσότητας από την αποθήκη
+    φόρτωσης, κατανεμημένη στα νούμερα/ποιότητες αναλογικά με την
+    παραγγελία. Χωρίς αποθηκευτικό χώρο η εγγραφή δεν κινεί απόθεμα.
+    """
+    if record is None or not record.get('storage_location_id'):
+        return {}
+    movement = {
+        'location_id': record['storage_location_id'],
+        'variety': record.get('variety'),
+        'size_quantities': record.get('size_quantities'),
+        'quality_quantities': record.get('quality_quantities'),
+    }
+    if key == 'orders':
+        quantities = {
+            ('size', size): kg for size, kg in (record.get('size_quantities') or {}).items() if kg
+        }
+        quantities.update({
+            ('quality', quality): kg for quality, kg in (record.get('quality_quantities') or {}).items() if kg
+        })
+        executed = split_quantity(record.get('executed_quantity') or 0, quantities)
+        movement['size_quantities'] = {name: -kg for (kind, name), kg in executed.items() if kind == 'size'}
+        movement['quality_quantities'] = {name: -kg for (kind, name), kg in executed.items() if kind == 'quality'}
+    day = record[SOURCES[key][1]]
+    return {(day, line_key): kg for line_key, kg in movement_lines(movement)}
+
+
+def _movements(repository, key, records, created_by):
+    """Κινήσεις με τη διαφορά ανάμεσα σε ό,τι έχει καταχωρηθεί και ό,τι πρέπει
+
+    records: ζεύγη (id, εγγραφή ή None αν διαγράφηκε).
+    """
+    ledger = repository.index('movements', 'ledger')
+    movement_type = SOURCES[key][0]
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    next_id = repository.next_id('movements')
+    movements = []
+    for record_id, record in records:
+        delta = target_lines(key, record)
+        for line, kg in ledger.posted(key, record_id).items():
+            _add(delta, line, -kg)
+        # Μία κίνηση ανά (ημερομηνία, χώρος, ποικιλία)
+        grouped = {}
+        for (day, (location_id, variety, size, quality)), kg in delta.items():
+            movement = grouped.get((day, location_id, variety))
+            if movement is None:
+                movement = grouped[(day, location_id, variety)] = {
+                    'id': next_id + len(movements),
+                    'date': day,
+                    'type': movement_type,
+                    'location_id': location_id,
+                    'variety': variety,
+                    'size_quantities': {},
+                    'quality_quantities': {},
+                    'kg': 0,
+                    'source': key,
+                    'source_id': record_id,
+                    'created_by': created_by,
+                    'created_at': created_at,
+                }
+                movements.append(movement)
+            if size:
+                movement['size_quantities'][size] = kg
+            else:
+                movement['quality_quantities'][quality] = kg
+            movement['kg'] += kg
+    return movements
+
+
+def post(repository, key, record_ids, created_by):
+    """Καταχώρηση των κινήσεων που φέρνουν το καθολικό σε συμφωνία με τις εγγραφές
+
+    Καλείται μετά από αποθήκευση ή διαγραφή παραλαβής/παραγγελίας· αν δεν
+    υπάρχει διαφορά δεν γράφεται τίποτα, οπότε η επανάληψη είναι ασφαλής.
+    """
+    with repository.transaction():
+        records = [(record_id, repository.get(key, record_id)) for record_id in record_ids]
+        movements = _movements(repository, key, records, created_by)
+        if movements:
+            repository.upsert_many('movements', movements, [0] * len(movements))
+    return movements
+
+
+def sync(repository, created_by='system', force=False):
+    """Κινήσεις για όλες τις παραλαβές/παραγγελίες που δεν έχουν (μία φορά ανά βάση)
+
+    Χρησιμοποιείται για δεδομένα που γράφτηκαν πριν από το καθολικό ή
+    εκτός εφαρμογής· με force ελέγχονται ξανά όλες οι εγγραφές.
+    """
+    with repository.transaction():
+        if repository.store.get_meta('ledger_synced') and not force:
+            return []
+        ledger = repository.index('movements', 'ledger')
+        movements = []
+        for key in SOURCES:
+            # Από τον δίσκο, ώστε να περιληφθούν και οι μήνες που δεν έχουν φορτωθεί
+            records = [(record['id'], record) for record in repository.store.iter_records(key)]
+            # Και όσες διαγράφηκαν ενώ είχαν κινήσεις, για να αντιλογιστούν
+            records += [(source_id, None) for source_id in ledger.sources(key) if repository.get(key, source_id) is None]
+            batch = _movements(repository, key, records, created_by)
+            for movement in batch:
+                movement['id'] += len(movements)
+            movements += batch
+        if movements:
+            repository.upsert_many('movements', movements, [0] * len(movements))
+        repository.store.set_meta('ledger_synced', 1)
+    return movements
+
+
+def _manual(repository, movement, check):
+    """Καταχώρηση μεταφοράς/διόρθωσης με έλεγχο υπολοίπου υπό το κλείδωμα
+
+    Το υπόλοιπο ελέγχεται από την ημερομηνία της κίνησης και μετά, ώστε μια
+    αναδρομική μεταφορά να μην το κάνει αρνητικό σε ενδιάμεσες ημέρες.
+    """
+    ledger = repository.index('movements', 'ledger')
+
+    def prepare(movement, current):
+        check()
+        for key, kg in movement_lines(movement):
+            if kg >= 0:
+                continue
+            available = ledger.lowest_balance(key, movement['date'])
+            if available + kg < 0:
+                location_id, variety, size, quality = key
+                grade = f"νούμερο {size}" if size else f"ποιότητα {quality}"
+                raise ValueError(
+                    f"Στον χώρο #{location_id} υπάρχουν μόνο {available} kg {variety} ({grade}) "
+                    f"από {movement['date']} και μετά"
+                )
+        return movement
+
+    movement = dict(
+        movement,
+        id=repository.next_id('movements'),
+        created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    )
+    return repository.upsert('movements', movement, expected_version=0, prepare=prepare)
+
+
+def _grade_quantities(size, quality, kg):
+    if size:
+        return {'size_quantities': {size: kg}, 'quality_quantities': {}}
+    return {'size_quantities': {}, 'quality_quantities': {quality: kg}}
+
+
+def transfer(repository, from_location_id, to_location_id, variety, size, quality, kg, day, created_by, note=''):
+    """Μεταφορά kg κιλών (ενός νούμερου ή μιας ποιότητας) από έναν χώρο σε άλλον
+
+    ValueError αν οι χώροι συμπίπτουν, τα κιλά δεν είναι θετικά ή ξεπερνούν
+    το απόθεμα του χώρου προέλευσης.
+    """
+    def check():
+        if from_location_id == to_location_id:
+            raise ValueError("Ο χώρος προέλευσης και προορισμού πρέπει να διαφέρουν")
+        if kg <= 0:
+            raise ValueError("Τα κιλά της μεταφοράς πρέπει να είναι θετικά")
+
+    movement = {
+        'date': str(day), 'type': 'transfer', 'location_id': from_location_id, 'to_location_id': to_location_id,
+        'variety': variety, **_grade_quantities(size, quality, kg), 'kg': kg, 'note': note, 'created_by': created_by,
+    }
+    return _manual(repository, movement, check)
+
+
+def adjust(repository, location_id, variety, size, quality, kg, day, created_by, note=''):
+    """Διόρθωση αποθέματος (π.χ. απογραφή, φύρα) κατά kg κιλά, θετικά ή αρνητικά
+
+    ValueError αν τα κιλά είναι μηδέν ή το απόθεμα θα γινόταν αρνητικό.
+    """
+    def check():
+        if not kg:
+            raise ValueError("Η διόρθωση πρέπει να έχει μη μηδενικά κιλά")
+
+    movement = {
+        'date': str(day), 'type': 'adjustment', 'location_id': location_id,
+        'variety': variety, **_grade_quantities(size, quality, kg), 'kg': kg, 'note': note, 'created_by': created_by,
+    }
+    return _manual(repository, movement, check)
+
+
+if __name__ == '__main__':
+    import argparse
+    from datetime import date
+
+    from .services import open_repository
+
+    parser = argparse.ArgumentParser(description='Καθολικό κινήσεων αποθέματος')
+    commands = parser.add_subparsers(dest='command', required=True)
+    sync_parser = commands.add_parser('sync', help='Κινήσεις για παραλαβές/παραγγελίες που δεν έχουν')
+    sync_parser.add_argument('--force', action='store_true', help='Έλεγχος όλων των εγγραφών ξανά')
+    stock_parser = commands.add_parser('stock', help='Απόθεμα ανά χώρο, ποικιλία, νούμερο και ποιότητα')
+    stock_parser.add_argument('--date', type=date.fromisoformat, help='Απόθεμα στο τέλος της ημερομηνίας')
+    stock_parser.add_argument('--location', type=int, help='Μόνο ένας αποθηκευτικός χώρος')
+    args = parser.parse_args()
+
+    repository = open_repository(write_behind=False)
+    if args.command == 'sync':
+        print(f'{len(sync(repository, force=args.force))} νέες κινήσεις')
+    else:
+        ledger = repository.index('movements', 'ledger')
+        day = args.date.isoformat() if args.date else None
+        for (location_id, variety, size, quality), kg in sorted(ledger.balances(args.location, day).items(), key=str):
+            grade = f'νούμερο {size}' if size else f'ποιότητα {quality}'
+            print(f'{location_id:>4} {variety:<20} {grade:<14} {kg:>12}')
@@ -0,0 +1,135 @@
+"""Αριθμοί LOT παραλαβών και παραγγελιών"""
+from datetime import date, datetime
+
+# Πεδία ημερομηνίας και οντότητας από τα οποία σχηματίζεται το LOT
+LOT_FIELDS = {'receipts': ('receipt_date', 'producer_id'), 'orders': ('date', 'customer_id')}
+
+# Πρόθεμα ανά συλλογή: παραλαβή και παραγγελία με ίδια ημέρα, ίδιο id
+# οντότητας (παραγωγού/πελάτη) και ίδια ποικιλία δεν παίρνουν τον ίδιο LOT
+LOT_PREFIXES = {'receipts': '', 'orders': 'O-'}
+
+
+def generate_lot_number(receipt_date, producer_id, variety, taken=None, prefix=''):
+    """Αυτόματη δημιουργία αριθμού LOT
+
+    Με taken (συνάρτηση LOT -> True αν υπάρχει ήδη) ο αριθμός γίνεται
+    μοναδικός: όταν συμπίπτει (ίδια ημέρα, ίδια οντότητα και ίδια τρία
+    πρώτα γράμματα ποικιλίας) προστίθεται -2, -3, ... Οι παραγγελίες
+    δίνουν prefix=LOT_PREFIXES['orders'].
+    """
+    date_str = receipt_date.strftime("%y%m%d")
+    lot = base = f"{prefix}{date_str}-{producer_id}-{variety[:3].upper()}"
+    suffix = 1
+    while taken is not None and taken(lot):
+        suffix += 1
+        lot = f"{base}-{suffix}"
+    return lot
+
+
+def lot_collection(lot):
+    """Η συλλογή στην οποία ανήκει ένας LOT με βάση το πρόθεμά του
+
+    Οι παλαιότεροι LOT παραγγελιών δεν έχουν πρόθεμα και δίνουν 'receipts'·
+    το trace_lot τους αναζητά τότε και στις παραγγελίες.
+    """
+    for key, prefix in LOT_PREFIXES.items():
+        if prefix and lot.startswith(prefix):
+            return key
+    return 'receipts'
+
+
+def lot_date(lot):
+    """Η ημερομηνία που είναι γραμμένη στον LOT, μετά το πρόθεμα (None αν δεν διαβάζεται)"""
+    try:
+        lot = lot[len(LOT_PREFIXES[lot_collection(lot)]):]
+        return datetime.strptime(lot[:6], "%y%m%d").date()
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def lot_ids(repository, key, lot):
+    """Τα id των εγγραφών με αυτό τον LOT, φορτώνοντας πρώτα τον μήνα του αν είναι ιστορικός"""
+    day = lot_date(lot)
+    if day is not None:
+        repository.load_range(key, day, day)
+    return repository.index(key, 'lots').ids(lot)
+
+
+class LotIndex:
+    """LOT -> id εγγραφών μιας συλλογής (παραλαβών ή παραγγελιών)
+
+    Τα παλαιότερα δεδομένα μπορεί να έχουν τον ίδιο LOT σε πολλές εγγραφές,
+    γι' αυτό κάθε LOT αντιστοιχεί σε λίστα id. Οι νέες εγγραφές παίρνουν
+    μοναδικό LOT μέσω του assign, που δίνεται ως prepare στο upsert του
+    αποθετηρίου ώστε ο έλεγχος να γίνεται υπό το κλείδωμά του.
+    """
+
+    def __init__(self, key):
+        self.date_field, self.entity_field = LOT_FIELDS[key]
+        self.prefix = LOT_PREFIXES[key]
+        self._ids = {}
+
+    def _add(self, record):
+        lot = record.get('lot')
+        if lot:
+            self._ids.setdefault(lot, []).append(record['id'])
+
+    def _remove(self, record):
+        lot = record.get('lot')
+        ids = self._ids.get(lot)
+        if ids and record['id'] in ids:
+            ids.remove(record['id'])
+            if not ids:
+                del self._ids[lot]
+
+    def rebuild(self, items):
+        self._ids = {}
+        for record in items:
+            self._add(record)
+
+    def insert(self, record):
+        self._add(record)
+
+    def update(self, old, new):
+        self._remove(old)
+        self._add(new)
+
+    def delete(self, old):
+        self._remove(old)
+
+    def __contains__(self, lot):
+        return lot in self._ids
+
+    def ids(self, lot):
+        """Τα id των εγγραφών με αυτό τον LOT"""
+        return list(self._ids.get(lot, ()))
+
+    def assign(self, record, current=None, reserved=()):
+        """Η εγγραφή με μοναδικό LOT
+
+        Σε επεξεργασία (current) ο LOT διατηρείται όσο δεν αλλάζουν
+        ημερομηνία, οντότητα και ποικιλία, και όταν είναι παλαιότερος LOT
+        χωρίς το πρόθεμα της συλλογής. reserved είναι LOT που έχουν ήδη
+        δοθεί χωρίς να έχουν καταχωρηθεί ακόμη (π.χ. στην ίδια δέσμη).
+        """
+        day = date.fromisoformat(record[self.date_field])
+        entity_id = record.get(self.entity_field)
+        variety = record.get('variety') or ''
+        bases = {generate_lot_number(day, entity_id, variety, prefix=self.prefix),
+                 generate_lot_number(day, entity_id, variety)}
+        lot = current.get('lot') if current else None
+        if not lot or not any(lot == base or lot.startswith(f'{base}-') for base in bases):
+            lot = generate_lot_number(day, entity_id, variety, lambda lot: lot in self._ids or lot in reserved,
+                                      prefix=self.prefix)
+        return dict(record, lot=lot)
+
+    def assigner(self):
+        """prepare για upsert_many: οι LOT της ίδιας δέσμης μετρούν ως δεσμευμένοι"""
+        reserved = set()
+
+        def assign(record, current):
+            record = self.assign(record, current, reserved)
+            reserved.add(record['lot'])
+            return record
+
+        return assign
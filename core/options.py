@@ -0,0 +1,59 @@
+"""Λίστες επιλογών ("id - όνομα") για τα πεδία επιλογής, ανά έκδοση συλλογής"""
+import threading
+
+SEPARATOR = " - "
+
+
+def option_label(record):
+    return f"{record['id']}{SEPARATOR}{record['name']}"
+
+
+def option_id(label):
+    """Το id από μια ετικέτα "id - όνομα" """
+    return int(label.split(SEPARATOR, 1)[0])
+
+
+def option_name(label):
+    """Το όνομα από μια ετικέτα "id - όνομα" (το όνομα μπορεί να περιέχει " - ")"""
+    return label.split(SEPARATOR, 1)[1]
+
+
+class OptionLists:
+    """Ετικέτες επιλογής και αντιστοίχιση id -> θέση ανά συλλογή
+
+    Οι λίστες χτίζονται μία φορά ανά έκδοση της συλλογής στο αποθετήριο,
+    οπότε ξαναϋπολογίζονται μόνο όταν γραφτεί παραγωγός, πελάτης ή
+    αποθηκευτικός χώρος· οι επανεκτελέσεις των φορμών παίρνουν την ίδια
+    λίστα και βρίσκουν την προεπιλογή με μία αναζήτηση σε λεξικό.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, all_label=None):
+        """(ετικέτες, id -> θέση) για τη συλλογή key
+
+        Με all_label (π.χ. "Όλοι") η πρώτη επιλογή είναι το all_label και
+        οι θέσεις των εγγραφών ξεκινούν από το 1. Οι λίστες είναι κοινές
+        και δεν πρέπει να τροποποιούνται.
+        """
+        version = self.repository.version(key)
+        with self._lock:
+            cached = self._cache.get((key, all_label))
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        labels = [] if all_label is None else [all_label]
+        positions = {}
+        for record in self.repository.view(key):
+            positions[record['id']] = len(labels)
+            labels.append(option_label(record))
+        with self._lock:
+            self._cache[(key, all_label)] = (version, labels, positions)
+        return labels, positions
+
+    def index_of(self, key, record_id, default=0):
+        """Θέση της εγγραφής record_id στη λίστα (default αν δεν υπάρχει)"""
+        return self.get(key)[1].get(record_id, default)
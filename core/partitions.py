@@ -0,0 +1,129 @@
+"""Διαμερίσματα παραλαβών/παραγγελιών ανά μήνα και σεζόν
+
+Η μηχανή αποθήκευσης κρατά κατάλογο (manifest) με το πλήθος εγγραφών ανά
+συλλογή και μήνα ('YYYY-MM'). Το αποθετήριο φορτώνει κατά την εκκίνηση
+μόνο τους μήνες των ενεργών σεζόν (ACTIVE_SEASONS, από την τρέχουσα και
+πίσω)· οι παλαιότεροι μήνες φορτώνονται όταν τους χρειαστεί μια αναφορά
+ή μια επεξεργασία και κρατιούνται σε LRU cache με όριο PARTITION_CACHE
+μήνες. Έτσι μνήμη και χρόνος φόρτωσης εξαρτώνται από την τρέχουσα σεζόν
+και όχι από τα χρόνια του ιστορικού.
+
+Με PRODUCER_ACTIVE_SEASONS=0 φορτώνονται όλα, όπως πριν.
+"""
+import os
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from .constants import SEASON_START_MONTH
+
+# Σεζόν που φορτώνονται πάντα (0: όλο το ιστορικό)
+ACTIVE_SEASONS = int(os.environ.get('PRODUCER_ACTIVE_SEASONS', 1))
+
+# Μέγιστο πλήθος ιστορικών μηνών (όλων των συλλογών) στη μνήμη
+PARTITION_CACHE = int(os.environ.get('PRODUCER_PARTITION_CACHE', 24))
+
+
+def month_of(day):
+    """Ο μήνας ('YYYY-MM') μιας ημερομηνίας (date ή 'YYYY-MM-DD')"""
+    return str(day)[:7]
+
+
+def month_bounds(month):
+    """Πρώτη και τελευταία ημέρα του μήνα σε μορφή ISO"""
+    first = date(int(month[:4]), int(month[5:7]), 1)
+    last = (first + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+    return first.isoformat(), last.isoformat()
+
+
+def months_between(start, end):
+    """Οι μήνες από τον μήνα του start ως τον μήνα του end (συμπεριλαμβάνονται)"""
+    year, month = int(str(start)[:4]), int(str(start)[5:7])
+    last = month_of(end)
+    months = []
+    while f'{year}-{month:02d}' <= last:
+        months.append(f'{year}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def season_of(month):
+    """Το έτος έναρξης της σεζόν στην οποία ανήκει ο μήνας"""
+    year = int(month[:4])
+    return year if int(month[5:7]) >= SEASON_START_MONTH else year - 1
+
+
+def season_label(season):
+    return f'{season}-{(season + 1) % 100:02d}'
+
+
+def season_bounds(season):
+    """Πρώτη και τελευταία ημέρα της σεζόν σε μορφή ISO"""
+    first = date(season, SEASON_START_MONTH, 1)
+    return first.isoformat(), (first.replace(year=season + 1) - timedelta(days=1)).isoformat()
+
+
+def active_start(months, seasons=ACTIVE_SEASONS, today=None):
+    """Η πρώτη ημέρα των ενεργών σεζόν (None: όλοι οι μήνες είναι ενεργοί)
+
+    Τρέχουσα σεζόν είναι αυτή του νεότερου μήνα με εγγραφές, όχι μετά τον
+    σημερινό (μια λάθος μελλοντική ημερομηνία δεν αδειάζει τη μνήμη).
+    """
+    if not seasons or not months:
+        return None
+    current = min(max(months), month_of(today or date.today()))
+    return season_bounds(season_of(current) - seasons + 1)[0]
+
+
+class PartitionCache:
+    """Οι ιστορικοί μήνες που βρίσκονται στη μνήμη, από τον παλαιότερο σε χρήση
+
+    Μετρά επιτυχίες (ο μήνας ήταν ήδη φορτωμένος), αστοχίες και εκτοπίσεις.
+    """
+
+    def __init__(self, capacity=PARTITION_CACHE):
+        self.capacity = capacity
+        self._months = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, partition):
+        return partition in self._months
+
+    def __len__(self):
+        return len(self._months)
+
+    def touch(self, partition):
+        """Σημείωση χρήσης· True αν ο μήνας ήταν ήδη φορτωμένος"""
+        if partition in self._months:
+            self._months.move_to_end(partition)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, partition):
+        self._months[partition] = None
+
+    def evict(self, keep=()):
+        """Οι λιγότερο πρόσφατοι μήνες πέρα από το όριο (εκτός όσων στο keep)"""
+        evicted = []
+        for partition in list(self._months):
+            if len(self._months) <= self.capacity:
+                break
+            if partition not in keep:
+                del self._months[partition]
+                evicted.append(partition)
+        self.evictions += len(evicted)
+        return evicted
+
+    def months(self, key):
+        return sorted(month for collection, month in self._months if collection == key)
+
+    def drop(self, key):
+        """Αφαίρεση όλων των μηνών μιας συλλογής (π.χ. μετά από πλήρη αντικατάστασή της)"""
+        for partition in [partition for partition in self._months if partition[0] == key]:
+            del self._months[partition]
+
+    def clear(self):
+        self._months.clear()
@@ -0,0 +1,354 @@
+"""Ερωτήματα αναφορών: φίλτρα, ομαδοποίηση και πίνακες διασταύρωσης
+
+Τα ερωτήματα τρέχουν πάνω στο στηλοθετημένο είδωλο (ColumnarMirror) κάθε
+συλλογής, χωρίς βρόχους Python ανά εγγραφή. Οι γραμμές φιλτράρονται με
+μάσκες NumPy, κάθε διάσταση ομαδοποίησης γίνεται ακέραιος κωδικός και οι
+κωδικοί συνδυάζονται σε έναν (μικτή βάση), ώστε τα αθροίσματα ανά ομάδα να
+είναι ένα np.bincount ανά μέτρο. Οι στήλες που προκύπτουν από την
+ημερομηνία (εβδομάδα, μήνας, σεζόν) υπολογίζονται μία φορά ανά έκδοση της
+συλλογής.
+
+Παράδειγμα:
+    engine = QueryEngine(repository)
+    engine.run('receipts', group_by=['producer', 'month'], start=date(2025, 10, 1))
+    engine.pivot('receipts', 'producer', 'size', variety='Navel')
+"""
+import threading
+from datetime import date
+
+import numpy as np
+
+from . import timing
+from .columnar import CERT_BITS, date_ordinal
+from .constants import CERTIFICATIONS, QUALITIES, SEASON_START_MONTH, SIZES
+
+# Διαστάσεις ομαδοποίησης και επικεφαλίδες στηλών
+DIMENSIONS = {
+    'producer': 'Παραγωγός',
+    'customer': 'Πελάτης',
+    'variety': 'Ποικιλία',
+    'certification': 'Πιστοποίηση',
+    'paid': 'Πληρώθηκε',
+    'storage': 'Αποθηκευτικός Χώρος',
+    'date': 'Ημερομηνία',
+    'week': 'Εβδομάδα',
+    'month': 'Μήνας',
+    'season': 'Σεζόν',
+}
+
+# Η οντότητα κάθε συλλογής (στήλη entities του ειδώλου) και πού βρίσκονται τα ονόματα
+ENTITY_DIMENSION = {'receipts': 'producer', 'orders': 'customer'}
+NAMED_COLLECTIONS = {'producer': 'producers', 'customer': 'customers', 'storage': 'storage_locations'}
+
+MEASURES = ['count', 'total_kg', 'total_value']
+MEASURE_LABELS = {'count': 'Πλήθος', 'total_kg': 'Σύνολο Κιλών', 'total_value': 'Συνολική Αξία'}
+SIZE_MEASURES = [f'size_{size}' for size in SIZES]
+QUALITY_MEASURES = [f'quality_{quality}' for quality in QUALITIES]
+
+NO_CERTIFICATION = 'Χωρίς πιστοποίηση'
+_EPOCH = date(1970, 1, 1).toordinal()
+
+# Μέγιστο πλήθος συνδυασμών για απευθείας np.bincount· πάνω από αυτό np.unique
+_DENSE_LIMIT = 1 << 22
+
+
+def _values(value):
+    """Ένα φίλτρο δέχεται μία τιμή ή λίστα τιμών"""
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _mask(column, value):
+    values = _values(value)
+    if len(values) == 1:
+        return column == values[0]
+    return np.isin(column, values)
+
+
+class QueryEngine:
+    """Εκτέλεση ερωτημάτων στις παραλαβές και τις παραγγελίες ενός αποθετηρίου"""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def mirror(self, key):
+        return self.repository.index(key, 'columns')
+
+    def dimensions(self, key):
+        """Διαστάσεις που έχουν νόημα για τη συλλογή key"""
+        entity = ENTITY_DIMENSION[key]
+        names = [entity, 'variety', 'certification', 'paid']
+        if self.mirror(key).location_field:
+            names.append('storage')
+        return names + ['date', 'week', 'month', 'season']
+
+    def varieties(self, key):
+        """Ποικιλίες που έχουν καταχωρηθεί στη συλλογή (για λίστες φίλτρων)"""
+        return sorted(value for value in self.mirror(key).variety_values if value)
+
+    # Φίλτρα
+
+    def load(self, key, start=None, end=None):
+        """Φόρτωση των ιστορικών μηνών που χρειάζεται ένα select στο εύρος (τίποτα με πλήρες είδωλο)
+
+        Η φόρτωση αλλάζει την έκδοση της συλλογής, γι' αυτό οι αναφορές την
+        καλούν πριν φτιάξουν το κλειδί της cache τους (core.cache).
+        """
+        if not self.mirror(key).complete:
+            self.repository.load_range(key, start, end)
+
+    def select(self, key, start=None, end=None, producer=None, customer=None, variety=None,
+               certification=None, paid=None, storage=None):
+        """Γραμμές του ειδώλου που ικανοποιούν τα φίλτρα (όχι ταξινομημένες)
+
+        producer/customer/storage είναι id, variety κείμενο, certification
+        όνομα πιστοποίησης και paid 'Ναι'/'Όχι' ή bool. Κάθε φίλτρο δέχεται
+        και λίστα τιμών. Οι ημερομηνίες συμπεριλαμβάνονται.
+        """
+        with timing.span(f'select {key}') as span:
+            mirror = self.mirror(key)
+            # Οι ιστορικοί μήνες του εύρους φορτώνονται (μία φορά) πριν διαβαστεί το είδωλο
+            self.load(key, start, end)
+            if start is None and end is None:
+                rows = mirror.rows()
+            else:
+                rows = mirror.date_index.between(
+                    date_ordinal(start) if start is not None else None,
+                    date_ordinal(end) if end is not None else None
+                )
+            entity = producer if key == 'receipts' else customer
+            if entity is not None:
+                rows = rows[_mask(mirror.entities[rows], entity)]
+            if variety is not None:
+                codes = [mirror.find_variety(v) for v in _values(variety)]
+                rows = rows[_mask(mirror.varieties[rows], codes)]
+            if certification is not None:
+                bits = 0
+                for cert in _values(certification):
+                    bits |= CERT_BITS.get(cert, 0)
+                rows = rows[(mirror.certs[rows] & bits) != 0]
+            if paid is not None:
+                rows = rows[mirror.paid[rows] == (paid in (True, 'Ναι'))]
+            if storage is not None:
+                rows = rows[_mask(mirror.locations[rows], storage)]
+            span.count(rows=len(rows))
+        return rows
+
+    def records(self, key, rows):
+        """Οι εγγραφές των γραμμών με σειρά καταχώρησης"""
+        with timing.span(f'records {key}', rows=len(rows)):
+            return self.mirror(key).records(np.sort(rows))
+
+    # Στήλες από την ημερομηνία, μία φορά ανά έκδοση
+
+    def _derived_column(self, key, name):
+        mirror = self.mirror(key)
+        version = self.repository.version(key)
+        with self._lock:
+            cached = self._derived.get((key, name))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        dates = mirror.dates[:mirror.row_count]
+        if name == 'week':
+            # Το ordinal 1 (1/1/0001) είναι Δευτέρα
+            column = (dates - 1) // 7
+        else:
+            months = (dates.astype('int64') - _EPOCH).astype('datetime64[D]').astype('datetime64[M]').astype('int64')
+            column = months if name == 'month' else (months - (SEASON_START_MONTH - 1)) // 12
+        with self._lock:
+            self._derived[(key, name)] = (version, column)
+        return column
+
+    def _codes(self, key, dimension, rows, cert_codes):
+        """(κωδικοί ≥ 0 για τις γραμμές, πλήθος κωδικών, τιμή του κωδικού 0)"""
+        mirror = self.mirror(key)
+        if dimension == 'certification':
+            return cert_codes, len(CERTIFICATIONS) + 1, 0
+        if dimension == 'variety':
+            return mirror.varieties[rows].astype(np.int64), max(1, len(mirror.variety_values)), 0
+        if dimension == 'paid':
+            return mirror.paid[rows].astype(np.int64), 2, 0
+
+        if dimension in ('producer', 'customer'):
+            if dimension != ENTITY_DIMENSION[key]:
+                raise ValueError(f"Η διάσταση {dimension} δεν υπάρχει στη συλλογή {key}")
+            column = mirror.entities[rows]
+        elif dimension == 'storage':
+            column = mirror.locations[rows]
+        elif dimension == 'date':
+            column = mirror.dates[rows].astype(np.int64)
+        elif dimension in ('week', 'month', 'season'):
+            column = self._derived_column(key, dimension)[rows]
+        else:
+            raise ValueError(f"Άγνωστη διάσταση: {dimension}")
+        low = int(column.min()) if len(column) else 0
+        high = int(column.max()) if len(column) else 0
+        return column - low, high - low + 1, low
+
+    def _labels(self, key, dimension, values):
+        """Ετικέτες για διακριτές τιμές μιας διάστασης (κωδικοί ή id)"""
+        if dimension == 'certification':
+            names = CERTIFICATIONS + [NO_CERTIFICATION]
+            return [names[v] for v in values]
+        if dimension == 'variety':
+            return [self.mirror(key).variety_values[v] for v in values]
+        if dimension == 'paid':
+            return ['Ναι' if v else 'Όχι' for v in values]
+        if dimension in NAMED_COLLECTIONS:
+            return self._names(dimension, values)
+        if dimension == 'date':
+            return [date.fromordinal(v) for v in values]
+        if dimension == 'week':
+            return [date.fromordinal(v * 7 + 1) for v in values]
+        if dimension == 'month':
+            return [f'{1970 + v // 12}-{v % 12 + 1:02d}' for v in values]
+        return [f'{1970 + v}-{(1971 + v) % 100:02d}' for v in values]
+
+    def _expand(self, key, rows, group_by):
+        """Με ομαδοποίηση ανά πιστοποίηση κάθε γραμμή μετρά σε κάθε πιστοποίησή της"""
+        if 'certification' not in group_by:
+            return rows, None
+        mirror = self.mirror(key)
+        # Όταν ζητούνται όλες οι γραμμές, οι θέσεις της μάσκας είναι οι ίδιες οι γραμμές
+        full = len(rows) == mirror.row_count
+        certs = mirror.certs[:mirror.row_count] if full else mirror.certs[rows]
+        masks = [(certs & CERT_BITS[cert]) != 0 for cert in CERTIFICATIONS] + [certs == 0]
+        parts = [np.flatnonzero(mask) if full else rows[mask] for mask in masks]
+        codes = np.repeat(np.arange(len(parts)), [len(part) for part in parts])
+        return np.concatenate(parts), codes
+
+    # Ομαδοποίηση
+
+    def aggregate(self, key, rows, group_by=(), sizes=False, qualities=False):
+        """Αθροίσματα ανά ομάδα ως λεξικό στηλών (πίνακες NumPy)
+
+        rows είναι γραμμές από το select(). Για κάθε διάσταση επιστρέφεται
+        στήλη με την ετικέτα της· για producer/customer/storage και στήλη
+        <διάσταση>_id. Τα μέτρα είναι count, total_kg, total_value και, αν
+        ζητηθούν, size_*/quality_*.
+        """
+        with timing.span(f'aggregate {key}', rows=len(rows)):
+            mirror = self.mirror(key)
+            group_by = list(group_by)
+            rows, cert_codes = self._expand(key, rows, group_by)
+            if cert_codes is None and len(rows) == mirror.row_count:
+                # Όλες οι γραμμές: φέτες των στηλών αντί για αντιγραφή ανά γραμμή
+                rows = slice(0, mirror.row_count)
+            size = mirror.row_count if isinstance(rows, slice) else len(rows)
+
+            combined = np.zeros(size, dtype=np.int64)
+            decoders = []
+            for dimension in group_by:
+                codes, cardinality, low = self._codes(key, dimension, rows, cert_codes)
+                combined = combined * cardinality + codes
+                decoders.append((dimension, cardinality, low))
+
+            if not group_by:
+                groups = np.zeros(1 if size else 0, dtype=np.int64)
+                inverse = np.zeros(size, dtype=np.int64)
+            else:
+                space = 1
+                for _, cardinality, _ in decoders:
+                    space *= cardinality
+                if space <= max(_DENSE_LIMIT, 4 * size):
+                    present = np.bincount(combined, minlength=space) > 0
+                    groups = np.flatnonzero(present)
+                    position = np.zeros(space, dtype=np.int64)
+                    position[groups] = np.arange(len(groups))
+                    inverse = position[combined]
+                else:
+                    groups, inverse = np.unique(combined, return_inverse=True)
+
+            count = len(groups)
+            result = {}
+            remaining = groups
+            decoded = []
+            for dimension, cardinality, low in reversed(decoders):
+                remaining, codes = np.divmod(remaining, cardinality)
+                decoded.append((dimension, codes + low))
+            for dimension, values in reversed(decoded):
+                # Οι ετικέτες φτιάχνονται μία φορά ανά διακριτή τιμή
+                distinct, position = np.unique(values, return_inverse=True)
+                labels = np.empty(len(distinct), dtype=object)
+                labels[:] = self._labels(key, dimension, distinct.tolist())
+                if dimension in NAMED_COLLECTIONS:
+                    result[f'{dimension}_id'] = values
+                result[dimension] = labels[position]
+
+            result['count'] = np.bincount(inverse, minlength=count)
+            result['total_kg'] = np.bincount(inverse, weights=mirror.total_kg[rows], minlength=count)
+            result['total_value'] = np.bincount(inverse, weights=mirror.total_value[rows], minlength=count)
+            if sizes:
+                for j, name in enumerate(SIZE_MEASURES):
+                    weights = mirror.sizes[rows, j]
+                    result[name] = np.bincount(inverse, weights=weights, minlength=count).astype(np.int64)
+            if qualities:
+                for j, name in enumerate(QUALITY_MEASURES):
+                    weights = mirror.qualities[rows, j]
+                    result[name] = np.bincount(inverse, weights=weights, minlength=count).astype(np.int64)
+            return result
+
+    def _names(self, dimension, ids):
+        collection = NAMED_COLLECTIONS[dimension]
+        names = []
+        for record_id in ids:
+            record = self.repository.get(collection, record_id)
+            if record is not None:
+                names.append(record['name'])
+            else:
+                # 0: χωρίς τιμή (π.χ. παραγγελίες χωρίς αποθήκη φόρτωσης)
+                names.append(f'#{record_id}' if record_id else '—')
+        return names
+
+    def entity_totals(self, key, start=None, end=None):
+        """Πλήθος, κιλά και αξία ανά παραγωγό/πελάτη από τα ημερήσια συγκεντρωτικά
+
+        Ίδιες στήλες με το aggregate(key, rows, [οντότητα]), αλλά το κόστος
+        είναι O(ημέρες × κλειδιά) του εύρους και όχι O(εγγραφές). Τα rollups
+        ακολουθούν τους μήνες στη μνήμη, οπότε οι ιστορικοί μήνες του εύρους
+        φορτώνονται πάντα πρώτα (και με πλήρες είδωλο).
+        """
+        dimension = ENTITY_DIMENSION[key]
+        with timing.span(f'entity_totals {key}') as span:
+            self.repository.load_range(key, start, end)
+            totals = self.repository.index(key, 'rollup').totals_by_entity(start, end)
+            # Εγγραφές χωρίς οντότητα (None) έχουν id 0, όπως στο είδωλο
+            ids = sorted(totals, key=lambda entity_id: entity_id or 0)
+            codes = [entity_id or 0 for entity_id in ids]
+            span.count(rows=sum(totals[entity_id]['count'] for entity_id in ids))
+            labels = np.empty(len(ids), dtype=object)
+            labels[:] = self._labels(key, dimension, codes)
+            return {
+                f'{dimension}_id': np.array(codes, dtype=np.int64),
+                dimension: labels,
+                'count': np.array([totals[entity_id]['count'] for entity_id in ids], dtype=np.int64),
+                'total_kg': np.array([totals[entity_id]['total_kg'] for entity_id in ids], dtype=np.float64),
+                'total_value': np.array([totals[entity_id]['total_value'] for entity_id in ids], dtype=np.float64),
+            }
+
+    def run(self, key, group_by=(), sizes=False, qualities=False, **filters):
+        """Αποτέλεσμα ερωτήματος ως pandas DataFrame (μία γραμμή ανά ομάδα)
+
+        Χωρίς group_by επιστρέφεται μία γραμμή με τα συνολικά αθροίσματα
+        (καμία αν δεν ταιριάζει εγγραφή). Τα filters είναι αυτά του select().
+        """
+        import pandas as pd
+
+        rows = self.select(key, **filters)
+        return pd.DataFrame(self.aggregate(key, rows, group_by, sizes, qualities))
+
+    def pivot(self, key, index, columns, value='total_kg', **filters):
+        """Πίνακας διασταύρωσης: γραμμές ανά διάσταση index, στήλες ανά columns
+
+        columns μπορεί να είναι διάσταση ή 'size'/'quality' για ανάλυση σε
+        νούμερα ή ποιότητες (τότε οι τιμές είναι κιλά).
+        """
+        if columns in ('size', 'quality'):
+            frame = self.run(key, [index], sizes=columns == 'size', qualities=columns == 'quality', **filters)
+            measures, labels = (SIZE_MEASURES, SIZES) if columns == 'size' else (QUALITY_MEASURES, QUALITIES)
+            table = frame.set_index(index)[measures]
+            table.columns = labels
+            return table
+        frame = self.run(key, [index, columns], **filters)
+        return frame.pivot_table(index=index, columns=columns, values=value, aggfunc='sum', fill_value=0)
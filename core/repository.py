@@ -0,0 +1,523 @@
+"""Κοινό αποθετήριο δεδομένων στη μνήμη για όλες τις συνεδρίες"""
+import threading
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from .partitions import ACTIVE_SEASONS, PARTITION_CACHE, PartitionCache, active_start, month_bounds, month_of, months_between
+from .storage import COLLECTIONS, DATE_COLUMNS, KEYED_COLLECTIONS, PARTITIONED_COLLECTIONS
+
+
+class ConflictError(Exception):
+    """Η εγγραφή άλλαξε, διαγράφηκε ή δημιουργήθηκε από άλλον χρήστη
+
+    current είναι η τρέχουσα εγγραφή (None αν δεν υπάρχει).
+    """
+
+    def __init__(self, key, record_id, expected, current):
+        self.key = key
+        self.record_id = record_id
+        self.expected = expected
+        self.current = current
+        super().__init__(f'{key} #{record_id}: αναμενόταν έκδοση {expected}, βρέθηκε {record_version(current)}')
+
+
+def record_version(record):
+    """Έκδοση εγγραφής: 0 αν δεν υπάρχει, 1 για εγγραφές χωρίς πεδίο version"""
+    if record is None:
+        return 0
+    return record.get('version', 1)
+
+
+class CollectionView(Sequence):
+    """Προβολή μόνο για ανάγνωση σε συλλογή-λίστα του αποθετηρίου
+
+    Δεν αντιγράφει τα δεδομένα· κάθε πρόσβαση διαβάζει την τρέχουσα
+    κατάσταση, οπότε παραμένει έγκυρη και μετά από επαναφόρτωση.
+    Οι εγγραφές δεν πρέπει να τροποποιούνται επί τόπου.
+    """
+
+    def __init__(self, repository, key):
+        self._repository = repository
+        self._key = key
+
+    def __getitem__(self, index):
+        return self._repository._list(self._key)[index]
+
+    def __len__(self):
+        return len(self._repository._records[self._key])
+
+    def __iter__(self):
+        return iter(self._repository._list(self._key))
+
+    def __bool__(self):
+        return bool(self._repository._records[self._key])
+
+
+class KeyedView(Mapping):
+    """Προβολή μόνο για ανάγνωση σε συλλογή-λεξικό (π.χ. χρήστες)"""
+
+    def __init__(self, repository, key):
+        self._repository = repository
+        self._key = key
+
+    def __getitem__(self, name):
+        return self._repository._records[self._key][name]
+
+    def __len__(self):
+        return len(self._repository._records[self._key])
+
+    def __iter__(self):
+        return iter(self._repository._records[self._key])
+
+
+class Repository:
+    """Μία κοινή εικόνα των δεδομένων ανά διεργασία
+
+    Όλες οι αλλαγές περνούν από εδώ ώστε να ενημερώνονται ταυτόχρονα η
+    μνήμη και η μηχανή αποθήκευσης. Η επαναφόρτωση από τον δίσκο γίνεται
+    μόνο όταν αλλάξει η υπογραφή των αρχείων από άλλη διεργασία.
+
+    Κάθε συλλογή-λίστα κρατιέται ως λεξικό id -> εγγραφή (με σειρά
+    εισαγωγής), οπότε αναζήτηση, ενημέρωση και διαγραφή είναι O(1). Η
+    λίστα για τις προβολές ανανεώνεται τεμπέλικα μόνο μετά από διαγραφή.
+    Τα id δίνονται από αποθηκευμένη αύξουσα ακολουθία ανά συλλογή και δεν
+    επαναχρησιμοποιούνται ποτέ, ακόμη κι αν διαγραφεί η τελευταία εγγραφή.
+
+    Τα ευρετήρια που καταχωρούνται με add_index ενημερώνονται σε κάθε
+    αλλαγή μέσω των μεθόδων rebuild/insert/update/delete.
+
+    Κάθε εγγραφή συλλογής-λίστας έχει version και updated_at. Οι αλλαγές
+    γίνονται υπό το κλείδωμα αρχείου της μηχανής (store.lock()): πρώτα
+    φορτώνονται όσα έγραψαν άλλες διεργασίες και μετά ελέγχεται η
+    αναμενόμενη έκδοση, οπότε δύο ταυτόχρονες επεξεργασίες της ίδιας
+    εγγραφής δίνουν ConflictError αντί να χαθεί σιωπηλά η μία.
+
+    Από τις παραλαβές και τις παραγγελίες φορτώνονται μόνο οι ενεργές
+    σεζόν (core.partitions). Οι παλαιότεροι μήνες μπαίνουν στη μνήμη (και
+    στα ευρετήρια) με load_range ή όταν αλλάζει μια εγγραφή τους, και
+    βγαίνουν όταν ξεπεραστεί το όριο της LRU cache. Το get βρίσκει και
+    εγγραφές που δεν έχουν φορτωθεί, διαβάζοντάς τες από τον δίσκο.
+
+    Με snapshot_dir, τα ευρετήρια που καταχωρούνται με history=True (το
+    στηλοθετημένο είδωλο) χτίζονται από το στιγμιότυπο της συλλογής
+    (core.snapshot) και καλύπτουν όλους τους μήνες· από τη μηχανή
+    διαβάζονται μόνο οι ιστορικοί μήνες που άλλαξαν μετά το στιγμιότυπο.
+    Η φόρτωση και η εκτόπιση μηνών δεν τα αφορά.
+    """
+
+    def __init__(self, store, active_seasons=ACTIVE_SEASONS, partition_cache=PARTITION_CACHE, snapshot_dir=None):
+        self.store = store
+        self.active_seasons = active_seasons
+        self.partition_cache = PartitionCache(partition_cache)
+        self.snapshot_dir = snapshot_dir
+        self._active = {}
+        self._first_month = {}
+        self._bases = {}
+        self._history = {}
+        self._lock = threading.RLock()
+        self._records = {}
+        self._lists = {}
+        self._positions = {}
+        self._sequences = {}
+        self._signature = None
+        self._indexes = {}
+        self._versions = dict.fromkeys(COLLECTIONS, 0)
+        self._views = {
+            key: KeyedView(self, key) if key in KEYED_COLLECTIONS else CollectionView(self, key)
+            for key in COLLECTIONS
+        }
+        self.reload()
+
+    def _set_collection(self, key, value):
+        if key in KEYED_COLLECTIONS:
+            self._records[key] = dict(value)
+            return
+        self._records[key] = {item['id']: item for item in value}
+        self._lists[key] = None
+        self._positions[key] = None
+        stored = int(self.store.get_meta(f'sequence_{key}', 0))
+        if self._active.get(key) is not None:
+            # Τα id των μη φορτωμένων μηνών μετρούν επίσης
+            stored = max(stored, self.store.last_id(key))
+        self._sequences[key] = max([stored, *self._records[key]])
+
+    def _list(self, key):
+        """Η λίστα εγγραφών για θέσεις/φέτες, ξαναχτίζεται μόνο αν χρειαστεί"""
+        items = self._lists.get(key)
+        if items is None:
+            items = self._lists[key] = list(self._records[key].values())
+            self._positions[key] = None
+        return items
+
+    def _position(self, key, record_id):
+        positions = self._positions.get(key)
+        if positions is None:
+            positions = self._positions[key] = {
+                item['id']: i for i, item in enumerate(self._list(key))
+            }
+        return positions[record_id]
+
+    def reload(self):
+        """Πλήρης φόρτωση όλων των συλλογών (των ενεργών σεζόν) από τη μηχανή αποθήκευσης"""
+        with self._lock:
+            self.store.invalidate()
+            self.partition_cache.clear()
+            for key in COLLECTIONS:
+                if key in PARTITIONED_COLLECTIONS:
+                    months = self.store.partitions(key)
+                    self._active[key] = active_start(months, self.active_seasons)
+                    self._first_month[key] = min(months, default=None)
+                    self._bases[key] = self._open_base(key)
+                self._set_collection(key, self.store.load(key, self._active.get(key)))
+                self._versions[key] += 1
+            self._signature = self.store.signature()
+            for key in self._indexes:
+                self._rebuild_indexes(key)
+
+    def refresh(self):
+        """Επαναφόρτωση μόνο αν τα αρχεία άλλαξαν εξωτερικά"""
+        with self._lock:
+            if self.store.signature() != self._signature:
+                self.reload()
+
+    # Διαμερίσματα ανά μήνα
+
+    def active_start(self, key):
+        """Η πρώτη ημερομηνία που είναι πάντα στη μνήμη (None: όλη η συλλογή)"""
+        return self._active.get(key)
+
+    def partitions(self, key):
+        """Κατάλογος μηνών της συλλογής από τη μηχανή: 'YYYY-MM' -> πλήθος εγγραφών"""
+        return self.store.partitions(key)
+
+    def load_range(self, key, start=None, end=None):
+        """Φόρτωση των ιστορικών μηνών που τέμνει το εύρος ημερομηνιών (None: χωρίς όριο)
+
+        Καλείται πριν από αναφορές σε παλαιότερες ημερομηνίες· για εύρος
+        μέσα στις ενεργές σεζόν ή ήδη φορτωμένους μήνες δεν διαβάζει τίποτα.
+        Επιστρέφει το πλήθος των μηνών που διαβάστηκαν από τον δίσκο.
+        """
+        with self._lock:
+            active = self._active.get(key)
+            first = self._first_month.get(key)
+            if active is None or first is None:
+                return 0
+            months = []
+            if start is None or str(start) < active:
+                last = (date.fromisoformat(active) - timedelta(days=1)).isoformat()
+                if end is not None:
+                    last = min(last, str(end))
+                months = months_between(max(first, month_of(start or first)), last)
+            if not months and len(self.partition_cache) <= self.partition_cache.capacity:
+                return 0
+            # Και χωρίς νέους μήνες: όσοι κρατήθηκαν πέρα από το όριο (π.χ. για
+            # αναφορά σε όλο το ιστορικό) εκτοπίζονται τώρα
+            return self._load_partitions(key, months)
+
+    def _load_partitions(self, key, months):
+        """Φόρτωση ιστορικών μηνών και εκτόπιση των λιγότερο πρόσφατων πέρα από το όριο
+
+        Οι μήνες που ζητούνται δεν εκτοπίζονται, ακόμη κι αν ξεπερνούν το
+        όριο. Τα ευρετήρια ενημερώνονται ανά εγγραφή για λίγες εγγραφές
+        (π.χ. ένας μήνας για μια επεξεργασία) και ξαναχτίζονται μία φορά
+        όταν αλλάζει μεγάλο μέρος της συλλογής (π.χ. μια σεζόν για αναφορά).
+        """
+        cache = self.partition_cache
+        loaded = [month for month in months if not cache.touch((key, month))]
+        changes = {}
+        if loaded:
+            records = []
+            for month in loaded:
+                cache.add((key, month))
+                records += self.store.load(key, *month_bounds(month))
+            changes[key] = (records, [])
+            self._first_month[key] = min(self._first_month[key] or loaded[0], loaded[0])
+
+        evicted = {}
+        for evicted_key, month in cache.evict(keep={(key, month) for month in months}):
+            evicted.setdefault(evicted_key, set()).add(month)
+        for evicted_key, evicted_months in evicted.items():
+            column = DATE_COLUMNS[evicted_key]
+            removed = [r for r in self._records[evicted_key].values() if month_of(r[column]) in evicted_months]
+            changes.setdefault(evicted_key, ([], []))[1].extend(removed)
+
+        for changed_key, (added, removed) in changes.items():
+            records = self._records[changed_key]
+            indexes = self._paged(changed_key)
+            incremental = 4 * (len(added) + len(removed)) < len(records)
+            for old in removed:
+                del records[old['id']]
+                if incremental:
+                    for index in indexes:
+                        index.delete(old)
+            for record in added:
+                old = records.get(record['id'])
+                records[record['id']] = record
+                if incremental:
+                    for index in indexes:
+                        if old is None:
+                            index.insert(record)
+                        else:
+                            index.update(old, record)
+            if added:
+                # Οι προβολές με σειρά id, όπως μετά από πλήρη φόρτωση
+                self._records[changed_key] = dict(sorted(records.items()))
+            self._invalidate_lists(changed_key)
+            if not incremental:
+                for index in indexes:
+                    index.rebuild(self._list(changed_key))
+        return len(loaded)
+
+    def _open_base(self, key):
+        """(στιγμιότυπο, stop, stale, εγγραφές μηνών που άλλαξαν) για τα ευρετήρια history, ή None
+
+        Ένα στιγμιότυπο που δεν διαβάζεται αγνοείται: η συλλογή φορτώνεται
+        όπως χωρίς αυτό (python -m core.snapshot verify δείχνει το πρόβλημα).
+        """
+        active = self._active.get(key)
+        if self.snapshot_dir is None or active is None:
+            return None
+        from .snapshot import open_snapshot
+
+        try:
+            snapshot = open_snapshot(self.snapshot_dir, key)
+        except (OSError, ValueError, KeyError):
+            return None
+        if snapshot is None:
+            return None
+        stop, stale, load = snapshot.changes(self.store.partition_stamps(key), active[:7])
+        records = [record for month in load for record in self.store.load(key, *month_bounds(month))]
+        return snapshot, stop, stale, records
+
+    def _paged(self, key):
+        """Τα ευρετήρια που ακολουθούν τους μήνες στη μνήμη (όχι όσα έχουν όλο το ιστορικό)"""
+        history = self._history.get(key, ()) if self._bases.get(key) is not None else ()
+        return [index for name, index in self._indexes.get(key, {}).items() if name not in history]
+
+    def _invalidate_lists(self, key):
+        """Η λίστα των προβολών ξαναχτίζεται στην επόμενη πρόσβαση"""
+        self._lists[key] = None
+        self._positions[key] = None
+        self._versions[key] += 1
+
+    def _page_in(self, key, changes):
+        """Φόρτωση των ιστορικών μηνών που αφορά μια αλλαγή, πριν από τον έλεγχο έκδοσης
+
+        changes: (id, νέα ημερομηνία ή None). Φορτώνεται ο μήνας της νέας
+        ημερομηνίας (για μοναδικό LOT και συνεπή ευρετήρια) και ο μήνας της
+        αποθηκευμένης εγγραφής αν δεν είναι ήδη στη μνήμη.
+        """
+        active = self._active.get(key)
+        if active is None:
+            return
+        months = set()
+        for record_id, day in changes:
+            if day is not None and day < active:
+                months.add(month_of(day))
+            if record_id not in self._records[key] and record_id <= self._sequences[key]:
+                stored = self.store.get(key, record_id)
+                if stored is not None:
+                    months.add(month_of(stored[DATE_COLUMNS[key]]))
+        months = [month for month in months if month < active[:7]]
+        if months:
+            self._load_partitions(key, sorted(months))
+
+    @contextmanager
+    def transaction(self):
+        """Κλείδωμα για αλλαγές που πρέπει να γίνουν μαζί
+
+        Τα upsert/delete μέσα στο with ξαναπαίρνουν τα ίδια κλειδώματα, οπότε
+        ανάμεσά τους δεν παρεμβάλλονται αλλαγές άλλων νημάτων ή διεργασιών
+        (π.χ. η παραλαβή και οι κινήσεις αποθέματος που δημιουργεί).
+        """
+        with self._lock, self.store.lock():
+            self.refresh()
+            yield self
+
+    def add_index(self, key, name, index, history=False):
+        """Καταχώρηση παράγωγου ευρετηρίου για μία συλλογή-λίστα
+
+        history=True: το ευρετήριο έχει attach(στιγμιότυπο, stop, stale,
+        εγγραφές) και χτίζεται από το στιγμιότυπο όταν υπάρχει.
+        """
+        with self._lock:
+            self._indexes.setdefault(key, {})[name] = index
+            if history:
+                self._history.setdefault(key, set()).add(name)
+            self._rebuild_index(key, name, index)
+        return index
+
+    def index(self, key, name):
+        return self._indexes[key][name]
+
+    def _rebuild_indexes(self, key):
+        for name, index in self._indexes.get(key, {}).items():
+            self._rebuild_index(key, name, index)
+
+    def _rebuild_index(self, key, name, index):
+        base = self._bases.get(key)
+        if base is not None and name in self._history.get(key, ()):
+            snapshot, stop, stale, records = base
+            index.attach(snapshot, stop, stale, records + self._list(key))
+        else:
+            index.rebuild(self._list(key))
+
+    def get(self, key, record_id):
+        """Μία εγγραφή με βάση το id της (ή None), και από μήνες που δεν έχουν φορτωθεί"""
+        record = self._records[key].get(record_id)
+        if record is None and self._active.get(key) is not None and record_id <= self._sequences[key]:
+            return self.store.get(key, record_id)
+        return record
+
+    def next_id(self, key):
+        """Το επόμενο id της ακολουθίας (χωρίς να δεσμεύεται)"""
+        return self._sequences[key] + 1
+
+    def version(self, key):
+        """Μετρητής που αυξάνεται σε κάθε αλλαγή της συλλογής"""
+        return self._versions[key]
+
+    def view(self, key):
+        return self._views[key]
+
+    def views(self):
+        return dict(self._views)
+
+    def _written(self, key):
+        # Οι δικές μας εγγραφές αλλάζουν την υπογραφή· δεν χρειάζεται επαναφόρτωση
+        self._signature = self.store.signature()
+        self._versions[key] += 1
+
+    def _advance_sequence(self, key, record_id):
+        if record_id > self._sequences[key]:
+            self._sequences[key] = record_id
+            self.store.set_meta(f'sequence_{key}', record_id)
+
+    def save(self, key, value):
+        """Πλήρης αντικατάσταση μίας συλλογής"""
+        with self._lock, self.store.lock():
+            sequence = self._sequences.get(key, 0)
+            if key in PARTITIONED_COLLECTIONS:
+                # Όλη η νέα συλλογή είναι πλέον στη μνήμη (και το στιγμιότυπο δεν ισχύει)
+                self._active[key] = None
+                self._bases[key] = None
+                self.partition_cache.drop(key)
+            self._set_collection(key, value)
+            if key in KEYED_COLLECTIONS:
+                self.store.save(key, self._records[key])
+            else:
+                self._sequences[key] = max(self._sequences[key], sequence)
+                self.store.set_meta(f'sequence_{key}', self._sequences[key])
+                self.store.save(key, self._list(key))
+            self._written(key)
+            self._rebuild_indexes(key)
+
+    def _upsert_memory(self, key, record):
+        """Ενημέρωση μνήμης και ευρετηρίων για μία εγγραφή συλλογής-λίστας"""
+        record_id = record['id']
+        old = self._records[key].get(record_id)
+        self._records[key][record_id] = record
+        items = self._lists.get(key)
+        if old is None:
+            if items is not None:
+                if self._positions.get(key) is not None:
+                    self._positions[key][record_id] = len(items)
+                items.append(record)
+        elif items is not None:
+            items[self._position(key, record_id)] = record
+        for index in self._indexes.get(key, {}).values():
+            if old is None:
+                index.insert(record)
+            else:
+                index.update(old, record)
+        return old
+
+    def _check(self, key, record_id, expected_version):
+        current = self._records[key].get(record_id)
+        if expected_version is not None and record_version(current) != expected_version:
+            raise ConflictError(key, record_id, expected_version, current)
+        return current
+
+    def _stamp(self, record, current):
+        return dict(
+            record,
+            version=record_version(current) + 1,
+            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+
+    def upsert(self, key, record, record_id=None, expected_version=None, prepare=None):
+        """Εισαγωγή ή ενημέρωση μίας εγγραφής
+
+        Με expected_version (0 για νέα εγγραφή) η αλλαγή απορρίπτεται με
+        ConflictError αν η εγγραφή άλλαξε στο μεταξύ. Το prepare(εγγραφή,
+        τρέχουσα) καλείται υπό το κλείδωμα, μετά τη φόρτωση των αλλαγών
+        άλλων διεργασιών, και επιστρέφει την εγγραφή προς αποθήκευση (π.χ.
+        με μοναδικό LOT) ή σηκώνει εξαίρεση. Επιστρέφει την εγγραφή όπως
+        αποθηκεύτηκε.
+        """
+        with self._lock, self.store.lock():
+            self.refresh()
+            if key in KEYED_COLLECTIONS:
+                self._records[key][record_id] = record
+            else:
+                record_id = record['id']
+                if key in PARTITIONED_COLLECTIONS:
+                    self._page_in(key, [(record_id, record.get(DATE_COLUMNS[key]))])
+                current = self._check(key, record_id, expected_version)
+                if prepare is not None:
+                    record = prepare(record, current)
+                record = self._stamp(record, current)
+                if self._upsert_memory(key, record) is None:
+                    self._advance_sequence(key, record_id)
+            self.store.upsert(key, record_id, record)
+            self._written(key)
+            return record
+
+    def upsert_many(self, key, records, expected_versions=None, prepare=None):
+        """Εισαγωγή ή ενημέρωση πολλών εγγραφών με μία εγγραφή στον δίσκο
+
+        Οι εκδόσεις ελέγχονται για όλες πριν γραφτεί οποιαδήποτε, οπότε οι
+        εγγραφές αποθηκεύονται όλες ή καμία. Το prepare καλείται για κάθε
+        εγγραφή με τη σειρά, όπως στο upsert.
+        """
+        records = list(records)
+        if not records:
+            return []
+        if expected_versions is None:
+            expected_versions = [None] * len(records)
+        with self._lock, self.store.lock():
+            self.refresh()
+            if key in PARTITIONED_COLLECTIONS:
+                self._page_in(key, [(record['id'], record.get(DATE_COLUMNS[key])) for record in records])
+            currents = [
+                self._check(key, record['id'], expected)
+                for record, expected in zip(records, expected_versions)
+            ]
+            if prepare is not None:
+                records = [prepare(record, current) for record, current in zip(records, currents)]
+            records = [self._stamp(record, current) for record, current in zip(records, currents)]
+            self.store.write_batch(key, [(record['id'], record) for record in records])
+            for record in records:
+                self._upsert_memory(key, record)
+            self._advance_sequence(key, max(record['id'] for record in records))
+            self._written(key)
+            return records
+
+    def delete(self, key, record_id, expected_version=None):
+        """Διαγραφή μίας εγγραφής (με έλεγχο έκδοσης όπως στο upsert)"""
+        with self._lock, self.store.lock():
+            self.refresh()
+            if key in PARTITIONED_COLLECTIONS:
+                self._page_in(key, [(record_id, None)])
+            if key not in KEYED_COLLECTIONS:
+                self._check(key, record_id, expected_version)
+            old = self._records[key].pop(record_id, None)
+            if key not in KEYED_COLLECTIONS and old is not None:
+                # Η λίστα των προβολών ξαναχτίζεται στην επόμενη πρόσβαση
+                self._lists[key] = None
+                self._positions[key] = None
+                for index in self._indexes.get(key, {}).values():
+                    index.delete(old)
+            self.store.delete(key, record_id)
+            self._written(key)
@@ -0,0 +1,285 @@
+"""Ημερήσια συγκεντρωτικά (rollups) που ενημερώνονται με διαφορές
+
+Ακολουθούν τους μήνες που έχει στη μνήμη το αποθετήριο, όπως κάθε
+ευρετήριο χωρίς history: η QueryEngine φορτώνει πρώτα τους μήνες του
+εύρους (load_range) και μετά διαβάζει τα σύνολα ανά οντότητα από εδώ.
+
+Εκτέλεση:
+    python -m core.rollups rebuild    # πλήρης υπολογισμός από την αποθήκευση
+    python -m core.rollups check      # σταδιακή ενημέρωση έναντι πλήρους επανυπολογισμού
+"""
+import bisect
+from operator import itemgetter
+
+import numpy as np
+
+from .columnar import date_ordinal
+from .constants import QUALITIES, SIZES
+
+# Θέσεις στο διάνυσμα τιμών κάθε κλειδιού
+COUNT, KG, VALUE = 0, 1, 2
+SIZE_SLICE = slice(3, 3 + len(SIZES))
+QUALITY_SLICE = slice(3 + len(SIZES), 3 + len(SIZES) + len(QUALITIES))
+WIDTH = 3 + len(SIZES) + len(QUALITIES)
+
+# Όλες οι ποσότητες ενός λεξικού με μία κλήση (σε C) όταν υπάρχουν όλα τα κλειδιά
+_SIZE_VALUES = itemgetter(*SIZES)
+_QUALITY_VALUES = itemgetter(*QUALITIES)
+
+
+def _grades(quantities, getter, names):
+    """Οι ποσότητες ανά νούμερο ή ποιότητα με τη σειρά των names (0 όσες λείπουν)"""
+    try:
+        return getter(quantities)
+    except (KeyError, TypeError):
+        return tuple((quantities or {}).get(name, 0) for name in names)
+
+
+class DailyRollup:
+    """Αθροίσματα ανά (ημέρα, οντότητα, ποικιλία, πιστοποιήσεις)
+
+    Κάθε κλειδί κρατά πλήθος, κιλά, αξία και τα διανύσματα νούμερων και
+    ποιοτήτων. Οι πιστοποιήσεις μιας εγγραφής αποτελούν ένα κλειδί
+    (ταξινομημένη πλειάδα) ώστε να μη μετρηθεί η ίδια εγγραφή δύο φορές.
+    Οι αλλαγές εφαρμόζονται ως διαφορές (+παλιά/−νέα), οπότε μια αναφορά
+    αθροίζει O(ημέρες × κλειδιά) γραμμές αντί για O(εγγραφές).
+
+    Κρατιούνται επιπλέον τα σύνολα κάθε οντότητας σε όλες τις ημέρες, οπότε
+    ένα εύρος που καλύπτει τις περισσότερες ημέρες (π.χ. τις ενεργές σεζόν)
+    αθροίζει μόνο τις ημέρες εκτός του εύρους και τις αφαιρεί.
+    """
+
+    def __init__(self, date_field, entity_field, name_field):
+        self.date_field = date_field
+        self.entity_field = entity_field
+        self.name_field = name_field
+        self._days = {}
+        self._sorted_days = []
+        self._entities = {}
+        self.names = {}
+
+    def _key(self, record):
+        return (
+            record.get(self.entity_field),
+            record.get('variety', ''),
+            tuple(sorted(record.get('certifications') or [])),
+        )
+
+    def _vector(self, record):
+        vector = np.zeros(WIDTH, dtype=np.float64)
+        size_quantities = record.get('size_quantities') or {}
+        quality_quantities = record.get('quality_quantities') or {}
+        vector[COUNT] = 1
+        vector[KG] = record.get('total_kg') or 0
+        vector[VALUE] = record.get('total_value') or 0
+        vector[SIZE_SLICE] = [size_quantities.get(size, 0) or 0 for size in SIZES]
+        vector[QUALITY_SLICE] = [quality_quantities.get(quality, 0) or 0 for quality in QUALITIES]
+        return vector
+
+    def _apply(self, record, sign):
+        day = date_ordinal(record[self.date_field])
+        key = self._key(record)
+        vector = sign * self._vector(record)
+        rows = self._days.get(day)
+        if rows is None:
+            rows = self._days[day] = {}
+            bisect.insort(self._sorted_days, day)
+        if key in rows:
+            rows[key] += vector
+        else:
+            rows[key] = vector.copy()
+        entity_id = key[0]
+        if entity_id in self._entities:
+            self._entities[entity_id] += vector
+        else:
+            self._entities[entity_id] = vector
+        if self._entities[entity_id][COUNT] == 0:
+            del self._entities[entity_id]
+        if rows[key][COUNT] == 0:
+            del rows[key]
+            if not rows:
+                del self._days[day]
+                del self._sorted_days[bisect.bisect_left(self._sorted_days, day)]
+        if sign > 0 and record.get(self.entity_field) is not None:
+            self.names[record[self.entity_field]] = record.get(self.name_field, '')
+
+    def rebuild(self, items):
+        """Πλήρης επανυπολογισμός από τις εγγραφές
+
+        Ίδιο αποτέλεσμα με ένα insert ανά εγγραφή, αλλά τα διανύσματα
+        φτιάχνονται ως ένας πίνακας και αθροίζονται ανά κλειδί με np.add.at.
+        """
+        groups = {}
+        positions = []
+        ordinals = {}
+        self.names = {}
+        for record in items:
+            key = self._key(record)
+            text = record[self.date_field]
+            day = ordinals.get(text)
+            if day is None:
+                day = ordinals[text] = date_ordinal(text)
+            positions.append(groups.setdefault((day, key), len(groups)))
+            if key[0] is not None:
+                self.names[key[0]] = record.get(self.name_field, '')
+        sums = np.zeros((len(groups), WIDTH), dtype=np.float64)
+        np.add.at(sums, np.array(positions, dtype=np.int64), self._vectors(items))
+
+        self._days = {}
+        entities = {}
+        for (day, key), vector in zip(groups, sums):
+            self._days.setdefault(day, {})[key] = vector
+            entities.setdefault(key[0], []).append(vector)
+        self._sorted_days = sorted(self._days)
+        self._entities = {entity_id: np.sum(vectors, axis=0) for entity_id, vectors in entities.items()}
+
+    def _vectors(self, items):
+        """Πίνακας len(items) × WIDTH με το διάνυσμα κάθε εγγραφής (όπως το _vector)"""
+        vectors = np.zeros((len(items), WIDTH), dtype=np.float64)
+        vectors[:, COUNT] = 1
+        vectors[:, KG] = [record.get('total_kg') or 0 for record in items]
+        vectors[:, VALUE] = [record.get('total_value') or 0 for record in items]
+        if items:
+            vectors[:, SIZE_SLICE] = [_grades(record.get('size_quantities'), _SIZE_VALUES, SIZES) for record in items]
+            vectors[:, QUALITY_SLICE] = [
+                _grades(record.get('quality_quantities'), _QUALITY_VALUES, QUALITIES) for record in items
+            ]
+            # Κενές τιμές (None) γίνονται NaN στη μετατροπή· μετρούν ως 0 όπως στο _vector
+            np.nan_to_num(vectors, copy=False)
+        return vectors
+
+    def insert(self, record):
+        self._apply(record, 1)
+
+    def update(self, old, new):
+        self._apply(old, -1)
+        self._apply(new, 1)
+
+    def delete(self, old):
+        self._apply(old, -1)
+
+    def _span(self, start=None, end=None):
+        """Οι θέσεις [left, right) των ημερών του εύρους στις ταξινομημένες ημέρες"""
+        left = 0 if start is None else bisect.bisect_left(self._sorted_days, date_ordinal(start))
+        right = len(self._sorted_days) if end is None else bisect.bisect_right(self._sorted_days, date_ordinal(end))
+        return left, right
+
+    def _rows(self, start=None, end=None):
+        left, right = self._span(start, end)
+        for day in self._sorted_days[left:right]:
+            for key, vector in self._days[day].items():
+                yield day, key, vector
+
+    def totals_by_entity(self, start=None, end=None):
+        """Πλήθος, κιλά και αξία ανά οντότητα (παραγωγό ή πελάτη)
+
+        Αθροίζονται οι ημέρες του εύρους ή, αν είναι λιγότερες, αφαιρούνται
+        από τα συνολικά οι ημέρες εκτός εύρους.
+        """
+        left, right = self._span(start, end)
+        if 2 * (right - left) > len(self._sorted_days):
+            totals = {entity_id: vector.copy() for entity_id, vector in self._entities.items()}
+            for day in self._sorted_days[:left] + self._sorted_days[right:]:
+                for (entity_id, variety, certifications), vector in self._days[day].items():
+                    totals[entity_id] -= vector
+            totals = {entity_id: vector for entity_id, vector in totals.items() if vector[COUNT]}
+        else:
+            totals = {}
+            for day in self._sorted_days[left:right]:
+                for (entity_id, variety, certifications), vector in self._days[day].items():
+                    if entity_id in totals:
+                        totals[entity_id] += vector
+                    else:
+                        totals[entity_id] = vector.copy()
+        return {
+            entity_id: {
+                'name': self.names.get(entity_id, 'Άγνωστος'),
+                'count': int(vector[COUNT]),
+                'total_kg': vector[KG],
+                'total_value': vector[VALUE],
+            }
+            for entity_id, vector in totals.items()
+        }
+
+    def summarize(self, start=None, end=None, entity_id=None, variety=None, certification=None):
+        """Συνολικά αθροίσματα με φίλτρα στα πεδία του κλειδιού"""
+        total = np.zeros(WIDTH, dtype=np.float64)
+        for day, key, vector in self._rows(start, end):
+            if entity_id is not None and key[0] != entity_id:
+                continue
+            if variety is not None and key[1] != variety:
+                continue
+            if certification is not None and certification not in key[2]:
+                continue
+            total += vector
+        return {
+            'count': int(total[COUNT]),
+            'total_kg': total[KG],
+            'total_value': total[VALUE],
+            'sizes': dict(zip(SIZES, total[SIZE_SLICE])),
+            'qualities': dict(zip(QUALITIES, total[QUALITY_SLICE])),
+        }
+
+    def snapshot(self):
+        """Όλες οι γραμμές ως λεξικό (ημέρα, κλειδί) -> διάνυσμα"""
+        return {(day, key): vector for day, key, vector in self._rows()}
+
+    def differences(self, other, tolerance=1e-6):
+        """Κλειδιά στα οποία διαφέρουν δύο rollups (κενή λίστα = ίδια)"""
+        mine, theirs = self.snapshot(), other.snapshot()
+        differing = []
+        for key in set(mine) | set(theirs):
+            a = mine.get(key, np.zeros(WIDTH))
+            b = theirs.get(key, np.zeros(WIDTH))
+            if not np.allclose(a, b, atol=tolerance):
+                differing.append(key)
+        for entity_id in set(self._entities) | set(other._entities):
+            a = self._entities.get(entity_id, np.zeros(WIDTH))
+            b = other._entities.get(entity_id, np.zeros(WIDTH))
+            if not np.allclose(a, b, atol=tolerance):
+                differing.append(('σύνολο', entity_id))
+        return differing
+
+
+# Ορισμοί rollups ανά συλλογή: πεδίο ημερομηνίας, οντότητας και ονόματος
+ROLLUPS = {
+    'receipts': ('receipt_date', 'producer_id', 'producer_name'),
+    'orders': ('date', 'customer_id', 'customer'),
+}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from .storage import open_store
+
+    parser = argparse.ArgumentParser(description='Επανυπολογισμός και έλεγχος των ημερήσιων συγκεντρωτικών')
+    parser.add_argument('command', choices=['rebuild', 'check'])
+    args = parser.parse_args()
+
+    store = open_store()
+    failed = False
+    for key, fields in ROLLUPS.items():
+        items = store.load(key)
+        rebuilt = DailyRollup(*fields)
+        rebuilt.rebuild(items)
+        if args.command == 'rebuild':
+            print(f'{key}: {len(rebuilt.snapshot())} γραμμές από {len(items)} εγγραφές')
+            continue
+
+        # Σταδιακή εφαρμογή: κάθε εγγραφή εισάγεται, διαγράφεται και ξαναεισάγεται
+        incremental = DailyRollup(*fields)
+        for record in items:
+            incremental.insert(record)
+            incremental.update(record, record)
+        for record in items[::2]:
+            incremental.delete(record)
+        for record in items[::2]:
+            incremental.insert(record)
+        differing = incremental.differences(rebuilt)
+        if differing:
+            failed = True
+            print(f'{key}: {len(differing)} διαφορές, π.χ. {differing[:5]}')
+        else:
+            print(f'{key}: εντάξει ({len(items)} εγγραφές)')
+    raise SystemExit(1 if failed else 0)
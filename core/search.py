@@ -0,0 +1,258 @@
+"""Αναζήτηση κειμένου σε παραλαβές, παραγγελίες, παραγωγούς και πελάτες
+
+Κάθε συλλογή έχει ένα ανεστραμμένο ευρετήριο (SearchIndex) όρος -> id
+εγγραφής -> βάρος πεδίου, που ενημερώνεται σε κάθε αλλαγή όπως τα άλλα
+ευρετήρια του αποθετηρίου.
+
+Ελληνικά και greeklish γράφονται στην ίδια κανονική μορφή: πεζά, χωρίς
+τόνους και διαλυτικά, μεταγραμμένα σε λατινικά και με τους συνηθισμένους
+διπλούς χαρακτήρες ενοποιημένους ("Παπαδόπουλος", "ΠΑΠΑΔΟΠΟΥΛΟΣ" και
+"Papadopoulos" δίνουν όλα 'papadopulos'). Ο όρος ταιριάζει ακριβώς ή ως
+πρόθεμα (για πληκτρολόγηση), και αν δεν βρεθεί τίποτα με κοινές τριάδες
+χαρακτήρων (για ορθογραφικά λάθη). Όλοι οι όροι του ερωτήματος πρέπει να
+ταιριάζουν· η κατάταξη αθροίζει το βάρος του πεδίου επί την ποιότητα
+της αντιστοίχισης.
+
+Εκτέλεση:
+    python -m core.search "παπαδοπουλος navel" [--limit 20]
+"""
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+# Πεδία ανά συλλογή και βάρος τους στην κατάταξη
+SEARCH_FIELDS = {
+    'receipts': {'lot': 3, 'invoice_ref': 3, 'producer_name': 2, 'variety': 2, 'observations': 1},
+    'orders': {'lot': 3, 'invoice_ref': 3, 'customer': 2, 'variety': 2, 'observations': 1},
+    'producers': {'name': 3, 'phone': 2, 'address': 1, 'certifications': 1},
+    'customers': {'name': 3, 'vat': 3, 'phone': 2, 'email': 2, 'address': 1},
+}
+
+# Ποιότητα αντιστοίχισης: ακριβής όρος, πρόθεμα, κοινές τριάδες (επί την ομοιότητα)
+EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.6
+
+# Όρια ώστε ένα σύντομο πρόθεμα ή ένα λάθος να μην σαρώνει όλο το λεξιλόγιο
+MIN_PREFIX = 2
+MAX_EXPANSIONS = 50
+MIN_SIMILARITY = 0.5
+
+# Ελληνικά γράμματα (και τα τονισμένα, ώστε να μη χρειάζεται NFD) -> λατινικά
+_GREEK = str.maketrans({
+    'α': 'a', 'β': 'v', 'γ': 'g', 'δ': 'd', 'ε': 'e', 'ζ': 'z', 'η': 'i', 'θ': 'q', 'ι': 'i',
+    'κ': 'k', 'λ': 'l', 'μ': 'm', 'ν': 'n', 'ξ': 'x', 'ο': 'o', 'π': 'p', 'ρ': 'r', 'σ': 's',
+    'ς': 's', 'τ': 't', 'υ': 'y', 'φ': 'f', 'χ': 'x', 'ψ': 'ps', 'ω': 'o',
+    'ά': 'a', 'έ': 'e', 'ή': 'i', 'ί': 'i', 'ϊ': 'i', 'ΐ': 'i', 'ό': 'o', 'ύ': 'y', 'ϋ': 'y',
+    'ΰ': 'y', 'ώ': 'o',
+})
+
+# Greeklish -> κανονική μορφή, σε ένα πέρασμα (οι διπλοί χαρακτήρες πριν από τους μονούς)
+_GREEKLISH = {
+    'oy': 'u', 'ou': 'u', 'ay': 'av', 'ey': 'ev', 'au': 'av', 'eu': 'ev', 'ph': 'f', 'ch': 'x',
+    'ks': 'x', 'th': 'q', 'mp': 'b', 'ei': 'i', 'oi': 'i', 'ai': 'e', 'w': 'o', 'y': 'i', 'h': 'i',
+}
+_GREEKLISH_PATTERN = re.compile(r'(?P<initial>\bh)|' + '|'.join(sorted(_GREEKLISH, key=len, reverse=True)))
+
+# Όροι: γράμματα/ψηφία, μαζί με ενωτικά ή κάθετους ανάμεσά τους (LOT, τιμολόγια)
+_TOKEN = re.compile(r'[a-z0-9]+(?:[-/.][a-z0-9]+)*')
+
+
+def _canonical(match):
+    # Αρχικό h είναι συνήθως χ (Haris), αλλού η (kalhmera)
+    return 'x' if match.group('initial') else _GREEKLISH[match.group()]
+
+
+def normalize(text):
+    """Κείμενο στην κανονική μορφή της αναζήτησης"""
+    text = str(text).casefold().translate(_GREEK)
+    if not text.isascii():
+        # Λοιποί τόνοι (π.χ. λατινικά é) ή σπάνιοι συνδυασμοί
+        text = unicodedata.normalize('NFD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c)).translate(_GREEK)
+    return _GREEKLISH_PATTERN.sub(_canonical, text)
+
+
+@lru_cache(maxsize=65536)
+def tokenize(text):
+    """Οι όροι ενός κειμένου (με cache: ονόματα και ποικιλίες επαναλαμβάνονται)"""
+    return tuple(_TOKEN.findall(normalize(text)))
+
+
+def _trigrams(token):
+    padded = f' {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Ανεστραμμένο ευρετήριο μιας συλλογής: όρος -> {id: βάρος}
+
+    Το ταξινομημένο λεξιλόγιο δίνει τα προθέματα με bisect και οι τριάδες
+    χαρακτήρων κρατιούνται μόνο για όρους χωρίς ψηφία (ονόματα, ποικιλίες,
+    παρατηρήσεις), όχι για LOT και αριθμούς τιμολογίων.
+    """
+
+    def __init__(self, key):
+        self.fields = SEARCH_FIELDS[key]
+        self._postings = {}
+        self._vocabulary = []
+        self._trigrams = {}
+
+    def _terms(self, record):
+        terms = {}
+        for field, weight in self.fields.items():
+            value = record.get(field)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = ' '.join(str(v) for v in value)
+            for token in tokenize(value):
+                if weight > terms.get(token, 0):
+                    terms[token] = weight
+        return terms
+
+    def _add(self, record):
+        for token, weight in self._terms(record).items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+                if not any(c.isdigit() for c in token):
+                    for trigram in _trigrams(token):
+                        self._trigrams.setdefault(trigram, set()).add(token)
+            postings[record['id']] = weight
+
+    def _remove(self, record):
+        for token in self._terms(record):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(record['id'], None)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+                for trigram in _trigrams(token):
+                    tokens = self._trigrams.get(trigram)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._trigrams[trigram]
+
+    def rebuild(self, items):
+        self._postings = {}
+        self._trigrams = {}
+        for record in items:
+            for token, weight in self._terms(record).items():
+                self._postings.setdefault(token, {})[record['id']] = weight
+        self._vocabulary = sorted(self._postings)
+        for token in self._vocabulary:
+            if not any(c.isdigit() for c in token):
+                for trigram in _trigrams(token):
+                    self._trigrams.setdefault(trigram, set()).add(token)
+
+    def insert(self, record):
+        self._add(record)
+
+    def update(self, old, new):
+        self._remove(old)
+        self._add(new)
+
+    def delete(self, old):
+        self._remove(old)
+
+    def _expand(self, term):
+        """[(όρος λεξιλογίου, ποιότητα αντιστοίχισης)] για έναν όρο του ερωτήματος"""
+        matches = [(term, EXACT)] if term in self._postings else []
+        if len(term) >= MIN_PREFIX:
+            i = bisect_left(self._vocabulary, term)
+            for token in self._vocabulary[i:i + MAX_EXPANSIONS + 1]:
+                if not token.startswith(term):
+                    break
+                if token != term:
+                    matches.append((token, PREFIX))
+        if matches or any(c.isdigit() for c in term):
+            return matches
+        # Κοινές τριάδες (συντελεστής Dice) μόνο όταν δεν υπάρχει ακριβής/πρόθεμα
+        trigrams = _trigrams(term)
+        counts = {}
+        for trigram in trigrams:
+            for token in self._trigrams.get(trigram, ()):
+                counts[token] = counts.get(token, 0) + 1
+        similar = []
+        for token, common in counts.items():
+            similarity = 2 * common / (len(trigrams) + len(token))
+            if similarity >= MIN_SIMILARITY:
+                similar.append((similarity, token))
+        return [(token, FUZZY * similarity) for similarity, token in heapq.nlargest(MAX_EXPANSIONS, similar)]
+
+    def _scores(self, term):
+        matches = self._expand(term)
+        if len(matches) == 1 and matches[0][1] == EXACT:
+            # Συνηθισμένη περίπτωση: η λίστα του όρου χωρίς αντιγραφή
+            return self._postings[term]
+        scores = {}
+        for token, quality in matches:
+            postings = self._postings[token]
+            if quality != EXACT:
+                postings = {record_id: weight * quality for record_id, weight in postings.items()}
+            # Ένωση με το μέγιστο ανά εγγραφή· ο βρόχος μόνο στις κοινές εγγραφές
+            better = {
+                record_id: postings[record_id] for record_id in scores.keys() & postings.keys()
+                if postings[record_id] > scores[record_id]
+            }
+            scores = {**postings, **scores, **better}
+        return scores
+
+    def query(self, text, limit=None):
+        """[(id, βαθμός)] των εγγραφών που ταιριάζουν σε όλους τους όρους, οι καλύτερες πρώτες
+
+        Σε ισοβαθμία προηγούνται οι νεότερες εγγραφές (μεγαλύτερο id).
+        """
+        scores = None
+        for term in dict.fromkeys(tokenize(text)):
+            term_scores = self._scores(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                small, large = (scores, term_scores) if len(scores) <= len(term_scores) else (term_scores, scores)
+                scores = {record_id: score + large[record_id] for record_id, score in small.items() if record_id in large}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+        # Τα id σε φθίνουσα σειρά και ταξινόμηση (σταθερή) κατά βαθμό με κλειδί σε C
+        ids = sorted(scores, reverse=True)
+        if limit is None:
+            ids.sort(key=scores.get, reverse=True)
+        else:
+            ids = heapq.nlargest(limit, ids, key=scores.get)
+        return [(record_id, scores[record_id]) for record_id in ids]
+
+
+def search(repository, text, keys=tuple(SEARCH_FIELDS), limit=20):
+    """[(συλλογή, εγγραφή, βαθμός)] από όλες τις συλλογές keys, οι καλύτερες πρώτες"""
+    results = [
+        (score, key, record_id)
+        for key in keys
+        for record_id, score in repository.index(key, 'search').query(text, limit)
+    ]
+    return [
+        (key, repository.get(key, record_id), score)
+        for score, key, record_id in heapq.nlargest(limit, results, key=lambda item: item[0])
+    ]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from .services import open_repository
+
+    parser = argparse.ArgumentParser(description='Αναζήτηση σε παραλαβές, παραγγελίες, παραγωγούς και πελάτες')
+    parser.add_argument('text')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    repository = open_repository(write_behind=False)
+    for key, record, score in search(repository, args.text, limit=args.limit):
+        label = record.get('name') or record.get('producer_name') or record.get('customer') or ''
+        print(f'{score:6.2f}  {key:<10} #{record["id"]:<8} {label}  {record.get("lot", "")}')
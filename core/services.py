@@ -0,0 +1,156 @@
+"""Λειτουργίες της εφαρμογής χωρίς εξάρτηση από το Streamlit
+
+Χρησιμοποιούνται από το app.py, τα εργαλεία γραμμής εντολών, εργασίες
+παρτίδας και τα benchmarks, ώστε να μετριέται ακριβώς ό,τι εκτελεί η
+εφαρμογή. Όλες παίρνουν ρητά το αποθετήριο· καμία δεν διαβάζει κατάσταση
+συνεδρίας. Τα ευρετήρια (NumPy) φορτώνονται μόνο όταν δημιουργηθεί
+αποθετήριο, ώστε η εισαγωγή του πακέτου να μην έχει κόστος.
+"""
+from .repository import Repository
+from .storage import DB_FILE, STORAGE_BACKEND, open_store
+from .writer import WRITE_BEHIND, WriteBehindStore
+
+
+def hash_password(password):
+    import hashlib  # ~5 ms (OpenSSL), μόνο κατά τη σύνδεση
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def init_data(store):
+    """Αρχικοποίηση όλων των δεδομένων"""
+    if store.is_empty('users'):
+        users = {
+            'admin': {
+                'password': hash_password('admin123'),
+                'role': 'admin',
+                'full_name': 'Διαχειριστής Συστήματος'
+            }
+        }
+        store.save('users', users)
+
+    if store.is_empty('storage_locations'):
+        storage_locations = [
+            {"id": 1, "name": "Αποθήκη Α", "capacity": 10000, "description": "Κύρια αποθήκη"},
+            {"id": 2, "name": "Αποθήκη Β", "capacity": 5000, "description": "Δευτερεύουσα αποθήκη"}
+        ]
+        store.save('storage_locations', storage_locations)
+
+    # Δειγματικά δεδομένα
+    if store.is_empty('producers'):
+        store.save('producers', [
+            {"id": 1, "name": "Παραγωγός Α", "quantity": 1500, "certifications": ["GlobalGAP"]},
+            {"id": 2, "name": "Παραγωγός Β", "quantity": 2000, "certifications": ["Βιολογικό"]}
+        ])
+
+    if store.is_empty('customers'):
+        store.save('customers', [
+            {"id": 1, "name": "Πελάτης Α", "address": "Διεύθυνση 1", "phone": "2101111111"},
+            {"id": 2, "name": "Πελάτης Β", "address": "Διεύθυνση 2", "phone": "2102222222"}
+        ])
+
+
+def build_repository(store, snapshot_dir=None):
+    """Αποθετήριο με όλα τα ευρετήρια που χρησιμοποιεί η εφαρμογή
+
+    Με snapshot_dir τα στηλοθετημένα είδωλα ξεκινούν από τα στιγμιότυπα
+    (core.snapshot) και έχουν όλο το ιστορικό.
+    """
+    from .columnar import ColumnarMirror
+    from .ledger import StockLedger
+    from .lots import LotIndex
+    from .rollups import ROLLUPS, DailyRollup
+    from .search import SEARCH_FIELDS, SearchIndex
+    from .trace import AllocationGraph
+
+    repository = Repository(store, snapshot_dir=snapshot_dir)
+    repository.add_index('receipts', 'columns', ColumnarMirror('receipt_date', 'producer_id', 'storage_location_id'),
+                         history=True)
+    repository.add_index('orders', 'columns', ColumnarMirror('date', 'customer_id', 'storage_location_id'),
+                         history=True)
+    for key, fields in ROLLUPS.items():
+        repository.add_index(key, 'rollup', DailyRollup(*fields))
+    for key in ('receipts', 'orders'):
+        repository.add_index(key, 'lots', LotIndex(key))
+    repository.add_index('allocations', 'graph', AllocationGraph())
+    repository.add_index('movements', 'ledger', StockLedger())
+    for key in SEARCH_FIELDS:
+        repository.add_index(key, 'search', SearchIndex(key))
+    return repository
+
+
+def open_repository(backend=STORAGE_BACKEND, path=DB_FILE, directory='.', write_behind=WRITE_BEHIND):
+    """Άνοιγμα της αποθήκευσης, αρχικοποίηση και αποθετήριο όπως στην εφαρμογή"""
+    from .snapshot import default_directory
+
+    store = open_store(backend, path=path, directory=directory)
+    init_data(store)
+    if write_behind:
+        store = WriteBehindStore(store)
+    return build_repository(store, default_directory(backend, path, directory))
+
+
+def authenticate(repository, username, password):
+    """Ο χρήστης αν υπάρχει και ο κωδικός είναι σωστός, αλλιώς None"""
+    user = repository.view('users').get(username)
+    if user is None or user['password'] != hash_password(password):
+        return None
+    return user
+
+
+def calculate_totals(size_quantities, quality_quantities, price_per_kg):
+    """(συνολικά κιλά, συνολική αξία) μιας παραλαβής ή παραγγελίας"""
+    total_kg = sum(size_quantities.values()) + sum(quality_quantities.values())
+    total_value = total_kg * price_per_kg if price_per_kg else 0
+    return total_kg, total_value
+
+
+def storage_usage(repository, day=None):
+    """Απόθεμα ανά αποθήκη από το καθολικό κινήσεων, τρέχον ή στο τέλος της day"""
+    ledger = repository.index('movements', 'ledger')
+    totals = ledger.location_totals(day.isoformat() if day is not None else None)
+    usage = {}
+    for location in repository.view('storage_locations'):
+        usage[location['id']] = {
+            'name': location['name'],
+            'capacity': location['capacity'],
+            'used': totals.get(location['id'], 0),
+            'count': ledger.count(location['id'])
+        }
+    return usage
+
+
+def storage_stock(repository, location_id, day=None):
+    """Απόθεμα ενός χώρου ανά ποικιλία και νούμερο/ποιότητα (μόνο τα μη μηδενικά)"""
+    balances = repository.index('movements', 'ledger').balances(location_id, day.isoformat() if day is not None else None)
+    return [
+        {'variety': variety, 'size': size, 'quality': quality, 'kg': kg}
+        for (_, variety, size, quality), kg in sorted(balances.items(), key=str)
+    ]
+
+
+def storage_contents(repository, location_id, offset=0, limit=None):
+    """Κινήσεις ενός αποθηκευτικού χώρου, οι νεότερες πρώτες, ανά σελίδα
+
+    Τα κιλά έχουν πρόσημο ως προς τον χώρο (η μεταφορά είναι αρνητική στον
+    χώρο προέλευσης και θετική στον προορισμό).
+    """
+    from .ledger import MOVEMENT_TYPES, movement_lines
+
+    contents = []
+    for movement in repository.index('movements', 'ledger').movements(location_id, offset, limit):
+        if movement['type'] == 'transfer':
+            other = movement['to_location_id'] if movement['location_id'] == location_id else movement['location_id']
+            reference = f"χώρος #{other}"
+        elif movement.get('source_id') is not None:
+            reference = f"#{movement['source_id']}"
+        else:
+            reference = movement.get('note', '')
+        contents.append({
+            'id': movement['id'],
+            'date': movement['date'],
+            'type': MOVEMENT_TYPES[movement['type']],
+            'variety': movement.get('variety', ''),
+            'kg': sum(kg for key, kg in movement_lines(movement) if key[0] == location_id),
+            'reference': reference,
+        })
+    return contents
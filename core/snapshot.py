@@ -0,0 +1,490 @@
+"""Στηλοθετημένο στιγμιότυπο παραλαβών/παραγγελιών σε αρχεία NumPy (.npy)
+
+Η μηχανή αποθήκευσης (SQLite ή JSON) μένει η πηγή των δεδομένων και η
+μορφή ανταλλαγής και αντιγράφων ασφαλείας. Το στιγμιότυπο είναι αντίγραφό
+της σε στήλες σταθερού πλάτους που ανοίγουν με np.load(mmap_mode=...):
+η εκκίνηση δεν διαβάζει JSON για τους ιστορικούς μήνες και οι σελίδες των
+αρχείων μοιράζονται από όλες τις διεργασίες του Streamlit (όσο καμία δεν
+γράφει σε αυτές· τότε παίρνει δικό της αντίγραφο της σελίδας).
+
+Κάθε πεδίο του σχήματος (SCHEMAS) είναι μία στήλη: ακέραιοι και αριθμοί
+(int64/float64), ημερομηνίες (ordinal, int32), νούμερα και ποιότητες
+(πίνακες N×13 και N×6) και κείμενα ως κωδικοί σε λεξικό τιμών (ονόματα,
+ποικιλίες, LOT κ.λπ. σε UTF-8 με πίνακα θέσεων). Τρεις μάσκες bit ανά
+γραμμή λένε ποια πεδία υπάρχουν, ποια είναι None και ποιοι αριθμοί ήταν
+float, ώστε η εγγραφή να ξαναφτιάχνεται ακριβώς όπως ήταν. Όσες εγγραφές
+δεν χωρούν στο σχήμα (άλλα πεδία, τύποι ή σειρά) κρατιούνται αυτούσιες ως
+JSON στη στήλη 'raw'.
+
+Οι γραμμές είναι ταξινομημένες κατά ημερομηνία, οπότε κάθε μήνας είναι
+μία συνεχής φέτα. Ο κατάλογος ({συλλογή}.json) κρατά για κάθε μήνα το
+stamp της μηχανής (partition_stamps) τη στιγμή της εγγραφής: όσοι μήνες
+άλλαξαν από τότε διαβάζονται από τη μηχανή όπως πριν. Κάθε εγγραφή
+στιγμιοτύπου γράφει νέο φάκελο και αλλάζει ατομικά τον κατάλογο, οπότε
+όσες διεργασίες έχουν ανοιχτό το προηγούμενο συνεχίζουν να το διαβάζουν.
+
+Εκτέλεση:
+    python -m core.snapshot write     # νέο στιγμιότυπο (π.χ. κάθε βράδυ)
+    python -m core.snapshot verify    # σύγκριση εγγραφή προς εγγραφή με τη μηχανή
+    python -m core.snapshot info
+"""
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from operator import itemgetter
+
+import numpy as np
+
+from .constants import QUALITIES, SIZES
+from .journal import atomic_write_json
+from .partitions import month_of
+from .storage import DATE_COLUMNS, DB_FILE, PARTITIONED_COLLECTIONS, STORAGE_BACKEND
+
+# Φάκελος στιγμιοτύπων (προεπιλογή: δίπλα στη βάση ή στα αρχεία JSON)
+SNAPSHOT_DIR = os.environ.get('PRODUCER_SNAPSHOT_DIR')
+
+# Αλλάζει όταν αλλάζει η μορφή των αρχείων· παλαιότερα στιγμιότυπα αγνοούνται
+FORMAT = 1
+
+# Πεδία ανά συλλογή με τη σειρά της εφαρμογής: int, number, date, text, list, sizes, qualities
+SCHEMAS = {
+    'receipts': {
+        'id': 'int', 'receipt_date': 'date', 'producer_id': 'int', 'producer_name': 'text', 'variety': 'text',
+        'lot': 'text', 'storage_location_id': 'int', 'storage_location': 'text', 'size_quantities': 'sizes',
+        'quality_quantities': 'qualities', 'certifications': 'list', 'agreed_price_per_kg': 'number',
+        'total_kg': 'number', 'total_value': 'number', 'paid': 'text', 'invoice_ref': 'text',
+        'observations': 'text', 'created_by': 'text', 'created_at': 'text', 'version': 'int', 'updated_at': 'text',
+    },
+    'orders': {
+        'id': 'int', 'date': 'date', 'customer_id': 'int', 'customer': 'text', 'variety': 'text', 'lot': 'text',
+        'size_quantities': 'sizes', 'quality_quantities': 'qualities', 'executed_quantity': 'number',
+        'storage_location_id': 'int', 'storage_location': 'text', 'agreed_price_per_kg': 'number',
+        'total_kg': 'number', 'total_value': 'number', 'paid': 'text', 'invoice_ref': 'text',
+        'observations': 'text', 'created_by': 'text', 'created_at': 'text', 'version': 'int', 'updated_at': 'text',
+    },
+}
+
+GRADES = {'sizes': SIZES, 'qualities': QUALITIES}
+
+# Διαχωριστικό των στοιχείων λίστας (πιστοποιήσεις) μέσα σε μία τιμή κειμένου
+LIST_SEPARATOR = '\x1f'
+
+_MISSING = object()
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def default_directory(backend=STORAGE_BACKEND, path=DB_FILE, directory='.'):
+    """Ο φάκελος στιγμιοτύπων της βάσης (ή PRODUCER_SNAPSHOT_DIR)"""
+    if SNAPSHOT_DIR:
+        return SNAPSHOT_DIR
+    if backend == 'journal':
+        return os.path.join(directory, 'columns')
+    return f'{path}.columns'
+
+
+class StringTable:
+    """Λεξικό τιμών κειμένου: κωδικός -> κείμενο, από UTF-8 και πίνακα θέσεων
+
+    Οι τιμές αποκωδικοποιούνται όταν ζητηθούν και κρατιούνται σε cache.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+        self._decoded = {}
+
+    @classmethod
+    def build(cls, values):
+        encoded = [value.encode() for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(value) for value in encoded])
+        return cls(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, code):
+        value = self._decoded.get(code)
+        if value is None:
+            value = self._decoded[code] = bytes(self.data[self.offsets[code]:self.offsets[code + 1]]).decode()
+        return value
+
+    def tolist(self):
+        return [self[code] for code in range(len(self))]
+
+    def values(self, codes):
+        """Οι τιμές για πίνακα κωδικών (κάθε διακριτός κωδικός αποκωδικοποιείται μία φορά)"""
+        distinct, position = np.unique(codes, return_inverse=True)
+        table = [self[code] for code in distinct.tolist()]
+        return [table[i] for i in position.tolist()]
+
+
+def _dictionary(values):
+    """(κωδικοί int32, πίνακας τιμών) για λίστα κειμένων"""
+    codes = {}
+    column = np.array([codes.setdefault(value, len(codes)) for value in values], dtype=np.int32)
+    return column, StringTable.build(list(codes))
+
+
+def encode(key, records, capacity=None):
+    """Στήλες (όνομα -> πίνακας) και λεξικά κειμένων για εγγραφές ταξινομημένες κατά ημερομηνία
+
+    Οι στήλες ανά γραμμή έχουν capacity γραμμές (οι επιπλέον είναι μηδενικές
+    και χρησιμεύουν ως χώρος για νέες εγγραφές στο είδωλο). Οι εγγραφές που
+    δεν ξαναφτιάχνονται ακριβώς από τις στήλες γράφονται στη στήλη 'raw'.
+    """
+    fields = SCHEMAS[key]
+    count = len(records)
+    capacity = max(capacity or 0, count)
+    columns = {name: np.zeros(capacity, dtype=np.uint32) for name in ('present', 'nulls', 'floats')}
+    tables = {}
+    invalid = set()
+
+    for bit, (field, kind) in enumerate(fields.items()):
+        flag = np.uint32(1 << bit)
+        values = [record.get(field, _MISSING) for record in records]
+        present = np.array([value is not _MISSING for value in values], dtype=bool)
+        nulls = np.array([value is None for value in values], dtype=bool)
+        columns['present'][:count][present] |= flag
+        columns['nulls'][:count][nulls] |= flag
+        empty = ~present | nulls
+
+        if kind in ('int', 'number', 'date'):
+            if kind == 'int':
+                valid = [type(value) is int for value in values]
+                stored = [value if ok else 0 for value, ok in zip(values, valid)]
+                column = np.zeros(capacity, dtype=np.int64)
+            elif kind == 'number':
+                valid = [type(value) in (int, float) for value in values]
+                stored = [value if ok else 0 for value, ok in zip(values, valid)]
+                column = np.zeros(capacity, dtype=np.float64)
+                floats = np.array([type(value) is float for value in values], dtype=bool)
+                columns['floats'][:count][floats] |= flag
+            else:
+                days = [date.fromisoformat(value) if type(value) is str else None for value in values]
+                valid = [day is not None and day.isoformat() == value for day, value in zip(days, values)]
+                stored = [day.toordinal() if ok else 0 for day, ok in zip(days, valid)]
+                column = np.zeros(capacity, dtype=np.int32)
+            column[:count] = stored
+        elif kind in GRADES:
+            grades = GRADES[kind]
+            valid = [
+                type(value) is dict and list(value) == grades and all(type(v) is int for v in value.values())
+                for value in values
+            ]
+            zeros = [0] * len(grades)
+            column = np.zeros((capacity, len(grades)), dtype=np.int64, order='F')
+            column[:count] = [
+                list(value.values()) if ok
+                # Όπως στο είδωλο: ό,τι λείπει ή δεν είναι αριθμός μετρά 0
+                else [int(value.get(grade, 0) or 0) for grade in grades] if isinstance(value, dict)
+                else zeros
+                for value, ok in zip(values, valid)
+            ]
+        else:
+            if kind == 'list':
+                valid = [
+                    type(value) is list and all(type(v) is str and LIST_SEPARATOR not in v for v in value)
+                    for value in values
+                ]
+                text = [LIST_SEPARATOR.join(value) if ok else '' for value, ok in zip(values, valid)]
+            else:
+                valid = [type(value) is str for value in values]
+                text = [value if ok else '' for value, ok in zip(values, valid)]
+            codes, tables[field] = _dictionary(text)
+            column = np.zeros(capacity, dtype=np.int32)
+            column[:count] = codes
+        columns[field] = column
+        invalid.update(np.flatnonzero(~(np.array(valid, dtype=bool) | empty)).tolist())
+
+    snapshot = ColumnSnapshot(key, columns, tables, count)
+    # Έλεγχος επιστροφής: ό,τι δεν ξαναφτιάχνεται ακριβώς κρατιέται ως JSON. Οι
+    # τύποι ελέγχθηκαν ανά πεδίο, οπότε αρκεί ισότητα και ίδια σειρά πεδίων.
+    decoded = snapshot.records(np.arange(count))
+    raw = [''] * count
+    for row, (record, copy) in enumerate(zip(records, decoded)):
+        if row in invalid or record != copy or list(record) != list(copy):
+            raw[row] = json.dumps(record, ensure_ascii=False)
+    codes, tables['raw'] = _dictionary([''] + raw)
+    columns['raw'] = np.zeros(capacity, dtype=np.int32)
+    columns['raw'][:count] = codes[1:]
+    return columns, tables
+
+
+class ColumnSnapshot:
+    """Οι στήλες ενός στιγμιοτύπου (πίνακες NumPy, συνήθως memory-mapped)
+
+    months: 'YYYY-MM' -> (πρώτη γραμμή, τέλος, stamp της μηχανής).
+    """
+
+    def __init__(self, key, columns, tables, rows, months=None, path=None):
+        self.key = key
+        self.fields = SCHEMAS[key]
+        self.columns = columns
+        self.tables = tables
+        self.rows = rows
+        self.months = months or {}
+        self.path = path
+        self._patterns = {}
+
+    @property
+    def capacity(self):
+        return len(self.columns['id'])
+
+    def column(self, field):
+        return self.columns[field]
+
+    def table(self, field):
+        return self.tables[field]
+
+    def __len__(self):
+        return self.rows
+
+    def changes(self, stamps, before=None):
+        """Τι ισχύει ακόμη για τους μήνες πριν από before ('YYYY-MM', None: όλους)
+
+        stamps είναι τα partition_stamps της μηχανής. Επιστρέφει (stop,
+        stale, load): οι γραμμές [0, stop) καλύπτουν τους μήνες πριν από
+        before, stale είναι οι φέτες (αρχή, τέλος) των μηνών που άλλαξαν
+        από τότε και load οι μήνες που πρέπει να διαβαστούν από τη μηχανή.
+        """
+        stop = self.rows
+        stale = []
+        for month, (start, end, stamp) in self.months.items():
+            if before is not None and month >= before:
+                stop = min(stop, start)
+            elif not self.fresh(month, stamps.get(month)):
+                stale.append((start, end))
+        load = [
+            month for month, stamp in stamps.items()
+            if (before is None or month < before) and not self.fresh(month, stamp)
+        ]
+        return stop, stale, load
+
+    def fresh(self, month, stamp):
+        """Αν ο μήνας υπάρχει στο στιγμιότυπο με το ίδιο stamp (δεν άλλαξε από τότε)"""
+        bounds = self.months.get(month)
+        return bounds is not None and bounds[2] is not None and bounds[2] == stamp
+
+    def _decode(self, field, kind, rows):
+        column = self.columns[field]
+        if kind == 'int':
+            return column[rows].tolist()
+        if kind == 'number':
+            values = column[rows]
+            floats = (self.columns['floats'][rows] & (1 << list(self.fields).index(field))) != 0
+            if floats.all():
+                return values.tolist()
+            ints = values.astype(np.int64).tolist()
+            if not floats.any():
+                return ints
+            return [f if is_float else i for i, f, is_float in zip(ints, values.tolist(), floats.tolist())]
+        if kind == 'date':
+            return (column[rows].astype(np.int64) - _EPOCH).astype('datetime64[D]').astype(str).tolist()
+        if kind in GRADES:
+            grades = GRADES[kind]
+            return [dict(zip(grades, values)) for values in column[rows].tolist()]
+        values = self.tables[field].values(column[rows])
+        if kind == 'list':
+            return [value.split(LIST_SEPARATOR) if value else [] for value in values]
+        return values
+
+    def _pattern(self, present, nulls):
+        """(πεδία, επιλογή τιμών, πεδία με None) για έναν συνδυασμό μασκών"""
+        pattern = self._patterns.get((present, nulls))
+        if pattern is None:
+            positions = [bit for bit in range(len(self.fields)) if present >> bit & 1]
+            names = [list(self.fields)[bit] for bit in positions]
+            select = itemgetter(*positions) if len(positions) > 1 else (lambda values: tuple(values[p] for p in positions))
+            empty = [list(self.fields)[bit] for bit in positions if nulls >> bit & 1]
+            pattern = self._patterns[(present, nulls)] = (names, select, empty)
+        return pattern
+
+    def records(self, rows):
+        """Οι εγγραφές των γραμμών rows, όπως ήταν στη μηχανή αποθήκευσης"""
+        rows = np.asarray(rows, dtype=np.int64)
+        values = zip(*[self._decode(field, kind, rows) for field, kind in self.fields.items()])
+        raw = self.columns.get('raw')
+        raw = self.tables['raw'].values(raw[rows]) if raw is not None else [''] * len(rows)
+        records = []
+        for present, nulls, row_values, text in zip(
+            self.columns['present'][rows].tolist(), self.columns['nulls'][rows].tolist(), values, raw
+        ):
+            if text:
+                records.append(json.loads(text))
+                continue
+            names, select, empty = self._pattern(present, nulls)
+            record = dict(zip(names, select(row_values)))
+            for name in empty:
+                record[name] = None
+            records.append(record)
+        return records
+
+
+def _manifest_path(directory, key):
+    return os.path.join(directory, f'{key}.json')
+
+
+def _save(path, array):
+    with open(path, 'wb') as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_snapshot(store, key, directory):
+    """Νέο στιγμιότυπο της συλλογής key από τη μηχανή αποθήκευσης
+
+    Τα stamps διαβάζονται πριν από τις εγγραφές: αν αλλάξει κάτι στο
+    μεταξύ, ο μήνας φαίνεται αλλαγμένος και διαβάζεται από τη μηχανή.
+    Επιστρέφει το ανοιχτό στιγμιότυπο.
+    """
+    os.makedirs(directory, exist_ok=True)
+    stamps = store.partition_stamps(key)
+    column = DATE_COLUMNS[key]
+    records = sorted(store.iter_records(key), key=lambda record: (record[column], record['id']))
+    count = len(records)
+    columns, tables = encode(key, records, capacity=count + max(1024, count // 4))
+
+    months = {}
+    for row, record in enumerate(records):
+        month = month_of(record[column])
+        if month not in months:
+            months[month] = [row, row, stamps.get(month)]
+        months[month][1] = row + 1
+
+    folder = tempfile.mkdtemp(prefix=f'{key}-', dir=directory)
+    for name, array in columns.items():
+        _save(os.path.join(folder, f'{name}.npy'), array)
+    for name, table in tables.items():
+        _save(os.path.join(folder, f'{name}.offsets.npy'), table.offsets)
+        _save(os.path.join(folder, f'{name}.text.npy'), table.data)
+    atomic_write_json(_manifest_path(directory, key), {
+        'format': FORMAT,
+        'collection': key,
+        'fields': SCHEMAS[key],
+        'folder': os.path.basename(folder),
+        'rows': count,
+        'raw': int(np.count_nonzero(columns['raw'][:count])),
+        'months': months,
+        'written_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    # Τα παλαιότερα αρχεία μένουν προσβάσιμα σε όποια διεργασία τα έχει ήδη ανοιχτά
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith(f'{key}-') and path != folder and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    return open_snapshot(directory, key)
+
+
+def _mapped(path, mode):
+    return np.load(path, mmap_mode=mode).view(np.ndarray)
+
+
+def open_snapshot(directory, key):
+    """Το στιγμιότυπο της συλλογής (None αν δεν υπάρχει ή είναι άλλης μορφής/σχήματος)
+
+    Οι στήλες ανά γραμμή ανοίγουν copy-on-write (mmap_mode='c'), ώστε το
+    είδωλο να τις ενημερώνει επί τόπου χωρίς να αλλάζουν τα αρχεία. Δίνονται
+    ως απλά ndarray (το mmap μένει ως base): η υποκλάση np.memmap κοστίζει σε
+    κάθε δεικτοδότηση.
+    """
+    try:
+        with open(_manifest_path(directory, key), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get('format') != FORMAT or manifest.get('fields') != SCHEMAS[key]:
+        return None
+    folder = os.path.join(directory, manifest['folder'])
+    names = ['present', 'nulls', 'floats', 'raw', *SCHEMAS[key]]
+    columns = {name: _mapped(os.path.join(folder, f'{name}.npy'), 'c') for name in names}
+    tables = {
+        name: StringTable(
+            _mapped(os.path.join(folder, f'{name}.offsets.npy'), 'r'),
+            _mapped(os.path.join(folder, f'{name}.text.npy'), 'r'),
+        )
+        for name, kind in [*SCHEMAS[key].items(), ('raw', 'text')] if kind in ('text', 'list')
+    }
+    months = {month: tuple(bounds) for month, bounds in manifest['months'].items()}
+    return ColumnSnapshot(key, columns, tables, manifest['rows'], months, folder)
+
+
+def verify(store, snapshot):
+    """Σύγκριση του στιγμιοτύπου με τη μηχανή: (εγγραφές ίδιες, διαφορετικές, σε αλλαγμένους μήνες)
+
+    Ελέγχονται μόνο οι μήνες με το ίδιο stamp· όσοι άλλαξαν μετρούν χωριστά.
+    """
+    stamps = store.partition_stamps(snapshot.key)
+    column = DATE_COLUMNS[snapshot.key]
+    ids = snapshot.column('id')[:snapshot.rows]
+    row_of = dict(zip(ids.tolist(), range(snapshot.rows)))
+    same = different = changed = 0
+    batch = []
+
+    def check(batch):
+        decoded = snapshot.records([row_of.get(record['id'], 0) for record in batch])
+        matches = sum(
+            record['id'] in row_of and json.dumps(record, ensure_ascii=False) == json.dumps(copy, ensure_ascii=False)
+            for record, copy in zip(batch, decoded)
+        )
+        return matches, len(batch) - matches
+
+    for record in store.iter_records(snapshot.key):
+        month = month_of(record[column])
+        if not snapshot.fresh(month, stamps.get(month)):
+            changed += 1
+            continue
+        batch.append(record)
+        if len(batch) == 10000:
+            matches, mismatches = check(batch)
+            same, different, batch = same + matches, different + mismatches, []
+    if batch:
+        matches, mismatches = check(batch)
+        same, different = same + matches, different + mismatches
+    return same, different, changed
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from .storage import open_store
+
+    parser = argparse.ArgumentParser(description='Στηλοθετημένο στιγμιότυπο (NumPy) παραλαβών και παραγγελιών')
+    parser.add_argument('command', choices=['write', 'verify', 'info'])
+    parser.add_argument('--backend', choices=['sqlite', 'journal'], default=STORAGE_BACKEND)
+    parser.add_argument('--db', default=DB_FILE, help='Αρχείο βάσης SQLite')
+    parser.add_argument('--dir', default='.', help='Φάκελος με τα αρχεία JSON (μηχανή journal)')
+    parser.add_argument('--out', help='Φάκελος στιγμιοτύπων (προεπιλογή: δίπλα στη βάση)')
+    args = parser.parse_args()
+
+    store = open_store(args.backend, path=args.db, directory=args.dir)
+    directory = args.out or default_directory(args.backend, args.db, args.dir)
+    failed = False
+    for key in PARTITIONED_COLLECTIONS:
+        if args.command == 'write':
+            start = time.perf_counter()
+            snapshot = write_snapshot(store, key, directory)
+            raw = np.count_nonzero(snapshot.column('raw')[:snapshot.rows])
+            print(f'{key:<10} {snapshot.rows:>9} εγγραφές, {raw} ως JSON, '
+                  f'{time.perf_counter() - start:.1f} s -> {snapshot.path}')
+            continue
+        snapshot = open_snapshot(directory, key)
+        if snapshot is None:
+            print(f'{key:<10} χωρίς στιγμιότυπο στο {directory}')
+            failed = failed or args.command == 'verify'
+            continue
+        if args.command == 'verify':
+            same, different, changed = verify(store, snapshot)
+            print(f'{key:<10} {same:>9} ίδιες, {different} διαφορετικές, {changed} σε μήνες που άλλαξαν')
+            failed = failed or different > 0
+        else:
+            stamps = store.partition_stamps(key)
+            stale = [month for month in snapshot.months if not snapshot.fresh(month, stamps.get(month))]
+            size = sum(os.path.getsize(os.path.join(snapshot.path, name)) for name in os.listdir(snapshot.path))
+            print(f'{key:<10} {snapshot.rows:>9} εγγραφές, {len(snapshot.months)} μήνες '
+                  f'({len(stale)} άλλαξαν), {size / 1e6:.1f} MB στο {snapshot.path}')
+    raise SystemExit(1 if failed else 0)
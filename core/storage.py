@@ -0,0 +1,393 @@
+"""Αποθήκευση δεδομένων σε SQLite (WAL) με εγγραφή ανά γραμμή"""
+import json
+import os
+import sqlite3
+import threading
+
+from . import timing
+
+try:
+    import fcntl
+except ImportError:  # Windows: κλείδωμα μόνο μέσα στη διεργασία
+    fcntl = None
+
+DB_FILE = os.environ.get('PRODUCER_DB', 'data.db')
+
+# Μηχανή αποθήκευσης: 'sqlite' ή 'journal' (JSON με ημερολόγιο)
+STORAGE_BACKEND = os.environ.get('PRODUCER_STORAGE', 'sqlite')
+
+# Συλλογές και στήλες με ευρετήριο (εκτός του id που είναι πρωτεύον κλειδί)
+INDEXED_COLUMNS = {
+    'producers': [],
+    'customers': [],
+    'agencies': [],
+    'receipts': ['receipt_date', 'producer_id', 'lot', 'storage_location_id'],
+    'orders': ['date', 'customer_id', 'lot'],
+    'storage_locations': [],
+    # Κατανομές κιλών μιας παραλαβής (LOT) σε παραγγελία
+    'allocations': ['receipt_id', 'order_id'],
+    # Καθολικό κινήσεων αποθέματος (core.ledger)
+    'movements': ['date', 'location_id', 'source_id'],
+}
+
+# Στήλη ημερομηνίας ανά συλλογή
+DATE_COLUMNS = {'receipts': 'receipt_date', 'orders': 'date', 'movements': 'date'}
+
+# Συλλογές χωρισμένες σε μήνες (core.partitions), με κατάλογο εγγραφών ανά μήνα
+PARTITIONED_COLLECTIONS = ['receipts', 'orders']
+
+# Συλλογές που αποθηκεύονται ως λεξικό (κλειδί -> εγγραφή) αντί για λίστα
+KEYED_COLLECTIONS = ['users']
+
+COLLECTIONS = KEYED_COLLECTIONS + list(INDEXED_COLUMNS)
+
+
+class FileLock:
+    """Αποκλειστικό κλείδωμα αρχείου (fcntl.flock) μεταξύ διεργασιών
+
+    Μέσα στη διεργασία μετρά τους κατόχους: το flock κρατιέται όσο
+    τουλάχιστον ένας κάτοχος (από οποιοδήποτε νήμα) το χρειάζεται, ώστε
+    να μπορεί να το αφήσει άλλο νήμα από αυτό που το πήρε. Ο αποκλεισμός
+    μεταξύ νημάτων της ίδιας διεργασίας γίνεται από τα δικά τους locks.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mutex = threading.Lock()
+        self._holders = 0
+        self._fd = None
+
+    def acquire(self):
+        with self._mutex:
+            if self._holders == 0:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+            self._holders += 1
+
+    def release(self):
+        with self._mutex:
+            self._holders -= 1
+            if self._holders == 0:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _encode(record):
+    return json.dumps(record, ensure_ascii=False)
+
+
+def _count_bytes(rows):
+    """Bytes JSON των γραμμών στο ανοιχτό διάστημα χρονομέτρησης (αν υπάρχει)"""
+    span = timing.current()
+    if span is not None:
+        span.count(bytes=sum(len(row[-1].encode()) for row in rows))
+
+
+class SQLiteStore:
+    """Αποθήκη συλλογών σε SQLite: κάθε εγγραφή είναι μία γραμμή"""
+
+    def __init__(self, path=DB_FILE, synchronous='FULL'):
+        self.path = path
+        self.file_lock = FileLock(f'{path}.lock')
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # FULL: fsync του WAL σε κάθε commit· οι εγγραφές ομαδοποιούνται από το writer.py
+        self._conn.execute(f'PRAGMA synchronous={synchronous}')
+        # Το INSERT OR REPLACE ενεργοποιεί και τα triggers διαγραφής του καταλόγου μηνών
+        self._conn.execute('PRAGMA recursive_triggers=ON')
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            for key in KEYED_COLLECTIONS:
+                self._conn.execute(f'CREATE TABLE IF NOT EXISTS {key} (key TEXT PRIMARY KEY, data TEXT NOT NULL)')
+            for key, columns in INDEXED_COLUMNS.items():
+                extra = ''.join(f', {col}' for col in columns)
+                self._conn.execute(f'CREATE TABLE IF NOT EXISTS {key} (id INTEGER PRIMARY KEY{extra}, data TEXT NOT NULL)')
+                for col in columns:
+                    self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{key}_{col} ON {key}({col})')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS partitions (collection TEXT NOT NULL, month TEXT NOT NULL, '
+                'records INTEGER NOT NULL, stamp INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (collection, month))'
+            )
+            if 'stamp' not in self._columns('partitions'):
+                self._add_partition_stamps()
+            for key in PARTITIONED_COLLECTIONS:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f'partitions_{key}_insert',)
+                ).fetchone()
+                if not exists:
+                    self._create_partition_triggers(key)
+
+    def _columns(self, table):
+        return {row[1] for row in self._conn.execute(f'PRAGMA table_info({table})')}
+
+    def _add_partition_stamps(self):
+        """Βάση με κατάλογο μηνών χωρίς stamp: νέα στήλη, και τα triggers ξαναδημιουργούνται"""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            if 'stamp' not in self._columns('partitions'):
+                self._conn.execute('ALTER TABLE partitions ADD COLUMN stamp INTEGER NOT NULL DEFAULT 0')
+                for key in PARTITIONED_COLLECTIONS:
+                    self._conn.execute(f'DROP TRIGGER IF EXISTS partitions_{key}_insert')
+                    self._conn.execute(f'DROP TRIGGER IF EXISTS partitions_{key}_delete')
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def _create_partition_triggers(self, key):
+        """Ο κατάλογος μηνών ενημερώνεται από triggers στην ίδια συναλλαγή με τις εγγραφές
+
+        Κάθε αλλαγή δίνει στον μήνα της νέο stamp, μεγαλύτερο από όλα τα
+        προηγούμενα της βάσης, ώστε ένα στιγμιότυπο (core.snapshot) να
+        ξέρει ποιοι μήνες άλλαξαν από τότε που γράφτηκε. Οι μήνες που
+        αδειάζουν μένουν με 0 εγγραφές για να μη χαθεί το stamp τους.
+        """
+        month = f'substr({{row}}.{DATE_COLUMNS[key]}, 1, 7)'
+        stamp = '(SELECT coalesce(max(stamp), 0) + 1 FROM partitions)'
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS partitions_{key}_insert AFTER INSERT ON {key} BEGIN
+                    INSERT INTO partitions (collection, month, records, stamp)
+                    VALUES ('{key}', {month.format(row='NEW')}, 1, {stamp})
+                    ON CONFLICT (collection, month) DO UPDATE SET records = records + 1, stamp = excluded.stamp;
+                END''')
+            self._conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS partitions_{key}_delete AFTER DELETE ON {key} BEGIN
+                    UPDATE partitions SET records = records - 1, stamp = {stamp}
+                    WHERE collection = '{key}' AND month = {month.format(row='OLD')};
+                END''')
+            # Υπάρχουσα βάση: ο κατάλογος χτίζεται μία φορά από τις εγγραφές
+            self._conn.execute('DELETE FROM partitions WHERE collection = ?', (key,))
+            self._conn.execute(
+                f'INSERT INTO partitions (collection, month, records, stamp) '
+                f'SELECT ?, {month.format(row=key)}, count(*), {stamp} FROM {key} GROUP BY 2',
+                (key,)
+            )
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def _row(self, key, record_id, record):
+        """Τιμές γραμμής για εισαγωγή: κλειδί, στήλες ευρετηρίου, JSON"""
+        columns = INDEXED_COLUMNS.get(key, [])
+        return (record_id, *[record.get(col) for col in columns], _encode(record))
+
+    def _upsert_sql(self, key):
+        if key in KEYED_COLLECTIONS:
+            return f'INSERT OR REPLACE INTO {key} (key, data) VALUES (?, ?)'
+        columns = ['id'] + INDEXED_COLUMNS[key] + ['data']
+        placeholders = ', '.join('?' for _ in columns)
+        return f'INSERT OR REPLACE INTO {key} ({", ".join(columns)}) VALUES ({placeholders})'
+
+    def _pk(self, key):
+        return 'key' if key in KEYED_COLLECTIONS else 'id'
+
+    def _where(self, key, start, end):
+        """Συνθήκη WHERE για εύρος ημερομηνιών (συμπεριλαμβάνονται) και οι παράμετροί της"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append(f'{DATE_COLUMNS[key]} >= ?')
+            params.append(str(start))
+        if end is not None:
+            clauses.append(f'{DATE_COLUMNS[key]} <= ?')
+            params.append(str(end))
+        return (f' WHERE {" AND ".join(clauses)}' if clauses else ''), params
+
+    def load(self, key, start=None, end=None):
+        """Φόρτωση συλλογής (λίστα ή λεξικό για τους χρήστες), προαιρετικά σε εύρος ημερομηνιών"""
+        with self._lock:
+            if key in KEYED_COLLECTIONS:
+                rows = self._conn.execute(f'SELECT key, data FROM {key} ORDER BY rowid').fetchall()
+                return {k: json.loads(data) for k, data in rows}
+            where, params = self._where(key, start, end)
+            rows = self._conn.execute(f'SELECT data FROM {key}{where} ORDER BY id', params).fetchall()
+            return [json.loads(data) for (data,) in rows]
+
+    def get(self, key, record_id):
+        """Μία εγγραφή συλλογής-λίστας από τον δίσκο (ή None)"""
+        with self._lock:
+            row = self._conn.execute(f'SELECT data FROM {key} WHERE id = ?', (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def last_id(self, key):
+        """Το μεγαλύτερο id της συλλογής (0 αν είναι άδεια)"""
+        with self._lock:
+            return self._conn.execute(f'SELECT max(id) FROM {key}').fetchone()[0] or 0
+
+    def partitions(self, key):
+        """Κατάλογος μηνών: 'YYYY-MM' -> πλήθος εγγραφών, με σειρά μηνών"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT month, records FROM partitions WHERE collection = ? AND records > 0 ORDER BY month', (key,)
+            ).fetchall()
+        return dict(rows)
+
+    def partition_stamps(self, key):
+        """'YYYY-MM' -> stamp της τελευταίας αλλαγής του μήνα (ίδιο stamp: ίδιες εγγραφές)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT month, stamp FROM partitions WHERE collection = ? AND records > 0 ORDER BY month', (key,)
+            ).fetchall()
+        return dict(rows)
+
+    def iter_records(self, key, start=None, end=None, batch_size=1000):
+        """Ροή εγγραφών (προαιρετικά σε εύρος ημερομηνιών) χωρίς φόρτωση όλης της συλλογής
+
+        Χρησιμοποιεί ξεχωριστή σύνδεση ώστε η ανάγνωση να μην κρατά το
+        κοινό κλείδωμα όσο διαρκεί η ροή.
+        """
+        where, params = self._where(key, start, end)
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(f'SELECT data FROM {key}{where} ORDER BY id', params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for (data,) in rows:
+                    yield json.loads(data)
+        finally:
+            conn.close()
+
+    def save(self, key, value):
+        """Πλήρης αντικατάσταση συλλογής σε μία συναλλαγή"""
+        if key in KEYED_COLLECTIONS:
+            rows = [self._row(key, k, v) for k, v in value.items()]
+        else:
+            rows = [self._row(key, item['id'], item) for item in value]
+        _count_bytes(rows)
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(f'DELETE FROM {key}')
+                self._conn.executemany(self._upsert_sql(key), rows)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def upsert(self, key, record_id, record):
+        """Εισαγωγή ή ενημέρωση μίας μόνο εγγραφής"""
+        row = self._row(key, record_id, record)
+        _count_bytes([row])
+        with self._lock:
+            self._conn.execute(self._upsert_sql(key), row)
+
+    def write_batch(self, key, upserts, deletes=()):
+        """Πολλές εισαγωγές/ενημερώσεις (id, εγγραφή) και διαγραφές σε μία συναλλαγή"""
+        rows = [self._row(key, record_id, record) for record_id, record in upserts]
+        _count_bytes(rows)
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(self._upsert_sql(key), rows)
+                self._conn.executemany(f'DELETE FROM {key} WHERE {self._pk(key)} = ?', [(i,) for i in deletes])
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def delete(self, key, record_id):
+        """Διαγραφή μίας μόνο εγγραφής"""
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {key} WHERE {self._pk(key)} = ?', (record_id,))
+
+    def is_empty(self, key):
+        with self._lock:
+            return self._conn.execute(f'SELECT 1 FROM {key} LIMIT 1').fetchone() is None
+
+    def signature(self):
+        """Αλλάζει μόνο όταν άλλη σύνδεση/διεργασία γράψει στη βάση"""
+        with self._lock:
+            return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def invalidate(self):
+        pass
+
+    def lock(self):
+        """Κλείδωμα για έλεγχο-και-εγγραφή μεταξύ διεργασιών"""
+        return self.file_lock
+
+    def get_meta(self, name, default=None):
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (name,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, name, value):
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (name, str(value)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_store(backend=STORAGE_BACKEND, path=DB_FILE, directory='.'):
+    """Άνοιγμα της επιλεγμένης μηχανής αποθήκευσης"""
+    if backend == 'journal':
+        from .journal import JournalStore
+        return JournalStore(directory)
+    store = SQLiteStore(path)
+    migrate_json(store, directory)
+    return store
+
+
+def migrate_json(store, directory='.', force=False):
+    """Εφάπαξ εισαγωγή των υπαρχόντων αρχείων *.json στη βάση
+
+    Επιστρέφει λεξικό συλλογή -> πλήθος εγγραφών που εισήχθησαν.
+    """
+    if store.get_meta('json_migrated') and not force:
+        return {}
+
+    imported = {}
+    for key in COLLECTIONS:
+        filename = os.path.join(directory, f'{key}.json')
+        if not os.path.exists(filename):
+            continue
+        with open(filename, 'r', encoding='utf-8') as f:
+            value = json.load(f)
+        store.save(key, value)
+        imported[key] = len(value)
+
+    store.set_meta('json_migrated', 1)
+    return imported
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Μεταφορά των αρχείων JSON στη βάση SQLite και κατάλογος μηνών')
+    parser.add_argument('command', choices=['migrate', 'partitions'])
+    parser.add_argument('--dir', default='.', help='Φάκελος με τα αρχεία *.json')
+    parser.add_argument('--db', default=DB_FILE, help='Αρχείο βάσης SQLite')
+    parser.add_argument('--force', action='store_true', help='Επανάληψη ακόμη κι αν έχει ήδη γίνει')
+    args = parser.parse_args()
+
+    if args.command == 'partitions':
+        store = SQLiteStore(args.db)
+        for key in PARTITIONED_COLLECTIONS:
+            for month, records in store.partitions(key).items():
+                print(f'{key:<10} {month}  {records:>8}')
+    else:
+        result = migrate_json(SQLiteStore(args.db), args.dir, force=args.force)
+        for key, count in result.items():
+            print(f'{key}: {count} εγγραφές')
+        if not result:
+            print('Δεν εισήχθησαν δεδομένα')
@@ -0,0 +1,286 @@
+"""Χρονομέτρηση των εκτελέσεων της εφαρμογής: διαστήματα ανά στάδιο
+
+Κάθε εκτέλεση του script (rerun) καταγράφεται ως Run με τα διαστήματα
+(Span) των σταδίων της: φόρτωση, ενότητα, ερωτήματα, DataFrame,
+αποθήκευση. Κάθε διάστημα κρατά χρόνο, γραμμές που επεξεργάστηκε και bytes
+που γράφτηκαν στον δίσκο. Οι τελευταίες εκτελέσεις μένουν στη μνήμη για το
+πάνελ των διαχειριστών και, αν οριστεί αρχείο, γράφονται μία ανά γραμμή JSON.
+
+Κλειστή (η προεπιλογή) η span() επιστρέφει ένα κοινό κενό αντικείμενο και
+η current() None, οπότε ο κώδικας που χρονομετρείται πληρώνει μία κλήση
+συνάρτησης ανά στάδιο. Ένα διάστημα εκτός εκτέλεσης (π.χ. στο νήμα της
+αποθήκευσης στο παρασκήνιο) καταγράφεται ως χωριστή εκτέλεση.
+
+Ρυθμίσεις: PRODUCER_TIMING=1 την ενεργοποιεί από την εκκίνηση,
+PRODUCER_TIMING_LOG=αρχείο.jsonl γράφει το ημερολόγιο και
+PRODUCER_TIMING_RUNS είναι οι εκτελέσεις που κρατά το πάνελ.
+
+Σύνοψη ημερολογίου:
+    python -m core.timing χρονομέτρηση.jsonl [--section Αναφορές]
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+TIMING = os.environ.get('PRODUCER_TIMING', '0') != '0'
+TIMING_LOG = os.environ.get('PRODUCER_TIMING_LOG')
+TIMING_RUNS = int(os.environ.get('PRODUCER_TIMING_RUNS', 20))
+
+
+class Span:
+    """Ένα στάδιο: όνομα, βάθος, χρόνος (δευτερόλεπτα), γραμμές και bytes"""
+
+    __slots__ = ('name', 'depth', 'offset', 'wall', 'rows', 'bytes', '_timer', '_run', '_start')
+
+    def __init__(self, timer, name, rows=0):
+        self._timer = timer
+        self._run = None
+        self.name = name
+        self.depth = 0
+        self.offset = 0.0
+        self.wall = 0.0
+        self.rows = rows
+        self.bytes = 0
+
+    def count(self, rows=0, bytes=0):
+        self.rows += rows
+        self.bytes += bytes
+
+    def __enter__(self):
+        self._timer._open(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self._start
+        self._timer._close(self)
+        return False
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'depth': self.depth,
+            'offset_ms': round(self.offset * 1000, 3),
+            'ms': round(self.wall * 1000, 3),
+            'rows': self.rows,
+            'bytes': self.bytes,
+        }
+
+
+class _NullSpan:
+    """Το διάστημα όταν η χρονομέτρηση είναι κλειστή: δεν καταγράφει τίποτα"""
+
+    __slots__ = ()
+
+    def count(self, rows=0, bytes=0):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class Run:
+    """Μία εκτέλεση: πότε ξεκίνησε, διάρκεια, στοιχεία (χρήστης, ενότητα) και διαστήματα"""
+
+    def __init__(self, info=None):
+        self.started = time.time()
+        self.wall = 0.0
+        self.info = dict(info or {})
+        self.spans = []
+        self._start = time.perf_counter()
+        self._stack = []
+
+    @property
+    def rows(self):
+        return sum(span.rows for span in self.spans)
+
+    @property
+    def bytes(self):
+        return sum(span.bytes for span in self.spans)
+
+    def as_dict(self):
+        return {
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec='milliseconds'),
+            'ms': round(self.wall * 1000, 3),
+            **self.info,
+            'spans': [span.as_dict() for span in self.spans],
+        }
+
+
+class Timer:
+    """Καταγραφή εκτελέσεων ανά νήμα, με τις τελευταίες runs κοινές για όλες τις συνεδρίες
+
+    Το Streamlit τρέχει το script κάθε συνεδρίας σε δικό του νήμα, οπότε η
+    τρέχουσα εκτέλεση και η στοίβα των ανοιχτών διαστημάτων είναι ανά νήμα.
+    """
+
+    def __init__(self, runs=TIMING_RUNS, log_path=TIMING_LOG):
+        self.log_path = log_path
+        self.last_error = None
+        self._runs = deque(maxlen=runs)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def begin(self, **info):
+        """Έναρξη εκτέλεσης στο τρέχον νήμα (μια ημιτελής προηγούμενη κλείνει πρώτα)"""
+        if getattr(self._local, 'run', None) is not None:
+            self.end(interrupted=True)
+        self._local.run = Run(info)
+        return self._local.run
+
+    def end(self, **info):
+        """Τέλος της εκτέλεσης του νήματος: στις πρόσφατες και στο ημερολόγιο"""
+        run = getattr(self._local, 'run', None)
+        if run is None:
+            return None
+        self._local.run = None
+        run.wall = time.perf_counter() - run._start
+        run.info.update(info)
+        with self._lock:
+            self._runs.append(run)
+            if self.log_path:
+                self._log(run)
+        return run
+
+    def _log(self, run):
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run.as_dict(), ensure_ascii=False) + '\n')
+        except OSError as e:
+            # Η εφαρμογή συνεχίζει· το σφάλμα φαίνεται στο πάνελ
+            self.last_error = f'{type(e).__name__}: {e}'
+        else:
+            self.last_error = None
+
+    def span(self, name, rows=0):
+        return Span(self, name, rows)
+
+    def _open(self, span):
+        run = getattr(self._local, 'run', None)
+        if run is None:
+            run = self.begin(detached=span.name)
+            span._run = run
+        span.depth = len(run._stack)
+        span.offset = time.perf_counter() - run._start
+        run._stack.append(span)
+        run.spans.append(span)
+
+    def _close(self, span):
+        run = getattr(self._local, 'run', None)
+        if run is None:
+            return
+        if run._stack and run._stack[-1] is span:
+            run._stack.pop()
+        if span._run is run:
+            self.end()
+
+    def current(self):
+        """Το εσωτερικότερο ανοιχτό διάστημα του νήματος (ή None)"""
+        run = getattr(self._local, 'run', None)
+        return run._stack[-1] if run is not None and run._stack else None
+
+    def runs(self):
+        """Οι πρόσφατες εκτελέσεις, νεότερη πρώτη"""
+        with self._lock:
+            return list(reversed(self._runs))
+
+
+_timer = Timer() if TIMING else None
+
+
+def enable(runs=TIMING_RUNS, log_path=TIMING_LOG):
+    """Ενεργοποίηση για όλη τη διεργασία (κρατά τις εκτελέσεις αν ήταν ήδη ενεργή)"""
+    global _timer
+    if _timer is None:
+        _timer = Timer(runs, log_path)
+    return _timer
+
+
+def disable():
+    global _timer
+    _timer = None
+
+
+def timer():
+    """Ο ενεργός Timer ή None"""
+    return _timer
+
+
+def span(name, rows=0):
+    """Διάστημα για with: with timing.span('load_data') as span: ... span.count(rows=n)"""
+    if _timer is None:
+        return _NULL
+    return _timer.span(name, rows)
+
+
+def current():
+    """Το ανοιχτό διάστημα του νήματος, για να προσθέσει γραμμές/bytes (None αν κλειστή)"""
+    if _timer is None:
+        return None
+    return _timer.current()
+
+
+def event(name, rows=0):
+    """Στιγμιαίο διάστημα (π.χ. επιτυχία cache) στην τρέχουσα εκτέλεση"""
+    if _timer is not None:
+        with _timer.span(name, rows):
+            pass
+
+
+def begin(**info):
+    if _timer is not None:
+        _timer.begin(**info)
+
+
+def end(**info):
+    if _timer is not None:
+        _timer.end(**info)
+
+
+def summarize(runs):
+    """Σύνοψη ανά όνομα διαστήματος: πλήθος, συνολικά/μέσα/μέγιστα ms, γραμμές, bytes
+
+    runs είναι λεξικά όπως του Run.as_dict() (π.χ. γραμμές του ημερολογίου).
+    """
+    totals = {}
+    for run in runs:
+        for item in run['spans']:
+            total = totals.setdefault(item['name'], {'count': 0, 'ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'bytes': 0})
+            total['count'] += 1
+            total['ms'] += item['ms']
+            total['max_ms'] = max(total['max_ms'], item['ms'])
+            total['rows'] += item['rows']
+            total['bytes'] += item['bytes']
+    for total in totals.values():
+        total['mean_ms'] = total['ms'] / total['count']
+    return dict(sorted(totals.items(), key=lambda item: -item[1]['ms']))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Σύνοψη ημερολογίου χρονομέτρησης (JSONL)')
+    parser.add_argument('log')
+    parser.add_argument('--section', help='Μόνο εκτελέσεις της ενότητας')
+    args = parser.parse_args()
+
+    with open(args.log, 'r', encoding='utf-8') as f:
+        runs = [json.loads(line) for line in f if line.strip()]
+    if args.section:
+        runs = [run for run in runs if run.get('section') == args.section]
+    walls = sorted(run['ms'] for run in runs)
+    if walls:
+        print(f"{len(runs)} εκτελέσεις · διάμεσος {walls[len(walls) // 2]:.1f} ms · μέγιστη {walls[-1]:.1f} ms")
+    print(f"{'διάστημα':<40} {'πλήθος':>7} {'σύνολο ms':>11} {'μέσο ms':>9} {'μέγιστο ms':>11} {'γραμμές':>9} {'bytes':>11}")
+    for name, total in summarize(runs).items():
+        print(f"{name:<40} {total['count']:>7} {total['ms']:>11.1f} {total['mean_ms']:>9.2f} "
+              f"{total['max_ms']:>11.1f} {total['rows']:>9} {total['bytes']:>11}")
@@ -0,0 +1,257 @@
+"""Ιχνηλασιμότητα LOT: από την παραλαβή του παραγωγού στην παραγγελία του πελάτη
+
+Κάθε κατανομή (συλλογή 'allocations') λέει ότι ορισμένα κιλά μιας
+παραλαβής (και του LOT της) φορτώθηκαν σε μια παραγγελία. Το ευρετήριο
+AllocationGraph κρατά τις κατανομές ανά παραλαβή και ανά παραγγελία, και
+τα LotIndex των παραλαβών/παραγγελιών δίνουν τις εγγραφές ενός LOT, οπότε
+η αναζήτηση προς τα εμπρός (LOT παραλαβής -> πελάτες) και προς τα πίσω
+(LOT παραγγελίας -> παραγωγοί) κοστίζει O(μέγεθος αποτελέσματος).
+
+Εκτέλεση:
+    python -m core.trace LOT [-f csv.gz] -o ιχνηλασιμότητα.csv.gz
+    python -m core.trace --producer 12 --date 2025-11-03 -o ανάκληση.xlsx -f xlsx
+"""
+from datetime import datetime
+
+from .lots import lot_collection, lot_date, lot_ids
+
+
+class AllocationGraph:
+    """Κατανομές ανά παραλαβή και ανά παραγγελία, με τα κατανεμημένα κιλά"""
+
+    def __init__(self):
+        self._by_receipt = {}
+        self._by_order = {}
+
+    def _add(self, allocation):
+        self._by_receipt.setdefault(allocation['receipt_id'], {})[allocation['id']] = allocation
+        self._by_order.setdefault(allocation['order_id'], {})[allocation['id']] = allocation
+
+    def _remove(self, allocation):
+        for side, key in ((self._by_receipt, allocation['receipt_id']), (self._by_order, allocation['order_id'])):
+            allocations = side.get(key)
+            if allocations is not None:
+                allocations.pop(allocation['id'], None)
+                if not allocations:
+                    del side[key]
+
+    def rebuild(self, items):
+        self._by_receipt = {}
+        self._by_order = {}
+        for allocation in items:
+            self._add(allocation)
+
+    def insert(self, allocation):
+        self._add(allocation)
+
+    def update(self, old, new):
+        self._remove(old)
+        self._add(new)
+
+    def delete(self, old):
+        self._remove(old)
+
+    def for_receipt(self, receipt_id):
+        return list(self._by_receipt.get(receipt_id, {}).values())
+
+    def for_order(self, order_id):
+        return list(self._by_order.get(order_id, {}).values())
+
+    def allocated_kg(self, receipt_id):
+        """Κιλά της παραλαβής που έχουν ήδη κατανεμηθεί σε παραγγελίες"""
+        return sum(a['kg'] for a in self._by_receipt.get(receipt_id, {}).values())
+
+    def supplied_kg(self, order_id):
+        """Κιλά της παραγγελίας που καλύπτονται από παραλαβές"""
+        return sum(a['kg'] for a in self._by_order.get(order_id, {}).values())
+
+
+def has_allocations(repository, key, record_id):
+    """Αν η παραλαβή ή παραγγελία συμμετέχει σε κατανομές (δεν διαγράφεται τότε)"""
+    graph = repository.index('allocations', 'graph')
+    if key == 'receipts':
+        return bool(graph.for_receipt(record_id))
+    if key == 'orders':
+        return bool(graph.for_order(record_id))
+    return False
+
+
+def same_variety(first, second):
+    """Αν δύο ποικιλίες είναι ίδιες (χωρίς διάκριση πεζών/κεφαλαίων και κενών στα άκρα)"""
+    return (first or '').strip().casefold() == (second or '').strip().casefold()
+
+
+def check_allocations(repository, key, record, current=None):
+    """Έλεγχος αποθήκευσης παραλαβής/παραγγελίας που συμμετέχει σε κατανομές
+
+    ValueError αν τα total_kg πέφτουν κάτω από τα ήδη κατανεμημένα κιλά ή
+    αν η ποικιλία άλλαξε (σε σχέση με την current) και δεν ταιριάζει πλέον
+    με την άλλη πλευρά μιας κατανομής. Καλείται μέσα στο prepare του
+    upsert, υπό το κλείδωμα.
+    """
+    graph = repository.index('allocations', 'graph')
+    if key == 'receipts':
+        allocations, other, other_key = graph.for_receipt(record['id']), 'orders', 'order_id'
+        label, verb = f"Η παραλαβή #{record['id']}", "έχει ήδη κατανεμηθεί"
+    elif key == 'orders':
+        allocations, other, other_key = graph.for_order(record['id']), 'receipts', 'receipt_id'
+        label, verb = f"Η παραγγελία #{record['id']}", "καλύπτεται ήδη από κατανομές"
+    else:
+        return
+    if not allocations:
+        return
+    allocated = sum(a['kg'] for a in allocations)
+    if (record.get('total_kg') or 0) < allocated:
+        raise ValueError(f"{label} {verb} για {allocated} kg· τα κιλά δεν μπορούν να είναι λιγότερα")
+    if current is not None and same_variety(record.get('variety'), current.get('variety')):
+        return
+    for allocation in allocations:
+        counterpart = repository.get(other, allocation[other_key]) or {}
+        if counterpart and not same_variety(record.get('variety'), counterpart.get('variety')):
+            raise ValueError(f"{label} συνδέεται με κατανομή #{allocation['id']} ποικιλίας "
+                             f"{counterpart.get('variety')}· η ποικιλία δεν μπορεί να αλλάξει")
+
+
+def allocate(repository, receipt_id, order_id, kg, created_by):
+    """Καταχώρηση κατανομής kg κιλών της παραλαβής receipt_id στην παραγγελία order_id
+
+    Ο έλεγχος γίνεται υπό το κλείδωμα του αποθετηρίου: ValueError αν λείπει
+    η παραλαβή ή η παραγγελία, αν οι ποικιλίες τους διαφέρουν ή αν τα κιλά
+    ξεπερνούν τα διαθέσιμα της παραλαβής ή τα ακάλυπτα της παραγγελίας.
+    """
+    graph = repository.index('allocations', 'graph')
+
+    def check(allocation, current):
+        receipt = repository.get('receipts', receipt_id)
+        order = repository.get('orders', order_id)
+        if receipt is None:
+            raise ValueError(f"Δεν υπάρχει η παραλαβή #{receipt_id}")
+        if order is None:
+            raise ValueError(f"Δεν υπάρχει η παραγγελία #{order_id}")
+        if kg <= 0:
+            raise ValueError("Τα κιλά της κατανομής πρέπει να είναι θετικά")
+        if not same_variety(receipt.get('variety'), order.get('variety')):
+            raise ValueError(f"Η παραλαβή #{receipt_id} είναι {receipt.get('variety')} ενώ η παραγγελία "
+                             f"#{order_id} είναι {order.get('variety')}")
+        available = receipt['total_kg'] - graph.allocated_kg(receipt_id)
+        if kg > available:
+            raise ValueError(f"Η παραλαβή #{receipt_id} ({receipt.get('lot')}) έχει διαθέσιμα μόνο {available} kg")
+        missing = order['total_kg'] - graph.supplied_kg(order_id)
+        if kg > missing:
+            raise ValueError(f"Η παραγγελία #{order_id} χρειάζεται μόνο {missing} kg ακόμη")
+        return dict(allocation, receipt_lot=receipt.get('lot', ''), order_lot=order.get('lot', ''))
+
+    allocation = {
+        'id': repository.next_id('allocations'),
+        'receipt_id': receipt_id,
+        'order_id': order_id,
+        'kg': kg,
+        'created_by': created_by,
+        'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    return repository.upsert('allocations', allocation, expected_version=0, prepare=check)
+
+
+def trace_row(repository, allocation):
+    """Μία γραμμή της αναφοράς: παραλαβή, κατανομή και παραγγελία"""
+    receipt = repository.get('receipts', allocation['receipt_id']) or {}
+    order = repository.get('orders', allocation['order_id']) or {}
+    return {
+        'allocation_id': allocation['id'],
+        'receipt_id': allocation['receipt_id'],
+        'receipt_lot': receipt.get('lot', allocation.get('receipt_lot')),
+        'receipt_date': receipt.get('receipt_date'),
+        'producer_id': receipt.get('producer_id'),
+        'producer_name': receipt.get('producer_name'),
+        'variety': receipt.get('variety') or order.get('variety'),
+        'kg': allocation['kg'],
+        'order_id': allocation['order_id'],
+        'order_lot': order.get('lot', allocation.get('order_lot')),
+        'order_date': order.get('date'),
+        'customer_id': order.get('customer_id'),
+        'customer': order.get('customer'),
+    }
+
+
+def trace_forward(repository, receipt_ids):
+    """Οι παραγγελίες (και οι πελάτες) που πήραν καρπό από τις παραλαβές receipt_ids"""
+    graph = repository.index('allocations', 'graph')
+    return [
+        trace_row(repository, allocation)
+        for receipt_id in receipt_ids
+        for allocation in graph.for_receipt(receipt_id)
+    ]
+
+
+def trace_backward(repository, order_ids):
+    """Οι παραλαβές (και οι παραγωγοί) από τις οποίες προήλθαν οι παραγγελίες order_ids"""
+    graph = repository.index('allocations', 'graph')
+    return [
+        trace_row(repository, allocation)
+        for order_id in order_ids
+        for allocation in graph.for_order(order_id)
+    ]
+
+
+def load_lot(repository, lot):
+    """Φόρτωση του μήνα ενός LOT σε παραλαβές και παραγγελίες (ό,τι φορτώνει και το trace_lot)"""
+    day = lot_date(lot)
+    if day is not None:
+        for key in ('receipts', 'orders'):
+            repository.load_range(key, day, day)
+
+
+def trace_lot(repository, lot):
+    """Ιχνηλασιμότητα ενός LOT: προς τα εμπρός αν είναι παραλαβής, προς τα πίσω αν είναι παραγγελίας
+
+    Η πλευρά βρίσκεται από το πρόθεμα (lot_collection). Ένας LOT χωρίς
+    πρόθεμα που δεν ανήκει σε παραλαβή είναι παλαιότερος LOT παραγγελίας·
+    αν υπάρχει και στις δύο συλλογές (παλαιά δεδομένα), μετρά η παραλαβή.
+    """
+    if lot_collection(lot) == 'receipts':
+        receipt_ids = lot_ids(repository, 'receipts', lot)
+        if receipt_ids:
+            return trace_forward(repository, receipt_ids)
+    return trace_backward(repository, lot_ids(repository, 'orders', lot))
+
+
+def producer_receipts(repository, producer_id, start, end=None):
+    """Τα id των παραλαβών ενός παραγωγού σε μία ημέρα (ή σε εύρος ημερομηνιών)"""
+    columns = repository.index('receipts', 'columns')
+    if not columns.complete:
+        repository.load_range('receipts', start, end or start)
+    rows = columns.select(start, end or start, entity_id=producer_id)
+    return columns.ids[rows].tolist()
+
+
+def trace_producer(repository, producer_id, start, end=None):
+    """Ποιοι πελάτες πήραν καρπό του παραγωγού στην ημέρα start (ή στο εύρος start-end)"""
+    return trace_forward(repository, producer_receipts(repository, producer_id, start, end))
+
+
+if __name__ == '__main__':
+    import argparse
+    from datetime import date
+
+    from .export import FORMATS, export
+    from .services import open_repository
+
+    parser = argparse.ArgumentParser(description='Αναφορά ιχνηλασιμότητας LOT')
+    parser.add_argument('lot', nargs='?', help='LOT παραλαβής ή παραγγελίας')
+    parser.add_argument('--producer', type=int, help='Παραγωγός (αντί για LOT)')
+    parser.add_argument('--date', type=date.fromisoformat, help='Ημερομηνία παραλαβής για το --producer')
+    parser.add_argument('--end', type=date.fromisoformat, help='Έως ημερομηνία για το --producer')
+    parser.add_argument('-f', '--format', choices=sorted(FORMATS), default='csv.gz')
+    parser.add_argument('-o', '--output', required=True)
+    args = parser.parse_args()
+    if (args.lot is None) == (args.producer is None) or (args.producer is not None and args.date is None):
+        parser.error('δώστε LOT ή --producer μαζί με --date')
+
+    repository = open_repository(write_behind=False)
+    if args.lot is not None:
+        rows = trace_lot(repository, args.lot)
+    else:
+        rows = trace_producer(repository, args.producer, args.date, args.end)
+    with open(args.output, 'wb') as f:
+        export(rows, 'trace', args.format, f)
+    print(f'{len(rows)} κατανομές')
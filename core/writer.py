@@ -0,0 +1,251 @@
+"""Αναβαλλόμενες εγγραφές (write-behind) σε νήμα παρασκηνίου"""
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from . import timing
+
+# Ενεργοποίηση και χρόνος συγκέντρωσης αλλαγών πριν την εγγραφή (δευτερόλεπτα)
+WRITE_BEHIND = os.environ.get('PRODUCER_WRITE_BEHIND', '1') != '0'
+WRITE_DELAY = float(os.environ.get('PRODUCER_WRITE_DELAY', 0.05))
+RETRY_DELAY = 1.0
+
+_DELETED = object()
+
+
+class WriteBehindStore:
+    """Περιτύλιγμα μηχανής αποθήκευσης που γράφει στο παρασκήνιο
+
+    Οι αλλαγές καταγράφονται αμέσως και επιστρέφουν χωρίς αναμονή. Ένα
+    νήμα τις συγκεντρώνει για WRITE_DELAY και τις γράφει με μία εγγραφή
+    ανά συλλογή (write_batch). Πολλές αλλαγές της ίδιας εγγραφής
+    συγχωνεύονται στην τελευταία, και μια πλήρης αποθήκευση συλλογής
+    αντικαθιστά όσες αλλαγές της εκκρεμούν. Η μόνιμη εγγραφή (fsync) την
+    αναλαμβάνει η μηχανή αποθήκευσης.
+
+    Οι αναγνώσεις από τον δίσκο (load, get, iter_records, partitions,
+    get_meta) περιμένουν πρώτα να γραφτούν οι εκκρεμείς αλλαγές. Σε
+    αποτυχία οι αλλαγές παραμένουν σε αναμονή και ξαναδοκιμάζονται· το
+    σφάλμα φαίνεται στο status(). Κατά τον τερματισμό της διεργασίας η ουρά αδειάζει (atexit).
+
+    Το κλείδωμα αρχείου της μηχανής (lock()) δεν αφήνεται στο τέλος της
+    αλλαγής αλλά όταν γραφτεί η παρτίδα της, ώστε άλλες διεργασίες να μη
+    δουν ποτέ δεδομένα στον δίσκο χωρίς τις αλλαγές που περιμένουν εδώ.
+    """
+
+    def __init__(self, store, delay=WRITE_DELAY):
+        self.store = store
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._saves = {}
+        self._changes = {}
+        self._meta = {}
+        self._submitted = 0
+        self._durable = 0
+        self._inflight = 0
+        self._writing = False
+        self._holding = False
+        self._urgent = False
+        self._closed = False
+        self.last_flush = None
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __getattr__(self, name):
+        # signature, invalidate, compact_all κ.λπ. πηγαίνουν κατευθείαν στη μηχανή
+        return getattr(self.store, name)
+
+    @contextmanager
+    def lock(self):
+        """Κλείδωμα για έλεγχο-και-εγγραφή, κρατιέται ως την εγγραφή της παρτίδας"""
+        with self.store.file_lock:
+            yield
+            with self._cond:
+                if (self._pending() or self._writing) and not self._holding:
+                    self.store.file_lock.acquire()
+                    self._holding = True
+
+    def _release(self):
+        # Καλείται υπό self._cond όταν δεν εκκρεμεί τίποτα
+        if self._holding:
+            self._holding = False
+            self.store.file_lock.release()
+
+    def _submit(self):
+        self._submitted += 1
+        self._cond.notify_all()
+
+    def save(self, key, value):
+        with self._cond:
+            self._saves[key] = dict(value) if isinstance(value, dict) else list(value)
+            self._changes.pop(key, None)
+            self._submit()
+
+    def upsert(self, key, record_id, record):
+        with self._cond:
+            self._changes.setdefault(key, {})[record_id] = record
+            self._submit()
+
+    def write_batch(self, key, upserts, deletes=()):
+        with self._cond:
+            changes = self._changes.setdefault(key, {})
+            for record_id, record in upserts:
+                changes[record_id] = record
+            for record_id in deletes:
+                changes[record_id] = _DELETED
+            self._submit()
+
+    def delete(self, key, record_id):
+        with self._cond:
+            self._changes.setdefault(key, {})[record_id] = _DELETED
+            self._submit()
+
+    def set_meta(self, name, value):
+        with self._cond:
+            self._meta[name] = value
+            self._submit()
+
+    def get_meta(self, name, default=None):
+        self.flush()
+        return self.store.get_meta(name, default)
+
+    def load(self, key, start=None, end=None):
+        self.flush()
+        return self.store.load(key, start, end)
+
+    def get(self, key, record_id):
+        """Μία εγγραφή: από τις εκκρεμείς αλλαγές αν υπάρχει εκεί, αλλιώς από τον δίσκο"""
+        with self._cond:
+            record = self._changes.get(key, {}).get(record_id)
+            if record is not None and key not in self._saves:
+                return None if record is _DELETED else record
+        self.flush()
+        return self.store.get(key, record_id)
+
+    def last_id(self, key):
+        self.flush()
+        return self.store.last_id(key)
+
+    def partitions(self, key):
+        self.flush()
+        return self.store.partitions(key)
+
+    def partition_stamps(self, key):
+        self.flush()
+        return self.store.partition_stamps(key)
+
+    def iter_records(self, key, start=None, end=None):
+        self.flush()
+        return self.store.iter_records(key, start, end)
+
+    def is_empty(self, key):
+        self.flush()
+        return self.store.is_empty(key)
+
+    def _pending(self):
+        return bool(self._saves or self._changes or self._meta)
+
+    def _queued(self):
+        """Πλήθος εγγραφών/συλλογών σε αναμονή (χωρίς τα μεταδεδομένα)"""
+        return len(self._saves) + sum(len(items) for items in self._changes.values())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending() or self._closed)
+                if not self._pending():
+                    return
+                # Συγκέντρωση διαδοχικών αλλαγών, εκτός αν ζητήθηκε flush
+                self._cond.wait_for(lambda: self._urgent or self._closed, timeout=self.delay)
+                self._urgent = False
+                self._inflight = self._queued()
+                self._writing = True
+                saves, changes, meta = self._saves, self._changes, self._meta
+                self._saves, self._changes, self._meta = {}, {}, {}
+                target = self._submitted
+            try:
+                self._write(saves, changes, meta)
+            except Exception as e:
+                self._requeue(saves, changes, meta, e)
+                if self._closed:
+                    # Τερματισμός: οι αλλαγές δεν γράφτηκαν, το σφάλμα μένει στο status()
+                    return
+                time.sleep(RETRY_DELAY)
+                continue
+            with self._cond:
+                self._durable = target
+                self._inflight = 0
+                self._writing = False
+                self.last_flush = time.time()
+                self.last_error = None
+                if not self._pending():
+                    self._release()
+                self._cond.notify_all()
+
+    def _write(self, saves, changes, meta):
+        # Στο νήμα του παρασκηνίου κάθε παρτίδα καταγράφεται ως χωριστή εκτέλεση
+        rows = sum(len(value) for value in saves.values()) + sum(len(items) for items in changes.values())
+        with timing.span('write-behind', rows=rows):
+            for key, value in saves.items():
+                self.store.save(key, value)
+            for key, items in changes.items():
+                upserts = [(record_id, record) for record_id, record in items.items() if record is not _DELETED]
+                deletes = [record_id for record_id, record in items.items() if record is _DELETED]
+                self.store.write_batch(key, upserts, deletes)
+            for name, value in meta.items():
+                self.store.set_meta(name, value)
+
+    def _requeue(self, saves, changes, meta, error):
+        """Επιστροφή μίας αποτυχημένης παρτίδας στην αναμονή (οι νεότερες αλλαγές υπερισχύουν)"""
+        with self._cond:
+            newer_saves = set(self._saves)
+            for key, value in saves.items():
+                self._saves.setdefault(key, value)
+            for key, items in changes.items():
+                if key in newer_saves:
+                    continue
+                merged = dict(items)
+                merged.update(self._changes.get(key, {}))
+                self._changes[key] = merged
+            for name, value in meta.items():
+                self._meta.setdefault(name, value)
+            self._inflight = 0
+            self._writing = False
+            self.last_error = f'{type(error).__name__}: {error}'
+
+    def flush(self, timeout=None):
+        """Αναμονή μέχρι να γραφτούν όσες αλλαγές έχουν υποβληθεί ως τώρα"""
+        with self._cond:
+            target = self._submitted
+            if self._durable >= target:
+                return True
+            self._urgent = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._durable >= target or not self._thread.is_alive(), timeout)
+
+    def status(self):
+        """Κατάσταση για τη διεπαφή: εκκρεμείς αλλαγές, τελευταία εγγραφή, σφάλμα"""
+        with self._cond:
+            return {
+                'pending': self._queued() + self._inflight,
+                'durable': self._durable >= self._submitted,
+                'last_flush': self.last_flush,
+                'error': self.last_error,
+            }
+
+    def close(self):
+        """Άδειασμα της ουράς και τερματισμός του νήματος"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        with self._cond:
+            self._release()
+        if hasattr(self.store, 'close'):
+            self.store.close()
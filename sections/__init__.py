@@ -0,0 +1,26 @@
+"""Ενότητες της εφαρμογής, μία μονάδα ανά επιλογή του μενού
+
+Κάθε μονάδα ορίζει show(data) και εισάγεται μόνο όταν επιλεγεί η ενότητα,
+οπότε μια εκτέλεση του script φορτώνει και τρέχει μόνο τον κώδικα της
+τρέχουσας ενότητας.
+"""
+import importlib
+
+from core import timing
+
+# Επιλογή μενού -> μονάδα (με τη σειρά εμφάνισης)
+SECTIONS = {
+    "Κεντρική Βάση": 'central_database',
+    "Νέα Παραλαβή": 'receipts',
+    "Νέα Παραγγελία": 'orders',
+    "Αναφορές": 'reports',
+    "Διαχείριση": 'management',
+    "Διαχείριση Χρηστών": 'users',
+    "Αποθηκευτικοί Χώροι": 'storage',
+}
+
+
+def show_section(name, data):
+    """Εισαγωγή (την πρώτη φορά) και εμφάνιση της ενότητας name"""
+    with timing.span(f'show {SECTIONS[name]}'):
+        importlib.import_module(f'{__name__}.{SECTIONS[name]}').show(data)
@@ -0,0 +1,179 @@
+"""Κεντρική Βάση: περιήγηση, επεξεργασία και διαγραφή εγγραφών"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from core import timing
+from core.partitions import season_bounds, season_label, season_of
+from core.repository import ConflictError, record_version
+from core.search import search
+from core.storage import PARTITIONED_COLLECTIONS
+from core.trace import has_allocations
+from sections.common import can_delete, conflict_message, delete_record, get_browser, get_repository, notify
+
+# Εγγραφές ανά σελίδα στην Κεντρική Βάση (προεπιλογή και επιλογές)
+BROWSER_PAGE_SIZE = int(os.environ.get('BROWSER_PAGE_SIZE', 50))
+BROWSER_PAGE_SIZES = sorted({25, 50, 100, 200, BROWSER_PAGE_SIZE})
+
+ALL_FIELDS = "Όλα τα πεδία"
+GLOBAL_SEARCH_LIMIT = 20
+
+# Συλλογή -> (τύπος, πεδίο περιγραφής) για τα αποτελέσματα της γενικής αναζήτησης
+SEARCH_RESULTS = {
+    'receipts': ("Παραλαβή", 'producer_name'),
+    'orders': ("Παραγγελία", 'customer'),
+    'producers': ("Παραγωγός", 'name'),
+    'customers': ("Πελάτης", 'name'),
+}
+
+def show_search():
+    """Αναζήτηση σε παραλαβές, παραγγελίες, παραγωγούς και πελάτες μαζί"""
+    text = st.text_input("🔎 Αναζήτηση σε όλες τις συλλογές (όνομα, LOT, τιμολόγιο, ποικιλία, παρατηρήσεις)",
+                         key="global_search").strip()
+    if not text:
+        return
+    results = search(get_repository(), text, limit=GLOBAL_SEARCH_LIMIT)
+    if not results:
+        st.info(f"Δεν βρέθηκαν εγγραφές για «{text}»")
+        return
+    rows = [
+        {
+            "Τύπος": SEARCH_RESULTS[key][0],
+            "ID": record['id'],
+            "Περιγραφή": record.get(SEARCH_RESULTS[key][1], ''),
+            "LOT": record.get('lot', ''),
+            "Ημερομηνία": record.get('receipt_date') or record.get('date', ''),
+            "Ποικιλία": record.get('variety', ''),
+            "Συνάφεια": round(score, 2),
+        }
+        for key, record, score in results
+    ]
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+def select_season(key):
+    """Εύρος ημερομηνιών προς περιήγηση: οι ενεργές σεζόν ή μία ιστορική, που φορτώνεται τότε"""
+    repository = get_repository()
+    active = repository.active_start(key)
+    if active is None:
+        return None, None
+    seasons = sorted({season_of(month) for month in repository.partitions(key) if month < active[:7]}, reverse=True)
+    options = [f"Τρέχουσα (από {active})"] + [season_label(season) for season in seasons]
+    choice = st.selectbox("Σεζόν", options, key=f"browser_season_{key}")
+    if choice == options[0]:
+        # Χωρίς φορτωμένους ιστορικούς μήνες η μνήμη έχει μόνο τις ενεργές σεζόν
+        return (active, None) if repository.partition_cache.months(key) else (None, None)
+    start, end = season_bounds(seasons[options.index(choice) - 1])
+    # Οι μήνες της σεζόν μένουν στη μνήμη όσο χωράνε στην cache
+    repository.load_range(key, start, end)
+    return start, end
+
+def show(data):
+    st.header("📊 Κεντρική Βάση Δεδομένων")
+    show_search()
+
+    # Επιλογή τύπου δεδομένων για επεξεργασία
+    data_type = st.selectbox("Επιλέξτε τύπο δεδομένων", ["Παραλαβές", "Παραγγελίες", "Παραγωγοί", "Πελάτες"])
+
+    if data_type == "Παραλαβές":
+        items = data['receipts']
+        item_key = 'receipts'
+        columns = ['id', 'receipt_date', 'producer_name', 'total_kg', 'total_value', 'lot', 'storage_location']
+    elif data_type == "Παραγγελίες":
+        items = data['orders']
+        item_key = 'orders'
+        columns = ['id', 'date', 'customer', 'total_kg', 'total_value', 'executed_quantity', 'lot']
+    elif data_type == "Παραγωγοί":
+        items = data['producers']
+        item_key = 'producers'
+        columns = ['id', 'name', 'quantity', 'certifications']
+    else:
+        items = data['customers']
+        item_key = 'customers'
+        columns = ['id', 'name', 'address', 'phone']
+
+    start = end = None
+    if item_key in PARTITIONED_COLLECTIONS:
+        start, end = select_season(item_key)
+
+    if items:
+        # Ταξινόμηση, φίλτρο και σελιδοποίηση στην πλευρά του διακομιστή
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sort_options = ["Σειρά καταχώρησης"] + columns
+            sort_choice = st.selectbox("Ταξινόμηση κατά", sort_options, key=f"browser_sort_{item_key}")
+            descending = st.checkbox("Φθίνουσα σειρά", key=f"browser_desc_{item_key}")
+        with col2:
+            # "Όλα τα πεδία": αναζήτηση χωρίς τόνους/κεφαλαία και με greeklish, με σειρά συνάφειας
+            filter_options = [ALL_FIELDS] + columns
+            filter_choice = st.selectbox("Φίλτρο στη στήλη", filter_options, key=f"browser_filter_col_{item_key}")
+            filter_column = None if filter_choice == ALL_FIELDS else filter_choice
+            filter_text = st.text_input("Αναζήτηση", key=f"browser_filter_{item_key}")
+        with col3:
+            page_size = st.selectbox("Εγγραφές ανά σελίδα", BROWSER_PAGE_SIZES, index=BROWSER_PAGE_SIZES.index(BROWSER_PAGE_SIZE), key=f"browser_page_size_{item_key}")
+            page = st.number_input("Σελίδα", min_value=1, step=1, value=1, key=f"browser_page_{item_key}")
+
+        sort_column = None if sort_choice == sort_options[0] else sort_choice
+        with timing.span(f'browser page {item_key}') as span:
+            page_items, total = get_browser(item_key).page(
+                page, page_size, sort_column, descending, filter_column, filter_text.strip(), start, end
+            )
+            span.count(rows=total)
+        pages = max(1, (total - 1) // page_size + 1)
+        st.caption(f"Σελίδα {page} από {pages} · {total} εγγραφές")
+
+        if page_items:
+            # Μόνο η ορατή σελίδα μετατρέπεται σε DataFrame
+            with timing.span('DataFrame', rows=len(page_items)):
+                df = pd.DataFrame(page_items)
+                display_columns = [col for col in columns if col in df.columns]
+                st.dataframe(df[display_columns], use_container_width=True)
+
+        # Επιλογή εγγραφής από τη σελίδα ή απευθείας με ID
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            options = [f"{item['id']} - {item.get('producer_name', item.get('name', item.get('customer', '')))}" for item in page_items]
+            selected_option = st.selectbox("Επιλέξτε εγγραφή για διαχείριση", options)
+        with col2:
+            lookup_id = st.number_input("ή ID εγγραφής", min_value=0, step=1, value=0, key=f"browser_lookup_{item_key}")
+
+        if lookup_id or selected_option:
+            selected_id = int(lookup_id) if lookup_id else int(selected_option.split(" - ")[0])
+            selected_item = get_repository().get(item_key, selected_id)
+            if lookup_id and selected_item is None:
+                st.warning(f"Δεν βρέθηκε εγγραφή με ID {selected_id}")
+            if selected_item:
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.write("**Λεπτομέρειες Εγγραφής:**")
+                    st.json(selected_item)
+
+                with col2:
+                    st.write("**Ενέργειες:**")
+
+                    if st.button("✏️ Επεξεργασία"):
+                        st.session_state.edit_item = selected_item
+                        st.session_state.edit_type = item_key
+                        if item_key == 'receipts':
+                            st.session_state.current_tab = "Νέα Παραλαβή"
+                        else:
+                            st.session_state.current_tab = "Νέα Παραγγελία"
+                        st.rerun()
+
+                    if can_delete() and st.button("🗑️ Διαγραφή"):
+                        if has_allocations(get_repository(), item_key, selected_id):
+                            # Η διαγραφή θα έσπαγε την ιχνηλασιμότητα των LOT
+                            st.error("❌ Η εγγραφή έχει κατανομές LOT· διαγράψτε πρώτα τις κατανομές")
+                            return
+                        try:
+                            delete_record(item_key, selected_id, record_version(selected_item))
+                        except ConflictError as e:
+                            st.error(conflict_message(e))
+                        else:
+                            notify("✅ Διαγραφή επιτυχής!")
+                            st.rerun()
+        elif not page_items:
+            st.info("Δεν βρέθηκαν εγγραφές για τα επιλεγμένα κριτήρια")
+    else:
+        st.info(f"Δεν υπάρχουν καταχωρημένες {data_type}")
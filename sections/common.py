@@ -0,0 +1,121 @@
+"""Κοινές βοηθητικές συναρτήσεις των ενοτήτων (αποθετήριο, αποθήκευση, ειδοποιήσεις)"""
+import streamlit as st
+
+from core import timing
+from core.browser import RecordBrowser
+from core.ledger import SOURCES, post, sync
+from core.lots import LOT_FIELDS
+from core.options import OptionLists
+from core.services import open_repository, storage_usage
+from core.trace import check_allocations
+
+@st.cache_resource
+def get_repository():
+    """Κοινό αποθετήριο για όλες τις συνεδρίες, φορτώνεται μία φορά ανά διεργασία"""
+    repository = open_repository()
+    # Μία φορά ανά βάση: κινήσεις αποθέματος για δεδομένα παλαιότερα του καθολικού
+    sync(repository)
+    return repository
+
+@st.cache_resource
+def get_browser(key):
+    """Κοινός περιηγητής εγγραφών ανά συλλογή (με cache ταξινομήσεων)"""
+    return RecordBrowser(get_repository(), key)
+
+@st.cache_resource
+def get_options():
+    """Κοινές λίστες επιλογών (παραγωγοί, πελάτες, αποθήκες) ανά έκδοση συλλογής"""
+    return OptionLists(get_repository())
+
+@st.cache_resource
+def get_query_engine():
+    """Κοινή μηχανή ερωτημάτων των αναφορών (με cache στηλών ανά έκδοση)"""
+    from core.query import QueryEngine
+
+    return QueryEngine(get_repository())
+
+@st.cache_resource
+def get_report_cache():
+    """Κοινή cache αποτελεσμάτων αναφορών και αρχείων εξαγωγής (κλειδί: φίλτρα και εκδόσεις συλλογών)"""
+    from core.cache import ResultCache
+
+    return ResultCache(get_repository())
+
+# Συναρτήσεις αυτόματης αποθήκευσης και φόρτωσης
+def load_data():
+    """Προβολές μόνο για ανάγνωση στο κοινό αποθετήριο (χωρίς αντίγραφα ανά συνεδρία)"""
+    with timing.span('load_data') as span:
+        repository = get_repository()
+        repository.refresh()
+        views = repository.views()
+        span.count(rows=sum(len(view) for view in views.values()))
+    return views
+
+def save_record(key, record, record_id=None, expected_version=None):
+    """Αποθήκευση μόνο της εγγραφής που άλλαξε
+
+    expected_version: η έκδοση που είδε ο χρήστης (0 για νέα εγγραφή)·
+    αν η εγγραφή άλλαξε στο μεταξύ προκύπτει ConflictError. Οι παραλαβές
+    και οι παραγγελίες παίρνουν μοναδικό LOT κατά την αποθήκευση και
+    καταχωρούν μαζί τις κινήσεις αποθέματος που προκύπτουν· ValueError αν
+    η αλλαγή δεν συμβιβάζεται με τις κατανομές τους (check_allocations).
+    """
+    repository = get_repository()
+    prepare = None
+    if key in LOT_FIELDS:
+        lots = repository.index(key, 'lots')
+
+        def prepare(record, current):
+            check_allocations(repository, key, record, current)
+            return lots.assign(record, current)
+    with timing.span(f'save_record {key}', rows=1), repository.transaction():
+        saved = repository.upsert(key, record, record_id, expected_version, prepare=prepare)
+        if key in SOURCES:
+            post(repository, key, [saved['id']], st.session_state.current_user)
+    return saved
+
+def delete_record(key, record_id, expected_version=None):
+    """Διαγραφή μόνο μίας εγγραφής (με αντιλογισμό των κινήσεων αποθέματος της)"""
+    repository = get_repository()
+    with timing.span(f'delete_record {key}', rows=1), repository.transaction():
+        repository.delete(key, record_id, expected_version)
+        if key in SOURCES:
+            post(repository, key, [record_id], st.session_state.current_user)
+
+def conflict_message(error):
+    """Μήνυμα για αλλαγή που απορρίφθηκε λόγω ταυτόχρονης επεξεργασίας"""
+    if error.expected == 0:
+        return (f"⚠️ Ο αριθμός #{error.record_id} καταχωρήθηκε μόλις από άλλον χρήστη. "
+                f"Επόμενος διαθέσιμος: #{get_next_id(error.key)}.")
+    if error.current is None:
+        return f"⚠️ Η εγγραφή #{error.record_id} διαγράφηκε από άλλον χρήστη. Οι αλλαγές σας δεν αποθηκεύτηκαν."
+    return (f"⚠️ Η εγγραφή #{error.record_id} τροποποιήθηκε από άλλον χρήστη "
+            f"({error.current.get('updated_at', '')}). Οι αλλαγές σας δεν αποθηκεύτηκαν· "
+            f"ανοίξτε την ξανά για επεξεργασία.")
+
+# Ειδοποιήσεις
+def notify(message):
+    """Μήνυμα που εμφανίζεται ως toast στην επόμενη εκτέλεση (μετά το st.rerun)"""
+    st.session_state.notifications.append(message)
+
+# Βοηθητικές συναρτήσεις
+def get_next_id(key):
+    """Επόμενο id από την αποθηκευμένη ακολουθία της συλλογής (O(1))"""
+    return get_repository().next_id(key)
+
+def can_edit():
+    return st.session_state.user_role in ['admin', 'editor']
+
+def can_delete():
+    return st.session_state.user_role == 'admin'
+
+def calculate_storage_usage(day=None):
+    """Απόθεμα ανά αποθήκη από το καθολικό κινήσεων (τρέχον ή σε ημερομηνία)
+
+    Οι κινήσεις κάθε αποθήκης διαβάζονται χωριστά, ανά σελίδα, μέσω
+    του storage_contents.
+    """
+    with timing.span('calculate_storage_usage') as span:
+        usage = storage_usage(get_repository(), day)
+        span.count(rows=len(usage))
+    return usage
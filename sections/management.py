@@ -0,0 +1,98 @@
+"""Διαχείριση παραγωγών και πελατών"""
+import pandas as pd
+import streamlit as st
+
+from core.constants import CERTIFICATIONS
+from core.repository import ConflictError
+from sections.common import conflict_message, get_next_id, notify, save_record
+
+def show(data):
+    st.header("⚙️ Διαχείριση Συστήματος")
+
+    management_type = st.selectbox("Επιλέξτε τύπο διαχείρισης", [
+        "Διαχείριση Παραγωγών",
+        "Διαχείριση Πελατών"
+    ])
+
+    if management_type == "Διαχείριση Παραγωγών":
+        st.subheader("Διαχείριση Παραγωγών")
+
+        # Προσθήκη νέου παραγωγού
+        with st.form("add_producer_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                producer_id = st.number_input("ID Παραγωγού", min_value=1, step=1, value=get_next_id('producers'))
+                producer_name = st.text_input("Όνομα Παραγωγού")
+                producer_quantity = st.number_input("Ποσότητα", min_value=0, step=1)
+
+            with col2:
+                certifications = st.multiselect(
+                    "Πιστοποιήσεις",
+                    CERTIFICATIONS
+                )
+                address = st.text_input("Διεύθυνση")
+                phone = st.text_input("Τηλέφωνο")
+
+            if st.form_submit_button("➕ Προσθήκη Παραγωγού"):
+                new_producer = {
+                    "id": producer_id,
+                    "name": producer_name,
+                    "quantity": producer_quantity,
+                    "certifications": certifications,
+                    "address": address,
+                    "phone": phone
+                }
+                try:
+                    save_record('producers', new_producer, expected_version=0)
+                except ConflictError as e:
+                    st.error(conflict_message(e))
+                else:
+                    notify(f"✅ Ο παραγωγός {producer_name} προστέθηκε επιτυχώς!")
+                    st.rerun()
+
+        # Λίστα παραγωγών
+        if data['producers']:
+            st.subheader("📋 Κατάλογος Παραγωγών")
+            df_producers = pd.DataFrame(data['producers'])
+            st.dataframe(df_producers[['id', 'name', 'quantity', 'certifications']], use_container_width=True)
+
+    elif management_type == "Διαχείριση Πελατών":
+        st.subheader("Διαχείριση Πελατών")
+
+        # Προσθήκη νέου πελάτη
+        with st.form("add_customer_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                customer_id = st.number_input("ID Πελάτη", min_value=1, step=1, value=get_next_id('customers'))
+                customer_name = st.text_input("Όνομα Πελάτη")
+                customer_address = st.text_input("Διεύθυνση")
+
+            with col2:
+                customer_phone = st.text_input("Τηλέφωνο")
+                customer_email = st.text_input("Email")
+                customer_vat = st.text_input("ΑΦΜ")
+
+            if st.form_submit_button("➕ Προσθήκη Πελάτη"):
+                new_customer = {
+                    "id": customer_id,
+                    "name": customer_name,
+                    "address": customer_address,
+                    "phone": customer_phone,
+                    "email": customer_email,
+                    "vat": customer_vat
+                }
+                try:
+                    save_record('customers', new_customer, expected_version=0)
+                except ConflictError as e:
+                    st.error(conflict_message(e))
+                else:
+                    notify(f"✅ Ο πελάτης {customer_name} προστέθηκε επιτυχώς!")
+                    st.rerun()
+
+        # Λίστα πελατών
+        if data['customers']:
+            st.subheader("📋 Κατάλογος Πελατών")
+            df_customers = pd.DataFrame(data['customers'])
+            st.dataframe(df_customers[['id', 'name', 'address', 'phone']], use_container_width=True)
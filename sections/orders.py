@@ -0,0 +1,235 @@
+"""Νέα Παραγγελία: καταχώρηση και επεξεργασία παραγγελιών"""
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from core.constants import QUALITIES, SIZES
+from core.lots import LOT_PREFIXES, generate_lot_number, lot_ids
+from core.options import option_id, option_name
+from core.repository import ConflictError, record_version
+from core.services import calculate_totals
+from core.trace import allocate, trace_backward
+from sections.common import (can_delete, can_edit, conflict_message, delete_record, get_next_id, get_options,
+                             get_repository, notify, save_record)
+
+def show_allocations(order_id):
+    """Κατανομές LOT παραλαβών στην παραγγελία (προέλευση του καρπού)"""
+    repository = get_repository()
+    order = repository.get('orders', order_id)
+    if order is None:
+        st.info(f"Δεν υπάρχει η παραγγελία #{order_id}")
+        return
+
+    rows = trace_backward(repository, [order_id])
+    supplied = sum(row['kg'] for row in rows)
+    st.write(f"**LOT {order.get('lot', '')}** — {order.get('customer', '')}: "
+             f"{supplied} από {order['total_kg']} kg με γνωστή προέλευση")
+    if rows:
+        st.dataframe(pd.DataFrame(rows)[
+            ['allocation_id', 'receipt_lot', 'receipt_date', 'producer_name', 'variety', 'kg']
+        ], use_container_width=True)
+
+    if can_edit():
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            receipt_lot = st.text_input("LOT παραλαβής", key=f"allocation_lot_{order_id}")
+        receipt_ids = lot_ids(repository, 'receipts', receipt_lot.strip()) if receipt_lot else []
+        with col2:
+            # Παλαιότερα δεδομένα μπορεί να έχουν τον ίδιο LOT σε πολλές παραλαβές
+            receipt_id = st.selectbox("Παραλαβή #", receipt_ids, key=f"allocation_receipt_{order_id}")
+        with col3:
+            kg = st.number_input("Κιλά", min_value=0, step=1, key=f"allocation_kg_{order_id}")
+        if receipt_lot and not receipt_ids:
+            st.warning(f"Δεν βρέθηκε παραλαβή με LOT {receipt_lot}")
+        if st.button("🔗 Κατανομή", key=f"allocate_{order_id}", disabled=receipt_id is None or kg <= 0):
+            try:
+                allocate(repository, receipt_id, order_id, kg, st.session_state.current_user)
+            except ValueError as e:
+                st.error(str(e))
+            except ConflictError as e:
+                st.error(conflict_message(e))
+            else:
+                notify(f"✅ {kg} kg της παραλαβής #{receipt_id} κατανεμήθηκαν στην παραγγελία #{order_id}")
+                st.rerun()
+
+    if rows and can_delete():
+        allocation_id = st.selectbox("Κατανομή προς διαγραφή", [row['allocation_id'] for row in rows],
+                                     key=f"allocation_delete_{order_id}")
+        if st.button("🗑️ Διαγραφή κατανομής", key=f"delete_allocation_{order_id}"):
+            allocation = repository.get('allocations', allocation_id)
+            try:
+                delete_record('allocations', allocation_id, record_version(allocation))
+            except ConflictError as e:
+                st.error(conflict_message(e))
+            else:
+                notify(f"✅ Η κατανομή #{allocation_id} διαγράφηκε")
+                st.rerun()
+
+def show(data):
+    # Έλεγχος αν υπάρχει προς επεξεργασία στοιχείο
+    if st.session_state.edit_item and st.session_state.edit_type == 'orders':
+        order = st.session_state.edit_item
+        is_edit = True
+        st.header("📝 Επεξεργασία Παραγγελίας")
+    else:
+        order = {}
+        is_edit = False
+        st.header("📋 Καταχώρηση Νέας Παραγγελίας")
+
+    with st.form("order_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if is_edit:
+                order_id = st.number_input("Αριθμός Παραγγελίας", value=order['id'], disabled=True)
+                st.text_input("Αριθμός LOT", value=order.get('lot', ''), disabled=True)
+            else:
+                order_id = st.number_input("Αριθμός Παραγγελίας", min_value=1, step=1, value=get_next_id('orders'))
+
+            if is_edit:
+                order_date = st.date_input("Ημερομηνία Παραγγελίας", value=datetime.strptime(order['date'], '%Y-%m-%d'))
+            else:
+                order_date = st.date_input("Ημερομηνία Παραγγελίας", value=datetime.today())
+
+            # Επιλογή πελάτη
+            customer_options, customer_positions = get_options().get('customers')
+            default_customer_index = customer_positions.get(order.get('customer_id'), 0)
+            selected_customer = st.selectbox("Πελάτης", options=customer_options, index=default_customer_index)
+            customer_id = option_id(selected_customer) if selected_customer else None
+            customer_name = option_name(selected_customer) if selected_customer else ""
+
+            variety = st.text_input("Ποικιλία Παραγγελίας", value=order.get('variety', ''))
+
+            # Αυτόματη δημιουργία LOT (με -2, -3, ... αν υπάρχει ήδη· ελέγχεται ξανά κατά την αποθήκευση)
+            if variety and customer_id and order_date:
+                lots = get_repository().index('orders', 'lots')
+                lot_number = generate_lot_number(order_date, customer_id, variety, lambda lot: lot in lots,
+                                                 prefix=LOT_PREFIXES['orders'])
+                if not is_edit:
+                    st.text_input("Αριθμός LOT", value=lot_number, disabled=True)
+            else:
+                lot_number = order.get('lot', '')
+
+            # Αποθήκη από την οποία φορτώνεται η εκτελεσθείσα ποσότητα (μειώνει το απόθεμά της)
+            storage_options, storage_positions = get_options().get('storage_locations', "—")
+            default_storage_index = storage_positions.get(order.get('storage_location_id'), 0)
+            selected_storage = st.selectbox("Αποθήκη Φόρτωσης", options=storage_options, index=default_storage_index)
+            storage_id = option_id(selected_storage) if selected_storage != "—" else None
+
+            # Πληρωμή
+            paid_options = ["Ναι", "Όχι"]
+            paid_index = 0 if order.get('paid') == "Ναι" else 1
+            paid_status = st.selectbox("Πληρώθηκε;", paid_options, index=paid_index)
+
+            # Σχετικό τιμολόγιο
+            invoice_ref = st.text_input("Σχετικό Τιμολόγιο", value=order.get('invoice_ref', ''))
+
+        with col2:
+            # Ποσότητες παραγγελίας ανά νούμερο
+            st.subheader("📦 Ποσότητες Παραγγελίας ανά Νούμερο")
+            sizes = SIZES
+            order_size_quantities = dict(order.get('size_quantities', {}))
+            for size in sizes:
+                order_size_quantities[size] = st.number_input(
+                    f"Ποσότητα για νούμερο {size}", 
+                    min_value=0, step=1, 
+                    value=int(order_size_quantities.get(size, 0)),
+                    key=f"order_size_{size}_{order_id if is_edit else 'new'}"
+                )
+
+            # Ποσότητες παραγγελίας ανά ποιότητα
+            st.subheader("📦 Ποσότητες Παραγγελίας ανά Ποιότητα")
+            qualities = QUALITIES
+            order_quality_quantities = dict(order.get('quality_quantities', {}))
+            for quality in qualities:
+                order_quality_quantities[quality] = st.number_input(
+                    f"Ποσότητα για ποιότητα {quality}", 
+                    min_value=0, step=1, 
+                    value=int(order_quality_quantities.get(quality, 0)),
+                    key=f"order_quality_{quality}_{order_id if is_edit else 'new'}"
+                )
+
+            # Εκτελεσθείσα ποσότητα
+            executed_quantity = st.number_input(
+                "Εκτελεσθείσα Ποσότητα (kg)", 
+                min_value=0, step=1, 
+                value=order.get('executed_quantity', 0)
+            )
+            if executed_quantity and storage_id is None:
+                st.caption("Χωρίς αποθήκη φόρτωσης η εκτέλεση δεν μειώνει το απόθεμα")
+
+            # Συμφωνηθείσα τιμή
+            agreed_price_per_kg = st.number_input(
+                "💰 Συμφωνηθείσα Τιμή ανά κιλό", 
+                min_value=0.0, step=0.01, 
+                value=order.get('agreed_price_per_kg', 0.0)
+            )
+
+            # Υπολογισμός συνολικής αξίας
+            total_kg, total_value = calculate_totals(order_size_quantities, order_quality_quantities, agreed_price_per_kg)
+
+            if total_kg > 0:
+                st.info(f"📦 Σύνολο κιλών: {total_kg} kg")
+                st.success(f"💶 Συνολική αξία: {total_value:.2f} €")
+
+            order_observations = st.text_area("📝 Παρατηρήσεις Παραγγελίας", value=order.get('observations', ''))
+
+        col1, col2 = st.columns(2)
+        with col1:
+            submitted = st.form_submit_button("✅ Καταχώρηση Παραγγελίας")
+        with col2:
+            if is_edit:
+                if st.form_submit_button("❌ Ακύρωση Επεξεργασίας"):
+                    st.session_state.edit_item = None
+                    st.session_state.edit_type = None
+                    st.rerun()
+
+        if submitted:
+            new_order = {
+                "id": order_id,
+                "date": order_date.strftime("%Y-%m-%d"),
+                "customer_id": customer_id,
+                "customer": customer_name,
+                "variety": variety,
+                "lot": lot_number,
+                "size_quantities": order_size_quantities,
+                "quality_quantities": order_quality_quantities,
+                "executed_quantity": executed_quantity,
+                "storage_location_id": storage_id,
+                "storage_location": option_name(selected_storage) if storage_id else "",
+                "agreed_price_per_kg": agreed_price_per_kg,
+                "total_kg": total_kg,
+                "total_value": total_value,
+                "paid": paid_status,
+                "invoice_ref": invoice_ref,
+                "observations": order_observations,
+                "created_by": st.session_state.current_user,
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+
+            # Εισαγωγή ή ενημέρωση μόνο της συγκεκριμένης παραγγελίας
+            try:
+                save_record('orders', new_order, expected_version=record_version(order) if is_edit else 0)
+            except ValueError as e:
+                st.error(str(e))
+            except ConflictError as e:
+                st.error(conflict_message(e))
+            else:
+                if is_edit:
+                    notify(f"✅ Η παραγγελία #{order_id} ενημερώθηκε επιτυχώς!")
+                else:
+                    notify(f"✅ Η παραγγελία #{order_id} καταχωρήθηκε επιτυχώς!")
+
+                st.session_state.edit_item = None
+                st.session_state.edit_type = None
+                st.rerun()
+
+    # Προέλευση: ποιες παραλαβές (LOT παραγωγών) τροφοδότησαν την παραγγελία
+    with st.expander("🔗 Προέλευση παραγγελίας (LOT παραλαβών)", expanded=is_edit):
+        if is_edit:
+            allocation_order = order['id']
+        else:
+            allocation_order = st.number_input("Αριθμός Παραγγελίας", min_value=1, step=1,
+                                               value=max(1, get_next_id('orders') - 1), key="allocation_order")
+        show_allocations(int(allocation_order))
@@ -0,0 +1,209 @@
+"""Νέα Παραλαβή: καταχώρηση, επεξεργασία και μαζική εισαγωγή παραλαβών"""
+from datetime import datetime
+
+import streamlit as st
+
+from core.constants import CERTIFICATIONS, QUALITIES, SIZES
+from core.lots import generate_lot_number
+from core.options import option_id, option_name
+from core.repository import ConflictError, record_version
+from core.services import calculate_totals
+from sections.common import conflict_message, get_next_id, get_options, get_repository, notify, save_record
+
+def show_bulk_import():
+    """Μαζική εισαγωγή παραλαβών από αρχείο ζυγαριάς (CSV/Excel)"""
+    with st.expander("📤 Μαζική εισαγωγή από αρχείο (CSV/Excel)"):
+        st.caption(
+            "Στήλες: receipt_date, producer_id ή producer_name, variety, "
+            "storage_location_id ή storage_location, size_*, quality_*, certifications, "
+            "agreed_price_per_kg, paid, invoice_ref, observations"
+        )
+        uploaded = st.file_uploader("Αρχείο παραλαβών", type=['csv', 'gz', 'xlsx', 'xls'], key="bulk_import_file")
+        if uploaded is None:
+            return
+        # Το ίδιο αρχείο δεν εισάγεται δεύτερη φορά με νέο πάτημα
+        if st.session_state.get('bulk_import_done') == uploaded.file_id:
+            st.info("ℹ️ Το αρχείο έχει ήδη εισαχθεί.")
+            return
+        if st.button("📥 Εισαγωγή παραλαβών", key="bulk_import_submit"):
+            # pandas/openpyxl φορτώνονται μόνο όταν γίνει πραγματικά εισαγωγή
+            from core.bulk_import import import_receipts, read_batch
+            try:
+                frame = read_batch(uploaded, uploaded.name)
+                records, rejected = import_receipts(get_repository(), frame, st.session_state.current_user)
+            except ValueError as e:
+                st.error(f"❌ Το αρχείο δεν μπορεί να εισαχθεί: {e}")
+                return
+            except ConflictError as e:
+                st.error(conflict_message(e))
+                return
+            st.session_state.bulk_import_done = uploaded.file_id
+            if records:
+                st.success(f"✅ Καταχωρήθηκαν {len(records)} παραλαβές (#{records[0]['id']} έως #{records[-1]['id']})")
+            if len(rejected):
+                st.warning(f"⚠️ Απορρίφθηκαν {len(rejected)} γραμμές")
+                st.dataframe(rejected, use_container_width=True)
+                st.download_button(
+                    label="📥 Κατέβασμα απορριφθεισών γραμμών",
+                    data=rejected.to_csv(index=False).encode('utf-8'),
+                    file_name="απορριφθείσες_παραλαβές.csv",
+                    mime="text/csv"
+                )
+
+def show(data):
+    # Έλεγχος αν υπάρχει προς επεξεργασία στοιχείο
+    if st.session_state.edit_item and st.session_state.edit_type == 'receipts':
+        receipt = st.session_state.edit_item
+        is_edit = True
+        st.header("📝 Επεξεργασία Παραλαβής")
+    else:
+        receipt = {}
+        is_edit = False
+        st.header("📥 Καταχώρηση Νέας Παραλαβής")
+        show_bulk_import()
+
+    with st.form("receipt_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if is_edit:
+                receipt_id = st.number_input("Αριθμός Παραλαβής", value=receipt['id'], disabled=True)
+                st.text_input("Αριθμός LOT", value=receipt.get('lot', ''), disabled=True)
+            else:
+                receipt_id = st.number_input("Αριθμός Παραλαβής", min_value=1, step=1, value=get_next_id('receipts'))
+
+            # Επιλογή ημερομηνίας
+            if is_edit:
+                receipt_date = st.date_input("Ημερομηνία Παραλαβής", value=datetime.strptime(receipt['receipt_date'], '%Y-%m-%d'))
+            else:
+                receipt_date = st.date_input("Ημερομηνία Παραλαβής", value=datetime.today())
+
+            # Επιλογή παραγωγού
+            producer_options, producer_positions = get_options().get('producers')
+            default_index = producer_positions.get(receipt.get('producer_id'), 0)
+            selected_producer = st.selectbox("Παραγωγός", options=producer_options, index=default_index)
+            producer_id = option_id(selected_producer) if selected_producer else None
+            producer_name = option_name(selected_producer) if selected_producer else ""
+
+            variety = st.text_input("Ποικιλία", value=receipt.get('variety', ''))
+
+            # Αυτόματη δημιουργία LOT (με -2, -3, ... αν υπάρχει ήδη· ελέγχεται ξανά κατά την αποθήκευση)
+            if variety and producer_id and receipt_date:
+                lots = get_repository().index('receipts', 'lots')
+                lot_number = generate_lot_number(receipt_date, producer_id, variety, lambda lot: lot in lots)
+                if not is_edit:
+                    st.text_input("Αριθμός LOT", value=lot_number, disabled=True)
+            else:
+                lot_number = receipt.get('lot', '')
+
+            # Επιλογή αποθηκευτικού χώρου
+            storage_options, storage_positions = get_options().get('storage_locations')
+            default_storage_index = storage_positions.get(receipt.get('storage_location_id'), 0)
+            selected_storage = st.selectbox("Αποθηκευτικός Χώρος", options=storage_options, index=default_storage_index)
+            storage_id = option_id(selected_storage) if selected_storage else None
+
+            # Πληρωμή
+            paid_options = ["Ναι", "Όχι"]
+            paid_index = 0 if receipt.get('paid') == "Ναι" else 1
+            paid_status = st.selectbox("Πληρώθηκε;", paid_options, index=paid_index)
+
+            # Σχετικό τιμολόγιο
+            invoice_ref = st.text_input("Σχετικό Τιμολόγιο", value=receipt.get('invoice_ref', ''))
+
+        with col2:
+            # Ποσότητες ανά νούμερο
+            st.subheader("📊 Ποσότητες ανά Νούμερο")
+            sizes = SIZES
+            size_quantities = dict(receipt.get('size_quantities', {}))
+            for size in sizes:
+                size_quantities[size] = st.number_input(
+                    f"Ποσότητα για νούμερο {size}", 
+                    min_value=0, step=1, 
+                    value=int(size_quantities.get(size, 0)),
+                    key=f"size_{size}_{receipt_id if is_edit else 'new'}"
+                )
+
+            # Ποσότητες ανά ποιότητα
+            st.subheader("📊 Ποσότητες ανά Ποιότητα")
+            qualities = QUALITIES
+            quality_quantities = dict(receipt.get('quality_quantities', {}))
+            for quality in qualities:
+                quality_quantities[quality] = st.number_input(
+                    f"Ποσότητα για ποιότητα {quality}", 
+                    min_value=0, step=1, 
+                    value=int(quality_quantities.get(quality, 0)),
+                    key=f"quality_{quality}_{receipt_id if is_edit else 'new'}"
+                )
+
+            # Πιστοποιήσεις
+            certifications = st.multiselect(
+                "📑 Πιστοποιήσεις",
+                CERTIFICATIONS,
+                default=receipt.get('certifications', [])
+            )
+
+            # Συμφωνηθείσα τιμή
+            agreed_price_per_kg = st.number_input(
+                "💰 Συμφωνηθείσα Τιμή ανά κιλό", 
+                min_value=0.0, step=0.01, 
+                value=receipt.get('agreed_price_per_kg', 0.0)
+            )
+
+            # Υπολογισμός συνολικής αξίας
+            total_kg, total_value = calculate_totals(size_quantities, quality_quantities, agreed_price_per_kg)
+
+            if total_kg > 0:
+                st.info(f"📦 Σύνολο κιλών: {total_kg} kg")
+                st.success(f"💶 Συνολική αξία: {total_value:.2f} €")
+
+            observations = st.text_area("📝 Παρατηρήσεις", value=receipt.get('observations', ''))
+
+        col1, col2 = st.columns(2)
+        with col1:
+            submitted = st.form_submit_button("✅ Καταχώρηση Παραλαβής")
+        with col2:
+            if is_edit:
+                if st.form_submit_button("❌ Ακύρωση Επεξεργασίας"):
+                    st.session_state.edit_item = None
+                    st.session_state.edit_type = None
+                    st.rerun()
+
+        if submitted:
+            new_receipt = {
+                "id": receipt_id,
+                "receipt_date": receipt_date.strftime("%Y-%m-%d"),
+                "producer_id": producer_id,
+                "producer_name": producer_name,
+                "variety": variety,
+                "lot": lot_number,
+                "storage_location_id": storage_id,
+                "storage_location": option_name(selected_storage) if selected_storage else "",
+                "size_quantities": size_quantities,
+                "quality_quantities": quality_quantities,
+                "certifications": certifications,
+                "agreed_price_per_kg": agreed_price_per_kg,
+                "total_kg": total_kg,
+                "total_value": total_value,
+                "paid": paid_status,
+                "invoice_ref": invoice_ref,
+                "observations": observations,
+                "created_by": st.session_state.current_user,
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+
+            # Εισαγωγή ή ενημέρωση μόνο της συγκεκριμένης παραλαβής
+            try:
+                save_record('receipts', new_receipt, expected_version=record_version(receipt) if is_edit else 0)
+            except ValueError as e:
+                st.error(str(e))
+            except ConflictError as e:
+                st.error(conflict_message(e))
+            else:
+                if is_edit:
+                    notify(f"✅ Η παραλαβή #{receipt_id} ενημερώθηκε επιτυχώς!")
+                else:
+                    notify(f"✅ Η παραλαβή #{receipt_id} καταχωρήθηκε επιτυχώς!")
+
+                st.session_state.edit_item = None
+                st.session_state.edit_type = None
+                st.rerun()
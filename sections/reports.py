@@ -0,0 +1,437 @@
+"""Αναφορές και εξαγωγές
+
+Οι αναφορές είναι ερωτήματα της μηχανής core.query: φίλτρα και
+ομαδοποίηση πάνω στο στηλοθετημένο είδωλο, χωρίς βρόχους ανά εγγραφή.
+Μια νέα αναφορά ορίζεται με τις διαστάσεις ομαδοποίησής της.
+"""
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from core import timing
+from core.constants import CERTIFICATIONS, QUALITIES, SIZES
+from core.export import FORMATS, export
+from core.options import option_id
+from core.query import DIMENSIONS, MEASURE_LABELS
+from core.services import storage_stock
+from core.trace import load_lot, trace_lot, trace_producer
+from sections.common import (calculate_storage_usage, get_options, get_query_engine, get_report_cache,
+                             get_repository)
+
+# Αναφορές εύρους ημερομηνιών: συλλογή, πρόθεμα κλειδιών, φίλτρο οντότητας,
+# στήλες πίνακα και κείμενα
+DATE_REPORTS = {
+    "Αναφορά Παραλαβών": {
+        'key': 'receipts', 'prefix': 'receipt_', 'entity': ("Παραγωγός", 'producers', 'producer'),
+        'columns': ['id', 'receipt_date', 'producer_name', 'total_kg', 'total_value', 'lot'],
+        'count_label': "Συνολικές Παραλαβές", 'file_stem': "παραλαβές",
+        'empty': "Δεν βρέθηκαν παραλαβές για τα επιλεγμένα κριτήρια",
+    },
+    "Αναφορά Παραγγελιών": {
+        'key': 'orders', 'prefix': 'order_', 'entity': ("Πελάτης", 'customers', 'customer'),
+        'columns': ['id', 'date', 'customer', 'total_kg', 'total_value', 'lot'],
+        'count_label': "Συνολικές Παραγγελίες", 'file_stem': "παραγγελίες",
+        'empty': "Δεν βρέθηκαν παραγγελίες για τα επιλεγμένα κριτήρια",
+    },
+}
+
+# Αναφορές συνόλων ανά οντότητα: (τίτλος, συλλογή, διάσταση, επικεφαλίδα πλήθους, γράφημα, κενό)
+ENTITY_REPORTS = {
+    "Αναφορά Πωλήσεων ανά Πελάτη": (
+        "Αναφορά Πωλήσεων ανά Πελάτη", 'orders', 'customer', 'Παραγγελίες',
+        "📊 Γράφημα Πωλήσεων ανά Πελάτη", "Δεν υπάρχουν δεδομένα πωλήσεων"
+    ),
+    "Αναφορά Παραγωγών ανά Παραγγελία": (
+        "Αναφορά Παραγωγών ανά Παραλαβή", 'receipts', 'producer', 'Παραλαβές',
+        "📊 Γράφημα Παραλαβών ανά Παραγωγό", "Δεν υπάρχουν δεδομένα παραλαβών"
+    ),
+}
+
+COLLECTIONS = {"Παραλαβές": 'receipts', "Παραγγελίες": 'orders'}
+
+# Επικεφαλίδα -> διάσταση για τις λίστες επιλογής, και οι αναλύσεις σε νούμερα/ποιότητες
+DIMENSION_LABELS = {label: dimension for dimension, label in DIMENSIONS.items()}
+BREAKDOWNS = {"Νούμερο": 'size', "Ποιότητα": 'quality'}
+
+# Συλλογές από τις οποίες διαβάζει κάθε αναφορά: οι εκδόσεις τους μπαίνουν
+# στο κλειδί της cache, οπότε μια αλλαγή σε αυτές δίνει νέο αποτέλεσμα
+REPORT_SOURCES = {
+    'receipts': ['receipts', 'producers', 'storage_locations'],
+    'orders': ['orders', 'customers', 'storage_locations'],
+    'trace': ['allocations', 'receipts', 'orders'],
+    'storage': ['movements', 'storage_locations'],
+}
+
+# Στήλες του πίνακα ιχνηλασιμότητας με τις επικεφαλίδες τους
+TRACE_LABELS = {
+    'receipt_lot': "LOT Παραλαβής", 'receipt_date': "Ημερομηνία Παραλαβής", 'producer_name': "Παραγωγός",
+    'variety': "Ποικιλία", 'kg': "Κιλά", 'order_lot': "LOT Παραγγελίας", 'order_date': "Ημερομηνία Παραγγελίας",
+    'customer': "Πελάτης",
+}
+
+def query_table(result, count_label=None):
+    """Αποτέλεσμα ερωτήματος ως DataFrame με ελληνικές επικεφαλίδες (χωρίς τα id)"""
+    frame = pd.DataFrame(result)
+    frame = frame.drop(columns=[column for column in frame.columns if column.endswith('_id')])
+    labels = dict(DIMENSIONS, **MEASURE_LABELS)
+    labels.update({f'size_{size}': f"Νούμερο {size}" for size in SIZES})
+    labels.update({f'quality_{quality}': f"Ποιότητα {quality}" for quality in QUALITIES})
+    if count_label:
+        labels['count'] = count_label
+    return frame.rename(columns=labels)
+
+def export_file(records, key, fmt):
+    """Το αρχείο εξαγωγής ως bytes, γραμμένο ανά τμήμα σε προσωρινό αρχείο (όχι σε BytesIO)"""
+    with tempfile.TemporaryFile() as output:
+        export(records, key, fmt, output)
+        output.seek(0)
+        return output.read()
+
+def show_export(report_key, records, key, file_stem, widget_key):
+    """Εξαγωγή φιλτραρισμένων εγγραφών, με το αρχείο στην cache των αναφορών
+
+    report_key είναι το κλειδί cache της αναφοράς και records συνάρτηση που
+    δίνει τις εγγραφές της. Το αρχείο φτιάχνεται μόνο με το κουμπί και μένει
+    στην cache, οπότε το «Κατέβασμα» και οι επόμενες εμφανίσεις της ίδιας
+    αναφοράς δεν το ξαναχτίζουν.
+    """
+    cache = get_report_cache()
+    fmt = st.selectbox("Μορφή εξαγωγής", list(FORMATS), key=f"{widget_key}_format")
+    export_key = ('export', report_key, fmt)
+    data = cache.get(export_key)
+    if data is None and st.button("📊 Εξαγωγή", key=widget_key):
+        data = cache.fetch(export_key, lambda: export_file(records(), key, fmt))
+    if data is not None:
+        st.download_button(
+            label="📥 Κατέβασμα αρχείου",
+            data=data,
+            file_name=f"{file_stem}.{fmt}",
+            mime=FORMATS[fmt][1],
+            key=f"{widget_key}_download"
+        )
+
+def select_summary(engine, key, start, end, filters):
+    """Οι γραμμές του ειδώλου που ικανοποιούν τα φίλτρα και τα σύνολά τους"""
+    rows = engine.select(key, start, end, **filters)
+    return rows, engine.mirror(key).summarize(rows)
+
+def date_report(engine, cache, key, start, end, filters):
+    """(κλειδί cache, γραμμές, σύνολα) της αναφοράς εύρους ημερομηνιών
+
+    Οι ιστορικοί μήνες φορτώνονται πριν από το κλειδί (αλλάζουν την έκδοση
+    της συλλογής), ώστε η ίδια επόμενη εμφάνιση να το βρίσκει στην cache.
+    """
+    engine.load(key, start, end)
+    report_key = cache.key('date report', REPORT_SOURCES[key], key, start, end, filters)
+    rows, summary = cache.fetch(report_key, lambda: select_summary(engine, key, start, end, filters))
+    return report_key, rows, summary
+
+def records_table(engine, key, rows, columns):
+    """Πίνακας των εγγραφών της αναφοράς με τις στήλες columns"""
+    records = engine.records(key, rows)
+    with timing.span('DataFrame', rows=len(records)):
+        return pd.DataFrame(records)[columns]
+
+def show_date_report(title, report):
+    """Αναφορά παραλαβών ή παραγγελιών σε εύρος ημερομηνιών με φίλτρα και ομαδοποίηση"""
+    st.subheader(title)
+    engine = get_query_engine()
+    key, prefix = report['key'], report['prefix']
+    entity_label, entity_collection, entity_filter = report['entity']
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        start_date = st.date_input("Από ημερομηνία", value=datetime.today() - timedelta(days=30), key=f"{prefix}start")
+        end_date = st.date_input("Έως ημερομηνία", value=datetime.today(), key=f"{prefix}end")
+
+        entity_options = get_options().get(entity_collection, "Όλοι")[0]
+        selected_entity = st.selectbox(entity_label, options=entity_options, key=f"{prefix}{entity_filter}")
+
+        filters = {}
+        if selected_entity != "Όλοι":
+            filters[entity_filter] = option_id(selected_entity)
+
+        selected_variety = st.selectbox("Ποικιλία", ["Όλες"] + engine.varieties(key), key=f"{prefix}variety")
+        if selected_variety != "Όλες":
+            filters['variety'] = selected_variety
+
+        if key == 'receipts':
+            selected_cert = st.selectbox("Πιστοποίηση", options=["Όλες"] + CERTIFICATIONS)
+            if selected_cert != "Όλες":
+                filters['certification'] = selected_cert
+
+        selected_paid = st.selectbox("Πληρώθηκε", ["Όλες", "Ναι", "Όχι"], key=f"{prefix}paid")
+        if selected_paid != "Όλες":
+            filters['paid'] = selected_paid
+
+        if 'storage' in engine.dimensions(key):
+            storage_options = get_options().get('storage_locations', "Όλοι")[0]
+            selected_storage = st.selectbox("Αποθηκευτικός Χώρος", storage_options, key=f"{prefix}storage")
+            if selected_storage != "Όλοι":
+                filters['storage'] = option_id(selected_storage)
+
+        # Επιλογή τύπου αθροίσματος
+        sum_type = st.selectbox("Τύπος Αθροίσματος", ["Σύνολο", "Ανά Νούμερο", "Ανά Ποιότητα"], key=f"{prefix}sum_type")
+
+    # Οι γραμμές και τα σύνολα της αναφοράς, μία φορά ανά φίλτρα και έκδοση δεδομένων
+    cache = get_report_cache()
+    report_key, rows, summary = date_report(engine, cache, key, start_date, end_date, filters)
+
+    with col2:
+        # Υπολογισμός συνολικών ποσοτήτων
+        if sum_type == "Σύνολο":
+            total_kg = summary['total_kg']
+        elif sum_type == "Ανά Νούμερο":
+            total_kg = sum(summary['sizes'].values())
+        else:  # Ανά Ποιότητα
+            total_kg = sum(summary['qualities'].values())
+
+        st.metric(report['count_label'], summary['count'])
+        st.metric("Συνολικά Κιλά", f"{total_kg} kg")
+        st.metric("Συνολική Αξία", f"{summary['total_value']:.2f} €")
+
+        # Εμφάνιση αναλυτικών ποσοτήτων
+        if sum_type == "Ανά Νούμερο":
+            st.write("**Ποσότητες ανά Νούμερο:**")
+            for size, quantity in summary['sizes'].items():
+                if quantity > 0:
+                    st.write(f"- {size}: {quantity} kg")
+
+        if sum_type == "Ανά Ποιότητα":
+            st.write("**Ποσότητες ανά Ποιότητα:**")
+            for quality, quantity in summary['qualities'].items():
+                if quantity > 0:
+                    st.write(f"- {quality}: {quantity} kg")
+
+    if not len(rows):
+        st.info(report['empty'])
+        return
+
+    # Ομαδοποίηση των φιλτραρισμένων εγγραφών (π.χ. ανά μήνα και ποικιλία)
+    group_by = [DIMENSION_LABELS[label] for label in st.multiselect(
+        "Ομαδοποίηση ανά", [DIMENSIONS[d] for d in engine.dimensions(key)], key=f"{prefix}group_by"
+    )]
+    if group_by:
+        groups = cache.fetch(('date report groups', report_key, tuple(group_by), sum_type), lambda: query_table(
+            engine.aggregate(key, rows, group_by, sizes=sum_type == "Ανά Νούμερο", qualities=sum_type == "Ανά Ποιότητα")
+        ))
+        st.dataframe(groups, use_container_width=True)
+
+    # Εμφάνιση πίνακα εγγραφών
+    table = cache.fetch(('date report table', report_key), lambda: records_table(engine, key, rows, report['columns']))
+    st.dataframe(table, use_container_width=True)
+
+    # Εξαγωγή σε αρχείο (ροή ανά τμήματα)
+    show_export(report_key, lambda: engine.records(key, rows), key,
+                f"{report['file_stem']}_{start_date}_{end_date}", f"export_{key}")
+
+def season_start(key):
+    """Η αρχή των ενεργών σεζόν της συλλογής (None αν όλη η συλλογή είναι στη μνήμη)"""
+    start = get_repository().active_start(key)
+    return date.fromisoformat(start) if start else None
+
+def entity_report(engine, cache, key, dimension, count_label, start, end):
+    """Ο πίνακας συνόλων ανά οντότητα από την cache
+
+    Τα ημερήσια συγκεντρωτικά ακολουθούν τους μήνες στη μνήμη, οπότε οι
+    μήνες του εύρους φορτώνονται πάντα πριν από το κλειδί.
+    """
+    engine.repository.load_range(key, start, end)
+    entity_key = cache.key('entity report', REPORT_SOURCES[key], key, dimension, count_label, start, end)
+    return cache.fetch(entity_key, lambda: query_table(engine.entity_totals(key, start, end), count_label))
+
+def show_entity_report(report):
+    """Πλήθος, κιλά και αξία ανά πελάτη ή παραγωγό (από τα ημερήσια συγκεντρωτικά), με γράφημα αξίας
+
+    Το εύρος ξεκινά από τις ενεργές σεζόν, οπότε η προεπιλογή δεν φορτώνει
+    ιστορικούς μήνες· με κενή αρχή η αναφορά καλύπτει όλο το ιστορικό.
+    """
+    title, key, dimension, count_label, chart_title, empty = report
+    st.subheader(title)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Από ημερομηνία (κενό: όλο το ιστορικό)", value=season_start(key),
+                                   key=f"{key}_entity_start")
+    with col2:
+        end_date = st.date_input("Έως ημερομηνία", value=None, key=f"{key}_entity_end")
+
+    df = entity_report(get_query_engine(), get_report_cache(), key, dimension, count_label, start_date, end_date)
+    if df.empty:
+        st.info(empty)
+        return
+
+    st.dataframe(df, use_container_width=True)
+
+    if len(df) > 1:
+        st.subheader(chart_title)
+        st.bar_chart(df.set_index(DIMENSIONS[dimension])[[MEASURE_LABELS['total_value']]])
+
+def pivot_table(engine, key, index, columns, value, start, end, index_label, columns_label):
+    """Ο πίνακας διασταύρωσης με τις επικεφαλίδες γραμμών/στηλών (δεν αλλάζει μετά την cache)"""
+    table = engine.pivot(key, index, columns, value, start=start, end=end)
+    table.index.name = index_label
+    table.columns.name = columns_label
+    return table
+
+def show_pivot():
+    """Πίνακας διασταύρωσης δύο διαστάσεων ή διάστασης × νούμερα/ποιότητες"""
+    st.subheader("Πίνακας Διασταύρωσης")
+    engine = get_query_engine()
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        key = COLLECTIONS[st.selectbox("Δεδομένα", list(COLLECTIONS), key="pivot_collection")]
+        start_date = st.date_input("Από ημερομηνία", value=None, key="pivot_start")
+        end_date = st.date_input("Έως ημερομηνία", value=None, key="pivot_end")
+
+    with col2:
+        labels = [DIMENSIONS[d] for d in engine.dimensions(key)]
+        index_label = st.selectbox("Γραμμές", labels, key="pivot_index")
+        columns_label = st.selectbox("Στήλες", list(BREAKDOWNS) + labels, key="pivot_columns")
+        index = DIMENSION_LABELS[index_label]
+        columns = BREAKDOWNS.get(columns_label) or DIMENSION_LABELS[columns_label]
+        value = 'total_kg'
+        if columns not in BREAKDOWNS.values():
+            value_label = st.selectbox("Τιμή", list(MEASURE_LABELS.values()), key="pivot_value")
+            value = next(measure for measure, label in MEASURE_LABELS.items() if label == value_label)
+
+    if columns == index:
+        st.info("Επιλέξτε διαφορετικές διαστάσεις για γραμμές και στήλες")
+        return
+    cache = get_report_cache()
+    engine.load(key, start_date, end_date)
+    pivot_key = cache.key('pivot', REPORT_SOURCES[key], key, index, columns, value, start_date, end_date)
+    table = cache.fetch(pivot_key, lambda: pivot_table(
+        engine, key, index, columns, value, start_date, end_date, index_label, columns_label
+    ))
+    if table.empty:
+        st.info("Δεν βρέθηκαν εγγραφές για τα επιλεγμένα κριτήρια")
+        return
+    st.dataframe(table, use_container_width=True)
+
+def show_trace():
+    """Ιχνηλασιμότητα: ποιοι πελάτες πήραν καρπό ενός LOT ή παραγωγού, και από πού προήλθε μια παραγγελία"""
+    st.subheader("Ιχνηλασιμότητα LOT")
+    repository = get_repository()
+    engine = get_query_engine()
+    cache = get_report_cache()
+
+    by_producer = st.radio("Αναζήτηση με", ["LOT", "Παραγωγό και ημερομηνία"], horizontal=True,
+                           key="trace_mode") != "LOT"
+    if by_producer:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            producer_options, _ = get_options().get('producers')
+            selected_producer = st.selectbox("Παραγωγός", producer_options, key="trace_producer")
+        with col2:
+            start_date = st.date_input("Από ημερομηνία", value=datetime.today(), key="trace_start")
+        with col3:
+            end_date = st.date_input("Έως ημερομηνία", value=None, key="trace_end")
+        if not selected_producer:
+            st.info("Δεν υπάρχουν καταχωρημένοι παραγωγοί")
+            return
+        producer_id = option_id(selected_producer)
+        # Οι μήνες που θα φορτώσει η αναζήτηση, πριν από το κλειδί της cache
+        engine.load('receipts', start_date, end_date or start_date)
+        trace_key = cache.key('trace', REPORT_SOURCES['trace'], producer_id, start_date, end_date)
+        rows = cache.fetch(trace_key, lambda: trace_producer(repository, producer_id, start_date, end_date))
+        file_stem = f"ιχνηλασιμότητα_παραγωγός_{producer_id}_{start_date}"
+    else:
+        lot = st.text_input("LOT παραλαβής ή παραγγελίας", key="trace_lot").strip()
+        if not lot:
+            st.info("Δώστε έναν LOT παραλαβής (προς τους πελάτες) ή παραγγελίας (προς τους παραγωγούς)")
+            return
+        load_lot(repository, lot)
+        trace_key = cache.key('trace', REPORT_SOURCES['trace'], lot)
+        rows = cache.fetch(trace_key, lambda: trace_lot(repository, lot))
+        file_stem = f"ιχνηλασιμότητα_{lot}"
+
+    if not rows:
+        st.info("Δεν βρέθηκαν κατανομές για τα επιλεγμένα κριτήρια")
+        return
+
+    df = pd.DataFrame(rows)
+    st.write(f"**{len(df)} κατανομές, {df['kg'].sum()} kg, "
+             f"{df['customer_id'].nunique()} πελάτες, {df['producer_id'].nunique()} παραγωγοί**")
+    st.dataframe(df.rename(columns=TRACE_LABELS)[list(TRACE_LABELS.values())], use_container_width=True)
+    show_export(trace_key, lambda: rows, 'trace', file_stem, "export_trace")
+
+def storage_report(day):
+    """Απόθεμα ανά αποθήκη με τις ποικιλίες της κατά φθίνοντα κιλά: (id, απόθεμα, ποικιλίες)"""
+    repository = get_repository()
+    report = []
+    for loc_id, usage in calculate_storage_usage(day).items():
+        varieties = {}
+        for item in storage_stock(repository, loc_id, day):
+            varieties[item['variety']] = varieties.get(item['variety'], 0) + item['kg']
+        report.append((loc_id, usage, sorted(varieties.items(), key=lambda item: -item[1])))
+    return report
+
+def show(data):
+    st.header("📈 Αναφορές και Εξαγωγές")
+
+    report_type = st.selectbox("Επιλέξτε τύπο αναφοράς", [
+        "Αναφορά Παραλαβών",
+        "Αναφορά Παραγγελιών",
+        "Αναφορά Πωλήσεων ανά Πελάτη",
+        "Αναφορά Αποθηκευτικών Χώρων",
+        "Αναφορά Παραγωγών ανά Παραγγελία",
+        "Πίνακας Διασταύρωσης",
+        "Ιχνηλασιμότητα LOT"
+    ])
+
+    if report_type in DATE_REPORTS:
+        show_date_report(report_type, DATE_REPORTS[report_type])
+
+    elif report_type in ENTITY_REPORTS:
+        show_entity_report(ENTITY_REPORTS[report_type])
+
+    elif report_type == "Πίνακας Διασταύρωσης":
+        show_pivot()
+
+    elif report_type == "Ιχνηλασιμότητα LOT":
+        show_trace()
+
+    elif report_type == "Αναφορά Αποθηκευτικών Χώρων":
+        st.subheader("Αναφορά Αποθηκευτικών Χώρων")
+        stock_date = st.date_input("Απόθεμα στο τέλος της ημερομηνίας (κενό: τρέχον)", value=None, key="stock_date")
+
+        # Το απόθεμα διαβάζεται από το καθολικό κινήσεων: τρέχον σε O(αποθήκες),
+        # σε ημερομηνία από το σημείο ελέγχου του μήνα και τις κινήσεις μετά από αυτό
+        cache = get_report_cache()
+        report = cache.fetch(cache.key('storage report', REPORT_SOURCES['storage'], stock_date),
+                             lambda: storage_report(stock_date))
+
+        with timing.span('storage report', rows=len(report)):
+            for loc_id, usage, ranked in report:
+                col1, col2, col3 = st.columns([2, 1, 1])
+
+                with col1:
+                    st.subheader(f"🏢 {usage['name']}")
+                    st.write(f"Χωρητικότητα: {usage['capacity']} kg")
+                    st.write(f"Απόθεμα: {usage['used']} kg")
+
+                    # Μπάρα προόδου
+                    if usage['capacity'] > 0:
+                        usage_percentage = (usage['used'] / usage['capacity']) * 100
+                        st.progress(max(0, min(100, int(usage_percentage))))
+                        st.write(f"Ποσοστό πλήρωσης: {usage_percentage:.1f}%")
+
+                with col2:
+                    st.metric("Συνολικά κιλά", f"{usage['used']} kg")
+                    st.metric("Ελεύθερος χώρος", f"{usage['capacity'] - usage['used']} kg")
+
+                with col3:
+                    if ranked:
+                        st.write("**Απόθεμα ανά ποικιλία:**")
+                        for variety, kg in ranked[:3]:  # Εμφάνιση μόνο των 3 μεγαλύτερων
+                            st.write(f"- {variety or '—'}: {kg} kg")
+                        if len(ranked) > 3:
+                            st.write(f"... και {len(ranked) - 3} ακόμη")
+                    else:
+                        st.info("Κενή αποθήκη")
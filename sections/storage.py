@@ -0,0 +1,162 @@
+"""Αποθηκευτικοί χώροι: προσθήκη, απόθεμα, κινήσεις, μεταφορές και διορθώσεις"""
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from core.constants import QUALITIES, SIZES
+from core.ledger import adjust, transfer
+from core.options import option_id
+from core.repository import ConflictError
+from core.services import storage_contents, storage_stock
+from sections.common import (calculate_storage_usage, can_edit, conflict_message, get_next_id, get_options,
+                             get_repository, notify, save_record)
+
+# Κινήσεις ανά σελίδα στο ιστορικό των αποθηκών
+STORAGE_PAGE_SIZE = 20
+
+# Ετικέτα -> (νούμερο, ποιότητα) για τις λίστες επιλογής
+GRADES = {
+    **{f"Νούμερο {size}": (size, '') for size in SIZES},
+    **{f"Ποιότητα {quality}": ('', quality) for quality in QUALITIES},
+}
+
+def stock_table(stock):
+    """Απόθεμα ενός χώρου ως πίνακας ποικιλία × νούμερο/ποιότητα"""
+    rows = [
+        {"Ποικιλία": item['variety'],
+         "Νούμερο/Ποιότητα": f"Νούμερο {item['size']}" if item['size'] else f"Ποιότητα {item['quality']}",
+         "Κιλά": item['kg']}
+        for item in stock
+    ]
+    return pd.DataFrame(rows)
+
+def show_stock_movement():
+    """Μεταφορά αποθέματος μεταξύ χώρων ή διόρθωση (απογραφή, φύρα)"""
+    st.subheader("🔁 Μεταφορά / Διόρθωση Αποθέματος")
+    repository = get_repository()
+    ledger = repository.index('movements', 'ledger')
+    storage_options, _ = get_options().get('storage_locations')
+    if not storage_options:
+        st.info("Δεν υπάρχουν αποθηκευτικοί χώροι")
+        return
+
+    movement_type = st.radio("Κίνηση", ["Μεταφορά", "Διόρθωση"], horizontal=True, key="movement_type")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        location_id = option_id(st.selectbox("Αποθήκη", storage_options, key="movement_location"))
+        if movement_type == "Μεταφορά":
+            to_location_id = option_id(st.selectbox("Προς αποθήκη", storage_options, key="movement_to"))
+    with col2:
+        varieties = sorted({key[1] for key in ledger.balances(location_id)})
+        if movement_type == "Διόρθωση":
+            variety = st.text_input("Ποικιλία", key="movement_variety")
+        elif varieties:
+            variety = st.selectbox("Ποικιλία", varieties, key="movement_variety_stock")
+        else:
+            st.info("Η αποθήκη δεν έχει απόθεμα")
+            return
+        size, quality = GRADES[st.selectbox("Νούμερο/Ποιότητα", list(GRADES), key="movement_grade")]
+        st.caption(f"Απόθεμα: {ledger.balance((location_id, variety, size, quality))} kg")
+    with col3:
+        if movement_type == "Μεταφορά":
+            kg = st.number_input("Κιλά", min_value=0, step=1, key="movement_kg")
+        else:
+            kg = st.number_input("Κιλά (+/−)", step=1, key="movement_adjust_kg")
+        day = st.date_input("Ημερομηνία", value=datetime.today(), key="movement_date")
+        note = st.text_input("Αιτιολογία", key="movement_note")
+
+    if st.button("✅ Καταχώρηση κίνησης", key="movement_submit"):
+        user = st.session_state.current_user
+        try:
+            if movement_type == "Μεταφορά":
+                transfer(repository, location_id, to_location_id, variety, size, quality, kg, day, user, note)
+            else:
+                adjust(repository, location_id, variety, size, quality, kg, day, user, note)
+        except ValueError as e:
+            st.error(str(e))
+        except ConflictError as e:
+            st.error(conflict_message(e))
+        else:
+            notify(f"✅ Η κίνηση ({movement_type.lower()} {kg} kg {variety}) καταχωρήθηκε")
+            st.rerun()
+
+def show(data):
+    st.header("🏢 Διαχείριση Αποθηκευτικών Χώρων")
+
+    # Προσθήκη νέου αποθηκευτικού χώρου
+    with st.form("add_storage_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            storage_id = st.number_input("ID Αποθήκης", min_value=1, step=1, value=get_next_id('storage_locations'))
+            storage_name = st.text_input("Όνομα Αποθήκης")
+            storage_capacity = st.number_input("Χωρητικότητα (kg)", min_value=1, step=100)
+
+        with col2:
+            storage_description = st.text_area("Περιγραφή")
+            storage_address = st.text_input("Διεύθυνση")
+            storage_manager = st.text_input("Υπεύθυνος")
+
+        if st.form_submit_button("➕ Προσθήκη Αποθήκης"):
+            new_storage = {
+                "id": storage_id,
+                "name": storage_name,
+                "capacity": storage_capacity,
+                "description": storage_description,
+                "address": storage_address,
+                "manager": storage_manager
+            }
+            try:
+                save_record('storage_locations', new_storage, expected_version=0)
+            except ConflictError as e:
+                st.error(conflict_message(e))
+            else:
+                notify(f"✅ Η αποθήκη {storage_name} προστέθηκε επιτυχώς!")
+                st.rerun()
+
+    # Εμφάνιση αποθηκευτικών χώρων και χρήσης
+    storage_usage = calculate_storage_usage()
+
+    for loc_id, usage in storage_usage.items():
+        with st.expander(f"🏢 {usage['name']} - {usage['used']}/{usage['capacity']} kg"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.write(f"**Χωρητικότητα:** {usage['capacity']} kg")
+                st.write(f"**Απόθεμα:** {usage['used']} kg")
+                st.write(f"**Ελεύθερος χώρος:** {usage['capacity'] - usage['used']} kg")
+
+                if usage['capacity'] > 0:
+                    usage_percentage = (usage['used'] / usage['capacity']) * 100
+                    st.progress(max(0, min(100, int(usage_percentage))))
+                    st.write(f"**Ποσοστό πλήρωσης:** {usage_percentage:.1f}%")
+
+            with col2:
+                # Το περιεχόμενο του expander εκτελείται πάντα· ο πίνακας αποθέματος
+                # υπολογίζεται μόνο όταν ζητηθεί, όπως και οι κινήσεις
+                if st.toggle("Απόθεμα ανά ποικιλία", key=f"storage_stock_{loc_id}"):
+                    stock = storage_stock(get_repository(), loc_id)
+                    if stock:
+                        st.dataframe(stock_table(stock), use_container_width=True, hide_index=True)
+                    else:
+                        st.info("Κενή αποθήκη")
+
+            if usage['count']:
+                # Οι κινήσεις φορτώνονται μόνο κατόπιν αιτήματος και ανά σελίδα
+                if st.toggle(f"Κινήσεις ({usage['count']})", key=f"storage_items_{loc_id}"):
+                    pages = (usage['count'] - 1) // STORAGE_PAGE_SIZE + 1
+                    page = st.number_input("Σελίδα", min_value=1, max_value=pages, value=1, step=1, key=f"storage_page_{loc_id}")
+                    offset = (page - 1) * STORAGE_PAGE_SIZE
+                    for item in storage_contents(get_repository(), loc_id, offset, STORAGE_PAGE_SIZE):
+                        st.write(f"- {item['date']} {item['type']} ({item['reference']}): "
+                                 f"{item['kg']:+} kg {item['variety']}")
+
+    if can_edit():
+        show_stock_movement()
+
+    # Λίστα όλων των αποθηκευτικών χώρων
+    if data['storage_locations']:
+        st.subheader("📋 Κατάλογος Αποθηκευτικών Χώρων")
+        df_storage = pd.DataFrame(data['storage_locations'])
+        st.dataframe(df_storage[['id', 'name', 'capacity', 'description']], use_container_width=True)
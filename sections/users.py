@@ -0,0 +1,75 @@
+"""Διαχείριση χρηστών (μόνο για τον διαχειριστή)"""
+import pandas as pd
+import streamlit as st
+
+from core.services import hash_password
+from sections.common import delete_record, notify, save_record
+
+def show(data):
+    st.header("👥 Διαχείριση Χρηστών")
+
+    if st.session_state.user_role != 'admin':
+        st.warning("⚠️ Μόνο ο διαχειριστής μπορεί να διαχειριστεί χρήστες")
+        return
+
+    # Προσθήκη νέου χρήστη
+    with st.form("add_user_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            username = st.text_input("Όνομα Χρήστη")
+            password = st.text_input("Κωδικός Πρόσβασης", type="password")
+            confirm_password = st.text_input("Επιβεβαίωση Κωδικού", type="password")
+
+        with col2:
+            full_name = st.text_input("Πλήρες Όνομα")
+            role = st.selectbox("Ρόλος", ["admin", "editor", "viewer"])
+            agency = st.text_input("Αντιπροσωπεία")
+
+        if st.form_submit_button("➕ Προσθήκη Χρήστη"):
+            if not username or not password:
+                st.error("Συμπληρώστε όλα τα απαραίτητα πεδία")
+            elif password != confirm_password:
+                st.error("Οι κωδικοί δεν ταιριάζουν")
+            elif username in data['users']:
+                st.error("Το όνομα χρήστη υπάρχει ήδη")
+            else:
+                new_user = {
+                    'password': hash_password(password),
+                    'role': role,
+                    'full_name': full_name,
+                    'agency': agency
+                }
+                save_record('users', new_user, username)
+                notify(f"✅ Ο χρήστης {username} προστέθηκε επιτυχώς!")
+                st.rerun()
+
+    # Λίστα χρηστών
+    st.subheader("📋 Κατάλογος Χρηστών")
+    users_data = []
+    for username, user_info in data['users'].items():
+        users_data.append({
+            'Όνομα Χρήστη': username,
+            'Πλήρες Όνομα': user_info.get('full_name', ''),
+            'Ρόλος': user_info.get('role', ''),
+            'Αντιπροσωπεία': user_info.get('agency', '')
+        })
+
+    if users_data:
+        df_users = pd.DataFrame(users_data)
+        st.dataframe(df_users, use_container_width=True)
+
+        # Επιλογή χρήστη για διαγραφή
+        user_options = [f"{user['Όνομα Χρήστη']} ({user['Ρόλος']})" for user in users_data]
+        selected_user = st.selectbox("Επιλέξτε χρήστη για διαγραφή", user_options)
+
+        if selected_user and st.button("🗑️ Διαγραφή Χρήστη"):
+            username_to_delete = selected_user.split(" ")[0]
+            if username_to_delete == st.session_state.current_user:
+                st.error("Δεν μπορείτε να διαγράψετε τον εαυτό σας")
+            else:
+                delete_record('users', username_to_delete)
+                notify(f"✅ Ο χρήστης {username_to_delete} διαγράφηκε επιτυχώς!")
+                st.rerun()
+    else:
+        st.info("Δεν υπάρχουν καταχωρημένοι χρήστες")
@@ -0,0 +1,38 @@
+"""Κοινά fixtures: προσωρινά αποθετήρια όπως της εφαρμογής"""
+import pytest
+
+from benchmarks.generate import write_store
+from core.query import QueryEngine
+from core.services import open_repository
+from core.storage import open_store
+
+# Παραλαβές των συνθετικών δεδομένων (2020–2026, άρα και ιστορικοί μήνες)
+HISTORY_RECEIPTS = 600
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Κενή μηχανή SQLite"""
+    store = open_store('sqlite', path=str(tmp_path / 'data.db'), directory=str(tmp_path))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Κενό αποθετήριο SQLite (με τα δείγματα του init_data), χωρίς write-behind"""
+    return open_repository('sqlite', str(tmp_path / 'data.db'), str(tmp_path), write_behind=False)
+
+
+@pytest.fixture
+def history(tmp_path):
+    """Αποθετήριο με συνθετικά δεδομένα: μόνο οι ενεργές σεζόν είναι στη μνήμη"""
+    store = open_store('sqlite', path=str(tmp_path / 'data.db'), directory=str(tmp_path))
+    write_store(store, HISTORY_RECEIPTS)
+    store.close()
+    return open_repository('sqlite', str(tmp_path / 'data.db'), str(tmp_path), write_behind=False)
+
+
+@pytest.fixture
+def engine(history):
+    return QueryEngine(history)
@@ -0,0 +1,99 @@
+"""Σελίδες εγγραφών: ταξινόμηση, φίλτρα, εύρος ημερομηνιών και cache ανά έκδοση"""
+import pytest
+
+from core.browser import RecordBrowser
+
+RECEIPTS = [
+    {'id': 1, 'receipt_date': '2026-09-03', 'producer_name': 'Παπαδόπουλος',
+     'variety': 'Navel', 'total_kg': 120, 'crates': 12},
+    {'id': 2, 'receipt_date': '2026-09-10', 'producer_name': 'Αθανασίου',
+     'variety': 'Valencia', 'total_kg': 0, 'crates': None},
+    {'id': 3, 'receipt_date': '2026-09-10', 'producer_name': 'Νικολάου',
+     'variety': 'navel late', 'total_kg': 7.5, 'crates': 0.5},
+    {'id': 4, 'receipt_date': '2026-09-21', 'producer_name': '',
+     'variety': 'Κλημεντίνη', 'total_kg': 60, 'crates': ''},
+    {'id': 5, 'receipt_date': '2026-10-02', 'producer_name': 'Βασιλείου',
+     'variety': 'Navel', 'total_kg': 45, 'crates': 'άγνωστο'},
+    {'id': 6, 'receipt_date': '2026-10-05', 'producer_name': 'Παπαδόπουλος',
+     'variety': 'Valencia', 'total_kg': 300, 'crates': 30},
+]
+
+
+@pytest.fixture
+def browser(repository):
+    for record in RECEIPTS:
+        repository.upsert('receipts', dict(record))
+    return RecordBrowser(repository, 'receipts', max_cached=2)
+
+
+def ids(records):
+    return [record['id'] for record in records]
+
+
+def test_unsorted_page_is_a_slice(browser):
+    records, total = browser.page(2, 4)
+    assert total == len(RECEIPTS)
+    assert ids(records) == [5, 6]
+
+
+def test_sort_mixed_and_empty_values(browser):
+    # Αριθμοί, μετά κείμενα, και τα κενά (None, '') στο τέλος με τη σειρά της συλλογής
+    records, _ = browser.page(1, 10, 'crates')
+    assert ids(records) == [3, 1, 6, 5, 2, 4]
+    records, _ = browser.page(1, 10, 'crates', descending=True)
+    assert ids(records) == [5, 6, 1, 3, 2, 4]
+    records, _ = browser.page(1, 10, 'producer_name')
+    assert ids(records) == [2, 5, 3, 1, 6, 4]
+    records, _ = browser.page(1, 10, 'producer_name', descending=True)
+    assert ids(records) == [1, 6, 3, 5, 2, 4]
+
+
+def test_column_filter(browser):
+    records, total = browser.page(1, 10, filter_column='variety', filter_text='NAVEL')
+    assert total == 3
+    assert ids(records) == [1, 3, 5]
+    records, total = browser.page(1, 10, 'total_kg', True, filter_column='variety', filter_text='navel')
+    assert ids(records) == [1, 5, 3]
+    assert browser.page(1, 10, filter_column='variety', filter_text='Μανταρίνι') == ([], 0)
+
+
+def test_search_in_all_fields(browser):
+    # Χωρίς στήλη: ευρετήριο κειμένου, με τόνους/κεφαλαία αδιάφορα και σειρά συνάφειας
+    records, total = browser.page(1, 10, filter_text='παπαδοπουλος')
+    assert total == 2
+    assert sorted(ids(records)) == [1, 6]
+    records, _ = browser.page(1, 10, filter_text='navel')
+    assert set(ids(records)) >= {1, 5}
+    # Η ταξινόμηση εφαρμόζεται μετά την αναζήτηση
+    records, _ = browser.page(1, 10, 'total_kg', True, filter_text='παπαδοπουλος')
+    assert ids(records) == [6, 1]
+
+
+def test_date_bounded_pages(browser):
+    records, total = browser.page(1, 10, start='2026-09-10', end='2026-09-21')
+    assert total == 3
+    assert ids(records) == [2, 3, 4]
+    assert browser.page(1, 10, start='2026-10-01')[1] == 2
+    assert browser.page(1, 10, end='2026-09-03')[1] == 1
+    records, total = browser.page(2, 1, 'total_kg', True, start='2026-09-01', end='2026-09-30')
+    assert total == 4
+    assert ids(records) == [4]
+    assert browser.page(1, 10, start='2026-11-01') == ([], 0)
+
+
+def test_cache_follows_collection_version(browser, repository):
+    ordered = browser._ordered('total_kg', False, None, '')
+    assert ids(ordered) == [2, 3, 5, 4, 1, 6]
+    assert browser._ordered('total_kg', False, None, '') is ordered
+
+    repository.upsert('receipts', {**RECEIPTS[2], 'total_kg': 1000})
+    assert browser._ordered('total_kg', False, None, '') is not ordered
+    records, _ = browser.page(1, 10, 'total_kg')
+    assert ids(records) == [2, 5, 4, 1, 6, 3]
+    repository.delete('receipts', 6)
+    records, total = browser.page(1, 10, 'total_kg')
+    assert total == 5
+    assert ids(records) == [2, 5, 4, 1, 3]
+    # Μέχρι max_cached σειρές, οι παλαιότερες αποβάλλονται
+    browser.page(1, 10, 'variety')
+    assert len(browser._cache) == 2
@@ -0,0 +1,137 @@
+"""Μαζική εισαγωγή παραλαβών: ανάγνωση CSV/xlsx, έλεγχος ανά γραμμή και μία καταχώρηση"""
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from core.bulk_import import check_columns, import_receipts, read_batch, validate_receipts
+
+PRODUCERS = [
+    {'id': 1, 'name': 'Παραγωγός Α'},
+    {'id': 2, 'name': 'Παραγωγός Β'},
+    {'id': 3, 'name': 'Διπλό Όνομα'},
+    {'id': 4, 'name': 'διπλό όνομα'},
+]
+STORAGE_LOCATIONS = [{'id': 1, 'name': 'Αποθήκη Α'}, {'id': 2, 'name': 'Αποθήκη Β'}]
+
+VALID_CSV = """receipt_date,producer_id,producer_name,variety,storage_location,size_16,size_18,quality_Ι,certifications,agreed_price_per_kg,paid
+2026-10-01,2,,Navel,Αποθήκη Α,100,50,,"GlobalGAP, Βιολογικό",0.45,Ναι
+02/10/2026,, παραγωγός α ,Valencia,αποθήκη β,,,80,,,
+2026-10-03,1,,Navel,Αποθήκη Β,10,,5,ΟΠ,0.5,Όχι
+"""
+
+
+def frame(text):
+    return read_batch(io.BytesIO(text.encode('utf-8')), 'παραλαβές.csv')
+
+
+def validate(data, first_id=100):
+    return validate_receipts(data, PRODUCERS, STORAGE_LOCATIONS, first_id, 'admin', '2026-10-17 10:00:00')
+
+
+def test_valid_rows_become_records():
+    records, rejected = validate(frame(VALID_CSV))
+    assert rejected.empty
+    assert [record['id'] for record in records] == [100, 101, 102]
+    first, second, third = records
+    assert first['producer_id'] == 2 and first['producer_name'] == 'Παραγωγός Β'
+    assert first['certifications'] == ['GlobalGAP', 'Βιολογικό']
+    assert first['size_quantities']['16'] == 100 and first['size_quantities']['18'] == 50
+    assert first['total_kg'] == 150 and first['total_value'] == pytest.approx(67.5)
+    assert first['paid'] == 'Ναι' and first['storage_location_id'] == 1
+    # Παραγωγός και αποθήκη από το όνομα (κενά/κεφαλαία αδιάφορα), ημερομηνία ΗΗ/ΜΜ/ΕΕΕΕ
+    assert second['producer_id'] == 1 and second['storage_location_id'] == 2
+    assert second['receipt_date'] == '2026-10-02'
+    assert second['quality_quantities']['Ι'] == 80 and second['total_kg'] == 80
+    assert second['agreed_price_per_kg'] == 0 and second['paid'] == 'Όχι' and second['certifications'] == []
+    assert third['lot'] == '261003-1-NAV'
+
+
+def test_rejected_rows_name_every_error():
+    data = frame(
+        "receipt_date,producer_id,producer_name,variety,storage_location_id,size_16,quality_ΙΙ,certifications,paid\n"
+        "2026-10-01,1,,Navel,1,100,,,Ναι\n"
+        "2026-13-01,9,,Navel,1,-5,,,\n"
+        "2026-10-02,,Διπλό όνομα,Navel,3,12.5,x,,\n"
+        "2026-10-03,2,,,2,0,0,\"GlobalGAP, Άγνωστη\",ίσως\n"
+        "2026-10-04,2,,Navel,2,10,,Βιολογικό,Όχι\n"
+    )
+    records, rejected = validate(data)
+    assert [record['id'] for record in records] == [100, 101]
+    assert [record['receipt_date'] for record in records] == ['2026-10-01', '2026-10-04']
+    assert rejected['row'].tolist() == [3, 4, 5]
+    errors = [message.split('; ') for message in rejected['errors']]
+    assert errors[0] == ["Μη έγκυρη ημερομηνία", "Άγνωστος παραγωγός", "Μη έγκυρη ποσότητα στη στήλη size_16",
+                         "Μηδενική ποσότητα"]
+    # Ίδιο όνομα σε δύο παραγωγούς: δεν αντιστοιχίζεται
+    assert errors[1] == ["Άγνωστος παραγωγός", "Άγνωστος αποθηκευτικός χώρος",
+                         "Μη έγκυρη ποσότητα στη στήλη size_16", "Μη έγκυρη ποσότητα στη στήλη quality_ΙΙ"]
+    assert errors[2] == ["Λείπει η ποικιλία", "Μηδενική ποσότητα", "Η στήλη paid δέχεται Ναι ή Όχι",
+                         "Άγνωστη πιστοποίηση"]
+    # Οι αρχικές τιμές μένουν για διόρθωση και επανάληψη
+    assert rejected['size_16'].tolist() == ['-5', '12.5', '0']
+
+
+def test_check_columns():
+    assert check_columns(frame(VALID_CSV)) == []
+    problems = check_columns(frame("date,producer,variety,extra\n2026-10-01,1,Navel,x\n"))
+    assert problems == [
+        "Λείπει η στήλη receipt_date",
+        "Λείπει η στήλη producer_id ή producer_name",
+        "Λείπει η στήλη storage_location_id ή storage_location",
+        "Άγνωστες στήλες: date, producer, extra",
+    ]
+
+
+def test_xlsx_and_csv_gz_read_like_csv():
+    expected = frame(VALID_CSV)
+    gz = io.BytesIO(gzip.compress(VALID_CSV.encode('utf-8')))
+    pd.testing.assert_frame_equal(read_batch(gz, 'ΠΑΡΑΛΑΒΕΣ.CSV.GZ'), expected)
+
+    # Στο Excel οι αριθμοί και οι ημερομηνίες έχουν τύπο· διαβάζονται ως κείμενο
+    sheet = pd.read_csv(io.StringIO(VALID_CSV), dtype=str, keep_default_na=False)
+    sheet['receipt_date'] = pd.to_datetime(['2026-10-01', '2026-10-02', '2026-10-03'])
+    sheet['size_16'] = [100, None, 10]
+    sheet[' variety '] = sheet.pop('variety')
+    xlsx = io.BytesIO()
+    sheet.to_excel(xlsx, index=False)
+    xlsx.seek(0)
+    data = read_batch(xlsx, 'παραλαβές.xlsx')
+    assert 'variety' in data and data['receipt_date'][0].startswith('2026-10-01')
+    records, rejected = validate(data)
+    assert rejected.empty
+    assert [record['receipt_date'] for record in records] == ['2026-10-01', '2026-10-02', '2026-10-03']
+    assert [record['total_kg'] for record in records] == [150, 80, 15]
+    assert [record['producer_id'] for record in records] == [2, 1, 1]
+
+
+def test_import_commits_all_rows_in_one_batch(repository, monkeypatch):
+    batches = []
+    write_batch = repository.store.write_batch
+
+    def counting(key, upserts, deletes=()):
+        upserts = list(upserts)
+        batches.append((key, len(upserts)))
+        return write_batch(key, upserts, deletes)
+
+    monkeypatch.setattr(repository.store, 'write_batch', counting)
+    first_id = repository.next_id('receipts')
+    # Η τελευταία γραμμή επαναλαμβάνει την τρίτη (ίδια ημερομηνία, παραγωγός και ποικιλία)
+    records, rejected = import_receipts(repository, frame(VALID_CSV + VALID_CSV.splitlines()[-1] + '\n'), 'admin')
+
+    assert rejected.empty
+    assert [key for key, _ in batches].count('receipts') == 1
+    assert ('receipts', 4) in batches
+    assert [record['id'] for record in records] == list(range(first_id, first_id + 4))
+    # Οι LOT γίνονται μοναδικοί και μεταξύ γραμμών του ίδιου αρχείου
+    assert [record['lot'] for record in records][2:] == ['261003-1-NAV', '261003-1-NAV-2']
+    assert repository.get('receipts', first_id)['total_kg'] == 150
+    ledger = repository.index('movements', 'ledger')
+    assert ledger.on_hand(1) == 150 and ledger.on_hand(2) == 110
+
+
+def test_import_rejects_missing_columns(repository):
+    with pytest.raises(ValueError, match='receipt_date'):
+        import_receipts(repository, frame("producer_id,variety,storage_location_id\n1,Navel,1\n"), 'admin')
+    assert not list(repository.view('receipts'))
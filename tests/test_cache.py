@@ -0,0 +1,61 @@
+"""Cache αναφορών: μια ίδια επόμενη εμφάνιση βρίσκει το αποτέλεσμα, και σε ιστορικούς μήνες"""
+from datetime import date
+
+import pytest
+
+from core.cache import ResultCache
+from sections.reports import date_report, entity_report
+
+OLD_START, OLD_END = date(2021, 1, 1), date(2021, 3, 31)
+
+
+@pytest.fixture
+def cache(history):
+    return ResultCache(history)
+
+
+def test_repeated_date_report_is_a_hit(history, engine, cache):
+    assert OLD_END.isoformat() < history.active_start('receipts')
+    first_key, first_rows, _ = date_report(engine, cache, 'receipts', OLD_START, OLD_END, {})
+    key, rows, _ = date_report(engine, cache, 'receipts', OLD_START, OLD_END, {})
+    assert len(first_rows) > 0
+    assert key == first_key
+    assert rows is first_rows
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_repeated_entity_report_is_a_hit(engine, cache):
+    first = entity_report(engine, cache, 'orders', 'customer', 'Παραγγελίες', None, None)
+    again = entity_report(engine, cache, 'orders', 'customer', 'Παραγγελίες', None, None)
+    assert again is first
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_alternating_reports_are_hits(history, engine, cache):
+    # Η αναφορά ανά οντότητα με την προεπιλογή της (από τις ενεργές σεζόν).
+    # Η πρώτη φόρτωση των ιστορικών μηνών αλλάζει την έκδοση (οι γραμμές
+    # του ειδώλου μετακινούνται), μετά όμως οι εναλλαγές βρίσκουν την cache.
+    season = date.fromisoformat(history.active_start('receipts'))
+
+    def show_both():
+        entity_report(engine, cache, 'receipts', 'producer', 'Παραλαβές', season, None)
+        date_report(engine, cache, 'receipts', OLD_START, OLD_END, {'paid': 'Ναι'})
+
+    show_both()
+    show_both()
+    before = cache.stats()
+    for _ in range(3):
+        show_both()
+    assert cache.stats()['misses'] == before['misses']
+    assert cache.stats()['hits'] == before['hits'] + 6
+
+
+def test_change_gives_new_result(history, engine, cache):
+    _, rows, summary = date_report(engine, cache, 'receipts', OLD_START, OLD_END, {})
+    record = history.get('receipts', int(engine.mirror('receipts').ids[rows[0]]))
+    history.upsert('receipts', dict(record, total_kg=record['total_kg'] + 100))
+    _, _, changed = date_report(engine, cache, 'receipts', OLD_START, OLD_END, {})
+    assert cache.stats()['misses'] == 2
+    assert changed['total_kg'] == summary['total_kg'] + 100
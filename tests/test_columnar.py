@@ -0,0 +1,79 @@
+"""Ταξινομημένο ευρετήριο ημερομηνιών: όρια εύρους, εισαγωγή και διαγραφή"""
+import random
+
+import numpy as np
+import pytest
+
+from core.columnar import SortedDateIndex
+
+DATES = np.array([5, 3, 9, 3, 7, 1, 9, 5], dtype=np.int32)
+
+
+def expected(dates, start=None, end=None):
+    """Γραμμές με start <= ημερομηνία <= end κατά (ημερομηνία, σειρά εισαγωγής)"""
+    rows = [row for row, day in enumerate(dates)
+            if (start is None or day >= start) and (end is None or day <= end)]
+    return sorted(rows, key=lambda row: dates[row])
+
+
+@pytest.fixture
+def index():
+    index = SortedDateIndex(capacity=4)
+    index.rebuild(DATES)
+    return index
+
+
+def test_rebuild_is_sorted_and_stable(index):
+    assert len(index) == len(DATES)
+    assert list(index.between()) == expected(DATES)
+
+
+@pytest.mark.parametrize('start, end', [
+    (3, 7), (1, 9), (3, 3), (9, None), (None, 1), (4, 6), (0, 100),
+])
+def test_range_includes_both_ends(index, start, end):
+    assert list(index.between(start, end)) == expected(DATES, start, end)
+
+
+@pytest.mark.parametrize('start, end', [(2, 2), (10, 20), (-5, 0), (7, 5)])
+def test_empty_range(index, start, end):
+    assert len(index.between(start, end)) == 0
+
+
+def test_rebuild_of_selected_rows():
+    index = SortedDateIndex()
+    rows = np.array([0, 2, 4, 6], dtype=np.int64)
+    index.rebuild(DATES, rows)
+    assert list(index.between()) == [0, 4, 2, 6]
+    assert list(index.between(9, 9)) == [2, 6]
+
+
+def test_insert_and_remove_keep_the_order():
+    rng = random.Random(3)
+    index = SortedDateIndex(capacity=2)
+    dates = {}
+    for row in range(300):
+        dates[row] = rng.randint(1, 40)
+        index.insert(dates[row], row)
+    for row in rng.sample(sorted(dates), 120):
+        index.remove(dates.pop(row), row)
+    # Αφαίρεση γραμμής που δεν υπάρχει (ή με άλλη ημερομηνία) δεν αλλάζει τίποτα
+    index.remove(41, 0)
+    index.remove(dates[min(dates)] + 100, min(dates))
+
+    assert len(index) == len(dates)
+    assert np.all(np.diff(index.dates[:len(index)]) >= 0)
+    for start, end in [(None, None), (10, 20), (15, 15), (1, 1), (40, None)]:
+        rows = index.between(start, end)
+        assert sorted(rows) == sorted(row for row, day in dates.items()
+                                      if (start is None or day >= start) and (end is None or day <= end))
+        assert all((start is None or dates[row] >= start) and (end is None or dates[row] <= end) for row in rows)
+
+
+def test_insert_after_equal_dates():
+    index = SortedDateIndex()
+    for row, day in enumerate([4, 2, 4, 4]):
+        index.insert(day, row)
+    assert list(index.between(4, 4)) == [0, 2, 3]
+    index.remove(4, 2)
+    assert list(index.between(4, 4)) == [0, 3]
@@ -0,0 +1,110 @@
+"""Εξαγωγή σε τμήματα: csv.gz, xlsx (write-only) και npz διαβάζονται πίσω ίδια με το ερώτημα"""
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+from core.constants import QUALITIES, SIZES
+from core.export import NUMERIC_TYPES, columns_for, export
+
+CHUNK = 64
+
+
+@pytest.fixture(params=['receipts', 'orders'])
+def exported(request, engine):
+    """(συλλογή, εγγραφές του ερωτήματος) με περισσότερα από ένα τμήματα"""
+    key = request.param
+    records = engine.records(key, engine.select(key, start=date(2022, 1, 1), end=date(2025, 12, 31)))
+    assert len(records) > 2 * CHUNK
+    return key, records
+
+
+def expected(record, column):
+    """Η τιμή μιας στήλης όπως πρέπει να βγει από την εγγραφή"""
+    if column.startswith('size_'):
+        return (record.get('size_quantities') or {}).get(column[5:], 0)
+    if column.startswith('quality_'):
+        return (record.get('quality_quantities') or {}).get(column[8:], 0)
+    value = record.get(column)
+    if isinstance(value, list):
+        return ', '.join(str(v) for v in value)
+    return value
+
+
+def test_columns():
+    columns = columns_for('receipts')
+    assert columns[:2] == ['id', 'receipt_date']
+    assert columns[-len(SIZES) - len(QUALITIES):] == [f'size_{s}' for s in SIZES] + [f'quality_{q}' for q in QUALITIES]
+    assert columns_for('allocations')[-1] == 'created_at'
+
+
+def test_csv_gz_round_trip(exported):
+    key, records = exported
+    buffer = io.BytesIO()
+    export(iter(records), key, 'csv.gz', buffer, chunk_size=CHUNK)
+
+    with gzip.open(io.BytesIO(buffer.getvalue()), 'rt', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        assert next(reader) == columns_for(key)
+        rows = list(reader)
+    assert len(rows) == len(records)
+    for record, row in zip(records, rows):
+        for column, text in zip(columns_for(key), row):
+            value = expected(record, column)
+            assert text == ('' if value is None else str(value)), column
+
+
+def test_xlsx_round_trip(exported):
+    from openpyxl import load_workbook
+
+    key, records = exported
+    buffer = io.BytesIO()
+    export(iter(records), key, 'xlsx', buffer, chunk_size=CHUNK)
+
+    workbook = load_workbook(io.BytesIO(buffer.getvalue()), read_only=True)
+    assert workbook.sheetnames == [key]
+    rows = list(workbook[key].iter_rows(values_only=True))
+    workbook.close()
+    assert list(rows[0]) == columns_for(key)
+    assert len(rows) - 1 == len(records)
+    for record, row in zip(records, rows[1:]):
+        for column, value in zip(columns_for(key), row):
+            # Το xlsx δεν έχει κενό κείμενο (το '' διαβάζεται ως κενό κελί) και
+            # αποθηκεύει τους δεκαδικούς με 15 σημαντικά ψηφία
+            wanted = expected(record, column)
+            if isinstance(wanted, float):
+                assert value == pytest.approx(wanted, rel=1e-12), column
+            else:
+                assert value == (None if wanted == '' else wanted), column
+
+
+def test_npz_round_trip(exported):
+    key, records = exported
+    buffer = io.BytesIO()
+    export(iter(records), key, 'npz', buffer, chunk_size=CHUNK)
+
+    with np.load(io.BytesIO(buffer.getvalue()), allow_pickle=False) as archive:
+        schema = json.loads(str(archive['schema']))
+        assert schema['columns'] == columns_for(key)
+        assert schema['parts'] == -(-len(records) // CHUNK)
+        for column in schema['columns']:
+            parts = [archive[f'part-{part:05d}/{column}'] for part in range(schema['parts'])]
+            assert all(len(array) <= CHUNK for array in parts)
+            values = np.concatenate(parts)
+            wanted = [expected(record, column) for record in records]
+            if column in NUMERIC_TYPES:
+                assert values.dtype == np.dtype(NUMERIC_TYPES[column])
+                assert np.allclose(values, [v or 0 for v in wanted]), column
+            else:
+                assert values.tolist() == ['' if v is None else str(v) for v in wanted], column
+
+
+def test_empty_export_has_header_only():
+    buffer = io.BytesIO()
+    export([], 'receipts', 'csv.gz', buffer)
+    with gzip.open(io.BytesIO(buffer.getvalue()), 'rt', encoding='utf-8') as f:
+        assert list(csv.reader(f)) == [columns_for('receipts')]
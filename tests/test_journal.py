@@ -0,0 +1,85 @@
+"""Μηχανή journal: συμπύκνωση του ημερολογίου σε στιγμιότυπο χωρίς απώλεια αλλαγών"""
+import os
+
+import pytest
+
+from core import journal
+from core.journal import JournalStore
+
+
+def receipt(record_id, kg):
+    return {'id': record_id, 'receipt_date': '2026-10-01', 'variety': 'Κλημεντίνη', 'total_kg': kg}
+
+
+def journal_lines(store, key):
+    path = store.journal_path(key)
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+
+@pytest.fixture
+def journal_store(tmp_path):
+    store = JournalStore(str(tmp_path), compact_entries=1000, fsync=False)
+    yield store
+    store.close()
+
+
+def reopened(tmp_path, key):
+    store = JournalStore(str(tmp_path), fsync=False)
+    try:
+        return sorted(store.load(key), key=lambda record: record['id'])
+    finally:
+        store.close()
+
+
+def test_compact_merges_journal_into_snapshot(tmp_path, journal_store):
+    for record_id in range(1, 6):
+        journal_store.upsert('receipts', record_id, receipt(record_id, record_id * 10))
+    journal_store.upsert('receipts', 2, receipt(2, 25))
+    journal_store.delete('receipts', 4)
+    journal_store.write_batch('receipts', [(6, receipt(6, 60))], deletes=[5])
+    expected = sorted(journal_store.load('receipts'), key=lambda record: record['id'])
+    assert journal_lines(journal_store, 'receipts') == 8
+
+    journal_store.compact('receipts')
+    assert not os.path.exists(journal_store.journal_path('receipts'))
+    assert reopened(tmp_path, 'receipts') == expected
+    assert [record['total_kg'] for record in expected] == [10, 25, 30, 60]
+
+
+def test_writes_during_compaction_are_kept(tmp_path, journal_store, monkeypatch):
+    journal_store.upsert('receipts', 1, receipt(1, 10))
+    write = journal.atomic_write_json
+
+    def write_and_append(path, value):
+        # Εγγραφή της ίδιας διεργασίας ενώ γράφεται το νέο στιγμιότυπο
+        write(path, value)
+        if path == journal_store.snapshot_path('receipts'):
+            journal_store.upsert('receipts', 2, receipt(2, 20))
+
+    monkeypatch.setattr(journal, 'atomic_write_json', write_and_append)
+    journal_store.compact('receipts')
+    monkeypatch.undo()
+
+    assert journal_lines(journal_store, 'receipts') == 1
+    assert [record['id'] for record in reopened(tmp_path, 'receipts')] == [1, 2]
+    journal_store.compact('receipts')
+    assert journal_lines(journal_store, 'receipts') == 0
+
+
+def test_automatic_compaction(tmp_path):
+    store = JournalStore(str(tmp_path), compact_entries=5, fsync=False)
+    for record_id in range(1, 13):
+        store.upsert('receipts', record_id, receipt(record_id, record_id))
+    store.close()
+    assert journal_lines(store, 'receipts') < 12
+    assert [record['id'] for record in reopened(tmp_path, 'receipts')] == list(range(1, 13))
+
+
+def test_torn_last_line_is_ignored(tmp_path, journal_store):
+    journal_store.upsert('receipts', 1, receipt(1, 10))
+    with open(journal_store.journal_path('receipts'), 'a', encoding='utf-8') as f:
+        f.write('{"op": "upsert", "id": 2, "rec')
+    assert [record['id'] for record in reopened(tmp_path, 'receipts')] == [1]
@@ -0,0 +1,163 @@
+"""Καθολικό αποθέματος: post/sync έναντι πλήρους επανυπολογισμού από τις εγγραφές"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from core.constants import QUALITIES, SIZES
+from core.ledger import StockLedger, adjust, movement_lines, post, sync, target_lines, transfer
+
+VARIETIES = ['Navel', 'Valencia', 'Κλημεντίνη']
+DAYS = [(date(2026, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(0, 120, 3)]
+
+
+def recompute(repository, day=None):
+    """Υπόλοιπα από την αρχή: ό,τι πρέπει να καταχωρούν οι εγγραφές συν οι χειροκίνητες κινήσεις"""
+    balances = {}
+
+    def add(line_day, key, kg):
+        if day is None or line_day <= day:
+            balances[key] = balances.get(key, 0) + kg
+
+    for key in ('receipts', 'orders'):
+        for record in repository.store.iter_records(key):
+            for (line_day, line_key), kg in target_lines(key, record).items():
+                add(line_day, line_key, kg)
+    for movement in repository.view('movements'):
+        if movement.get('source_id') is None:
+            for line_key, kg in movement_lines(movement):
+                add(movement['date'], line_key, kg)
+    return {key: kg for key, kg in balances.items() if kg}
+
+
+def quantities(rng, names):
+    return {name: rng.choice([0, 0, 10, 25, 40]) for name in names}
+
+
+def random_record(rng, key, record_id):
+    record = {
+        'id': record_id,
+        'variety': rng.choice(VARIETIES),
+        'storage_location_id': rng.choice([1, 2, None]),
+        'size_quantities': quantities(rng, SIZES),
+        'quality_quantities': quantities(rng, QUALITIES),
+    }
+    if key == 'receipts':
+        record.update(receipt_date=rng.choice(DAYS), producer_id=rng.choice([1, 2]))
+    else:
+        total = sum(record['size_quantities'].values()) + sum(record['quality_quantities'].values())
+        record.update(date=rng.choice(DAYS), customer_id=rng.choice([1, 2]),
+                      executed_quantity=rng.randint(0, total) // 4)
+    return record
+
+
+@pytest.fixture
+def posted(repository):
+    """Παραλαβές/παραγγελίες με καταχωρήσεις, διορθώσεις, διαγραφές και χειροκίνητες κινήσεις"""
+    rng = random.Random(7)
+    for step in range(150):
+        key = rng.choice(['receipts', 'receipts', 'orders'])
+        existing = [record['id'] for record in repository.view(key)]
+        if existing and rng.random() < 0.15:
+            record_id = rng.choice(existing)
+            repository.delete(key, record_id)
+        else:
+            record_id = rng.choice(existing) if existing and rng.random() < 0.3 else repository.next_id(key)
+            repository.upsert(key, random_record(rng, key, record_id))
+        post(repository, key, [record_id], 'admin')
+        if step % 25 == 24:
+            ledger = repository.index('movements', 'ledger')
+            stocked = [key for key, kg in ledger.balances(1).items() if kg >= 10]
+            if stocked:
+                _, variety, size, quality = rng.choice(stocked)
+                transfer(repository, 1, 2, variety, size, quality, 5, DAYS[-1], 'admin')
+                adjust(repository, 2, variety, size, quality, 3, DAYS[-1], 'admin')
+    return repository
+
+
+def test_post_matches_full_recompute(posted):
+    ledger = posted.index('movements', 'ledger')
+    assert {movement['type'] for movement in posted.view('movements')} == {'receipt', 'order', 'transfer', 'adjustment'}
+    assert ledger.balances() == recompute(posted)
+    for day in ['2025-12-31', DAYS[0], '2026-02-14', DAYS[len(DAYS) // 2], DAYS[-1]]:
+        assert ledger.balances(day=day) == recompute(posted, day)
+
+
+def test_incremental_ledger_matches_rebuild(posted):
+    ledger = posted.index('movements', 'ledger')
+    rebuilt = StockLedger()
+    rebuilt.rebuild(list(posted.view('movements')))
+    assert ledger.balances() == rebuilt.balances()
+    assert ledger.location_totals() == rebuilt.location_totals()
+    for day in DAYS[::5]:
+        assert ledger.balances(day=day) == rebuilt.balances(day=day)
+        assert ledger.location_totals(day) == rebuilt.location_totals(day)
+    for location_id in (1, 2):
+        assert ledger.count(location_id) == rebuilt.count(location_id)
+
+
+def test_location_balances(posted):
+    ledger = posted.index('movements', 'ledger')
+    rebuilt = StockLedger()
+    rebuilt.rebuild(list(posted.view('movements')))
+    balances = ledger.balances()
+    for location_id in (1, 2, 3):
+        expected = {key: kg for key, kg in balances.items() if key[0] == location_id}
+        assert ledger.balances(location_id) == expected
+        assert rebuilt.balances(location_id) == expected
+        assert sum(expected.values()) == ledger.on_hand(location_id)
+    # Αντίγραφο: αλλαγές στο αποτέλεσμα δεν αγγίζουν το καθολικό
+    ledger.balances(1).clear()
+    assert ledger.balances(1) == {key: kg for key, kg in balances.items() if key[0] == 1}
+
+
+def test_post_is_idempotent(posted):
+    for key in ('receipts', 'orders'):
+        ids = [record['id'] for record in posted.view(key)]
+        assert post(posted, key, ids, 'admin') == []
+
+
+def test_sync_matches_full_recompute(history):
+    # Οι συνθετικές παραλαβές γράφτηκαν χωρίς κινήσεις
+    assert not list(history.view('movements'))
+    movements = sync(history)
+    assert movements
+    ledger = history.index('movements', 'ledger')
+    assert ledger.balances() == recompute(history)
+    assert ledger.balances(day='2022-12-31') == recompute(history, '2022-12-31')
+    assert sync(history) == []
+    assert sync(history, force=True) == []
+
+
+def test_sync_reverses_deleted_records(repository):
+    record = random_record(random.Random(1), 'receipts', 1)
+    record['storage_location_id'] = 1
+    repository.upsert('receipts', record)
+    post(repository, 'receipts', [1], 'admin')
+    # Διαγραφή χωρίς post (π.χ. εκτός εφαρμογής): το sync με force την αντιλογίζει
+    repository.delete('receipts', 1)
+    assert repository.index('movements', 'ledger').on_hand(1) > 0
+    sync(repository, force=True)
+    assert repository.index('movements', 'ledger').on_hand(1) == 0
+    assert recompute(repository) == {}
+
+
+def test_backdated_transfer_checks_every_later_balance(repository):
+    # 100 kg στις 10-01, −80 στις 10-10, +100 στις 10-20: από τις 10-05 και μετά διαθέσιμα μόνο 20
+    adjust(repository, 1, 'Navel', '16', '', 100, '2026-10-01', 'admin')
+    adjust(repository, 1, 'Navel', '16', '', -80, '2026-10-10', 'admin')
+    adjust(repository, 1, 'Navel', '16', '', 100, '2026-10-20', 'admin')
+    ledger = repository.index('movements', 'ledger')
+    key = (1, 'Navel', '16', '')
+    assert ledger.balance(key) == 120
+    assert ledger.lowest_balance(key, '2026-10-05') == 20
+    assert ledger.lowest_balance(key, '2026-10-20') == 120
+
+    with pytest.raises(ValueError, match='20 kg'):
+        transfer(repository, 1, 2, 'Navel', '16', '', 50, '2026-10-05', 'admin')
+    with pytest.raises(ValueError):
+        adjust(repository, 1, 'Navel', '16', '', -30, '2026-10-12', 'admin')
+    transfer(repository, 1, 2, 'Navel', '16', '', 20, '2026-10-05', 'admin')
+    assert ledger.balances(2) == {(2, 'Navel', '16', ''): 20}
+    assert ledger.lowest_balance(key, '2026-10-01') == 0
+    assert ledger.balances(day='2026-10-10') == recompute(repository, '2026-10-10')
@@ -0,0 +1,44 @@
+"""Λίστες επιλογών: μία κατασκευή ανά έκδοση συλλογής και θέσεις με all_label"""
+from core.options import OptionLists, option_id, option_label, option_name
+
+
+def test_labels_round_trip():
+    label = option_label({'id': 12, 'name': 'Συνεταιρισμός - Άργος'})
+    assert label == '12 - Συνεταιρισμός - Άργος'
+    assert option_id(label) == 12
+    assert option_name(label) == 'Συνεταιρισμός - Άργος'
+
+
+def test_cached_per_version(repository):
+    options = OptionLists(repository)
+    labels, positions = options.get('producers')
+    assert labels == ['1 - Παραγωγός Α', '2 - Παραγωγός Β']
+    assert positions == {1: 0, 2: 1}
+    # Ίδια έκδοση: τα ίδια αντικείμενα, χωρίς νέα κατασκευή
+    assert options.get('producers')[0] is labels
+
+    repository.upsert('producers', {'id': 3, 'name': 'Παραγωγός Γ'})
+    labels, positions = options.get('producers')
+    assert labels[-1] == '3 - Παραγωγός Γ' and positions[3] == 2
+    repository.upsert('producers', {'id': 1, 'name': 'Παραγωγός Α (νέο όνομα)'})
+    assert options.get('producers')[0][0] == '1 - Παραγωγός Α (νέο όνομα)'
+    repository.delete('producers', 2)
+    labels, positions = options.get('producers')
+    assert labels == ['1 - Παραγωγός Α (νέο όνομα)', '3 - Παραγωγός Γ']
+    assert positions == {1: 0, 3: 1}
+    assert options.index_of('producers', 2, default=-1) == -1
+
+
+def test_all_label_shifts_positions(repository):
+    options = OptionLists(repository)
+    labels, positions = options.get('customers', "Όλοι")
+    assert labels == ["Όλοι", '1 - Πελάτης Α', '2 - Πελάτης Β']
+    assert positions == {1: 1, 2: 2}
+    # Χωριστή λίστα ανά all_label· η απλή μένει χωρίς μετατόπιση
+    assert options.get('customers')[1] == {1: 0, 2: 1}
+    assert options.index_of('customers', 2) == 1
+
+    repository.upsert('customers', {'id': 3, 'name': 'Πελάτης Γ'})
+    labels, positions = options.get('customers', "Όλοι")
+    assert labels[0] == "Όλοι" and labels[positions[3]] == '3 - Πελάτης Γ'
+    assert positions[3] == 3
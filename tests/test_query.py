@@ -0,0 +1,123 @@
+"""Μηχανή ερωτημάτων έναντι απλού υπολογισμού σε Python πάνω σε όλες τις εγγραφές"""
+from collections import defaultdict
+from datetime import date
+
+import pytest
+
+from core.constants import SIZES
+from core.query import QueryEngine
+from core.services import open_repository
+from core.snapshot import default_directory, write_snapshot
+
+START, END = date(2021, 11, 1), date(2024, 2, 29)
+
+
+def stored(repository, key):
+    return list(repository.store.iter_records(key))
+
+
+def between(record, key, start=START, end=END):
+    day = record['receipt_date' if key == 'receipts' else 'date']
+    return start.isoformat() <= day <= end.isoformat()
+
+
+def ids(engine, key, rows):
+    return sorted(engine.mirror(key).ids[rows].tolist())
+
+
+@pytest.fixture(params=['paged', 'snapshot'])
+def engines(request, tmp_path, history):
+    """Η μηχανή με είδωλο που ακολουθεί τους μήνες στη μνήμη ή που ξεκινά από στιγμιότυπο"""
+    if request.param == 'snapshot':
+        directory = default_directory('sqlite', str(tmp_path / 'data.db'), str(tmp_path))
+        for key in ('receipts', 'orders'):
+            write_snapshot(history.store, key, directory)
+        history = open_repository('sqlite', str(tmp_path / 'data.db'), str(tmp_path), write_behind=False)
+        assert history.index('receipts', 'columns').complete
+    return history, QueryEngine(history)
+
+
+def test_select_filters(engines):
+    repository, engine = engines
+    records = stored(repository, 'receipts')
+    variety = records[0]['variety']
+    cases = [
+        ({}, lambda r: True),
+        ({'producer': 3}, lambda r: r['producer_id'] == 3),
+        ({'producer': [1, 2, 5]}, lambda r: r['producer_id'] in (1, 2, 5)),
+        ({'variety': variety}, lambda r: r['variety'] == variety),
+        ({'paid': 'Όχι'}, lambda r: r['paid'] == 'Όχι'),
+        ({'certification': 'GlobalGAP'}, lambda r: 'GlobalGAP' in r['certifications']),
+        ({'storage': 2, 'paid': True}, lambda r: r['storage_location_id'] == 2 and r['paid'] == 'Ναι'),
+    ]
+    for filters, match in cases:
+        rows = engine.select('receipts', START, END, **filters)
+        expected = sorted(r['id'] for r in records if between(r, 'receipts') and match(r))
+        assert ids(engine, 'receipts', rows) == expected, filters
+    assert ids(engine, 'receipts', engine.select('receipts')) == sorted(r['id'] for r in records)
+
+
+def test_summarize(engines):
+    repository, engine = engines
+    records = [r for r in stored(repository, 'orders') if between(r, 'orders')]
+    summary = engine.mirror('orders').summarize(engine.select('orders', START, END))
+    assert summary['count'] == len(records)
+    assert summary['total_kg'] == sum(r['total_kg'] for r in records)
+    assert summary['total_value'] == pytest.approx(sum(r['total_value'] for r in records))
+    assert summary['sizes'] == {size: sum(r['size_quantities'][size] for r in records) for size in SIZES}
+
+
+def test_aggregate_by_entity_and_month(engines):
+    repository, engine = engines
+    expected = defaultdict(lambda: [0, 0, 0.0])
+    for r in stored(repository, 'receipts'):
+        if between(r, 'receipts'):
+            totals = expected[(r['producer_id'], r['receipt_date'][:7])]
+            totals[0] += 1
+            totals[1] += r['total_kg']
+            totals[2] += r['total_value']
+
+    result = engine.aggregate('receipts', engine.select('receipts', START, END), ['producer', 'month'])
+    names = {producer['id']: producer['name'] for producer in repository.view('producers')}
+    actual = {}
+    for producer_id, name, month, count, kg, value in zip(
+        result['producer_id'].tolist(), result['producer'], result['month'],
+        result['count'].tolist(), result['total_kg'].tolist(), result['total_value'].tolist()
+    ):
+        assert name == names[producer_id]
+        actual[(producer_id, month)] = (count, kg, value)
+    assert set(actual) == set(expected)
+    for group, (count, kg, value) in actual.items():
+        assert (count, kg) == tuple(expected[group][:2])
+        assert value == pytest.approx(expected[group][2])
+
+
+def test_pivot(engines):
+    repository, engine = engines
+    expected = defaultdict(int)
+    for r in stored(repository, 'orders'):
+        if between(r, 'orders'):
+            expected[(r['customer'], r['variety'])] += r['total_kg']
+    table = engine.pivot('orders', 'customer', 'variety', start=START, end=END)
+    actual = {
+        (customer, variety): kg
+        for customer, row in table.iterrows() for variety, kg in row.items() if kg
+    }
+    assert actual == dict(expected)
+
+
+def test_entity_totals(engines):
+    repository, engine = engines
+    for start, end in [(None, None), (START, END), (date.fromisoformat(repository.active_start('orders')), None)]:
+        expected = defaultdict(lambda: [0, 0, 0.0])
+        for r in stored(repository, 'orders'):
+            if between(r, 'orders', start or date.min, end or date.max):
+                totals = expected[r['customer_id']]
+                totals[0] += 1
+                totals[1] += r['total_kg']
+                totals[2] += r['total_value']
+        result = engine.entity_totals('orders', start, end)
+        assert result['customer_id'].tolist() == sorted(expected)
+        assert result['count'].tolist() == [expected[c][0] for c in sorted(expected)]
+        assert result['total_kg'].tolist() == [expected[c][1] for c in sorted(expected)]
+        assert result['total_value'].tolist() == pytest.approx([expected[c][2] for c in sorted(expected)])
@@ -0,0 +1,102 @@
+"""Αποθετήριο: έλεγχος έκδοσης (optimistic concurrency) στο upsert και στο upsert_many"""
+import pytest
+
+from core.repository import ConflictError, record_version
+from core.services import open_repository
+
+
+def receipt(record_id, day='2026-10-01', **fields):
+    return dict({'id': record_id, 'receipt_date': day, 'producer_id': 1, 'variety': 'Navel', 'total_kg': 100}, **fields)
+
+
+@pytest.fixture
+def other(tmp_path, repository):
+    """Δεύτερο αποθετήριο στην ίδια βάση, όπως μια άλλη διεργασία του Streamlit"""
+    return open_repository('sqlite', str(tmp_path / 'data.db'), str(tmp_path), write_behind=False)
+
+
+def test_new_record_and_stale_edit(repository):
+    saved = repository.upsert('receipts', receipt(1), expected_version=0)
+    assert record_version(saved) == 1
+    edited = repository.upsert('receipts', dict(saved, total_kg=120), expected_version=1)
+    assert record_version(edited) == 2
+
+    with pytest.raises(ConflictError) as error:
+        repository.upsert('receipts', dict(saved, total_kg=90), expected_version=1)
+    assert error.value.expected == 1
+    assert error.value.current['total_kg'] == 120
+    assert repository.get('receipts', 1)['total_kg'] == 120
+
+
+def test_id_taken_by_another_process(repository, other):
+    other.upsert('receipts', receipt(1), expected_version=0)
+    with pytest.raises(ConflictError) as error:
+        repository.upsert('receipts', receipt(1, total_kg=50), expected_version=0)
+    assert error.value.expected == 0
+    assert error.value.current['total_kg'] == 100
+
+
+def test_edit_after_delete_by_another_process(repository, other):
+    saved = repository.upsert('receipts', receipt(1), expected_version=0)
+    other.delete('receipts', 1, expected_version=1)
+    with pytest.raises(ConflictError) as error:
+        repository.upsert('receipts', dict(saved, total_kg=80), expected_version=1)
+    assert error.value.current is None
+    assert repository.get('receipts', 1) is None
+
+
+def test_concurrent_edits_of_the_same_record(repository, other):
+    saved = repository.upsert('receipts', receipt(1), expected_version=0)
+    other.refresh()
+    other.upsert('receipts', dict(other.get('receipts', 1), total_kg=150), expected_version=1)
+    with pytest.raises(ConflictError):
+        repository.upsert('receipts', dict(saved, total_kg=200), expected_version=1)
+    repository.refresh()
+    assert repository.get('receipts', 1)['total_kg'] == 150
+    assert other.get('receipts', 1)['total_kg'] == 150
+
+
+def test_upsert_without_expected_version_overwrites(repository, other):
+    repository.upsert('receipts', receipt(1), expected_version=0)
+    other.refresh()
+    other.upsert('receipts', dict(other.get('receipts', 1), total_kg=150))
+    saved = repository.upsert('receipts', receipt(1, total_kg=200))
+    assert saved['total_kg'] == 200 and record_version(saved) == 3
+
+
+def test_upsert_many_is_all_or_nothing(repository, other):
+    repository.upsert_many('receipts', [receipt(1), receipt(2)], [0, 0])
+    other.refresh()
+    other.upsert('receipts', dict(other.get('receipts', 2), total_kg=150), expected_version=1)
+
+    with pytest.raises(ConflictError) as error:
+        repository.upsert_many('receipts', [receipt(1, total_kg=10), receipt(2, total_kg=20), receipt(3)], [1, 1, 0])
+    assert error.value.record_id == 2
+    assert repository.get('receipts', 1)['total_kg'] == 100
+    assert repository.get('receipts', 3) is None
+    assert repository.store.get('receipts', 3) is None
+    assert repository.next_id('receipts') == 3
+
+    saved = repository.upsert_many('receipts', [receipt(1, total_kg=10), receipt(3)], [1, 0])
+    assert [record_version(record) for record in saved] == [2, 1]
+
+
+def test_prepare_error_writes_nothing(repository):
+    def reject(record, current):
+        raise ValueError("απορρίφθηκε")
+
+    with pytest.raises(ValueError):
+        repository.upsert_many('receipts', [receipt(1), receipt(2)], [0, 0], prepare=reject)
+    assert repository.get('receipts', 1) is None
+    assert repository.store.is_empty('receipts')
+
+
+def test_conflict_on_historical_month(history):
+    # Η εγγραφή ιστορικού μήνα φορτώνεται πριν από τον έλεγχο έκδοσης
+    record = history.store.get('receipts', 1)
+    assert record['receipt_date'] < history.active_start('receipts')
+    with pytest.raises(ConflictError):
+        history.upsert('receipts', dict(record, total_kg=1), expected_version=0)
+    saved = history.upsert('receipts', dict(record, total_kg=1), expected_version=record_version(record))
+    assert history.get('receipts', 1)['total_kg'] == 1
+    assert record_version(saved) == record_version(record) + 1
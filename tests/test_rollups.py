@@ -0,0 +1,93 @@
+"""Ημερήσια συγκεντρωτικά: σταδιακή ενημέρωση και rebuild έναντι πλήρους επανυπολογισμού"""
+import random
+from collections import defaultdict
+from datetime import date
+
+import pytest
+
+from core.constants import QUALITIES, SIZES
+from core.rollups import ROLLUPS, DailyRollup
+
+
+@pytest.fixture
+def receipts(history):
+    return list(history.store.iter_records('receipts'))
+
+
+def rebuilt(key, records):
+    rollup = DailyRollup(*ROLLUPS[key])
+    rollup.rebuild(records)
+    return rollup
+
+
+def expected_totals(records, start=None, end=None):
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for record in records:
+        day = record['receipt_date']
+        if (start is None or day >= start) and (end is None or day <= end):
+            entity = totals[record['producer_id']]
+            entity[0] += 1
+            entity[1] += record['total_kg']
+            entity[2] += record['total_value']
+    return totals
+
+
+def test_rebuild_matches_insert_per_record(receipts):
+    incremental = DailyRollup(*ROLLUPS['receipts'])
+    for record in receipts:
+        incremental.insert(record)
+    assert incremental.differences(rebuilt('receipts', receipts)) == []
+
+
+def test_incremental_changes_match_rebuild(receipts):
+    rng = random.Random(3)
+    rollup = rebuilt('receipts', receipts)
+    current = {record['id']: record for record in receipts}
+    for record_id in rng.sample(sorted(current), 200):
+        old = current[record_id]
+        if rng.random() < 0.3:
+            rollup.delete(old)
+            del current[record_id]
+            continue
+        new = dict(old, total_kg=old['total_kg'] + rng.randint(-50, 50), variety=rng.choice(['Navel', 'Μέρκοτ']),
+                   receipt_date=rng.choice([old['receipt_date'], '2025-12-24']), producer_id=rng.choice([1, 2, None]))
+        rollup.update(old, new)
+        current[record_id] = new
+    assert rollup.differences(rebuilt('receipts', list(current.values()))) == []
+
+
+@pytest.mark.parametrize('start, end', [
+    (None, None), ('2021-01-01', '2021-03-31'), ('2020-11-15', '2025-05-31'), ('2024-02-29', '2024-02-29'),
+])
+def test_totals_by_entity_match_recompute(receipts, start, end):
+    totals = rebuilt('receipts', receipts).totals_by_entity(start, end)
+    expected = expected_totals(receipts, start, end)
+    assert sorted(totals) == sorted(expected)
+    for entity_id, (count, kg, value) in expected.items():
+        assert totals[entity_id]['count'] == count
+        assert totals[entity_id]['total_kg'] == kg
+        assert totals[entity_id]['total_value'] == pytest.approx(value)
+
+
+def test_summarize_matches_recompute(receipts):
+    rollup = rebuilt('receipts', receipts)
+    start, end = date(2022, 9, 1), date(2023, 8, 31)
+    chosen = [r for r in receipts if start.isoformat() <= r['receipt_date'] <= end.isoformat()
+              and r['variety'] == 'Navel' and 'GlobalGAP' in r['certifications']]
+    summary = rollup.summarize(start, end, variety='Navel', certification='GlobalGAP')
+    assert summary['count'] == len(chosen)
+    assert summary['total_kg'] == sum(r['total_kg'] for r in chosen)
+    assert summary['sizes'] == {size: sum(r['size_quantities'][size] for r in chosen) for size in SIZES}
+    assert summary['qualities'] == {q: sum(r['quality_quantities'][q] for r in chosen) for q in QUALITIES}
+
+
+def test_repository_rollup_follows_resident_months(history):
+    rollup = history.index('receipts', 'rollup')
+    history.load_range('receipts', date(2021, 1, 1), date(2021, 6, 30))
+    record = history.get('receipts', 1)
+    history.upsert('receipts', dict(record, total_kg=record['total_kg'] + 7))
+    history.delete('receipts', 2)
+    # Εκτόπιση πέρα από το όριο της cache μηνών και νέα φόρτωση
+    history.load_range('receipts')
+    history.load_range('receipts', date.fromisoformat(history.active_start('receipts')))
+    assert rollup.differences(rebuilt('receipts', list(history.view('receipts')))) == []
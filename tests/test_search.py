@@ -0,0 +1,101 @@
+"""Αναζήτηση κειμένου: κανονική μορφή ελληνικών/greeklish, προθέματα, τριάδες και ενημέρωση"""
+import pytest
+
+from core.search import SearchIndex, normalize, search, tokenize
+
+
+@pytest.mark.parametrize('variants', [
+    ['Παπαδόπουλος', 'ΠΑΠΑΔΟΠΟΥΛΟΣ', 'παπαδοπουλος', 'Papadopoulos', 'papadopoylos'],
+    ['Θεοδωρίδης', 'ΘΕΟΔΩΡΙΔΗΣ', 'Theodoridis', 'theodwridis'],
+    ['Ευαγγελία', 'Evaggelia', 'Eyaggelia', 'EVAGGELIA'],
+    ['Χαράλαμπος', 'Haralampos', 'Xaralampos'],
+    ['Ψαράς', 'Psaras', 'ψαρας'],
+    ['Ϊόνιο', 'ιονιο', 'Ionio'],
+])
+def test_greek_and_greeklish_normalize_alike(variants):
+    assert len({normalize(text) for text in variants}) == 1
+
+
+def test_tokenize():
+    assert tokenize('LOT 251103-12-NAV, Τιμ. 2025/117') == ('lot', '251103-12-nav', 'tim', '2025/117')
+    assert tokenize('Κλημεντίνη  café') == ('klimentini', 'cafe')
+    assert tokenize('') == ()
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex('producers')
+    index.rebuild([
+        {'id': 1, 'name': 'Γιώργος Παπαδόπουλος', 'phone': '2101111111', 'address': 'Άργος'},
+        {'id': 2, 'name': 'Μαρία Παπαδάκη', 'phone': '2102222222', 'address': 'Ναύπλιο'},
+        {'id': 3, 'name': 'Χαράλαμπος Θεοδωρίδης', 'address': 'Παπαδοπούλου 5, Άργος',
+         'certifications': ['GlobalGAP', 'Βιολογικό']},
+    ])
+    return index
+
+
+def ids(results):
+    return [record_id for record_id, _ in results]
+
+
+def test_exact_match_ranks_by_field_weight(index):
+    # Το όνομα (βάρος 3) προηγείται της διεύθυνσης (βάρος 1)
+    results = index.query('ΠΑΠΑΔΟΠΟΥΛΟΣ')
+    assert ids(results) == [1]
+    assert ids(index.query('papadopoulou')) == [3]
+    assert ids(index.query('argos')) == [3, 1]
+    assert ids(index.query('γιωργος argos')) == [1]
+    assert index.query('γιωργος ναυπλιο') == []
+    assert index.query('') == []
+
+
+def test_prefix_while_typing(index):
+    assert sorted(ids(index.query('παπαδ'))) == [1, 2, 3]
+    assert ids(index.query('Παπαδά')) == [2]
+    assert ids(index.query('210222')) == [2]
+    assert ids(index.query('βιολ')) == [3]
+    # Το ακριβές ταίριασμα βαθμολογείται πάνω από το πρόθεμα
+    exact, = index.query('argos')[:1]
+    prefix, = index.query('arg')[:1]
+    assert exact[1] > prefix[1]
+
+
+def test_trigram_fallback_for_typos(index):
+    # Ορθογραφικά λάθη χωρίς ακριβές ή πρόθεμα: κοινές τριάδες
+    assert ids(index.query('Charalambos')) == [3]
+    assert ids(index.query('Θεοδρίδης')) == [3]
+    assert ids(index.query('Παπαδόπουλως')) == [1]
+    # Τα ο/ω και ι/η ταυτίζονται· δεν είναι λάθος, βαθμολογείται ως ακριβές
+    assert index.query('Θεοδορίδις') == index.query('Θεοδωρίδης')
+    score = index.query('Θεοδρίδης')[0][1]
+    assert 0 < score < index.query('Θεοδωρίδης')[0][1]
+    # Όροι με ψηφία (LOT, τηλέφωνα) δεν ψάχνονται με τριάδες
+    assert index.query('2109999999') == []
+    assert index.query('ξξξξξξ') == []
+
+
+def test_limit_and_ties(index):
+    # Σε ισοβαθμία προηγούνται οι νεότερες εγγραφές
+    assert ids(index.query('παπαδ', limit=2)) == ids(index.query('παπαδ'))[:2]
+    tied = SearchIndex('producers')
+    tied.rebuild([{'id': record_id, 'name': 'Navel'} for record_id in (4, 9, 7)])
+    assert ids(tied.query('navel')) == [9, 7, 4]
+
+
+def test_index_follows_repository_writes(repository):
+    repository.upsert('producers', {'id': 3, 'name': 'Χαράλαμπος Θεοδωρίδης', 'phone': '6971234567'})
+    assert [record['id'] for _, record, _ in search(repository, 'theodoridis', keys=['producers'])] == [3]
+
+    repository.upsert('producers', {'id': 3, 'name': 'Χαράλαμπος Νικολάου', 'phone': '6971234567'})
+    index = repository.index('producers', 'search')
+    assert index.query('theodoridis') == []
+    assert ids(index.query('nikolaou')) == [3]
+    assert ids(index.query('697123')) == [3]
+
+    repository.delete('producers', 3)
+    assert index.query('nikolaou') == [] and index.query('697123') == []
+    # Και οι παραλαβές ενημερώνονται, π.χ. με τον LOT
+    repository.upsert('receipts', {'id': 1, 'receipt_date': '2026-10-05', 'producer_id': 1,
+                                   'producer_name': 'Παραγωγός Α', 'variety': 'Navel', 'lot': '261005-1-NAV'})
+    results = search(repository, '261005-1')
+    assert [(key, record['id']) for key, record, _ in results] == [('receipts', 1)]
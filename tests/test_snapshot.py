@@ -0,0 +1,84 @@
+"""Στιγμιότυπο: JSON -> write_snapshot -> open_snapshot -> ίδιες εγγραφές (τύποι, σειρά πεδίων, None)"""
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.generate import write_store
+from core.snapshot import open_snapshot, verify, write_snapshot
+
+# Παραλαβές όπως τις γράφει η εφαρμογή, και παραλλαγές που δεν χωρούν ακριβώς στο σχήμα
+RECEIPTS = '''[
+  {"id": 1, "receipt_date": "2024-11-05", "producer_id": 3, "producer_name": "Γιώργος Παπαδόπουλος (3)",
+   "variety": "Κλημεντίνη", "lot": "241105-3-ΚΛΗ", "storage_location_id": 1, "storage_location": "Αποθήκη Α",
+   "size_quantities": {"10": 0, "12": 5, "14": 10, "16": 20, "18": 40, "20": 80, "22": 60, "24": 30, "26": 10,
+                       "26-32": 5, "Διάφορα": 0, "Σκάρτα": 0, "Μεταποίηση": 0},
+   "quality_quantities": {"Ι": 50, "ΙΙ": 20, "ΙΙΙ": 5, "Σκάρτα": 0, "Διάφορα": 0, "Μεταποίηση": 0},
+   "certifications": ["GlobalGAP", "Βιολογικό"], "agreed_price_per_kg": 0.45, "total_kg": 335,
+   "total_value": 150.75, "paid": "Όχι", "invoice_ref": "ΤΔΑ-1", "observations": "Καλή ποιότητα",
+   "created_by": "admin", "created_at": "2024-11-05 09:12:00", "version": 2, "updated_at": "2024-11-06 10:00:00"},
+  {"id": 2, "receipt_date": "2024-11-05", "producer_id": null, "producer_name": null, "variety": "Navel",
+   "lot": null, "storage_location_id": null, "storage_location": null, "certifications": [],
+   "agreed_price_per_kg": null, "total_kg": 0, "total_value": 0, "paid": "Ναι"},
+  {"id": 3, "receipt_date": "2024-12-01", "producer_id": 4, "variety": "Valencia", "agreed_price_per_kg": 0.5,
+   "total_kg": 120.0, "total_value": 60, "observations": ""},
+  {"id": 4, "receipt_date": "2024-12-02", "producer_id": 4, "variety": "Νοβα", "total_kg": 10,
+   "pallets": 3, "notes": {"driver": "Νίκος"}},
+  {"id": 5, "receipt_date": "2025-01-15", "producer_id": "5", "variety": "Μέρκοτ", "total_kg": "12"},
+  {"id": 6, "receipt_date": "2025-01-15", "variety": "Lane Late", "total_kg": 5,
+   "size_quantities": {"12": 5}, "certifications": ["a\\u001fb"]},
+  {"id": 7, "variety": "Merlin", "receipt_date": "2025-01-16", "total_kg": 7}
+]'''
+
+
+def round_trip(store, tmp_path, key, records):
+    store.write_batch(key, [(record['id'], record) for record in records])
+    write_snapshot(store, key, str(tmp_path / 'snapshots'))
+    snapshot = open_snapshot(str(tmp_path / 'snapshots'), key)
+    ids = snapshot.column('id')[:snapshot.rows].tolist()
+    return snapshot, dict(zip(ids, snapshot.records(np.arange(snapshot.rows))))
+
+
+def same(record, copy):
+    """Ίδιες τιμές, ίδιοι τύποι (int/float) και ίδια σειρά πεδίων"""
+    return json.dumps(record, ensure_ascii=False) == json.dumps(copy, ensure_ascii=False)
+
+
+@pytest.fixture
+def receipts():
+    return json.loads(RECEIPTS)
+
+
+def test_records_round_trip(store, tmp_path, receipts):
+    snapshot, decoded = round_trip(store, tmp_path, 'receipts', receipts)
+    assert snapshot.rows == len(receipts)
+    for record in receipts:
+        assert same(record, decoded[record['id']])
+    assert verify(store, snapshot) == (len(receipts), 0, 0)
+
+
+def test_columns_keep_null_missing_and_number_types(store, tmp_path, receipts):
+    _, decoded = round_trip(store, tmp_path, 'receipts', receipts)
+    assert decoded[2]['producer_id'] is None and decoded[2]['lot'] is None
+    assert 'size_quantities' not in decoded[2] and 'version' not in decoded[3]
+    assert type(decoded[1]['total_kg']) is int and type(decoded[1]['total_value']) is float
+    assert type(decoded[3]['total_kg']) is float and type(decoded[3]['total_value']) is int
+    assert decoded[1]['variety'] == "Κλημεντίνη" and decoded[1]['certifications'] == ["GlobalGAP", "Βιολογικό"]
+
+
+def test_only_unfitting_records_fall_back_to_json(store, tmp_path, receipts):
+    snapshot, decoded = round_trip(store, tmp_path, 'receipts', receipts)
+    raw = snapshot.column('raw')[:snapshot.rows]
+    ids = snapshot.column('id')[:snapshot.rows].tolist()
+    # Άγνωστα πεδία, λάθος τύποι, ελλιπή νούμερα, διαχωριστικό σε λίστα, άλλη σειρά πεδίων
+    assert {record_id for record_id, code in zip(ids, raw.tolist()) if code} == {4, 5, 6, 7}
+    assert decoded[4]['notes'] == {"driver": "Νίκος"}
+    assert decoded[5]['producer_id'] == "5"
+
+
+def test_generated_collections_round_trip(store, tmp_path):
+    write_store(store, 300)
+    for key in ('receipts', 'orders'):
+        snapshot = write_snapshot(store, key, str(tmp_path / 'snapshots'))
+        assert not np.count_nonzero(snapshot.column('raw')[:snapshot.rows])
+        assert verify(store, snapshot) == (snapshot.rows, 0, 0)
@@ -0,0 +1,155 @@
+"""LOT και ιχνηλασιμότητα: μοναδικοί LOT, κατανομές και αναζήτηση προς τα εμπρός/πίσω"""
+from datetime import date
+
+import pytest
+
+from core.lots import LotIndex, generate_lot_number, lot_collection, lot_date
+from core.trace import allocate, check_allocations, trace_backward, trace_forward, trace_lot, trace_producer
+
+
+def save(repository, key, record):
+    """Αποθήκευση όπως στο save_record: έλεγχος κατανομών και μοναδικός LOT υπό το κλείδωμα"""
+    lots = repository.index(key, 'lots')
+
+    def prepare(record, current):
+        check_allocations(repository, key, record, current)
+        return lots.assign(record, current)
+
+    return repository.upsert(key, record, prepare=prepare)
+
+
+def receipt(record_id, day, producer_id, variety, kg):
+    return {'id': record_id, 'receipt_date': day, 'producer_id': producer_id,
+            'producer_name': f'Παραγωγός {producer_id}', 'variety': variety, 'total_kg': kg,
+            'size_quantities': {'16': kg}, 'quality_quantities': {}}
+
+
+def order(record_id, day, customer_id, variety, kg):
+    return {'id': record_id, 'date': day, 'customer_id': customer_id, 'customer': f'Πελάτης {customer_id}',
+            'variety': variety, 'total_kg': kg, 'size_quantities': {'16': kg}, 'quality_quantities': {}}
+
+
+@pytest.fixture
+def traced(repository):
+    """Δύο παραλαβές του ίδιου παραγωγού/ημέρας/ποικιλίας, μία άλλη, και τρεις παραγγελίες"""
+    save(repository, 'receipts', receipt(1, '2026-10-05', 1, 'Navel', 500))
+    save(repository, 'receipts', receipt(2, '2026-10-05', 1, 'navel', 300))
+    save(repository, 'receipts', receipt(3, '2026-10-06', 2, 'Valencia', 200))
+    save(repository, 'orders', order(1, '2026-10-05', 1, 'Navel', 400))
+    save(repository, 'orders', order(2, '2026-10-07', 2, 'Navel', 350))
+    save(repository, 'orders', order(3, '2026-10-07', 2, 'Valencia', 100))
+    allocate(repository, 1, 1, 250, 'admin')
+    allocate(repository, 2, 1, 150, 'admin')
+    allocate(repository, 1, 2, 200, 'admin')
+    allocate(repository, 3, 3, 100, 'admin')
+    return repository
+
+
+def lots(repository, key):
+    return {record['id']: record['lot'] for record in repository.view(key)}
+
+
+def test_generate_lot_number():
+    day = date(2026, 10, 5)
+    assert generate_lot_number(day, 7, 'navel') == '261005-7-NAV'
+    taken = {'O-261005-7-NAV', 'O-261005-7-NAV-2'}
+    assert generate_lot_number(day, 7, 'Navel', taken.__contains__, prefix='O-') == 'O-261005-7-NAV-3'
+    assert lot_collection('O-261005-7-NAV') == 'orders' and lot_collection('261005-7-NAV-2') == 'receipts'
+    assert lot_date('O-261005-7-NAV') == day and lot_date('χωρίς-ημερομηνία') is None
+
+
+def test_unique_lot_suffix(traced):
+    receipts = lots(traced, 'receipts')
+    assert receipts == {1: '261005-1-NAV', 2: '261005-1-NAV-2', 3: '261006-2-VAL'}
+    # Ίδια ημέρα, id και ποικιλία με την παραλαβή 1, αλλά με το πρόθεμα των παραγγελιών
+    assert lots(traced, 'orders')[1] == 'O-261005-1-NAV'
+
+    # Η επεξεργασία κρατά τον LOT· αλλαγή ημερομηνίας δίνει νέο
+    save(traced, 'receipts', {**traced.get('receipts', 2), 'total_kg': 320})
+    assert traced.get('receipts', 2)['lot'] == '261005-1-NAV-2'
+    save(traced, 'receipts', receipt(4, '2026-10-05', 1, 'Navel', 50))
+    assert traced.get('receipts', 4)['lot'] == '261005-1-NAV-3'
+    save(traced, 'receipts', {**traced.get('receipts', 4), 'receipt_date': '2026-10-06'})
+    assert traced.get('receipts', 4)['lot'] == '261006-1-NAV'
+    # Ελεύθερος πάλι μετά τη διαγραφή
+    traced.delete('receipts', 4)
+    save(traced, 'receipts', receipt(5, '2026-10-06', 1, 'Navel', 50))
+    assert traced.get('receipts', 5)['lot'] == '261006-1-NAV'
+
+
+def test_assigner_reserves_lots_within_a_batch(repository):
+    index = LotIndex('receipts')
+    assign = index.assigner()
+    batch = [assign(receipt(record_id, '2026-10-05', 1, 'Navel', 10), None) for record_id in (1, 2, 3)]
+    assert [record['lot'] for record in batch] == ['261005-1-NAV', '261005-1-NAV-2', '261005-1-NAV-3']
+    # Παλαιότερος LOT χωρίς πρόθεμα σε παραγγελία διατηρείται στην επεξεργασία
+    orders = LotIndex('orders')
+    current = {**order(1, '2026-10-05', 1, 'Navel', 10), 'lot': '261005-1-NAV'}
+    assert orders.assign(dict(current, total_kg=20), current)['lot'] == '261005-1-NAV'
+
+
+def test_trace_forward_and_backward(traced):
+    forward = trace_forward(traced, [1])
+    assert [(row['order_id'], row['kg'], row['customer']) for row in forward] == [
+        (1, 250, 'Πελάτης 1'), (2, 200, 'Πελάτης 2')]
+    assert {row['receipt_lot'] for row in forward} == {'261005-1-NAV'}
+    assert forward[0]['order_lot'] == 'O-261005-1-NAV' and forward[1]['order_date'] == '2026-10-07'
+
+    backward = trace_backward(traced, [1])
+    assert [(row['receipt_id'], row['kg'], row['producer_name']) for row in backward] == [
+        (1, 250, 'Παραγωγός 1'), (2, 150, 'Παραγωγός 1')]
+    assert trace_backward(traced, [3])[0]['receipt_lot'] == '261006-2-VAL'
+    assert trace_forward(traced, [99]) == [] and trace_backward(traced, []) == []
+
+
+def test_trace_lot_by_side(traced):
+    # LOT παραλαβής: προς τα εμπρός· LOT παραγγελίας (πρόθεμα O-): προς τα πίσω
+    assert [row['order_id'] for row in trace_lot(traced, '261005-1-NAV-2')] == [1]
+    assert [row['receipt_id'] for row in trace_lot(traced, 'O-261005-1-NAV')] == [1, 2]
+    assert trace_lot(traced, '261231-9-XXX') == []
+    # Παλαιότερος LOT παραγγελίας χωρίς πρόθεμα: δεν είναι παραλαβής, άρα προς τα πίσω
+    traced.upsert('orders', {**traced.get('orders', 2), 'lot': '261007-2-NAV'})
+    assert [row['receipt_id'] for row in trace_lot(traced, '261007-2-NAV')] == [1]
+
+    rows = trace_producer(traced, 1, date(2026, 10, 5))
+    assert sorted((row['receipt_id'], row['order_id']) for row in rows) == [(1, 1), (1, 2), (2, 1)]
+    assert trace_producer(traced, 2, date(2026, 10, 5)) == []
+
+
+def test_allocate_rejects_over_allocation(traced):
+    # Παραλαβή 1: 500 kg, ήδη 450 σε παραγγελίες
+    with pytest.raises(ValueError, match='διαθέσιμα μόνο 50 kg'):
+        allocate(traced, 1, 2, 60, 'admin')
+    # Παραγγελία 1: 400 kg, ήδη καλυμμένη
+    with pytest.raises(ValueError, match='μόνο 0 kg'):
+        allocate(traced, 2, 1, 10, 'admin')
+    with pytest.raises(ValueError, match='θετικά'):
+        allocate(traced, 2, 2, 0, 'admin')
+    with pytest.raises(ValueError, match='Δεν υπάρχει η παραλαβή #9'):
+        allocate(traced, 9, 2, 10, 'admin')
+    count = len(list(traced.view('allocations')))
+    allocation = allocate(traced, 2, 2, 150, 'admin')
+    assert allocation['receipt_lot'] == '261005-1-NAV-2' and allocation['order_lot'] == 'O-261007-2-NAV'
+    assert len(list(traced.view('allocations'))) == count + 1
+    # Τα κιλά μιας παραλαβής δεν πέφτουν κάτω από τα κατανεμημένα
+    with pytest.raises(ValueError, match='450 kg'):
+        save(traced, 'receipts', {**traced.get('receipts', 1), 'total_kg': 400})
+
+
+def test_variety_mismatch(traced):
+    with pytest.raises(ValueError, match='Valencia'):
+        allocate(traced, 3, 2, 10, 'admin')
+    # Ίδια ποικιλία με άλλα κεφαλαία/κενά
+    save(traced, 'orders', order(4, '2026-10-08', 1, ' NAVEL ', 100))
+    allocate(traced, 2, 4, 100, 'admin')
+
+    # Παραλαβή ή παραγγελία με κατανομές δεν αλλάζει ποικιλία
+    with pytest.raises(ValueError, match='ποικιλία δεν μπορεί να αλλάξει'):
+        save(traced, 'receipts', {**traced.get('receipts', 1), 'variety': 'Valencia'})
+    with pytest.raises(ValueError, match='κατανομή #4'):
+        save(traced, 'orders', {**traced.get('orders', 3), 'variety': 'Navel'})
+    assert traced.get('receipts', 1)['variety'] == 'Navel'
+    # Αλλαγή μόνο κεφαλαίων επιτρέπεται
+    save(traced, 'receipts', {**traced.get('receipts', 1), 'variety': 'NAVEL'})
+    assert traced.get('receipts', 1)['variety'] == 'NAVEL'
+    check_allocations(traced, 'receipts', traced.get('receipts', 1))
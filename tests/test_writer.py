@@ -0,0 +1,105 @@
+"""Write-behind: αποτυχημένες παρτίδες μένουν σε αναμονή και ξαναδοκιμάζονται"""
+import threading
+import time
+
+import pytest
+
+from core import writer
+from core.writer import WriteBehindStore
+
+
+class FailingStore:
+    """Μηχανή που αποτυγχάνει στις εγγραφές όσο fail είναι True (τα υπόλοιπα στην πραγματική)"""
+
+    def __init__(self, store):
+        self.store = store
+        self.fail = True
+        self.attempts = 0
+        self.started = threading.Event()
+        self.release = None
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def write_batch(self, key, upserts, deletes=()):
+        self.attempts += 1
+        self.started.set()
+        if self.release is not None:
+            self.release.wait(5)
+        if self.fail:
+            raise OSError("ο δίσκος δεν είναι διαθέσιμος")
+        self.store.write_batch(key, upserts, deletes)
+
+
+@pytest.fixture(autouse=True)
+def fast_retry(monkeypatch):
+    monkeypatch.setattr(writer, 'RETRY_DELAY', 0.01)
+
+
+@pytest.fixture
+def failing(store):
+    return FailingStore(store)
+
+
+def test_failed_batch_is_retried(failing):
+    behind = WriteBehindStore(failing, delay=0)
+    behind.upsert('receipts', 1, {'id': 1, 'receipt_date': '2026-10-01', 'total_kg': 10})
+    assert not behind.flush(timeout=0.2)
+    status = behind.status()
+    assert status['pending'] == 1 and not status['durable']
+    assert status['error'] == "OSError: ο δίσκος δεν είναι διαθέσιμος"
+    assert failing.store.get('receipts', 1) is None
+
+    failing.fail = False
+    assert behind.flush(timeout=5)
+    assert failing.store.get('receipts', 1)['total_kg'] == 10
+    status = behind.status()
+    assert status['pending'] == 0 and status['durable'] and status['error'] is None
+    assert failing.attempts > 1
+    behind.close()
+
+
+def test_requeued_batch_keeps_newer_changes(failing):
+    failing.release = threading.Event()
+    behind = WriteBehindStore(failing, delay=0)
+    behind.upsert('receipts', 1, {'id': 1, 'receipt_date': '2026-10-01', 'total_kg': 10})
+    behind.upsert('receipts', 2, {'id': 2, 'receipt_date': '2026-10-01', 'total_kg': 20})
+    assert failing.started.wait(5)
+    # Αλλαγές ενώ γράφεται (και αποτυγχάνει) η πρώτη παρτίδα
+    behind.upsert('receipts', 1, {'id': 1, 'receipt_date': '2026-10-01', 'total_kg': 11})
+    behind.delete('receipts', 2)
+    behind.upsert('receipts', 3, {'id': 3, 'receipt_date': '2026-10-02', 'total_kg': 30})
+    failing.release.set()
+    # Η πρώτη παρτίδα αποτυγχάνει και επιστρέφει στην αναμονή μαζί με τις νεότερες
+    deadline = time.monotonic() + 5
+    while failing.attempts < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    failing.fail = False
+    assert behind.flush(timeout=5)
+    assert failing.store.get('receipts', 1)['total_kg'] == 11
+    assert failing.store.get('receipts', 2) is None
+    assert failing.store.get('receipts', 3)['total_kg'] == 30
+    behind.close()
+
+
+def test_requeue_does_not_override_newer_save(failing):
+    # Μεγάλη καθυστέρηση: η παρτίδα γράφεται μόνο με το flush
+    behind = WriteBehindStore(failing, delay=10)
+    failed = {'receipts': {1: {'id': 1, 'receipt_date': '2026-10-01', 'total_kg': 10}}}
+    behind.save('receipts', [{'id': 5, 'receipt_date': '2026-10-03', 'total_kg': 50}])
+    behind._requeue({}, failed, {'sequence_receipts': 1}, OSError("σφάλμα"))
+    assert behind._changes == {}
+    assert behind._meta == {'sequence_receipts': 1}
+    failing.fail = False
+    assert behind.flush(timeout=5)
+    assert [record['id'] for record in failing.store.load('receipts')] == [5]
+    behind.close()
+
+
+def test_reads_wait_for_pending_writes(store):
+    behind = WriteBehindStore(store, delay=0.05)
+    behind.write_batch('receipts', [(1, {'id': 1, 'receipt_date': '2026-10-01', 'total_kg': 10})])
+    assert behind.get('receipts', 1)['total_kg'] == 10
+    assert [record['id'] for record in behind.load('receipts')] == [1]
+    assert behind.status()['durable']
+    behind.close()